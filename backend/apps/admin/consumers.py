@@ -103,48 +103,28 @@ class AdminTaskConsumer(AsyncWebsocketConsumer):
                     'task_id': task_id
                 }))
                 
-                # Poll for completion (no timeout - runs until complete)
-                poll_interval = 3.0
+                # Follow the orchestrator's task event stream (no timeout - runs until complete)
                 while True:
-                    await asyncio.sleep(poll_interval)
-                    
                     try:
-                        status_response = await client.get(f"{ORCHESTRATOR_URL}/tasks/{task_id}")
-                        
-                        if status_response.status_code != 200:
-                            continue
-                        
-                        status_data = status_response.json()
-                        task_status = status_data.get("status")
-                        
-                        # Send status update
-                        await self.send(text_data=json.dumps({
-                            'type': 'task_status',
-                            'task_id': task_id,
-                            'status': task_status
-                        }))
-                        
-                        if task_status == "completed":
-                            await self.send(text_data=json.dumps({
-                                'type': 'task_complete',
-                                'task_id': task_id,
-                                'success': True,
-                                'result': status_data.get("result")
-                            }))
-                            return
-                        
-                        elif task_status in ("failed", "cancelled"):
-                            await self.send(text_data=json.dumps({
-                                'type': 'task_complete',
-                                'task_id': task_id,
-                                'success': False,
-                                'error': status_data.get("error")
-                            }))
-                            return
+                        status_data = await self.follow_task_events(client, task_id)
+                    except (httpx.HTTPError, ValueError) as stream_error:
+                        logger.warning(f"Task event stream error: {stream_error}")
+                        # Reconnect on errors
+                        await asyncio.sleep(3.0)
+                        continue
+                    
+                    if status_data is None:
+                        continue
                     
-                    except Exception as poll_error:
-                        logger.warning(f"Poll error: {poll_error}")
-                        # Continue polling on errors
+                    task_status = status_data.get("status")
+                    await self.send(text_data=json.dumps({
+                        'type': 'task_complete',
+                        'task_id': task_id,
+                        'success': task_status == "completed",
+                        'result': status_data.get("result"),
+                        'error': status_data.get("error")
+                    }))
+                    return
                         
         except Exception as e:
             logger.error(f"Task execution error: {e}")
@@ -153,6 +133,46 @@ class AdminTaskConsumer(AsyncWebsocketConsumer):
                 'error': str(e)
             }))
     
+    async def follow_task_events(self, client: httpx.AsyncClient, task_id: str):
+        """
+        Relay a task's state transitions from the orchestrator SSE stream.
+        
+        Returns the final task status (with result) once it is terminal,
+        or None if the stream ended first.
+        """
+        async with client.stream(
+            "GET",
+            f"{ORCHESTRATOR_URL}/tasks/events",
+            params={"task_id": task_id}
+        ) as events:
+            # Subscribed now - catch a task that finished before the stream opened
+            status_response = await client.get(f"{ORCHESTRATOR_URL}/tasks/{task_id}")
+            if status_response.status_code == 200:
+                status_data = status_response.json()
+                if status_data.get("status") in ("completed", "failed", "cancelled"):
+                    return status_data
+            
+            async for line in events.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                
+                event = json.loads(line[len("data:"):])
+                task_status = event.get("status")
+                
+                # Send status update
+                await self.send(text_data=json.dumps({
+                    'type': 'task_status',
+                    'task_id': task_id,
+                    'status': task_status
+                }))
+                
+                if task_status in ("completed", "failed", "cancelled"):
+                    status_response = await client.get(f"{ORCHESTRATOR_URL}/tasks/{task_id}")
+                    status_response.raise_for_status()
+                    return status_response.json()
+        
+        return None
+    
     async def send_error(self, error: str):
         """Send error message."""
         await self.send(text_data=json.dumps({
@@ -45,6 +45,10 @@ class ChatConsumer(AsyncWebsocketConsumer):
             'messages': history
         }))
         logger.info(f"📤 Sent {len(history)} history messages")
+        
+        # Full progress snapshots for running reports; deltas follow from their seq
+        for snapshot in await self.get_progress_snapshots():
+            await self.send_progress_snapshot(snapshot)
     
     async def disconnect(self, close_code):
         """Handle WebSocket disconnection."""
@@ -65,6 +69,8 @@ class ChatConsumer(AsyncWebsocketConsumer):
                 await self.handle_user_message(data)
             elif message_type == 'typing':
                 await self.handle_typing(data)
+            elif message_type == 'progress_resync':
+                await self.handle_progress_resync(data)
         except json.JSONDecodeError:
             logger.error("❌ Invalid JSON received")
             await self.send_error("Invalid message format")
@@ -130,6 +136,24 @@ class ChatConsumer(AsyncWebsocketConsumer):
             }
         )
     
+    async def handle_progress_resync(self, data):
+        """Client saw a gap in progress deltas; send a fresh snapshot."""
+        report_id = data.get('report_id')
+        if not report_id:
+            return
+        snapshots = await self.get_progress_snapshots(report_id)
+        for snapshot in snapshots:
+            await self.send_progress_snapshot(snapshot)
+    
+    async def send_progress_snapshot(self, snapshot):
+        # A snapshot replaces whatever the client has, like a delta with reset
+        await self.send(text_data=json.dumps({
+            'type': 'report_progress',
+            'snapshot': True,
+            'reset': True,
+            **snapshot
+        }))
+    
     # Group message handlers
     async def chat_message(self, event):
         """Send chat message to WebSocket."""
@@ -167,6 +191,34 @@ class ChatConsumer(AsyncWebsocketConsumer):
             'time_estimate': event.get('time_estimate')  # Forward time estimate
         }))
     
+    async def report_progress_delta(self, event):
+        """Send changed steps (with newly appended details) since the previous seq."""
+        await self.send(text_data=json.dumps({
+            'type': 'report_progress_delta',
+            'report_type': event['report_type'],
+            'report_id': event['report_id'],
+            'seq': event['seq'],
+            'reset': event.get('reset', False),
+            'progress': event['progress'],
+            'current_step': event['current_step'],
+            'step_key': event.get('step_key'),
+            'status': event.get('status'),
+            'steps': event.get('steps', []),
+            'time_estimate': event.get('time_estimate')
+        }))
+    
+    async def section_delta(self, event):
+        """Forward streamed report section text (coalesced deltas, ~5 Hz)."""
+        await self.send(text_data=json.dumps({
+            'type': 'section_delta',
+            'report_type': event['report_type'],
+            'report_id': event.get('report_id'),
+            'section': event['section'],
+            'delta': event['delta'],
+            'seq': event['seq'],
+            'done': event.get('done', False)
+        }))
+
     async def auto_fill(self, event):
         """Send auto-fill notification."""
         await self.send(text_data=json.dumps({
@@ -211,6 +263,27 @@ class ChatConsumer(AsyncWebsocketConsumer):
             # Explicitly close connection to return it to pool
             connection.close()
     
+    @database_sync_to_async
+    def get_progress_snapshots(self, report_id=None):
+        """Progress snapshots for this project's running reports (or one report)."""
+        from apps.reports.models import Report
+        from apps.reports.progress_tracker import ReportProgressTracker
+        from django.db import connection
+        
+        try:
+            reports = Report.objects.filter(project_id=self.project_id)
+            if report_id:
+                reports = reports.filter(id=report_id)
+            else:
+                reports = reports.filter(status='running')
+            return [ReportProgressTracker(report).get_progress_snapshot() for report in reports]
+        except Exception as e:
+            logger.warning(f"Failed to build progress snapshots: {e}")
+            return []
+        finally:
+            # Explicitly close connection to return it to pool
+            connection.close()
+    
     @database_sync_to_async
     def save_message(self, message, is_bot=False, message_type='text', metadata=None):
         """Save message to database."""
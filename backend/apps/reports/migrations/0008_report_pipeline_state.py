@@ -0,0 +1,18 @@
+# Generated by Django 5.0.14 on 2026-10-16 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0007_alter_report_report_type'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='report',
+            name='pipeline_state',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.14 on 2026-10-16 11:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0008_report_pipeline_state'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='report',
+            name='checkpoint',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.14 on 2026-10-16 14:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0009_report_checkpoint'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reportprogressstep',
+            name='detail_seq',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -49,6 +49,8 @@ class Report(models.Model):
     # Data and metadata
     data = models.JSONField(default=dict, blank=True)
     inputs_hash = models.CharField(max_length=32, blank=True)  # To detect input changes
+    pipeline_state = models.JSONField(default=dict, blank=True)  # Parked stage while a remote scrape runs
+    checkpoint = models.JSONField(default=dict, blank=True)  # Completed steps of the version being generated
     
     # Progress tracking
     progress = models.PositiveIntegerField(default=0)  # 0-100
@@ -160,6 +162,7 @@ class ReportProgressStep(models.Model):
     # Additional data
     metadata = models.JSONField(default=dict, blank=True)  # e.g., companies_found, errors
     details = models.JSONField(default=list, blank=True)   # Real-time sub-step details array
+    detail_seq = models.PositiveIntegerField(default=0)    # Sequence of the last detail written (never reset)
     error_message = models.TextField(blank=True)
     
     created_at = models.DateTimeField(auto_now_add=True)
@@ -2,16 +2,216 @@
 Report Progress Tracker Service.
 Scalable progress tracking for all report types with real-time WebSocket updates.
 Includes connection management to prevent pool exhaustion during long-running tasks.
+
+High-frequency updates (step details, messages, step progress) are written
+behind: they are queued in Redis and applied in one transaction, followed by a
+single broadcast, at most once per PROGRESS_FLUSH_INTERVAL_MS. Lifecycle
+changes (start/complete/fail/skip) flush the queue and are written immediately.
+
+Broadcasts use a delta protocol: each `report_progress_delta` event carries a
+per-report sequence number and only the steps that changed since the previous
+event, with only their newly appended details (picked by the per-step detail
+sequence assigned when a detail is written). Clients get a full
+`report_progress` snapshot on connect and request one (`progress_resync`)
+whenever they see a gap in the sequence.
 """
+import asyncio
+import hashlib
+import json
 import logging
+import threading
+import time
+from contextlib import contextmanager
 from typing import Optional, Dict, Any, List
+from django.conf import settings
 from django.utils import timezone
-from django.db import connection
+from django.db import connection, transaction
 from channels.layers import get_channel_layer
 from asgiref.sync import async_to_sync
 
+from core.cache import CacheService
+
 logger = logging.getLogger(__name__)
 
+# Keep only the most recent details per step to prevent bloat
+MAX_STEP_DETAILS = 50
+# Pending updates are dropped if nothing flushes them for this long
+PENDING_TTL = 60 * 60
+# Sequence numbers and last-sent step state outlive any single report run
+STATE_TTL = 60 * 60 * 24
+
+
+class _ProgressBuffer:
+    """
+    Shared progress state for one report: the queue of pending updates, the
+    broadcast sequence number and the last state sent to clients.
+    
+    Lives in Redis so that every writer for a report (the Celery task and the
+    StatusUpdateView requests from the scrapers) shares one queue, one flush
+    cadence and one sequence. Falls back to process memory if Redis is unavailable.
+    """
+    
+    _local_ops: Dict[str, List[Dict]] = {}
+    _local_claims: Dict[str, float] = {}
+    _local_seq: Dict[str, int] = {}
+    _local_sent: Dict[str, Dict[str, Dict]] = {}
+    _local_lock = threading.Lock()
+    _local_broadcast_lock = threading.RLock()
+    
+    def __init__(self, report_id: str):
+        self.key = CacheService.make_key('progress', report_id, 'pending')
+        self.seq_key = CacheService.make_key('progress', report_id, 'seq')
+        self.sent_key = CacheService.make_key('progress', report_id, 'sent')
+        self.lock_key = CacheService.make_key('progress', report_id, 'broadcast_lock')
+        try:
+            from django_redis import get_redis_connection
+            self.redis = get_redis_connection('default')
+        except Exception as e:
+            logger.debug(f"Progress buffer using process memory: {e}")
+            self.redis = None
+    
+    def push(self, op: Dict[str, Any]):
+        self.push_many([op])
+    
+    def push_many(self, ops: List[Dict[str, Any]]):
+        """Queue several updates in one round-trip."""
+        if not ops:
+            return
+        if self.redis is not None:
+            try:
+                pipe = self.redis.pipeline()
+                pipe.rpush(self.key, *[json.dumps(op) for op in ops])
+                pipe.expire(self.key, PENDING_TTL)
+                pipe.execute()
+                return
+            except Exception as e:
+                logger.warning(f"Progress buffer push failed, using process memory: {e}")
+        with self._local_lock:
+            self._local_ops.setdefault(self.key, []).extend(ops)
+    
+    def drain(self) -> List[Dict[str, Any]]:
+        """Atomically take every pending update."""
+        ops = []
+        if self.redis is not None:
+            try:
+                pipe = self.redis.pipeline(transaction=True)
+                pipe.lrange(self.key, 0, -1)
+                pipe.delete(self.key)
+                raw, _ = pipe.execute()
+                ops = [json.loads(item) for item in raw]
+            except Exception as e:
+                logger.warning(f"Progress buffer drain failed: {e}")
+        with self._local_lock:
+            ops.extend(self._local_ops.pop(self.key, []))
+        return ops
+    
+    def claim(self, name: str, interval: float) -> bool:
+        """Claim a named slot for `interval` seconds (at most one holder per report)."""
+        claim_key = f"{self.key}:{name}"
+        if self.redis is not None:
+            try:
+                return bool(self.redis.set(claim_key, 1, nx=True, px=max(1, int(interval * 1000))))
+            except Exception as e:
+                logger.warning(f"Progress buffer claim failed: {e}")
+        now = time.monotonic()
+        with self._local_lock:
+            if self._local_claims.get(claim_key, 0) > now:
+                return False
+            self._local_claims[claim_key] = now + interval
+            return True
+    
+    @contextmanager
+    def broadcast_lock(self):
+        """
+        Serialize delta computation + send across processes for this report.
+        
+        Yields whether the lock is held. If another process holds the Redis
+        lock past the blocking timeout this yields False rather than falling
+        back to a process-local lock, which would not exclude that process;
+        the process-local lock is only used when Redis is unavailable.
+        """
+        if self.redis is not None:
+            try:
+                lock = self.redis.lock(self.lock_key, timeout=10, blocking_timeout=5)
+                acquired = lock.acquire()
+            except Exception as e:
+                logger.warning(f"Progress broadcast lock failed: {e}")
+                lock = None
+            if lock is not None:
+                if not acquired:
+                    yield False
+                    return
+                try:
+                    yield True
+                finally:
+                    try:
+                        lock.release()
+                    except Exception:
+                        pass
+                return
+        with self._local_broadcast_lock:
+            yield True
+    
+    def current_seq(self) -> int:
+        if self.redis is not None:
+            try:
+                return int(self.redis.get(self.seq_key) or 0)
+            except Exception as e:
+                logger.warning(f"Progress seq read failed: {e}")
+        return self._local_seq.get(self.seq_key, 0)
+    
+    def next_seq(self) -> int:
+        if self.redis is not None:
+            try:
+                pipe = self.redis.pipeline()
+                pipe.incr(self.seq_key)
+                pipe.expire(self.seq_key, STATE_TTL)
+                seq, _ = pipe.execute()
+                return int(seq)
+            except Exception as e:
+                logger.warning(f"Progress seq increment failed: {e}")
+        with self._local_lock:
+            self._local_seq[self.seq_key] = self._local_seq.get(self.seq_key, 0) + 1
+            return self._local_seq[self.seq_key]
+    
+    def get_sent(self) -> Dict[str, Dict]:
+        """Last broadcast state per step ({step_key: {sig, last_seq, status}})."""
+        if self.redis is not None:
+            try:
+                raw = self.redis.hgetall(self.sent_key)
+                return {
+                    (k.decode() if isinstance(k, bytes) else k): json.loads(v)
+                    for k, v in raw.items()
+                }
+            except Exception as e:
+                logger.warning(f"Progress sent-state read failed: {e}")
+        return dict(self._local_sent.get(self.sent_key, {}))
+    
+    def set_sent(self, states: Dict[str, Dict]):
+        if not states:
+            return
+        if self.redis is not None:
+            try:
+                pipe = self.redis.pipeline()
+                pipe.hset(self.sent_key, mapping={k: json.dumps(v) for k, v in states.items()})
+                pipe.expire(self.sent_key, STATE_TTL)
+                pipe.execute()
+                return
+            except Exception as e:
+                logger.warning(f"Progress sent-state write failed: {e}")
+        with self._local_lock:
+            self._local_sent.setdefault(self.sent_key, {}).update(states)
+    
+    def reset_sent(self):
+        """Forget the last broadcast state so the next event is a full reset."""
+        if self.redis is not None:
+            try:
+                self.redis.delete(self.sent_key)
+            except Exception as e:
+                logger.warning(f"Progress sent-state reset failed: {e}")
+        with self._local_lock:
+            self._local_sent.pop(self.sent_key, None)
+
 
 class ReportProgressTracker:
     """
@@ -108,17 +308,29 @@ class ReportProgressTracker:
     # Number of DB operations before triggering connection cleanup
     CONNECTION_CLEANUP_INTERVAL = 10
     
-    def __init__(self, report):
+    def __init__(self, report, write_behind: bool = None, flush_interval_ms: int = None):
         """
         Initialize tracker for a report.
         
         Args:
             report: Report model instance
+            write_behind: Buffer high-frequency updates (defaults to PROGRESS_WRITE_BEHIND)
+            flush_interval_ms: Minimum time between flushes (defaults to PROGRESS_FLUSH_INTERVAL_MS)
         """
         self.report = report
         self.steps_config = self.REPORT_STEPS.get(report.report_type, [])
         self._channel_layer = None
         self._operation_count = 0  # Track DB operations for periodic cleanup
+        
+        if write_behind is None:
+            write_behind = getattr(settings, 'PROGRESS_WRITE_BEHIND', True)
+        if flush_interval_ms is None:
+            flush_interval_ms = getattr(settings, 'PROGRESS_FLUSH_INTERVAL_MS', 500)
+        self.write_behind = write_behind
+        self.flush_interval = flush_interval_ms / 1000
+        self._buffer = _ProgressBuffer(str(report.id))
+        self._flush_lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
     
     @property
     def channel_layer(self):
@@ -127,6 +339,13 @@ class ReportProgressTracker:
             self._channel_layer = get_channel_layer()
         return self._channel_layer
     
+    def _get_step_info(self, step_key: str) -> Optional[Dict[str, Any]]:
+        """Look up a step's configuration for this report type."""
+        for i, step_config in enumerate(self.steps_config):
+            if step_config['key'] == step_key:
+                return {**step_config, 'number': i + 1}
+        return None
+    
     def _maybe_cleanup_connection(self):
         """Periodically close DB connection to prevent pool exhaustion."""
         self._operation_count += 1
@@ -145,7 +364,9 @@ class ReportProgressTracker:
         """
         from .models import ReportProgressStep
         
-        # Delete existing steps from previous runs
+        # Delete existing steps (and their unflushed updates) from previous runs
+        self._buffer.drain()
+        self._buffer.reset_sent()
         ReportProgressStep.objects.filter(report=self.report).delete()
         
         created_steps = []
@@ -178,6 +399,7 @@ class ReportProgressTracker:
         """
         from .models import ReportProgressStep
         
+        self.flush(broadcast=False)
         try:
             step = ReportProgressStep.objects.get(report=self.report, step_key=step_key)
             step.status = 'running'
@@ -205,20 +427,7 @@ class ReportProgressTracker:
             step_key: The key identifier for the step
             progress_percent: Progress within this step (0-100)
         """
-        from .models import ReportProgressStep
-        
-        try:
-            step = ReportProgressStep.objects.get(report=self.report, step_key=step_key)
-            step.progress_percent = min(100, max(0, progress_percent))
-            step.save(update_fields=['progress_percent', 'updated_at'])
-            
-            # Update overall progress
-            self.report.progress = self._calculate_overall_progress()
-            self.report.save(update_fields=['progress', 'updated_at'])
-            
-            self._broadcast_update()
-        except ReportProgressStep.DoesNotExist:
-            pass
+        self._enqueue(self._progress_op(step_key, progress_percent))
     
     def update_step_message(self, step_key: str, message: str, progress_percent: int = None):
         """
@@ -230,26 +439,7 @@ class ReportProgressTracker:
             message: New message to display for this step
             progress_percent: Optional progress update (0-100)
         """
-        from .models import ReportProgressStep
-        
-        try:
-            step = ReportProgressStep.objects.get(report=self.report, step_key=step_key)
-            step.step_description = message
-            update_fields = ['step_description', 'updated_at']
-            
-            if progress_percent is not None:
-                step.progress_percent = min(100, max(0, progress_percent))
-                update_fields.append('progress_percent')
-            
-            step.save(update_fields=update_fields)
-            
-            # Update report's current_step to show the message
-            self.report.current_step = message
-            self.report.save(update_fields=['current_step', 'updated_at'])
-            
-            self._broadcast_update()
-        except ReportProgressStep.DoesNotExist:
-            pass
+        self._enqueue(self._message_op(step_key, message, progress_percent))
     
     def add_step_detail(self, step_key: str, detail_type: str, message: str, data: Dict[str, Any] = None):
         """
@@ -265,32 +455,48 @@ class ReportProgressTracker:
             message: Human-readable message
             data: Optional data to include (e.g., {'count': 20, 'companies': [...]})
         """
-        from .models import ReportProgressStep
-        import time
+        logger.debug(f"📝 Added detail to step {step_key}: {detail_type} - {message[:50]}...")
+        self._enqueue(self._detail_op(step_key, detail_type, message, data))
+    
+    def add_step_details(self, details: List[Dict[str, Any]]) -> bool:
+        """
+        Add several detail items at once (bulk status ingestion).
         
-        try:
-            step = ReportProgressStep.objects.get(report=self.report, step_key=step_key)
-        except ReportProgressStep.DoesNotExist:
-            # Auto-start the step if it doesn't exist (for real-time API callbacks)
-            step_info = self._get_step_info(step_key)
-            if step_info:
-                logger.info(f"📤 Auto-starting step {step_key} for incoming status update")
-                step = ReportProgressStep.objects.create(
-                    report=self.report,
-                    step_key=step_key,
-                    name=step_info['name'],
-                    description=step_info['description'],
-                    status='in_progress',
-                    started_at=timezone.now()
-                )
-                # Update report model
-                self.report.current_step = step_info['name']
-                self.report.save(update_fields=['current_step', 'updated_at'])
-            else:
-                logger.warning(f"⚠️ Step {step_key} not found in REPORT_STEPS, cannot auto-start")
-                return
+        All items, plus anything already buffered for this report, are
+        written in one transaction followed by one broadcast.
         
-        # Build detail item
+        Args:
+            details: Dicts with step_key, message and optional detail_type/data
+            
+        Returns:
+            True if any updates were written
+        """
+        for detail in details:
+            self._buffer.push(self._detail_op(
+                detail['step_key'],
+                detail.get('detail_type') or 'status',
+                detail['message'],
+                detail.get('data')
+            ))
+        logger.debug(f"📝 Added {len(details)} details to report {self.report.id}")
+        return self.flush()
+    
+    @staticmethod
+    def _progress_op(step_key: str, progress_percent: int) -> Dict[str, Any]:
+        """Build a queued 'progress' update."""
+        return {'op': 'progress', 'step': step_key, 'progress': min(100, max(0, progress_percent))}
+    
+    @staticmethod
+    def _message_op(step_key: str, message: str, progress_percent: int = None) -> Dict[str, Any]:
+        """Build a queued 'message' update."""
+        op = {'op': 'message', 'step': step_key, 'message': message}
+        if progress_percent is not None:
+            op['progress'] = min(100, max(0, progress_percent))
+        return op
+    
+    @staticmethod
+    def _detail_op(step_key: str, detail_type: str, message: str, data: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Build a queued 'detail' update."""
         detail_item = {
             'type': detail_type,
             'message': message,
@@ -298,25 +504,136 @@ class ReportProgressTracker:
         }
         if data:
             detail_item['data'] = data
+        return {'op': 'detail', 'step': step_key, 'item': detail_item}
+    
+    # =========================================================================
+    # Write-behind buffering
+    # =========================================================================
+    
+    def _enqueue(self, op: Dict[str, Any]):
+        """Queue an update and flush now, or schedule a trailing flush."""
+        self._buffer.push(op)
+        if not self.write_behind or self._buffer.claim('flush', self.flush_interval):
+            self.flush()
+        elif self._timer is None and self._buffer.claim('trailing', self.flush_interval / 2):
+            # Nobody may write again for a while; make sure this update still lands.
+            # The claim expires before the timer fires so a late push schedules another.
+            self._timer = threading.Timer(self.flush_interval, self._trailing_flush)
+            self._timer.daemon = True
+            self._timer.start()
+    
+    def _trailing_flush(self):
+        self._timer = None
+        try:
+            self.flush()
+        except Exception as e:
+            logger.warning(f"Trailing progress flush failed: {e}")
+        finally:
+            # Timer threads hold their own DB connection
+            connection.close()
+    
+    def flush(self, broadcast: bool = True) -> bool:
+        """
+        Apply every pending update in one transaction and broadcast once.
         
-        # Append to details array (limit to last 50 items to prevent bloat)
-        details = step.details or []
-        details.append(detail_item)
-        if len(details) > 50:
-            details = details[-50:]
+        Returns:
+            True if any updates were written
+        """
+        with self._flush_lock:
+            ops = self._buffer.drain()
+            if not ops:
+                return False
+            self._apply_updates(ops)
+        self._maybe_cleanup_connection()
+        if broadcast:
+            self._broadcast_update()
+        return True
+    
+    def _apply_updates(self, ops: List[Dict[str, Any]]):
+        """Fold queued updates into the step rows and write them with one bulk update."""
+        from .models import ReportProgressStep
         
-        step.details = details
-        step.save(update_fields=['details', 'updated_at'])
+        with transaction.atomic():
+            steps = {
+                s.step_key: s
+                for s in ReportProgressStep.objects.select_for_update().filter(report=self.report)
+            }
+            changed_steps = {}
+            fields = set()
+            current_step = None
+            progress_changed = False
+            
+            for op in ops:
+                step_key = op['step']
+                step = steps.get(step_key)
+                if step is None:
+                    step = self._auto_start_step(step_key)
+                    if step is None:
+                        continue
+                    steps[step_key] = step
+                    current_step = step.step_name
+                    progress_changed = True
+                
+                if op['op'] == 'detail':
+                    # Sequenced on write (not on creation), so the broadcaster can
+                    # pick up details queued by any writer in the order they landed
+                    step.detail_seq += 1
+                    step.details = ((step.details or []) + [{**op['item'], 'seq': step.detail_seq}])[-MAX_STEP_DETAILS:]
+                    fields.update(('details', 'detail_seq'))
+                elif op['op'] == 'message':
+                    step.step_description = op['message']
+                    fields.add('step_description')
+                    current_step = op['message']
+                if 'progress' in op:
+                    step.progress_percent = op['progress']
+                    fields.add('progress_percent')
+                    progress_changed = True
+                changed_steps[step_key] = step
+            
+            if changed_steps and fields:
+                now = timezone.now()
+                for step in changed_steps.values():
+                    step.updated_at = now
+                ReportProgressStep.objects.bulk_update(
+                    list(changed_steps.values()), sorted(fields | {'updated_at'})
+                )
+            
+            report_fields = []
+            if current_step is not None:
+                self.report.current_step = current_step
+                report_fields.append('current_step')
+            if progress_changed:
+                self.report.progress = self._progress_from_steps(steps.values())
+                report_fields.append('progress')
+            if report_fields:
+                self.report.save(update_fields=report_fields + ['updated_at'])
+    
+    def _auto_start_step(self, step_key: str) -> Optional['ReportProgressStep']:
+        """Create a running step for a status update that arrived before the step existed."""
+        from .models import ReportProgressStep
         
-        logger.info(f"📝 Added detail to step {step_key}: {detail_type} - {message[:50]}...")
+        step_info = self._get_step_info(step_key)
+        if not step_info:
+            logger.warning(f"⚠️ Step {step_key} not found in REPORT_STEPS, cannot auto-start")
+            return None
         
-        self._maybe_cleanup_connection()  # Periodic cleanup for frequent detail adds
-        self._broadcast_update()
+        logger.info(f"📤 Auto-starting step {step_key} for incoming status update")
+        return ReportProgressStep.objects.create(
+            report=self.report,
+            step_number=step_info['number'],
+            step_key=step_key,
+            step_name=step_info['name'],
+            step_description=step_info.get('description', ''),
+            weight=step_info.get('weight', 10),
+            status='running',
+            started_at=timezone.now()
+        )
     
     def clear_step_details(self, step_key: str):
         """Clear all details for a step (useful when restarting)."""
         from .models import ReportProgressStep
         
+        self.flush(broadcast=False)
         try:
             step = ReportProgressStep.objects.get(report=self.report, step_key=step_key)
             step.details = []
@@ -339,6 +656,7 @@ class ReportProgressTracker:
         from .models import ReportProgressStep
         from .time_estimator import TimeEstimator
         
+        self.flush(broadcast=False)
         try:
             step = ReportProgressStep.objects.get(report=self.report, step_key=step_key)
             step.status = 'completed'
@@ -388,6 +706,7 @@ class ReportProgressTracker:
         """
         from .models import ReportProgressStep
         
+        self.flush(broadcast=False)
         try:
             step = ReportProgressStep.objects.get(report=self.report, step_key=step_key)
             step.status = 'failed'
@@ -417,6 +736,7 @@ class ReportProgressTracker:
         """
         from .models import ReportProgressStep
         
+        self.flush(broadcast=False)
         try:
             step = ReportProgressStep.objects.get(report=self.report, step_key=step_key)
             step.status = 'skipped'
@@ -445,9 +765,13 @@ class ReportProgressTracker:
         """
         from .models import ReportProgressStep
         
-        steps = ReportProgressStep.objects.filter(report=self.report)
-        
-        if not steps.exists():
+        return self._progress_from_steps(ReportProgressStep.objects.filter(report=self.report))
+    
+    @staticmethod
+    def _progress_from_steps(steps) -> int:
+        """Weighted overall progress for already-loaded steps."""
+        steps = list(steps)
+        if not steps:
             return 0
         
         total_weight = sum(s.weight for s in steps)
@@ -495,44 +819,221 @@ class ReportProgressTracker:
             for s in steps
         ]
     
+    @staticmethod
+    def _current_step(steps_summary: List[Dict[str, Any]]):
+        """Key and name of the running step, if any."""
+        for step in steps_summary:
+            if step['status'] == 'running':
+                return step['step_key'], step['step_name']
+        return None, None
+    
+    def _time_estimate(self) -> Optional[Dict[str, Any]]:
+        from .time_estimator import TimeEstimator
+        try:
+            return TimeEstimator.get_estimates_dict(self.report)
+        except Exception as e:
+            logger.warning(f"Failed to get time estimate: {e}")
+            return None
+    
+    @staticmethod
+    def _signature(data: Dict[str, Any]) -> str:
+        return hashlib.md5(json.dumps(data, sort_keys=True, default=str).encode()).hexdigest()
+    
+    def get_progress_snapshot(self) -> Dict[str, Any]:
+        """
+        Full progress state for a client connecting or resyncing.
+        
+        The snapshot's `seq` is the sequence of the last delta it includes;
+        clients apply deltas from seq + 1 onwards.
+        """
+        # Read-only: without the lock the snapshot may trail a concurrent
+        # delta, which the client then sees as a gap and resyncs
+        with self._buffer.broadcast_lock():
+            seq = self._buffer.current_seq()
+            steps_summary = self.get_steps_summary()
+        current_step_key, current_step_name = self._current_step(steps_summary)
+        return {
+            "report_type": self.report.report_type,
+            "report_id": str(self.report.id),
+            "seq": seq,
+            "progress": self.report.progress,
+            "current_step": current_step_name or self.report.current_step,
+            "step_key": current_step_key,
+            "status": self.report.status,
+            "steps": steps_summary,
+            "time_estimate": self._time_estimate(),
+        }
+    
     def _broadcast_update(self):
-        """Send progress update via WebSocket to all connected clients."""
+        """
+        Send the changes since the last broadcast via WebSocket.
+        
+        Only steps whose fields changed are sent, each with just the details
+        appended since the previous event (detail `seq` above the last one
+        sent). When none of the step's details is one already sent (cleared,
+        or more than MAX_STEP_DETAILS appended), the step's details are
+        resent whole with `details_reset`. The time estimate is included when
+        a step changed status.
+        """
         try:
-            from .time_estimator import TimeEstimator
-            
             project_id = str(self.report.project_id)
-            steps_summary = self.get_steps_summary()
-            
-            # Find current running step
-            current_step_key = None
-            current_step_name = None
-            for step in steps_summary:
-                if step['status'] == 'running':
-                    current_step_key = step['step_key']
-                    current_step_name = step['step_name']
-                    break
-            
-            # Get time estimate
-            try:
-                estimate = TimeEstimator.get_estimates_dict(self.report)
-            except Exception as e:
-                logger.warning(f"Failed to get time estimate: {e}")
-                estimate = None
             
-            async_to_sync(self.channel_layer.group_send)(
-                f"project_{project_id}",
-                {
-                    "type": "report_progress",
-                    "report_type": self.report.report_type,
-                    "report_id": str(self.report.id),
+            with self._buffer.broadcast_lock() as locked:
+                if not locked:
+                    # The holder is broadcasting; the sent state is untouched, so
+                    # these changes go out with the next delta (or a client resync)
+                    logger.warning(f"Progress broadcast lock busy for report {self.report.id}, skipping broadcast")
+                    return
+                steps_summary = self.get_steps_summary()
+                current_step_key, current_step_name = self._current_step(steps_summary)
+                report_state = {
                     "progress": self.report.progress,
                     "current_step": current_step_name or self.report.current_step,
                     "step_key": current_step_key,
                     "status": self.report.status,
-                    "steps": steps_summary,
-                    "time_estimate": estimate,
                 }
-            )
+                
+                sent = self._buffer.get_sent()
+                reset = not sent
+                new_sent = {}
+                changed_steps = []
+                status_changed = reset
+                
+                for step in steps_summary:
+                    details = step['details']
+                    fields = {k: v for k, v in step.items() if k != 'details'}
+                    signature = self._signature(fields)
+                    last_seq = details[-1].get('seq', 0) if details else 0
+                    previous = sent.get(step['step_key'])
+                    if previous and previous['sig'] == signature and previous.get('last_seq') == last_seq:
+                        continue
+                    
+                    delta = dict(fields)
+                    prev_seq = previous.get('last_seq', 0) if previous else 0
+                    if prev_seq and not any(0 < d.get('seq', 0) <= prev_seq for d in details):
+                        delta['details_reset'] = True
+                        delta['new_details'] = details
+                    else:
+                        delta['new_details'] = [d for d in details if d.get('seq', 0) > prev_seq]
+                    if not previous or previous.get('status') != step['status']:
+                        status_changed = True
+                    
+                    changed_steps.append(delta)
+                    new_sent[step['step_key']] = {'sig': signature, 'last_seq': last_seq, 'status': step['status']}
+                
+                report_sig = self._signature(report_state)
+                if not changed_steps and sent.get('__report__', {}).get('sig') == report_sig:
+                    return
+                new_sent['__report__'] = {'sig': report_sig}
+                
+                seq = self._buffer.next_seq()
+                self._buffer.set_sent(new_sent)
+                
+                event = {
+                    "type": "report_progress_delta",
+                    "report_type": self.report.report_type,
+                    "report_id": str(self.report.id),
+                    "seq": seq,
+                    "reset": reset,
+                    **report_state,
+                    "steps": changed_steps,
+                }
+                if status_changed:
+                    event["time_estimate"] = self._time_estimate()
+                
+                async_to_sync(self.channel_layer.group_send)(f"project_{project_id}", event)
         except Exception as e:
             logger.warning(f"Failed to broadcast progress update: {e}")
 
+
+class AsyncProgressTracker:
+    """
+    Async-native progress tracker for pipelines running on the event loop.
+    
+    Wraps a ReportProgressTracker. Messages, step progress and details are
+    queued on the loop and handed over in one thread hop per flush interval
+    (one Redis push, one transaction, one broadcast) instead of a thread hop
+    per call. Lifecycle changes (start/complete/fail/skip) take the queue
+    with them in a single hop. All DB and broadcast work stays in the sync
+    tracker, so both can be used for the same report.
+    
+    Run the pipeline through run() (or call flush()) so that nothing
+    queued is left behind when the loop stops.
+    """
+    
+    def __init__(self, tracker: ReportProgressTracker):
+        from asgiref.sync import sync_to_async
+        
+        self.tracker = tracker
+        self._pending: List[Dict[str, Any]] = []
+        self._flush_task: Optional[asyncio.Task] = None
+        self._hop = sync_to_async(self._apply, thread_sensitive=True)
+    
+    async def start_step(self, step_key: str):
+        return await self._lifecycle('start_step', step_key)
+    
+    async def complete_step(self, step_key: str, metadata: Dict[str, Any] = None):
+        return await self._lifecycle('complete_step', step_key, metadata)
+    
+    async def fail_step(self, step_key: str, error_message: str):
+        return await self._lifecycle('fail_step', step_key, error_message)
+    
+    async def skip_step(self, step_key: str, reason: str = ""):
+        return await self._lifecycle('skip_step', step_key, reason)
+    
+    async def update_step_progress(self, step_key: str, progress_percent: int):
+        await self._queue(ReportProgressTracker._progress_op(step_key, progress_percent))
+    
+    async def update_step_message(self, step_key: str, message: str, progress_percent: int = None):
+        await self._queue(ReportProgressTracker._message_op(step_key, message, progress_percent))
+    
+    async def add_step_detail(self, step_key: str, detail_type: str, message: str, data: Dict[str, Any] = None):
+        await self._queue(ReportProgressTracker._detail_op(step_key, detail_type, message, data))
+    
+    async def run(self, coro):
+        """Await a coroutine that reports through this tracker, then flush (even if it fails)."""
+        try:
+            return await coro
+        finally:
+            await self.flush()
+    
+    async def flush(self):
+        """Hand every queued update to the sync tracker and write it now."""
+        self._cancel_scheduled()
+        ops, self._pending = self._pending, []
+        if ops:
+            await self._hop(ops, 'flush')
+    
+    # =========================================================================
+    # Private methods
+    # =========================================================================
+    
+    async def _queue(self, op: Dict[str, Any]):
+        self._pending.append(op)
+        if not self.tracker.write_behind:
+            await self.flush()
+        elif self._flush_task is None:
+            self._flush_task = asyncio.get_running_loop().create_task(self._flush_later())
+    
+    async def _flush_later(self):
+        await asyncio.sleep(self.tracker.flush_interval)
+        self._flush_task = None
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.warning(f"Async progress flush failed: {e}")
+    
+    def _cancel_scheduled(self):
+        task, self._flush_task = self._flush_task, None
+        if task is not None and task is not asyncio.current_task():
+            task.cancel()
+    
+    async def _lifecycle(self, method: str, *args):
+        self._cancel_scheduled()
+        ops, self._pending = self._pending, []
+        return await self._hop(ops, method, *args)
+    
+    def _apply(self, ops: List[Dict[str, Any]], method: str, *args):
+        """Runs in the sync thread: queue the ops, then call the tracker (which flushes)."""
+        self.tracker._buffer.push_many(ops)
+        return getattr(self.tracker, method)(*args)
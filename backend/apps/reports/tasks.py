@@ -17,11 +17,15 @@ from channels.layers import get_channel_layer
 from asgiref.sync import async_to_sync
 import asyncio
 import logging
+import time
+import uuid
 
 import logging
 import functools
 from django.db import close_old_connections
 
+from core import async_runtime
+
 logger = logging.getLogger(__name__)
 
 def close_db_wrapper(func):
@@ -80,6 +84,168 @@ def get_project_inputs_dict(inputs):
         'inspiration_sources': inputs.inspiration_sources or '',
     }
 
+
+def _run_async(coro):
+    """
+    Run a coroutine to completion on the worker process's persistent event loop.
+    
+    The loop outlives the task, so the LLM gateway and scraper clients keep
+    their pooled connections between stages and between tasks.
+    """
+    return async_runtime.run(coro)
+
+
+def _fail_report(report, tracker, error, label):
+    """Mark a report, and the step that was running, as failed."""
+    logger.error(f"❌ Failed to generate {label} report: {error}")
+    if report:
+        report.status = 'failed'
+        report.error_message = str(error)
+        report.pipeline_state = {}
+        report.save()
+        if tracker:
+            from .models import ReportProgressStep
+            running_step = ReportProgressStep.objects.filter(
+                report=report, status='running'
+            ).first()
+            if running_step:
+                tracker.fail_step(running_step.step_key, str(error))
+
+
+def _park_report(report, tracker, user_id, stage, task_id, **state):
+    """
+    Checkpoint a report that is waiting on an orchestrator task and return.
+    
+    The Celery slot (and its DB connection) is released; the orchestrator's
+    task_terminal status update enqueues resume_report_stage, which runs the
+    stage's continuation (REMOTE_STAGES). One check is enqueued right away in
+    case the task finished before the report was parked, and
+    sweep_parked_reports re-checks in case the update is lost.
+    `state` must be JSON-serializable.
+    """
+    tracker.flush()
+    report.pipeline_state = {
+        'stage': stage,
+        'task_id': task_id,
+        'user_id': str(user_id),
+        'deadline': time.time() + settings.REPORT_REMOTE_TIMEOUT,
+        **state,
+    }
+    report.save(update_fields=['pipeline_state', 'updated_at'])
+    resume_report_stage.delay(str(report.id), task_id)
+    logger.info(f"⏸️ Report {report.id} parked at {stage} until task {task_id} finishes")
+
+
+def _open_checkpoint(report):
+    """
+    Checkpoint of the version being generated (current_version + 1).
+
+    Steps completed by an earlier, failed run are reused only for the same
+    pending version and unchanged project inputs; otherwise the raw data and
+    analysis docs saved for that version are discarded and a fresh
+    checkpoint is started.
+    """
+    from .models import ReportRawData
+    from services.report_storage import report_storage
+
+    project = report.project
+    version = report.current_version + 1
+    inputs_hash = project.inputs.get_inputs_hash()
+    checkpoint = report.checkpoint or {}
+    if checkpoint.get('version') == version and checkpoint.get('inputs_hash') == inputs_hash:
+        if checkpoint.get('steps'):
+            logger.info(f"♻️ Resuming report {report.id} v{version} after: {', '.join(checkpoint['steps'])}")
+        return checkpoint
+
+    ReportRawData.objects.filter(report=report, version=version).delete()
+    try:
+        org_id = str(project.organization_id) if project.organization_id else 'default'
+        report_storage.discard_version(str(project.id), org_id, report.report_type, version)
+    except Exception as e:
+        logger.warning(f"Failed to discard stale docs of v{version}: {e}")
+
+    report.checkpoint = {'version': version, 'inputs_hash': inputs_hash, 'steps': {}}
+    report.save(update_fields=['checkpoint', 'updated_at'])
+    return report.checkpoint
+
+
+def _checkpoint_step(report, step_key, **data):
+    """Record a completed step of the pending version; `data` is what resuming it needs."""
+    report.checkpoint.setdefault('steps', {})[step_key] = data
+    report.save(update_fields=['checkpoint', 'updated_at'])
+
+
+def _checkpointed_search(report):
+    """
+    (step data, raw data) of a checkpointed api_search step, or None.
+
+    The raw data is the version's ReportRawData row, written right before
+    the step was checkpointed.
+    """
+    from .models import ReportRawData
+
+    checkpoint = report.checkpoint or {}
+    step = checkpoint.get('steps', {}).get('api_search')
+    if step is None:
+        return None
+    raw = ReportRawData.objects.filter(
+        report=report, version=checkpoint['version'], report_type=report.report_type
+    ).first()
+    return (step, raw.data) if raw else None
+
+
+def _checkpointed_sections(report):
+    """
+    Analysis already saved for the pending version by an earlier run.
+
+    Returns {(section_type, company_name or None): content}. Failed sections
+    are never saved, so they are generated again.
+    """
+    from services.report_storage import report_storage
+
+    checkpoint = report.checkpoint or {}
+    if 'api_search' not in checkpoint.get('steps', {}):
+        return {}  # Fresh version, nothing saved yet
+
+    project = report.project
+    org_id = str(project.organization_id) if project.organization_id else 'default'
+    try:
+        docs = report_storage.get_pending_docs(str(project.id), org_id, report.report_type, checkpoint['version'])
+    except Exception as e:
+        logger.warning(f"Failed to load checkpointed sections: {e}")
+        return {}
+
+    sections = {}
+    for doc in docs.values():
+        section = doc.get('section_type') or doc.get('summary_type')
+        content = doc.get('content')
+        if section and isinstance(content, str) and content:
+            sections[(section, doc.get('company_name'))] = content
+    if sections:
+        logger.info(f"♻️ Reusing {len(sections)} saved sections of report {report.id}")
+    return sections
+
+
+def _split_reused_companies(companies, saved_sections, name_keys=('Company Name', 'name')):
+    """
+    Split companies into deep dives reusable from the checkpoint and ones still to analyze.
+
+    Returns (reports, missing): reports holds the reused {company_name,
+    content} in company order (None elsewhere), missing the indices of the
+    companies to analyze. `name_keys` must follow the pipeline's own lookup
+    order for company names.
+    """
+    reports = [None] * len(companies)
+    missing = []
+    for idx, company in enumerate(companies):
+        company_name = next((company[key] for key in name_keys if key in company), f'Company {idx + 1}')
+        content = saved_sections.get(('company_deep_dive', company_name))
+        if content is None:
+            missing.append(idx)
+        else:
+            reports[idx] = {'company_name': company_name, 'content': content}
+    return reports, missing
+
 @shared_task(bind=True, queue='reports')
 @close_db_wrapper
 def generate_crunchbase_report(self, report_id, user_id):
@@ -92,13 +258,10 @@ def generate_crunchbase_report(self, report_id, user_id):
     2-7. Per-company reports (Tech, Market Demand, Competitor, Funding, Growth, SWOT)
     8-13. Executive Summaries
     """
-    from .models import Report, ReportVersion, ReportAnalysisSection
+    from .models import Report
     from .progress_tracker import ReportProgressTracker
     from apps.users.models import User
     from services.scrapers.crunchbase_scraper import crunchbase_scraper
-    from services.crunchbase_analysis import CrunchbaseAnalysisPipeline, generate_analysis_html
-    from services.report_storage import report_storage
-    from core.storage import storage_service
     
     report = None
     tracker = None
@@ -112,11 +275,13 @@ def generate_crunchbase_report(self, report_id, user_id):
         # Mark as running
         report.status = 'running'
         report.started_at = timezone.now()
+        report.pipeline_state = {}  # Orphan any poll left by a previous run
         report.save()
         
         # Initialize progress tracker
         tracker = ReportProgressTracker(report)
         tracker.initialize_steps()
+        _open_checkpoint(report)
         
         # ===== Step 1: Initialize & Generate Keywords =====
         tracker.start_step('init')
@@ -183,25 +348,74 @@ def generate_crunchbase_report(self, report_id, user_id):
         keywords_list = ', '.join(keywords[:3])
         tracker.update_step_message('api_search', f"Searching Crunchbase with {len(keywords)} keywords: {keywords_list}...")
         
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
+        search_kwargs = dict(
+            keywords=keywords,
+            target_description=target_description,
+            num_companies=20,
+            top_count=10,
+            report_id=str(report.id),  # For real-time status callbacks
+        )
+        result = {}
+        search_error = None
+        checkpointed = _checkpointed_search(report)
+        if checkpointed:
+            # An earlier run of this version already finished the search
+            _, raw = checkpointed
+            keywords = raw.get('keywords', keywords)
+            target_description = raw.get('target_description', target_description)
+            result = {
+                'all_companies': raw.get('all_companies', []),
+                'top_companies_full_data': raw.get('top_companies', []),
+                'metadata': raw.get('metadata', {}),
+            }
+            tracker.update_step_message('api_search', "Reusing search results from the previous run...")
+        else:
+            try:
+                if settings.REPORT_PIPELINE_NONBLOCKING:
+                    # Park until the remote search finishes instead of holding this worker
+                    submitted = _run_async(crunchbase_scraper.search_similar_companies(**search_kwargs, wait=False))
+                    _park_report(
+                        report, tracker, user_id, 'crunchbase_search', submitted['task_id'],
+                        keywords=keywords, target_description=target_description
+                    )
+                    return {"status": "waiting", "task_id": submitted['task_id']}
+                result = _run_async(crunchbase_scraper.search_similar_companies(**search_kwargs))
+            except Exception as e:
+                search_error = e
+    
+    except Exception as e:
+        _fail_report(report, tracker, e, 'Crunchbase')
+        raise
+    
+    return _finish_crunchbase_report(report, user, tracker, keywords, target_description, result, search_error)
+
+
+def _finish_crunchbase_report(report, user, tracker, keywords, target_description, result, search_error=None):
+    """
+    Crunchbase pipeline after the remote search: sorting, analysis, HTML and save.
+    
+    Runs inline in blocking mode, or from resume_report_stage once the
+    parked search has finished.
+    """
+    from .models import ReportVersion, ReportAnalysisSection
+    from .progress_tracker import AsyncProgressTracker
+    from services.crunchbase_analysis import CrunchbaseAnalysisPipeline, generate_analysis_html
+    from services.section_stream import SectionStreamPublisher
+    from services.report_storage import report_storage
+    from core.storage import storage_service
+    
+    project = report.project
+    inputs = project.inputs
+    
+    try:
         # Initialize before try block to prevent undefined var errors on exception
         all_companies = []
         top_companies = []
         metadata = {}
-        result = {}
         
         try:
-            result = loop.run_until_complete(
-                crunchbase_scraper.search_similar_companies(
-                    keywords=keywords,
-                    target_description=target_description,
-                    num_companies=20,
-                    top_count=10,
-                    report_id=str(report.id),  # For real-time status callbacks
-                )
-            )
+            if search_error is not None:
+                raise search_error
             
             all_companies = result.get('all_companies', [])
             top_companies = result.get('top_companies_full_data', [])
@@ -252,19 +466,20 @@ def generate_crunchbase_report(self, report_id, user_id):
                 
                 # Save to DB (Dual-Write)
                 from .models import ReportRawData
-                ReportRawData.objects.create(
+                ReportRawData.objects.update_or_create(
                     report=report,
                     version=report.current_version + 1,
                     report_type='crunchbase',
-                    data={
+                    defaults={'data': {
                         'all_companies': all_companies,
                         'top_companies': top_companies,
                         'metadata': metadata,
                         'keywords': keywords,
                         'target_description': target_description,
-                    }
+                    }}
                 )
                 logger.info(f"✅ Saved raw Crunchbase data to DB")
+                _checkpoint_step(report, 'api_search')
             except Exception as e:
                 logger.warning(f"Failed to save Crunchbase raw data JSON: {e}")
             
@@ -273,8 +488,6 @@ def generate_crunchbase_report(self, report_id, user_id):
             tracker.fail_step('api_search', str(e))
             all_companies = []
             top_companies = []
-        finally:
-            loop.close()
         
         # ===== Step 3: Sorting =====
         # NOTE: If orchestrator was used, the remote worker already sent sorting/ranking updates
@@ -376,14 +589,17 @@ def generate_crunchbase_report(self, report_id, user_id):
         })
         
         # ===== Part 1-3: Run Analysis Pipeline =====
+        # Sections an earlier run of this version finished are reused as-is
+        saved_sections = _checkpointed_sections(report)
+        
         async def run_analysis_with_tracking():
             """Run analysis pipeline with step-by-step progress updates."""
             from asgiref.sync import sync_to_async
             
             # Wrap tracker methods for async use
-            start_step = sync_to_async(tracker.start_step, thread_sensitive=True)
-            complete_step = sync_to_async(tracker.complete_step, thread_sensitive=True)
-            update_step_message = sync_to_async(tracker.update_step_message, thread_sensitive=True)
+            start_step = progress.start_step
+            complete_step = progress.complete_step
+            update_step_message = progress.update_step_message
             
             # Wrap storage methods
             save_section = sync_to_async(report_storage.save_analysis_section, thread_sensitive=True)
@@ -392,7 +608,8 @@ def generate_crunchbase_report(self, report_id, user_id):
             # Create pipeline (uses LIARA_MODEL from settings by default)
             pipeline = CrunchbaseAnalysisPipeline(
                 target_market_description=target_description,
-                progress_callback=None  # We handle progress via tracker
+                progress_callback=None,  # We handle progress via tracker
+                section_stream=SectionStreamPublisher(str(project.id), 'crunchbase', str(report.id))
             )
             
             num_companies = len(companies_for_analysis)
@@ -401,53 +618,51 @@ def generate_crunchbase_report(self, report_id, user_id):
             await start_step('company_deep_dive')
             
             # --- Part 1: Company Deep Dive ---
-            deep_dive_reports = []
+            # All companies run concurrently (bounded by the LLM limiter); each report
+            # is saved as soon as it finishes while the remaining calls are in flight
+            org_id = str(project.organization_id) if project.organization_id else 'default'
+            pending_saves = []
             
-            for idx, company in enumerate(companies_for_analysis):
-                company_name = company.get("Company Name", company.get("name", f"Company {idx + 1}"))
-                
-                # Update tracker message
-                await update_step_message(
-                    'company_deep_dive', 
-                    f"Analyzing {company_name} ({idx+1}/{num_companies})",
-                    progress_percent=int((idx / num_companies) * 100)
-                )
-                
+            async def save_company_report(company_report):
+                company_name = company_report['company_name']
                 try:
-                    # Call AI
-                    report_content = await pipeline._call_ai(
-                        pipeline.prompts.generate_company_summary(company)
+                    await save_section(
+                        project_id=str(project.id),
+                        org_id=org_id,
+                        version=report.current_version + 1,
+                        section_type='company_deep_dive',
+                        content=company_report['content'],
+                        company_name=company_name
                     )
-                    
-                    deep_dive_reports.append({
-                        "company_name": company_name,
-                        "content": report_content
-                    })
-                    
-                    # Save per-company analysis to JSON
-                    try:
-                        org_id = str(project.organization_id) if project.organization_id else 'default'
-                        await save_section(
-                            project_id=str(project.id),
-                            org_id=org_id,
-                            version=report.current_version + 1,
-                            section_type='company_deep_dive',
-                            content=report_content,
-                            company_name=company_name
-                        )
-                    except Exception as save_err:
-                        logger.warning(f"Failed to save company_deep_dive JSON for {company_name}: {save_err}")
-                        
-                except Exception as e:
-                    logger.error(f"Analysis failed for {company_name}: {e}")
-                    deep_dive_reports.append({
-                        "company_name": company_name,
-                        "content": f"Analysis error: {str(e)}"
-                    })
-
-                # Close DB connections occasionally
-                if idx % 3 == 0:
-                    await sync_to_async(close_old_connections)()
+                except Exception as save_err:
+                    logger.warning(f"Failed to save company_deep_dive JSON for {company_name}: {save_err}")
+            
+            deep_dive_reports, missing = _split_reused_companies(companies_for_analysis, saved_sections)
+            reused = num_companies - len(missing)
+            
+            async def on_company_done(idx, company_report, completed):
+                completed += reused
+                await update_step_message(
+                    'company_deep_dive',
+                    f"Analyzed {company_report['company_name']} ({completed}/{num_companies})",
+                    progress_percent=int((completed / num_companies) * 100)
+                )
+                # A failed deep dive is not saved, so a restart generates it again
+                if not company_report.get('failed'):
+                    pending_saves.append(asyncio.create_task(save_company_report(company_report)))
+            
+            await update_step_message(
+                'company_deep_dive',
+                f"Analyzing {len(missing)} companies..." + (f" ({reused} reused from the previous run)" if reused else ""),
+                progress_percent=int((reused / num_companies) * 100)
+            )
+            fresh_reports = await pipeline.analyze_companies(
+                [companies_for_analysis[idx] for idx in missing], on_company_done
+            )
+            for idx, company_report in zip(missing, fresh_reports):
+                deep_dive_reports[idx] = company_report
+            await asyncio.gather(*pending_saves)
+            await sync_to_async(close_old_connections)()
             
             await complete_step('company_deep_dive', {'companies_analyzed': len(deep_dive_reports)})
             
@@ -455,22 +670,25 @@ def generate_crunchbase_report(self, report_id, user_id):
             await start_step('strategic_summary')
             await update_step_message('strategic_summary', "Synthesizing strategic trends...")
             
-            strategic_summary = await pipeline._call_ai(
-                pipeline.prompts.generate_strategic_summary(companies_for_analysis)
-            )
-            
-            # Save summary to JSON
-            try:
-                org_id = str(project.organization_id) if project.organization_id else 'default'
-                await save_summary(
-                    project_id=str(project.id),
-                    org_id=org_id,
-                    version=report.current_version + 1,
-                    summary_type='strategic_summary',
-                    content=strategic_summary
+            strategic_summary = saved_sections.get(('strategic_summary', None))
+            if strategic_summary is None:
+                strategic_summary = await pipeline._call_ai(
+                    pipeline.prompts.generate_strategic_summary(companies_for_analysis),
+                    section='strategic_summary'
                 )
-            except Exception as e:
-                 logger.warning(f"Failed to save strategic_summary JSON: {e}")
+                
+                # Save summary to JSON
+                try:
+                    org_id = str(project.organization_id) if project.organization_id else 'default'
+                    await save_summary(
+                        project_id=str(project.id),
+                        org_id=org_id,
+                        version=report.current_version + 1,
+                        summary_type='strategic_summary',
+                        content=strategic_summary
+                    )
+                except Exception as e:
+                     logger.warning(f"Failed to save strategic_summary JSON: {e}")
             
             await complete_step('strategic_summary')
 
@@ -478,22 +696,25 @@ def generate_crunchbase_report(self, report_id, user_id):
             await start_step('fast_analysis')
             await update_step_message('fast_analysis', "Generating executive flash report...")
             
-            fast_analysis = await pipeline._call_ai(
-                pipeline.prompts.generate_fast_analysis(companies_for_analysis)
-            )
-            
-            # Save summary to JSON
-            try:
-                org_id = str(project.organization_id) if project.organization_id else 'default'
-                await save_summary(
-                    project_id=str(project.id),
-                    org_id=org_id,
-                    version=report.current_version + 1,
-                    summary_type='fast_analysis',
-                    content=fast_analysis
+            fast_analysis = saved_sections.get(('fast_analysis', None))
+            if fast_analysis is None:
+                fast_analysis = await pipeline._call_ai(
+                    pipeline.prompts.generate_fast_analysis(companies_for_analysis),
+                    section='fast_analysis'
                 )
-            except Exception as e:
-                 logger.warning(f"Failed to save fast_analysis JSON: {e}")
+                
+                # Save summary to JSON
+                try:
+                    org_id = str(project.organization_id) if project.organization_id else 'default'
+                    await save_summary(
+                        project_id=str(project.id),
+                        org_id=org_id,
+                        version=report.current_version + 1,
+                        summary_type='fast_analysis',
+                        content=fast_analysis
+                    )
+                except Exception as e:
+                     logger.warning(f"Failed to save fast_analysis JSON: {e}")
             
             await complete_step('fast_analysis')
             
@@ -505,12 +726,8 @@ def generate_crunchbase_report(self, report_id, user_id):
             }
         
         # Run the analysis
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            analysis_result = loop.run_until_complete(run_analysis_with_tracking())
-        finally:
-            loop.close()
+        progress = AsyncProgressTracker(tracker)
+        analysis_result = _run_async(progress.run(run_analysis_with_tracking()))
         
         # ===== Generate HTML =====
         tracker.start_step('html_gen')
@@ -557,8 +774,10 @@ def generate_crunchbase_report(self, report_id, user_id):
         )
         section_order += 1
         
-        # 3. Company Deep Dives
+        # 3. Company Deep Dives (failed ones only appear in the HTML)
         for report_item in analysis_result['company_deep_dive']:
+            if report_item.get('failed'):
+                continue
             ReportAnalysisSection.objects.create(
                 report=report,
                 section_type='company_deep_dive',
@@ -599,6 +818,7 @@ def generate_crunchbase_report(self, report_id, user_id):
         
         # Finalize report
         report.status = 'completed'
+        report.checkpoint = {}  # Version is complete
         report.progress = 100
         report.current_step = 'Complete!'
         report.html_content = html_content
@@ -639,24 +859,31 @@ def generate_crunchbase_report(self, report_id, user_id):
         
         logger.info(f"✅ Crunchbase report generated for project {project.id} with {section_order} sections")
         return {"status": "success", "version": report.current_version, "sections": section_order}
-        
-
+    
     except Exception as e:
-        logger.error(f"❌ Failed to generate Crunchbase report: {e}")
-        if report:
-            report.status = 'failed'
-            report.error_message = str(e)
-            report.save()
-            if tracker:
-                from .models import ReportProgressStep
-                running_step = ReportProgressStep.objects.filter(
-                    report=report, status='running'
-                ).first()
-                if running_step:
-                    tracker.fail_step(running_step.step_key, str(e))
+        _fail_report(report, tracker, e, 'Crunchbase')
         raise
 
 
+def _resume_crunchbase_report(report_id, state, status_data):
+    """Continue a Crunchbase report whose parked search has finished."""
+    from .models import Report
+    from .progress_tracker import ReportProgressTracker
+    from apps.users.models import User
+    from services.scrapers.crunchbase_scraper import crunchbase_scraper
+    
+    report = Report.objects.get(id=report_id)
+    user = User.objects.get(id=state['user_id'])
+    tracker = ReportProgressTracker(report)
+    try:
+        result, search_error = crunchbase_scraper.search_result(status_data), None
+    except Exception as e:
+        result, search_error = {}, e
+    return _finish_crunchbase_report(
+        report, user, tracker, state['keywords'], state['target_description'], result, search_error
+    )
+
+
 @shared_task(bind=True, queue='reports')
 def generate_social_report(self, report_id, user_id):
     """
@@ -670,14 +897,11 @@ def generate_social_report(self, report_id, user_id):
     4. Generate Executive Summary
     5. Save Report
     """
-    from .models import Report, ReportVersion, ReportAnalysisSection
+    from .models import Report
     from .progress_tracker import ReportProgressTracker
     from apps.users.models import User
     from services.keyword_generator import generate_social_keywords_async
     from services.scrapers.twitter_scraper import twitter_scraper
-    from services.twitter_analysis import TwitterAnalysisPipeline
-    from core.storage import storage_service
-    from services.report_storage import report_storage
     
     report = None
     tracker = None
@@ -691,112 +915,242 @@ def generate_social_report(self, report_id, user_id):
         # Mark as running
         report.status = 'running'
         report.started_at = timezone.now()
+        report.pipeline_state = {}  # Orphan any poll left by a previous run
         report.save()
         
         # Initialize progress tracker
         tracker = ReportProgressTracker(report)
         tracker.initialize_steps() # Assumes social steps are defined or generic enough
-        
-        # ===== Step 1: Generate Social Keywords =====
-        tracker.start_step('init')
-        tracker.update_step_message('init', "Generating social media search keywords...")
-        
-        project_input_dict = get_project_inputs_dict(inputs)
-        
-        # Force fresh generation for social (different from crunchbase keywords)
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
-        try:
-            kw_result = loop.run_until_complete(generate_social_keywords_async(project_input_dict))
-            keywords = kw_result['keywords']
-            target_desc = kw_result['target_description']
+        _open_checkpoint(report)
+        
+        checkpointed = _checkpointed_search(report)
+        if checkpointed:
+            # An earlier run of this version already collected the tweets
+            step, all_tweets = checkpointed
+            keywords, target_desc = step['keywords'], step['target_desc']
+            tracker.start_step('init')
+            tracker.complete_step('init', {'keywords_count': len(keywords)})
+            tracker.start_step('api_search')
+            tracker.update_step_message('api_search', "Reusing tweets from the previous run...")
+        else:
+            # ===== Step 1: Generate Social Keywords =====
+            tracker.start_step('init')
+            tracker.update_step_message('init', "Generating social media search keywords...")
             
-            # Save to report data for reference (keywords used)
-            report.data['social_keywords'] = keywords
-            report.save()
+            project_input_dict = get_project_inputs_dict(inputs)
             
-            for kw in keywords:
-                tracker.add_step_detail('init', 'keyword', kw, {'keyword': kw})
+            # Force fresh generation for social (different from crunchbase keywords)
+            try:
+                kw_result = _run_async(generate_social_keywords_async(project_input_dict))
+                keywords = kw_result['keywords']
+                target_desc = kw_result['target_description']
+                
+                # Save to report data for reference (keywords used)
+                report.data['social_keywords'] = keywords
+                report.save()
+                
+                for kw in keywords:
+                    tracker.add_step_detail('init', 'keyword', kw, {'keyword': kw})
+                
+                tracker.complete_step('init', {'keywords_count': len(keywords)})
+                
+            except Exception as e:
+                logger.error(f"Keyword generation failed: {e}")
+                tracker.fail_step('init', str(e))
+                raise
             
-            tracker.complete_step('init', {'keywords_count': len(keywords)})
+            # ===== Step 2: Search Twitter =====
+            tracker.start_step('api_search')
             
-        except Exception as e:
-            logger.error(f"Keyword generation failed: {e}")
-            tracker.fail_step('init', str(e))
-            raise
-        
-        # ===== Step 2: Search Twitter =====
-        tracker.start_step('api_search')
-        
-        # Search for top keywords
-        # Using top 3 keywords as requested
-        search_keywords = keywords[:3]
-        tracker.update_step_message('api_search', f"Searching Twitter for {len(search_keywords)} topics...")
-        
-        all_tweets = []
-        try:
-            # Run searches sequentially with delay to respect rate limit (5s)
-            results_list = []
+            # Search for top keywords
+            # Using top 3 keywords as requested
+            search_keywords = keywords[:3]
+            tracker.update_step_message('api_search', f"Searching Twitter for {len(search_keywords)} topics...")
             
+            if settings.REPORT_PIPELINE_NONBLOCKING:
+                # One orchestrator task per keyword; the slot is released between them
+                return _submit_social_search(report, tracker, user_id, {
+                    'keywords': keywords,
+                    'target_desc': target_desc,
+                    'search_keywords': search_keywords,
+                    'index': 0,
+                    'tweets': [],
+                })
+            
+            all_tweets = []
+            # Run searches sequentially with delay to respect rate limit (5s)
             for i, kw in enumerate(search_keywords):
                 if i > 0:
-                    tracker.update_step_message('api_search', f"Waiting 6s before next search (Rate Limit)...")
+                    tracker.update_step_message('api_search', "Waiting 6s before next search (Rate Limit)...")
                     # Wait 6s between requests
-                    loop.run_until_complete(asyncio.sleep(6))
+                    time.sleep(6)
                 
                 tracker.update_step_message('api_search', f"Searching for '{kw}'...")
                 
                 try:
-                    res = loop.run_until_complete(
+                    res = _run_async(
                         twitter_scraper.search_tweets(
                             keywords=[kw],
                             limit=10,
                             report_id=str(report.id)
                         )
                     )
-                    
-                    # Process result immediately
-                    if isinstance(res, dict) and 'tweets' in res:
-                        found_count = len(res['tweets'])
-                        all_tweets.extend(res['tweets'])
-                        
-                        # Prepare detail message and data
-                        message = f"Found {found_count} tweets for '{kw}'"
-                        detail_data = {'keyword': kw, 'count': found_count}
-                        
-                        # Add top tweet info if available (for expandable description)
-                        if res['tweets']:
-                            top_tweet = res['tweets'][0]
-                            author_name = top_tweet.get('author', {}).get('name', 'Unknown')
-                            tweet_text = top_tweet.get('text', '')
-                            
-                            # The frontend likely uses 'description' for expandable content
-                            detail_data['description'] = f"@{author_name}: {tweet_text}"
-                            detail_data['top_tweet_id'] = top_tweet.get('id')
-                            
-                            # Update title to include preview
-                            preview = tweet_text[:50] + "..." if len(tweet_text) > 50 else tweet_text
-                            # Ensure full text is available for frontend expansion
-                            if 'full_text' not in detail_data:
-                                detail_data['full_text'] = tweet_text
-
-                            message += f" - Top: {preview}"
-
-                        tracker.add_step_detail(
-                            'api_search', 
-                            'search_result', 
-                            message, 
-                            detail_data
-                        )
-                    elif isinstance(res, Exception):
-                        logger.warning(f"Search failed for '{kw}': {res}")
-                        tracker.add_step_detail('api_search', 'error', f"Search failed for '{kw}': {str(res)}")
-                    
                 except Exception as e:
-                    logger.error(f"Search failed for '{kw}': {e}")
-                    tracker.add_step_detail('api_search', 'error', f"Search failed for '{kw}': {str(e)}")
-            
+                    res = e
+                _record_social_search(tracker, kw, res, all_tweets)
+    
+    except Exception as e:
+        _fail_report(report, tracker, e, 'Social')
+        raise
+    
+    return _finish_social_report(report, user, tracker, keywords, target_desc, all_tweets)
+
+
+def _record_social_search(tracker, kw, res, all_tweets):
+    """Add one keyword's search result (or error) to the tweets and progress details."""
+    # Process result immediately
+    if isinstance(res, dict) and 'tweets' in res:
+        found_count = len(res['tweets'])
+        all_tweets.extend(res['tweets'])
+        
+        # Prepare detail message and data
+        message = f"Found {found_count} tweets for '{kw}'"
+        detail_data = {'keyword': kw, 'count': found_count}
+        
+        # Add top tweet info if available (for expandable description)
+        if res['tweets']:
+            top_tweet = res['tweets'][0]
+            author_name = top_tweet.get('author', {}).get('name', 'Unknown')
+            tweet_text = top_tweet.get('text', '')
+        
+            # The frontend likely uses 'description' for expandable content
+            detail_data['description'] = f"@{author_name}: {tweet_text}"
+            detail_data['top_tweet_id'] = top_tweet.get('id')
+        
+            # Update title to include preview
+            preview = tweet_text[:50] + "..." if len(tweet_text) > 50 else tweet_text
+            # Ensure full text is available for frontend expansion
+            if 'full_text' not in detail_data:
+                detail_data['full_text'] = tweet_text
+
+            message += f" - Top: {preview}"
+
+        tracker.add_step_detail(
+            'api_search', 
+            'search_result', 
+            message, 
+            detail_data
+        )
+    elif isinstance(res, Exception):
+        logger.warning(f"Search failed for '{kw}': {res}")
+        tracker.add_step_detail('api_search', 'error', f"Search failed for '{kw}': {str(res)}")
+
+
+def _submit_social_search(report, tracker, user_id, search):
+    """Submit the current keyword's Twitter search and park the report on it."""
+    from services.scrapers.twitter_scraper import twitter_scraper
+    
+    kw = search['search_keywords'][search['index']]
+    tracker.update_step_message('api_search', f"Searching for '{kw}'...")
+    try:
+        submitted = _run_async(
+            twitter_scraper.search_tweets(
+                keywords=[kw],
+                limit=10,
+                report_id=str(report.id),
+                wait=False
+            )
+        )
+    except Exception as e:
+        return _advance_social_search(report, tracker, user_id, search, e)
+    
+    _park_report(report, tracker, user_id, 'social_search', submitted['task_id'], search=search)
+    return {"status": "waiting", "task_id": submitted['task_id']}
+
+
+def _advance_social_search(report, tracker, user_id, search, res):
+    """Record a keyword's search, then schedule the next keyword or finish the report."""
+    from apps.users.models import User
+    
+    _record_social_search(tracker, search['search_keywords'][search['index']], res, search['tweets'])
+    search['index'] += 1
+    
+    if search['index'] < len(search['search_keywords']):
+        tracker.update_step_message('api_search', "Waiting 6s before next search (Rate Limit)...")
+        tracker.flush()
+        # Wait 6s between requests, without holding a worker slot
+        token = uuid.uuid4().hex
+        report.pipeline_state = {
+            'stage': 'social_pause',
+            'token': token,
+            'user_id': str(user_id),
+            'deadline': time.time() + settings.REPORT_PARKED_SWEEP_INTERVAL,
+            'search': search,
+        }
+        report.save(update_fields=['pipeline_state', 'updated_at'])
+        continue_social_search.apply_async(args=[str(report.id), token], countdown=6)
+        return {"status": "waiting"}
+    
+    user = User.objects.get(id=user_id)
+    return _finish_social_report(
+        report, user, tracker, search['keywords'], search['target_desc'], search['tweets']
+    )
+
+
+@shared_task(queue='reports', ignore_result=True)
+@close_db_wrapper
+def continue_social_search(report_id, token=None):
+    """Submit the next keyword search of a Social report paused for the rate limit."""
+    from .models import Report
+    from .progress_tracker import ReportProgressTracker
+    
+    report = Report.objects.filter(id=report_id).first()
+    state = report.pipeline_state if report else {}
+    if state.get('stage') != 'social_pause' or state.get('token') != token:
+        return None
+    if token is not None:
+        # Claim the pause so a re-kick by sweep_parked_reports cannot submit twice
+        if not Report.objects.filter(id=report_id, pipeline_state__token=token).update(pipeline_state={}):
+            return None
+    
+    tracker = ReportProgressTracker(report)
+    try:
+        return _submit_social_search(report, tracker, state['user_id'], state['search'])
+    except Exception as e:
+        _fail_report(report, tracker, e, 'Social')
+        raise
+
+
+def _resume_social_search(report_id, state, status_data):
+    """Continue a Social report whose parked keyword search has finished."""
+    from .models import Report
+    from .progress_tracker import ReportProgressTracker
+    from services.scrapers.twitter_scraper import twitter_scraper
+    
+    report = Report.objects.get(id=report_id)
+    tracker = ReportProgressTracker(report)
+    try:
+        res = twitter_scraper.search_result(status_data)
+    except Exception as e:
+        res = e
+    try:
+        return _advance_social_search(report, tracker, state['user_id'], state['search'], res)
+    except Exception as e:
+        _fail_report(report, tracker, e, 'Social')
+        raise
+
+
+def _finish_social_report(report, user, tracker, keywords, target_desc, all_tweets):
+    """Steps 3-5 of the Social pipeline, once all keyword searches are in."""
+    from .models import ReportVersion, ReportAnalysisSection
+    from .progress_tracker import AsyncProgressTracker
+    from services.twitter_analysis import TwitterAnalysisPipeline
+    from services.report_storage import report_storage
+    
+    project = report.project
+    
+    try:
+        try:
             tracker.update_step_message('api_search', f"Found {len(all_tweets)} unique tweets.")
             # Dedup tweets by ID
             seen_ids = set()
@@ -823,13 +1177,14 @@ def generate_social_report(self, report_id, user_id):
                 
                 # Save to DB (Dual-Write)
                 from .models import ReportRawData
-                ReportRawData.objects.create(
+                ReportRawData.objects.update_or_create(
                     report=report,
                     version=report.current_version + 1,
                     report_type='social',
-                    data=all_tweets
+                    defaults={'data': all_tweets}
                 )
                 logger.info(f"✅ Saved raw Twitter data to DB")
+                _checkpoint_step(report, 'api_search', keywords=keywords, target_desc=target_desc)
             except Exception as e:
                 logger.warning(f"Failed to save raw Twitter data: {e}")
             
@@ -842,34 +1197,42 @@ def generate_social_report(self, report_id, user_id):
         # ===== Step 3: Analyze Tweets =====
         # Note: Pipeline handles tracking of granular analysis steps internally
         
-        analysis_pipeline = TwitterAnalysisPipeline(target_market_description=target_desc)
-        
-        from asgiref.sync import sync_to_async
+        # Sections are saved as they finish; ones an earlier run of this version
+        # finished are reused as-is
+        saved_sections = {
+            section: content
+            for (section, company_name), content in _checkpointed_sections(report).items()
+            if company_name is None
+        }
+        org_id = str(project.organization_id) if project.organization_id else 'default'
         
-        class AsyncTracker:
-            def __init__(self, tracker):
-                self.tracker = tracker
+        async def save_section(section_type, content):
+            from asgiref.sync import sync_to_async
             
-            async def start_step(self, *args, **kwargs):
-                await sync_to_async(self.tracker.start_step)(*args, **kwargs)
-
-            async def update_step_message(self, *args, **kwargs):
-                await sync_to_async(self.tracker.update_step_message)(*args, **kwargs)
-
-            async def add_step_detail(self, *args, **kwargs):
-                await sync_to_async(self.tracker.add_step_detail)(*args, **kwargs)
-
-            async def complete_step(self, *args, **kwargs):
-                await sync_to_async(self.tracker.complete_step)(*args, **kwargs)
-                
-            async def fail_step(self, *args, **kwargs):
-                await sync_to_async(self.tracker.fail_step)(*args, **kwargs)
-
-        async_tracker = AsyncTracker(tracker)
+            try:
+                await sync_to_async(report_storage.save_analysis_section, thread_sensitive=True)(
+                    project_id=str(project.id),
+                    org_id=org_id,
+                    version=report.current_version + 1,
+                    section_type=section_type,
+                    content=str(content),  # Convert to string/markdown if it's a dict/json
+                    report_type='social'
+                )
+            except Exception as e:
+                logger.warning(f"S3 save failed for {section_type}: {e}")
+        
+        analysis_pipeline = TwitterAnalysisPipeline(target_market_description=target_desc)
+        
+        async_tracker = AsyncProgressTracker(tracker)
         
         try:
-            analysis_results = loop.run_until_complete(
-                analysis_pipeline.analyze(all_tweets, tracker=async_tracker)
+            analysis_results = _run_async(
+                async_tracker.run(analysis_pipeline.analyze(
+                    all_tweets,
+                    tracker=async_tracker,
+                    saved_sections=saved_sections,
+                    on_section_done=save_section
+                ))
             )
         except Exception as e:
             logger.error(f"Analysis failed: {e}")
@@ -886,7 +1249,7 @@ def generate_social_report(self, report_id, user_id):
         # Or store JSON sections and let Frontend render.
         # `generate_crunchbase_report` does both.
         
-        # Save sections
+        # Save sections (reused and new; S3 docs were written as each finished)
         for key, content in analysis_results.items():
             ReportAnalysisSection.objects.create(
                 report=report,
@@ -895,20 +1258,6 @@ def generate_social_report(self, report_id, user_id):
                 order=section_order
             )
             section_order += 1
-            
-            # S3
-            try:
-                org_id = str(project.organization_id) if project.organization_id else 'default'
-                report_storage.save_analysis_section(
-                    project_id=str(project.id),
-                    org_id=org_id,
-                    version=report.current_version + 1,
-                    section_type=key,
-                    content=str(content),  # Convert to string/markdown if it's a dict/json
-                    report_type='social'
-                )
-            except Exception as e:
-                logger.warning(f"S3 save failed: {e}")
 
         # Finalize
         # Create a simple HTML report for now
@@ -926,6 +1275,7 @@ def generate_social_report(self, report_id, user_id):
         )
         
         report.status = 'completed'
+        report.checkpoint = {}  # Version is complete
         report.progress = 100
         report.current_step = 'Complete!'
         report.html_content = html_content
@@ -956,16 +1306,11 @@ def generate_social_report(self, report_id, user_id):
             logger.warning(f"Failed to save Social report metadata JSON: {e}")
         
         tracker.complete_step('save')
-        loop.close()
         
         return {"status": "success", "tweets": len(all_tweets)}
 
     except Exception as e:
-        logger.error(f"❌ Failed to generate Social report: {e}")
-        if report:
-            report.status = 'failed'
-            report.error_message = str(e)
-            report.save()
+        _fail_report(report, tracker, e, 'Social')
         raise
 
 
@@ -986,12 +1331,10 @@ def generate_tracxn_report(self, report_id, user_id):
     8. Generate HTML Report
     9. Save Report to DB and S3
     """
-    from .models import Report, ReportVersion, ReportAnalysisSection
+    from .models import Report
     from .progress_tracker import ReportProgressTracker
     from apps.users.models import User
     from services.scrapers.tracxn_scraper import tracxn_scraper
-    from services.tracxn_analysis import TracxnAnalysisPipeline, generate_tracxn_html
-    from core.storage import storage_service
     
     report = None
     tracker = None
@@ -1005,11 +1348,13 @@ def generate_tracxn_report(self, report_id, user_id):
         # Mark as running
         report.status = 'running'
         report.started_at = timezone.now()
+        report.pipeline_state = {}  # Orphan any poll left by a previous run
         report.save()
         
         # Initialize progress tracker
         tracker = ReportProgressTracker(report)
         tracker.initialize_steps()
+        _open_checkpoint(report)
         
         # ===== Step 1: Initialize & Generate Keywords =====
         tracker.start_step('init')
@@ -1069,19 +1414,69 @@ def generate_tracxn_report(self, report_id, user_id):
         # Pre-start sorting and fetching_details so API status updates appear in real-time
         # These steps happen inside search_with_ranking() and send status updates via callback
         
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
+        search_kwargs = dict(
+            company_names=keywords,
+            target_description=target_description,
+            num_companies_per_search=30,
+            top_count=15,
+            report_id=str(report.id),  # Enable real-time status callbacks
+        )
+        result = {}
+        search_error = None
+        checkpointed = _checkpointed_search(report)
+        if checkpointed:
+            # An earlier run of this version already finished the search
+            step, top_companies = checkpointed
+            keywords = step.get('keywords', keywords)
+            target_description = step.get('target_description', target_description)
+            result = {
+                'all_companies': [],
+                'top_companies_full_data': top_companies,
+                'metadata': step.get('metadata', {}),
+            }
+            tracker.update_step_message('api_search', "Reusing search results from the previous run...")
+        else:
+            try:
+                if settings.REPORT_PIPELINE_NONBLOCKING:
+                    # Park until the remote search finishes instead of holding this worker
+                    submitted = _run_async(tracxn_scraper.search_with_ranking(**search_kwargs, wait=False))
+                    _park_report(
+                        report, tracker, user_id, 'tracxn_search', submitted['task_id'],
+                        keywords=keywords, target_description=target_description
+                    )
+                    return {"status": "waiting", "task_id": submitted['task_id']}
+                result = _run_async(tracxn_scraper.search_with_ranking(**search_kwargs))
+            except Exception as e:
+                search_error = e
+    
+    except Exception as e:
+        _fail_report(report, tracker, e, 'Tracxn')
+        raise
+    
+    return _finish_tracxn_report(report, user, tracker, keywords, target_description, result, search_error)
+
+
+def _finish_tracxn_report(report, user, tracker, keywords, target_description, result, search_error=None):
+    """
+    Tracxn pipeline after the remote search: ranking, analysis, HTML and save.
+    
+    Runs inline in blocking mode, or from resume_report_stage once the
+    parked search has finished.
+    """
+    from .models import ReportVersion, ReportAnalysisSection
+    from .progress_tracker import AsyncProgressTracker
+    from services.tracxn_analysis import TracxnAnalysisPipeline, generate_tracxn_html
+    from services.section_stream import SectionStreamPublisher
+    from services.report_storage import report_storage
+    from core.storage import storage_service
+    
+    project = report.project
+    inputs = project.inputs
+    
+    try:
         try:
-            result = loop.run_until_complete(
-                tracxn_scraper.search_with_ranking(
-                    company_names=keywords,
-                    target_description=target_description,
-                    num_companies_per_search=30,
-                    top_count=15,
-                    report_id=str(report.id),  # Enable real-time status callbacks
-                )
-            )
+            if search_error is not None:
+                raise search_error
             
             all_companies = result.get('all_companies', [])
             top_companies = result.get('top_companies_full_data', [])
@@ -1107,7 +1502,6 @@ def generate_tracxn_report(self, report_id, user_id):
             
             # Save raw data to S3/MinIO
             try:
-                from services.report_storage import report_storage
                 org_id = str(project.organization_id) if project.organization_id else 'default'
                 report_storage.save_tracxn_raw_data(
                     project_id=str(project.id),
@@ -1119,13 +1513,19 @@ def generate_tracxn_report(self, report_id, user_id):
                 
                 # Save to DB (Dual-Write)
                 from .models import ReportRawData
-                ReportRawData.objects.create(
+                ReportRawData.objects.update_or_create(
                     report=report,
                     version=report.current_version + 1,
                     report_type='tracxn',
-                    data=top_companies
+                    defaults={'data': top_companies}
                 )
                 logger.info(f"✅ Saved raw Tracxn data to DB")
+                _checkpoint_step(
+                    report, 'api_search',
+                    keywords=keywords,
+                    target_description=target_description,
+                    metadata={'total_unique_companies': total_unique}
+                )
             except Exception as e:
                 logger.warning(f"Failed to save raw Tracxn data: {e}")
             
@@ -1135,8 +1535,6 @@ def generate_tracxn_report(self, report_id, user_id):
             all_companies = []
             top_companies = []
             result = {}
-        finally:
-            loop.close()
         
         # ===== Step 3: Sorting =====
         tracker.start_step('sorting')
@@ -1202,60 +1600,119 @@ def generate_tracxn_report(self, report_id, user_id):
         tracker.complete_step('fetching_details', {'startups_processed': len(startups_for_analysis)})
         
         # ===== Steps 5-7: Run 3-Step Institutional AI Analysis Pipeline =====
+        # Sections are saved as they finish; ones an earlier run of this version
+        # finished are reused as-is
+        saved_sections = _checkpointed_sections(report)
+        org_id = str(project.organization_id) if project.organization_id else 'default'
+        
         async def run_analysis_with_tracking():
             """Run 3-step institutional analysis pipeline with progress updates."""
             from asgiref.sync import sync_to_async
             
-            start_step = sync_to_async(tracker.start_step, thread_sensitive=True)
-            complete_step = sync_to_async(tracker.complete_step, thread_sensitive=True)
+            start_step = progress.start_step
+            complete_step = progress.complete_step
+            update_step_message = progress.update_step_message
+            save_section = sync_to_async(report_storage.save_analysis_section, thread_sensitive=True)
+            save_summary = sync_to_async(report_storage.save_analysis_summary, thread_sensitive=True)
             
             pipeline = TracxnAnalysisPipeline(
                 target_market_description=target_description,
-                progress_callback=None
+                progress_callback=None,
+                section_stream=SectionStreamPublisher(str(project.id), 'tracxn', str(report.id))
             )
             
             num_startups = len(startups_for_analysis)
             
-            # Step 5: Company Deep Dive (per company comprehensive analysis)
+            # Step 5: Company Deep Dive (per company comprehensive analysis, run concurrently)
             await start_step('company_deep_dive')
-            company_reports = []
-            for startup in startups_for_analysis:
-                startup_name = startup.get('name', 'Unknown')
+            
+            company_reports, missing = _split_reused_companies(
+                startups_for_analysis, saved_sections, name_keys=('name', 'Company Name')
+            )
+            reused = num_startups - len(missing)
+            pending_saves = []
+            
+            async def save_company_report(company_report):
                 try:
-                    prompt = pipeline.prompts.generate_comprehensive_company_analysis(
-                        startup, target_description
+                    await save_section(
+                        project_id=str(project.id),
+                        org_id=org_id,
+                        version=report.current_version + 1,
+                        section_type='company_deep_dive',
+                        content=company_report['content'],
+                        company_name=company_report['company_name'],
+                        report_type='tracxn'
                     )
-                    content = await pipeline._call_ai(prompt, max_tokens=4000)
-                    company_reports.append({'company_name': startup_name, 'content': content})
                 except Exception as e:
-                    logger.error(f"Company deep dive failed for {startup_name}: {e}")
-                    company_reports.append({'company_name': startup_name, 'content': f"Analysis error: {str(e)}"})
+                    logger.warning(f"S3 company deep dive save failed for {company_report['company_name']}: {e}")
+            
+            async def on_company_done(idx, company_report, completed):
+                completed += reused
+                await update_step_message(
+                    'company_deep_dive',
+                    f"Analyzed {company_report['company_name']} ({completed}/{num_startups})",
+                    progress_percent=int((completed / num_startups) * 100)
+                )
+                # A failed deep dive is not saved, so a restart generates it again
+                if not company_report.get('failed'):
+                    pending_saves.append(asyncio.create_task(save_company_report(company_report)))
+            
+            if reused:
+                await update_step_message(
+                    'company_deep_dive',
+                    f"Reused {reused} startups from the previous run, analyzing {len(missing)}...",
+                    progress_percent=int((reused / num_startups) * 100)
+                )
+            fresh_reports = await pipeline.analyze_companies(
+                [startups_for_analysis[idx] for idx in missing], on_company_done
+            )
+            for idx, company_report in zip(missing, fresh_reports):
+                company_reports[idx] = company_report
+            await asyncio.gather(*pending_saves)
             await complete_step('company_deep_dive', {'startups_analyzed': len(company_reports)})
             
             # Step 6: Executive Summary (5-page strategic assessment)
             await start_step('executive_summary')
-            try:
+            executive_summary = saved_sections.get(('executive_summary', None))
+            if executive_summary is None:
                 report_texts = [r['content'] for r in company_reports]
                 prompt = pipeline.prompts.generate_executive_summary(
                     report_texts, num_startups, target_description
                 )
-                executive_summary = await pipeline._call_ai(prompt, max_tokens=5000)
-            except Exception as e:
-                logger.error(f"Executive summary failed: {e}")
-                executive_summary = f"Analysis error: {str(e)}"
+                executive_summary = await pipeline._call_ai(prompt, max_tokens=5000, section='executive_summary')
+                try:
+                    await save_summary(
+                        project_id=str(project.id),
+                        org_id=org_id,
+                        version=report.current_version + 1,
+                        summary_type='executive_summary',
+                        content=executive_summary,
+                        report_type='tracxn'
+                    )
+                except Exception as e:
+                    logger.warning(f"Failed to save executive_summary JSON: {e}")
             await complete_step('executive_summary', {'summary_generated': True})
             
             # Step 7: Flash Analysis (2-page market flash report - synthesizing all analysis)
             await start_step('flash_analysis')
-            try:
+            flash_analysis = saved_sections.get(('flash_analysis', None))
+            if flash_analysis is None:
                 # Pass company reports to flash analysis so it can synthesize the findings
                 prompt = pipeline.prompts.generate_flash_analysis_report(
                     company_reports, executive_summary, target_description
                 )
-                flash_analysis = await pipeline._call_ai(prompt, max_tokens=3000)
-            except Exception as e:
-                logger.error(f"Flash analysis failed: {e}")
-                flash_analysis = f"Analysis error: {str(e)}"
+                flash_analysis = await pipeline._call_ai(prompt, max_tokens=3000, section='flash_analysis')
+                try:
+                    await save_section(
+                        project_id=str(project.id),
+                        org_id=org_id,
+                        version=report.current_version + 1,
+                        section_type='flash_analysis',
+                        content=flash_analysis,
+                        report_type='tracxn'
+                    )
+                except Exception as e:
+                    logger.warning(f"Failed to save flash_analysis JSON: {e}")
             await complete_step('flash_analysis', {'report_generated': True})
             
             return {
@@ -1266,12 +1723,8 @@ def generate_tracxn_report(self, report_id, user_id):
             }
         
         # Run the analysis
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            analysis_result = loop.run_until_complete(run_analysis_with_tracking())
-        finally:
-            loop.close()
+        progress = AsyncProgressTracker(tracker)
+        analysis_result = _run_async(progress.run(run_analysis_with_tracking()))
         
         # ===== Step 8: Generate HTML =====
         tracker.start_step('html_gen')
@@ -1298,7 +1751,7 @@ def generate_tracxn_report(self, report_id, user_id):
         # Save analysis sections to database
         section_order = 0
         
-        # Save Flash Analysis (Dual-Write: DB + S3)
+        # Save Flash Analysis (S3 copy was saved when it was generated)
         if analysis_result.get('flash_analysis'):
             ReportAnalysisSection.objects.create(
                 report=report,
@@ -1307,23 +1760,11 @@ def generate_tracxn_report(self, report_id, user_id):
                 order=section_order
             )
             section_order += 1
-            
-            if getattr(settings, 'USE_S3', False):
-                try:
-                    org_id = str(project.organization_id) if project.organization_id else 'default'
-                    report_storage.save_analysis_section(
-                        project_id=str(project.id),
-                        org_id=org_id,
-                        version=report.current_version + 1,
-                        section_type='flash_analysis',
-                        content=analysis_result['flash_analysis'],
-                        report_type='tracxn'
-                    )
-                except Exception as e:
-                    logger.warning(f"S3 flash analysis save failed: {e}")
         
-        # Save Company Deep Dive Reports (Dual-Write: DB + S3)
+        # Save Company Deep Dive Reports (failed ones only appear in the HTML)
         for report_item in analysis_result.get('company_reports', []):
+            if report_item.get('failed'):
+                continue
             ReportAnalysisSection.objects.create(
                 report=report,
                 section_type='company_deep_dive',
@@ -1332,23 +1773,8 @@ def generate_tracxn_report(self, report_id, user_id):
                 order=section_order
             )
             section_order += 1
-            
-            if getattr(settings, 'USE_S3', False):
-                try:
-                    org_id = str(project.organization_id) if project.organization_id else 'default'
-                    report_storage.save_analysis_section(
-                        project_id=str(project.id),
-                        org_id=org_id,
-                        version=report.current_version + 1,
-                        section_type='company_deep_dive',
-                        content=report_item['content'],
-                        company_name=report_item['company_name'],
-                        report_type='tracxn'
-                    )
-                except Exception as e:
-                    logger.warning(f"S3 company deep dive save failed for {report_item['company_name']}: {e}")
         
-        # Save Executive Summary (Dual-Write: DB + S3)
+        # Save Executive Summary
         if analysis_result.get('executive_summary'):
             ReportAnalysisSection.objects.create(
                 report=report,
@@ -1357,20 +1783,6 @@ def generate_tracxn_report(self, report_id, user_id):
                 order=section_order
             )
             section_order += 1
-            
-            if getattr(settings, 'USE_S3', False):
-                try:
-                    org_id = str(project.organization_id) if project.organization_id else 'default'
-                    report_storage.save_analysis_summary(
-                        project_id=str(project.id),
-                        org_id=org_id,
-                        version=report.current_version + 1,
-                        summary_type='executive_summary',
-                        content=analysis_result['executive_summary'],
-                        report_type='tracxn'
-                    )
-                except Exception as e:
-                    logger.warning(f"S3 executive summary save failed: {e}")
         
         # Save to S3 if enabled
         if getattr(settings, 'USE_S3', False):
@@ -1402,6 +1814,7 @@ def generate_tracxn_report(self, report_id, user_id):
         
         # Finalize report
         report.status = 'completed'
+        report.checkpoint = {}  # Version is complete
         report.progress = 100
         report.current_step = 'Complete!'
         report.html_content = html_content
@@ -1442,23 +1855,118 @@ def generate_tracxn_report(self, report_id, user_id):
         
         logger.info(f"✅ Tracxn report generated for project {project.id} with {section_order} sections")
         return {"status": "success", "version": report.current_version, "sections": section_order}
-        
+    
     except Exception as e:
-        logger.error(f"❌ Failed to generate Tracxn report: {e}")
-        if report:
-            report.status = 'failed'
-            report.error_message = str(e)
-            report.save()
-            if tracker:
-                from .models import ReportProgressStep
-                running_step = ReportProgressStep.objects.filter(
-                    report=report, status='running'
-                ).first()
-                if running_step:
-                    tracker.fail_step(running_step.step_key, str(e))
+        _fail_report(report, tracker, e, 'Tracxn')
         raise
 
 
+def _resume_tracxn_report(report_id, state, status_data):
+    """Continue a Tracxn report whose parked search has finished."""
+    from .models import Report
+    from .progress_tracker import ReportProgressTracker
+    from apps.users.models import User
+    from services.scrapers.tracxn_scraper import tracxn_scraper
+    
+    report = Report.objects.get(id=report_id)
+    user = User.objects.get(id=state['user_id'])
+    tracker = ReportProgressTracker(report)
+    try:
+        result, search_error = tracxn_scraper.search_result(status_data), None
+    except Exception as e:
+        result, search_error = {}, e
+    return _finish_tracxn_report(
+        report, user, tracker, state['keywords'], state['target_description'], result, search_error
+    )
+
+
+# Parked stage -> continuation(report_id, pipeline_state, orchestrator task status)
+REMOTE_STAGES = {
+    'crunchbase_search': _resume_crunchbase_report,
+    'tracxn_search': _resume_tracxn_report,
+    'social_search': _resume_social_search,
+}
+
+
+@shared_task(queue='reports', ignore_result=True)
+@close_db_wrapper
+def resume_report_stage(report_id, task_id):
+    """
+    Resume a parked report if the orchestrator task it waits on has finished.
+    
+    Enqueued by the status-update view when the orchestrator reports the task
+    terminal, once on parking and by sweep_parked_reports. While the task is
+    still running this is a no-op; once it is terminal (or the report's
+    deadline passes) the parked stage is claimed and its continuation runs
+    in this worker.
+    """
+    from .models import Report
+    from services.orchestrator_client import fetch_task_status, TERMINAL_STATUSES
+    
+    report = Report.objects.filter(id=report_id).only('id', 'pipeline_state').first()
+    state = report.pipeline_state if report else {}
+    if state.get('task_id') != task_id:
+        # Report restarted, deleted or already resumed
+        return None
+    
+    try:
+        status_data = fetch_task_status(task_id)
+        if status_data is None:
+            status_data = {"status": "failed", "error": "Task not found on orchestrator"}
+    except Exception as e:
+        logger.warning(f"Could not poll orchestrator task {task_id}: {e}")
+        status_data = {"status": "unknown"}
+    
+    if status_data.get('status') not in TERMINAL_STATUSES:
+        if time.time() < state.get('deadline', 0):
+            return None
+        status_data = {"status": "failed", "error": f"Timed out waiting for task {task_id}"}
+    
+    # Claim the stage so a duplicate trigger cannot resume it twice
+    claimed = Report.objects.filter(id=report_id, pipeline_state__task_id=task_id).update(pipeline_state={})
+    if not claimed:
+        return None
+    
+    logger.info(f"▶️ Resuming report {report_id} at {state['stage']} (task {task_id} {status_data.get('status')})")
+    try:
+        return REMOTE_STAGES[state['stage']](report_id, state, status_data)
+    except Exception as e:
+        # Continuations mark the report failed themselves; never leave it running
+        Report.objects.filter(id=report_id, status='running').update(status='failed', error_message=str(e))
+        raise
+
+
+@shared_task(queue='reports', ignore_result=True)
+@close_db_wrapper
+def sweep_parked_reports():
+    """
+    Safety net for parked reports whose resume trigger was lost (Celery beat).
+    
+    Remote stages are normally resumed by the orchestrator's task_terminal
+    status update; if that update is dropped the report would stay running
+    forever, so every parked remote stage gets a fresh check here (which
+    resumes it if the orchestrator task finished, or fails it past its
+    deadline). A rate-limit pause past its deadline gets its next search
+    submitted. Both are claimed atomically, so a trigger that is merely late
+    cannot run the stage twice.
+    """
+    from .models import Report
+    
+    now = time.time()
+    kicked = 0
+    parked = Report.objects.filter(status='running').exclude(pipeline_state={}).values_list('id', 'pipeline_state')
+    for report_id, state in parked:
+        if state.get('stage') in REMOTE_STAGES and state.get('task_id'):
+            resume_report_stage.delay(str(report_id), state['task_id'])
+        elif state.get('stage') == 'social_pause' and now >= state.get('deadline', 0):
+            continue_social_search.delay(str(report_id), state.get('token'))
+            logger.warning(f"🧹 Re-kicking parked report {report_id} at social_pause (past its deadline)")
+        else:
+            continue
+        kicked += 1
+    return kicked
+
+
 @shared_task(bind=True, queue='reports')
 def generate_pitch_deck(self, report_id, user_id):
     """
@@ -1506,11 +2014,8 @@ def generate_pitch_deck(self, report_id, user_id):
         
         # Generate with AI if available
         if getattr(settings, 'OPENAI_API_KEY', ''):
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            
             try:
-                slides = loop.run_until_complete(
+                slides = _run_async(
                     openai_service.generate_pitch_deck_content(
                         inputs_dict,
                         crunchbase_data,
@@ -1519,8 +2024,6 @@ def generate_pitch_deck(self, report_id, user_id):
                 )
             except Exception as e:
                 logger.warning(f"AI pitch deck generation failed: {e}")
-            finally:
-                loop.close()
         
         # Fallback content if AI fails
         if not slides:
@@ -1653,12 +2156,9 @@ def generate_quick_report(self, report_id, user_id):
         tracker.start_step('api_search')  # Using api_search step key for progress consistency
         tracker.update_step_message('api_search', "Generating comprehensive market research with AI...")
         
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
         try:
             # Call the AI service
-            report_content = loop.run_until_complete(
+            report_content = _run_async(
                 openai_service.chat_completion(
                     messages=[{"role": "user", "content": user_prompt}],
                     system_prompt=system_prompt,
@@ -1677,8 +2177,6 @@ def generate_quick_report(self, report_id, user_id):
             logger.error(f"Quick Report AI generation failed: {e}")
             tracker.fail_step('api_search', str(e))
             raise
-        finally:
-            loop.close()
         
         # ===== Step 3: Parse and Save Sections =====
         tracker.start_step('save')
@@ -1792,12 +2290,12 @@ def generate_verdict_report(self, report_id, user_id):
     Uses VerdictAnalysisPipeline from services/verdict_analysis.py.
     """
     from .models import Report, ReportVersion, ReportAnalysisSection, ReportRawData
-    from .progress_tracker import ReportProgressTracker
+    from .progress_tracker import ReportProgressTracker, AsyncProgressTracker
     from apps.users.models import User
     from services.verdict_analysis import VerdictAnalysisPipeline, generate_verdict_html
+    from services.section_stream import SectionStreamPublisher
     from services.report_storage import report_storage
     from core.storage import storage_service
-    from asgiref.sync import sync_to_async
     import json
     
     report = None
@@ -1908,47 +2406,23 @@ Note: Analysis will be based only on available data sources. Missing data will r
         })
         
         # ===== Run Analysis Pipeline =====
-        # Create async tracker wrapper for pipeline
-        class AsyncTracker:
-            def __init__(self, sync_tracker):
-                self.tracker = sync_tracker
-            
-            async def start_step(self, *args, **kwargs):
-                await sync_to_async(self.tracker.start_step)(*args, **kwargs)
-            
-            async def update_step_message(self, *args, **kwargs):
-                await sync_to_async(self.tracker.update_step_message)(*args, **kwargs)
-            
-            async def add_step_detail(self, *args, **kwargs):
-                await sync_to_async(self.tracker.add_step_detail)(*args, **kwargs)
-            
-            async def complete_step(self, *args, **kwargs):
-                await sync_to_async(self.tracker.complete_step)(*args, **kwargs)
-            
-            async def fail_step(self, *args, **kwargs):
-                await sync_to_async(self.tracker.fail_step)(*args, **kwargs)
-        
-        async_tracker = AsyncTracker(tracker)
+        # Async-native tracker for the pipeline (batches updates per thread hop)
+        async_tracker = AsyncProgressTracker(tracker)
         
         # Initialize and run pipeline
         pipeline = VerdictAnalysisPipeline(
-            project_description=project_description
+            project_description=project_description,
+            section_stream=SectionStreamPublisher(str(project.id), 'verdict', str(report.id))
         )
         
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
-        try:
-            analysis_result = loop.run_until_complete(
-                pipeline.analyze(
-                    crunchbase_data=crunchbase_data,
-                    tracxn_data=tracxn_data,
-                    social_data=social_data,
-                    tracker=async_tracker
-                )
+        analysis_result = _run_async(async_tracker.run(
+            pipeline.analyze(
+                crunchbase_data=crunchbase_data,
+                tracxn_data=tracxn_data,
+                social_data=social_data,
+                tracker=async_tracker
             )
-        finally:
-            loop.close()
+        ))
         
         # Extract results
         scores = analysis_result.get('scores', {})
@@ -0,0 +1,233 @@
+"""
+Tests for parked report pipelines
+Covers how a report waiting on a remote scrape comes back to a Celery worker:
+the atomic claim in resume_report_stage, failing a stage whose orchestrator
+task failed, and the sweeper that re-kicks reports whose resume was lost.
+
+Run from the backend directory:
+    DJANGO_SETTINGS_MODULE=config.settings_test python manage.py test apps.reports
+"""
+
+import time
+from unittest import mock
+
+from django.test import TestCase
+
+from apps.organizations.models import Organization
+from apps.projects.models import Project
+from apps.reports import tasks
+from apps.reports.models import Report, ReportProgressStep
+from apps.reports.progress_tracker import ReportProgressTracker
+from apps.users.models import User
+from core.exceptions import ExternalAPIError
+
+
+TASK_ID = "task-1"
+
+
+class ParkedReportTestCase(TestCase):
+    """A running Crunchbase report with its progress steps, ready to be parked"""
+
+    def setUp(self):
+        self.user = User.objects.create(email="owner@example.com", username="owner", password="x")
+        self.org = Organization.objects.create(name="Acme", slug="acme")
+        self.report = self.make_report()
+
+        # Nothing in these tests may reach a real broker
+        patcher = mock.patch.object(tasks.resume_report_stage, "delay")
+        self.resume_delay = patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(tasks.continue_social_search, "delay")
+        self.continue_delay = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def make_report(self, report_type="crunchbase"):
+        # One report per type and project
+        project = Project.objects.create(organization=self.org, name="Widgets", created_by=self.user)
+        report = Report.objects.create(project=project, report_type=report_type, status="running")
+        ReportProgressTracker(report).initialize_steps()
+        return report
+
+    def park(self, report, stage="crunchbase_search", task_id=TASK_ID, deadline=None, **state):
+        report.pipeline_state = {
+            "stage": stage,
+            "task_id": task_id,
+            "user_id": str(self.user.id),
+            "deadline": time.time() + 3600 if deadline is None else deadline,
+            "keywords": ["widgets"],
+            "target_description": "widget makers",
+            **state,
+        }
+        report.save(update_fields=["pipeline_state", "updated_at"])
+
+    def status(self, task_status, **fields):
+        return mock.patch(
+            "services.orchestrator_client.fetch_task_status",
+            return_value={"status": task_status, **fields},
+        )
+
+
+class TestResumeClaim(ParkedReportTestCase):
+    def test_racing_resumes_run_the_stage_once(self):
+        """Two triggers that both saw the parked state: only the first claim resumes"""
+        self.park(self.report)
+        continuation = mock.Mock(return_value={"status": "success"})
+        results = []
+        racing = []
+
+        def fetch(task_id):
+            # The second trigger reads the same pipeline_state and wins the claim
+            # while the first is still between its read and its claim
+            if not racing:
+                racing.append(task_id)
+                results.append(tasks.resume_report_stage(str(self.report.id), task_id))
+            return {"status": "completed", "result": {}}
+
+        with mock.patch.dict(tasks.REMOTE_STAGES, {"crunchbase_search": continuation}), \
+                mock.patch("services.orchestrator_client.fetch_task_status", side_effect=fetch):
+            results.append(tasks.resume_report_stage(str(self.report.id), TASK_ID))
+
+        self.assertEqual(results, [{"status": "success"}, None])
+        continuation.assert_called_once()
+        report_id, state, status_data = continuation.call_args.args
+        self.assertEqual(report_id, str(self.report.id))
+        self.assertEqual(state["task_id"], TASK_ID)
+        self.assertEqual(status_data["status"], "completed")
+        self.report.refresh_from_db()
+        self.assertEqual(self.report.pipeline_state, {})
+
+    def test_resume_for_another_task_is_ignored(self):
+        """A trigger for a task the report no longer waits on does nothing"""
+        self.park(self.report, task_id="task-2")
+        continuation = mock.Mock()
+
+        with mock.patch.dict(tasks.REMOTE_STAGES, {"crunchbase_search": continuation}), \
+                self.status("completed") as fetch:
+            self.assertIsNone(tasks.resume_report_stage(str(self.report.id), TASK_ID))
+
+        fetch.assert_not_called()
+        continuation.assert_not_called()
+        self.report.refresh_from_db()
+        self.assertEqual(self.report.pipeline_state["task_id"], "task-2")
+
+    def test_running_task_stays_parked(self):
+        """Before the deadline a task still running leaves the report parked"""
+        self.park(self.report)
+        continuation = mock.Mock()
+
+        with mock.patch.dict(tasks.REMOTE_STAGES, {"crunchbase_search": continuation}), \
+                self.status("running"):
+            self.assertIsNone(tasks.resume_report_stage(str(self.report.id), TASK_ID))
+
+        continuation.assert_not_called()
+        self.report.refresh_from_db()
+        self.assertEqual(self.report.pipeline_state["task_id"], TASK_ID)
+        self.assertEqual(self.report.status, "running")
+
+
+class TestFailedRemoteTask(ParkedReportTestCase):
+    def assert_failed_not_parked(self):
+        self.report.refresh_from_db()
+        self.assertEqual(self.report.status, "failed")
+        self.assertEqual(self.report.pipeline_state, {})
+        self.assertEqual(
+            ReportProgressStep.objects.get(report=self.report, step_key="api_search").status, "failed"
+        )
+        self.assertFalse(
+            ReportProgressStep.objects.filter(report=self.report, status="running").exists()
+        )
+        self.resume_delay.assert_not_called()
+
+    def test_failed_and_cancelled_tasks_fail_the_search(self):
+        for task_status in ("failed", "cancelled"):
+            with self.subTest(task_status=task_status):
+                self.report = self.make_report()
+                self.park(self.report)
+                self.resume_delay.reset_mock()
+
+                with self.status(task_status, error="scraper crashed"), self.assertRaises(Exception):
+                    tasks.resume_report_stage(str(self.report.id), TASK_ID)
+
+                self.assert_failed_not_parked()
+                self.assertIn(
+                    "scraper crashed",
+                    ReportProgressStep.objects.get(report=self.report, step_key="api_search").error_message,
+                )
+
+    def test_unknown_task_fails_the_search(self):
+        """A task the orchestrator no longer knows is treated as failed"""
+        self.park(self.report)
+
+        with mock.patch("services.orchestrator_client.fetch_task_status", return_value=None), \
+                self.assertRaises(Exception):
+            tasks.resume_report_stage(str(self.report.id), TASK_ID)
+
+        self.assert_failed_not_parked()
+
+    def test_running_task_past_deadline_fails_the_search(self):
+        self.park(self.report, deadline=time.time() - 1)
+
+        with self.status("running"), self.assertRaises(Exception):
+            tasks.resume_report_stage(str(self.report.id), TASK_ID)
+
+        self.assert_failed_not_parked()
+        self.assertIn(
+            "Timed out",
+            ReportProgressStep.objects.get(report=self.report, step_key="api_search").error_message,
+        )
+
+    def test_search_result_raises_for_failed_status(self):
+        from services.scrapers.crunchbase_scraper import crunchbase_scraper
+
+        for task_status in ("failed", "cancelled"):
+            with self.subTest(task_status=task_status), self.assertRaises(ExternalAPIError):
+                crunchbase_scraper.search_result({"status": task_status, "error": "boom"})
+
+
+class TestSweepParkedReports(ParkedReportTestCase):
+    def test_requeues_lost_remote_resume(self):
+        """Every parked remote stage gets a fresh resume check"""
+        self.park(self.report)
+
+        self.assertEqual(tasks.sweep_parked_reports(), 1)
+
+        self.resume_delay.assert_called_once_with(str(self.report.id), TASK_ID)
+        self.continue_delay.assert_not_called()
+
+    def test_requeues_expired_social_pause_only(self):
+        """A rate-limit pause is re-kicked past its deadline and left alone before it"""
+        lost = self.make_report("social")
+        self.park(lost, stage="social_pause", task_id=None, token="lost", deadline=time.time() - 1)
+        fresh = self.make_report("social")
+        self.park(fresh, stage="social_pause", task_id=None, token="fresh")
+
+        self.assertEqual(tasks.sweep_parked_reports(), 1)
+
+        self.continue_delay.assert_called_once_with(str(lost.id), "lost")
+        self.resume_delay.assert_not_called()
+
+    def test_ignores_unparked_and_finished_reports(self):
+        """Running reports that are not parked, and finished ones, are left alone"""
+        finished = self.make_report()
+        self.park(finished)
+        finished.status = "completed"
+        finished.save(update_fields=["status"])
+
+        self.assertEqual(tasks.sweep_parked_reports(), 0)
+
+        self.resume_delay.assert_not_called()
+        self.continue_delay.assert_not_called()
+
+    def test_requeued_resume_of_finished_task_resumes_once(self):
+        """The sweeper's re-kick and a late completion update cannot both resume"""
+        self.park(self.report)
+        continuation = mock.Mock(return_value={"status": "success"})
+        tasks.sweep_parked_reports()
+        (report_id, task_id), _ = self.resume_delay.call_args
+
+        with mock.patch.dict(tasks.REMOTE_STAGES, {"crunchbase_search": continuation}), \
+                self.status("completed", result={}):
+            tasks.resume_report_stage(report_id, task_id)
+            tasks.resume_report_stage(report_id, task_id)
+
+        continuation.assert_called_once()
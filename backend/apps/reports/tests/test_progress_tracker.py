@@ -0,0 +1,272 @@
+"""
+Tests for the report progress tracker
+Runs ReportProgressTracker against fakeredis (with Lua scripting, for the
+broadcast lock) to cover the write-behind buffer, detail sequencing and the
+report_progress_delta protocol, including a client resync.
+
+Run from the backend directory:
+    DJANGO_SETTINGS_MODULE=config.settings_test python manage.py test apps.reports
+"""
+
+import json
+from unittest import mock
+
+import fakeredis
+from asgiref.sync import async_to_sync
+from django.test import TestCase
+
+from apps.chat.consumers import ChatConsumer
+from apps.organizations.models import Organization
+from apps.projects.models import Project
+from apps.reports.models import Report, ReportProgressStep
+from apps.reports.progress_tracker import MAX_STEP_DETAILS, ReportProgressTracker, _ProgressBuffer
+from apps.users.models import User
+
+
+class ProgressTrackerTestCase(TestCase):
+    """A running Crunchbase report, a fresh Redis and a recording channel layer"""
+
+    def setUp(self):
+        user = User.objects.create(email="owner@example.com", username="owner", password="x")
+        org = Organization.objects.create(name="Acme", slug="acme")
+        project = Project.objects.create(organization=org, name="Widgets", created_by=user)
+        self.report = Report.objects.create(project=project, report_type="crunchbase", status="running")
+
+        self.redis = fakeredis.FakeRedis(server=fakeredis.FakeServer())
+        patcher = mock.patch("django_redis.get_redis_connection", return_value=self.redis)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.events = []
+        self.channel_layer = mock.Mock()
+        self.channel_layer.group_send = mock.AsyncMock(side_effect=lambda group, event: self.events.append(event))
+
+    def tracker(self, **kwargs):
+        tracker = ReportProgressTracker(self.report, **kwargs)
+        tracker._channel_layer = self.channel_layer
+        self.addCleanup(lambda: tracker._timer and tracker._timer.cancel())
+        return tracker
+
+    def step(self, step_key="api_search"):
+        return ReportProgressStep.objects.get(report=self.report, step_key=step_key)
+
+    def pending(self):
+        return self.redis.llen(_ProgressBuffer(str(self.report.id)).key)
+
+
+class TestWriteBehindBuffer(ProgressTrackerTestCase):
+    def setUp(self):
+        super().setUp()
+        # Long enough that no trailing flush fires during a test
+        self.writer = self.tracker(write_behind=True, flush_interval_ms=60_000)
+        self.writer.initialize_steps()
+        self.writer.start_step("api_search")
+
+    def test_updates_within_interval_are_buffered_in_redis(self):
+        for i in range(5):
+            self.writer.add_step_detail("api_search", "search_result", f"keyword {i}")
+
+        # The first update claims the flush slot; the rest wait for the next flush
+        self.assertEqual([d["message"] for d in self.step().details], ["keyword 0"])
+        self.assertEqual(self.pending(), 4)
+        events_before = len(self.events)
+
+        self.assertTrue(self.writer.flush())
+
+        step = self.step()
+        self.assertEqual([d["message"] for d in step.details], [f"keyword {i}" for i in range(5)])
+        self.assertEqual([d["seq"] for d in step.details], [1, 2, 3, 4, 5])
+        self.assertEqual(step.detail_seq, 5)
+        self.assertEqual(self.pending(), 0)
+        self.assertEqual(len(self.events), events_before + 1)  # One broadcast per flush
+
+    def test_flush_with_nothing_pending_is_a_noop(self):
+        events_before = len(self.events)
+        self.assertFalse(self.writer.flush())
+        self.assertEqual(len(self.events), events_before)
+
+    def test_writers_share_one_queue(self):
+        """Details queued by the task and by a status update land in queue order"""
+        self.writer.add_step_detail("api_search", "search_result", "claimed the flush")
+        self.writer.add_step_detail("api_search", "search_result", "from the task")
+        other = self.tracker(write_behind=True, flush_interval_ms=60_000)
+
+        other.add_step_details([
+            {"step_key": "api_search", "message": "from the scraper 1"},
+            {"step_key": "api_search", "detail_type": "keyword", "message": "from the scraper 2"},
+        ])
+
+        step = self.step()
+        self.assertEqual(
+            [(d["seq"], d["type"], d["message"]) for d in step.details],
+            [
+                (1, "search_result", "claimed the flush"),
+                (2, "search_result", "from the task"),
+                (3, "status", "from the scraper 1"),
+                (4, "keyword", "from the scraper 2"),
+            ],
+        )
+        self.assertEqual(self.pending(), 0)
+
+    def test_messages_and_progress_fold_into_one_write(self):
+        self.writer.update_step_message("api_search", "claimed the flush")
+        self.writer.update_step_message("api_search", "Searching 1/3", progress_percent=10)
+        self.writer.update_step_message("api_search", "Searching 3/3", progress_percent=90)
+        self.writer.update_step_progress("api_search", 150)
+
+        self.writer.flush()
+
+        step = self.step()
+        self.assertEqual(step.step_description, "Searching 3/3")
+        self.assertEqual(step.progress_percent, 100)
+        self.report.refresh_from_db()
+        self.assertEqual(self.report.current_step, "Searching 3/3")
+
+    def test_lifecycle_change_flushes_pending_updates_first(self):
+        self.writer.add_step_detail("api_search", "search_result", "claimed the flush")
+        self.writer.add_step_detail("api_search", "search_result", "pending")
+
+        self.writer.complete_step("api_search", {"companies_found": 2})
+
+        step = self.step()
+        self.assertEqual(step.status, "completed")
+        self.assertEqual([d["message"] for d in step.details], ["claimed the flush", "pending"])
+        self.assertEqual(self.pending(), 0)
+
+    def test_detail_seq_keeps_counting_past_the_details_cap(self):
+        extra = 5
+        self.writer.add_step_details([
+            {"step_key": "api_search", "message": f"detail {i}"}
+            for i in range(MAX_STEP_DETAILS + extra)
+        ])
+
+        step = self.step()
+        self.assertEqual(len(step.details), MAX_STEP_DETAILS)
+        self.assertEqual(step.detail_seq, MAX_STEP_DETAILS + extra)
+        self.assertEqual(
+            [d["seq"] for d in step.details],
+            list(range(extra + 1, MAX_STEP_DETAILS + extra + 1)),
+        )
+
+    def test_initialize_drops_pending_updates_of_previous_run(self):
+        self.writer.add_step_detail("api_search", "search_result", "claimed the flush")
+        self.writer.add_step_detail("api_search", "search_result", "stale")
+
+        self.writer.initialize_steps()
+
+        self.assertEqual(self.pending(), 0)
+        self.assertEqual(self.step().details, [])
+
+
+class TestDeltaProtocol(ProgressTrackerTestCase):
+    def setUp(self):
+        super().setUp()
+        self.writer = self.tracker(write_behind=False)
+        self.writer.initialize_steps()
+
+    def assert_consecutive(self):
+        self.assertEqual([e["seq"] for e in self.events], list(range(1, len(self.events) + 1)))
+
+    def test_first_event_after_initialize_is_a_full_reset(self):
+        event = self.events[-1]
+        self.assertEqual(event["type"], "report_progress_delta")
+        self.assertEqual(event["seq"], 1)
+        self.assertTrue(event["reset"])
+        self.assertEqual(len(event["steps"]), len(self.writer.steps_config))
+        self.assertIn("time_estimate", event)
+
+    def test_consecutive_deltas_carry_only_new_details(self):
+        self.writer.start_step("api_search")
+        started = self.events[-1]
+        self.assertFalse(started["reset"])
+        self.assertEqual([s["step_key"] for s in started["steps"]], ["api_search"])
+        self.assertEqual(started["steps"][0]["status"], "running")
+        self.assertEqual(started["step_key"], "api_search")
+
+        self.writer.add_step_detail("api_search", "search_result", "first")
+        self.writer.add_step_details([
+            {"step_key": "api_search", "message": "second"},
+            {"step_key": "api_search", "message": "third"},
+        ])
+
+        first, batch = self.events[-2:]
+        self.assertEqual(batch["seq"], first["seq"] + 1)
+        self.assertFalse(first["reset"] or batch["reset"])
+        self.assertEqual([d["message"] for d in first["steps"][0]["new_details"]], ["first"])
+        self.assertEqual([d["message"] for d in batch["steps"][0]["new_details"]], ["second", "third"])
+        self.assertEqual([d["seq"] for d in batch["steps"][0]["new_details"]], [2, 3])
+        self.assertNotIn("details_reset", batch["steps"][0])
+        self.assertNotIn("time_estimate", batch)  # No step changed status
+        self.assert_consecutive()
+
+    def test_unchanged_state_sends_nothing(self):
+        self.writer.start_step("api_search")
+        count = len(self.events)
+
+        self.writer._broadcast_update()
+
+        self.assertEqual(len(self.events), count)
+
+    def test_trackers_of_one_report_share_the_sequence(self):
+        """The Celery task and a status update request broadcast one sequence"""
+        other = self.tracker(write_behind=False)
+        self.writer.start_step("api_search")
+        other.add_step_detail("api_search", "search_result", "from the scraper")
+        self.writer.add_step_detail("api_search", "search_result", "from the task")
+
+        self.assert_consecutive()
+        self.assertEqual(
+            [d["message"] for e in self.events[-2:] for d in e["steps"][0]["new_details"]],
+            ["from the scraper", "from the task"],
+        )
+
+    def test_cleared_details_are_resent_whole(self):
+        self.writer.start_step("api_search")
+        self.writer.add_step_detail("api_search", "search_result", "old")
+        self.writer.clear_step_details("api_search")
+
+        self.writer.add_step_detail("api_search", "search_result", "new")
+
+        delta = self.events[-1]["steps"][0]
+        self.assertTrue(delta["details_reset"])
+        self.assertEqual([d["message"] for d in delta["new_details"]], ["new"])
+        self.assert_consecutive()
+
+    def test_snapshot_matches_the_last_delta(self):
+        self.writer.start_step("api_search")
+        for i in range(3):
+            self.writer.add_step_detail("api_search", "search_result", f"keyword {i}")
+
+        snapshot = self.writer.get_progress_snapshot()
+
+        self.assertEqual(snapshot["seq"], self.events[-1]["seq"])
+        self.assertEqual(len(snapshot["steps"]), len(self.writer.steps_config))
+        api_search = next(s for s in snapshot["steps"] if s["step_key"] == "api_search")
+        self.assertEqual([d["seq"] for d in api_search["details"]], [1, 2, 3])
+
+        # The next delta follows the snapshot's seq
+        self.writer.add_step_detail("api_search", "search_result", "after snapshot")
+        self.assertEqual(self.events[-1]["seq"], snapshot["seq"] + 1)
+        self.assertEqual(
+            [d["message"] for d in self.events[-1]["steps"][0]["new_details"]], ["after snapshot"]
+        )
+
+    def test_resync_sends_a_full_snapshot_with_reset(self):
+        self.writer.start_step("api_search")
+        self.writer.add_step_detail("api_search", "search_result", "keyword 0")
+
+        consumer = ChatConsumer()
+        consumer.project_id = str(self.report.project_id)
+        consumer.send = mock.AsyncMock()
+        async_to_sync(consumer.receive)(json.dumps({"type": "progress_resync", "report_id": str(self.report.id)}))
+
+        consumer.send.assert_awaited_once()
+        message = json.loads(consumer.send.await_args.kwargs["text_data"])
+        self.assertEqual(message["type"], "report_progress")
+        self.assertTrue(message["snapshot"])
+        self.assertTrue(message["reset"])
+        self.assertEqual(message["report_id"], str(self.report.id))
+        self.assertEqual(message["seq"], self.events[-1]["seq"])
+        self.assertEqual(len(message["steps"]), len(self.writer.steps_config))
+        api_search = next(s for s in message["steps"] if s["step_key"] == "api_search")
+        self.assertEqual([d["message"] for d in api_search["details"]], ["keyword 0"])
@@ -23,6 +23,12 @@ urlpatterns = [
     path('project/<uuid:project_id>/<uuid:pk>/sections/', views.ReportViewSet.as_view({
         'get': 'sections',
     }), name='report-sections'),
+    path('project/<uuid:project_id>/<uuid:pk>/sections/file/', views.ReportViewSet.as_view({
+        'get': 'section_file',
+    }), name='report-section-file'),
+    path('project/<uuid:project_id>/<uuid:pk>/queue/', views.ReportViewSet.as_view({
+        'get': 'queue',
+    }), name='report-queue'),
     path('project/<uuid:project_id>/<uuid:pk>/download-markdown/', views.ReportViewSet.as_view({
         'get': 'download_markdown',
     }), name='report-download-markdown'),
@@ -34,5 +40,7 @@ urlpatterns = [
     }), name='report-restart'),
     # Internal API for crunchbase_api container to send status updates
     path('status-update/', views.StatusUpdateView.as_view(), name='report-status-update'),
+    # Bulk variant (JSON array) used by the orchestrator status relay
+    path('status-update/bulk/', views.StatusUpdateView.as_view(), name='report-status-update-bulk'),
 ]
 
@@ -6,13 +6,16 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.views import APIView
+from django.core.exceptions import ValidationError
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 import logging
+import time
+import uuid
 
 from .models import Report, ReportVersion
 from .serializers import ReportSerializer, ReportListSerializer, ReportVersionSerializer
-from .tasks import generate_crunchbase_report, generate_tracxn_report, generate_social_report, generate_pitch_deck, generate_quick_report, generate_verdict_report
+from .tasks import generate_crunchbase_report, generate_tracxn_report, generate_social_report, generate_pitch_deck, generate_quick_report, generate_verdict_report, resume_report_stage
 from .progress_tracker import ReportProgressTracker
 from apps.projects.models import Project
 
@@ -205,9 +208,11 @@ class ReportViewSet(viewsets.ReadOnlyModelViewSet):
     @action(detail=True, methods=['post'])
     def restart(self, request, project_id=None, pk=None):
         """
-        Restart a completed/failed report.
+        Restart a completed/failed report (or one parked past its deadline).
         - Clears progress steps and analysis sections (not versions)
-        - Resets status and starts a fresh generation
+        - Resets status and starts a new generation
+        - A failed run's checkpointed steps (search results, finished
+          sections) are reused if the project inputs are unchanged
         - The new report will become a new version when complete
         """
         from .models import ReportProgressStep, ReportAnalysisSection
@@ -215,8 +220,14 @@ class ReportViewSet(viewsets.ReadOnlyModelViewSet):
         report = self.get_object()
         project = report.project
         
-        # Only allow restart on completed or failed reports
-        if report.status not in ['completed', 'failed']:
+        # Only allow restart on completed or failed reports, or on a report
+        # still waiting on a remote stage whose deadline has passed
+        stalled = (
+            report.status == 'running'
+            and bool(report.pipeline_state)
+            and time.time() >= report.pipeline_state.get('deadline', 0)
+        )
+        if report.status not in ['completed', 'failed'] and not stalled:
             return Response(
                 {"error": f"Cannot restart a report with status '{report.status}'. Report must be completed or failed."},
                 status=status.HTTP_400_BAD_REQUEST
@@ -245,6 +256,7 @@ class ReportViewSet(viewsets.ReadOnlyModelViewSet):
         report.started_at = timezone.now()
         report.completed_at = None
         report.inputs_hash = project.inputs.get_inputs_hash()
+        report.pipeline_state = {}  # Orphan any parked stage of the old run
         # Note: Don't reset current_version - it will be incremented when new version is saved
         report.save()
         
@@ -262,10 +274,18 @@ class ReportViewSet(viewsets.ReadOnlyModelViewSet):
         if task:
             task.delay(str(report.id), str(request.user.id))
         
+        # Steps the new run can skip (see tasks._open_checkpoint)
+        checkpoint = report.checkpoint or {}
+        reusable = (
+            checkpoint.get('version') == report.current_version + 1
+            and checkpoint.get('inputs_hash') == report.inputs_hash
+        )
+        
         return Response({
             "message": f"{report.get_report_type_display()} restart initiated",
             "report_id": str(report.id),
-            "previous_version": report.current_version
+            "previous_version": report.current_version,
+            "checkpointed_steps": list(checkpoint.get('steps', {})) if reusable else []
         })
     
     def _get_sections_with_fallback(self, report, version=None):
@@ -404,6 +424,70 @@ class ReportViewSet(viewsets.ReadOnlyModelViewSet):
             logger.error(f"❌ Error fetching sections: {e}")
             return Response({"error": str(e), "sections": []})
 
+    @action(detail=True, methods=['get'], url_path='sections/file')
+    def section_file(self, request, project_id=None, pk=None):
+        """
+        Get one stored file of a report version, e.g.
+        ?path=analysis/summaries/swot_summary.json (optional 'version').
+        Served by a range GET on the version bundle when there is one.
+        """
+        from services.report_storage import report_storage
+
+        report = self.get_object()
+        project = report.project
+        org_id = str(project.organization_id) if project.organization_id else 'default'
+
+        file_path = request.query_params.get('path', '')
+        if not file_path.endswith('.json') or '..' in file_path or not (
+            file_path == 'metadata.json' or file_path.startswith('analysis/')
+        ):
+            return Response(
+                {"error": "Invalid file path"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            version = int(request.query_params.get('version', report.current_version))
+        except ValueError:
+            return Response(
+                {"error": "Invalid version number"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            data = report_storage.get_section_file(
+                project_id=str(project.id),
+                org_id=org_id,
+                report_type=report.report_type,
+                version=version,
+                file_path=file_path
+            )
+        except Exception as e:
+            logger.error(f"❌ Error fetching {file_path} for report {report.id}: {e}")
+            return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+        if data is None:
+            return Response(
+                {"error": f"{file_path} not found for version {version}"},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        return Response({'version': version, 'path': file_path, 'data': data})
+
+    @action(detail=True, methods=['get'])
+    def queue(self, request, project_id=None, pk=None):
+        """
+        Queue positions and estimated waits of the report's unfinished
+        orchestrator tasks (empty when the report is not running).
+        """
+        from django.conf import settings
+        from services.orchestrator_client import fetch_report_queue
+
+        report = self.get_object()
+        tasks = []
+        if report.status == 'running' and getattr(settings, 'USE_ORCHESTRATOR', False):
+            tasks = fetch_report_queue(str(report.id))
+        return Response({'report_id': str(report.id), 'tasks': tasks})
+
     @action(detail=True, methods=['get'], url_path='download-markdown')
     def download_markdown(self, request, project_id=None, pk=None):
         """
@@ -558,10 +642,17 @@ class StatusUpdateView(APIView):
     throttle_classes = [ScopedRateThrottle]
     throttle_scope = 'status_updates'
     
+    # Sent by the orchestrator when a report's task finishes; resumes a
+    # report parked on that task instead of being shown as progress
+    TASK_TERMINAL_DETAIL_TYPE = 'task_terminal'
+    
     def post(self, request):
         """
         Receive status update from crunchbase_api and forward to WebSocket.
         
+        A JSON array of updates (as sent by the orchestrator's status relay
+        to status-update/bulk/) is applied in bulk, see _post_bulk.
+        
         Expected payload:
         {
             "report_id": "uuid",
@@ -571,6 +662,9 @@ class StatusUpdateView(APIView):
             "data": {"keyword": "keyword", "count": 20}  # optional
         }
         """
+        if isinstance(request.data, list):
+            return self._post_bulk(request.data)
+        
         report_id = request.data.get('report_id')
         step_key = request.data.get('step_key')
         detail_type = request.data.get('detail_type')
@@ -583,6 +677,10 @@ class StatusUpdateView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
+        if detail_type == self.TASK_TERMINAL_DETAIL_TYPE:
+            self._resume_parked(report_id, data)
+            return Response({"status": "ok"})
+        
         try:
             report = Report.objects.get(id=report_id)
             tracker = ReportProgressTracker(report)
@@ -590,7 +688,7 @@ class StatusUpdateView(APIView):
             # Add the detail to the appropriate step
             tracker.add_step_detail(step_key, detail_type or 'status', message, data)
             
-            logger.info(f"📡 Status update received for report {report_id}: {message[:50]}...")
+            logger.debug(f"📡 Status update received for report {report_id}: {message[:50]}...")
             return Response({"status": "ok"})
             
         except Report.DoesNotExist:
@@ -605,3 +703,78 @@ class StatusUpdateView(APIView):
                 {"error": str(e)},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
+    
+    def _post_bulk(self, updates):
+        """
+        Apply a batch of status updates.
+        
+        Updates are grouped by report; each report's details are written in
+        one transaction and broadcast once. Unknown reports and malformed
+        items are skipped (and reported back) rather than failing the batch,
+        so the relay never retries them.
+        """
+        by_report = {}
+        invalid = 0
+        resumed = 0
+        for update in updates:
+            if not isinstance(update, dict) or not update.get('step_key') or not update.get('message'):
+                invalid += 1
+                continue
+            try:
+                report_id = str(uuid.UUID(str(update.get('report_id'))))
+            except ValueError:
+                invalid += 1
+                continue
+            if update.get('detail_type') == self.TASK_TERMINAL_DETAIL_TYPE:
+                resumed += self._resume_parked(report_id, update.get('data'))
+                continue
+            by_report.setdefault(report_id, []).append(update)
+        
+        reports = {str(r.id): r for r in Report.objects.filter(id__in=list(by_report))}
+        missing = [report_id for report_id in by_report if report_id not in reports]
+        applied = 0
+        errors = 0
+        
+        for report_id, report_updates in by_report.items():
+            report = reports.get(report_id)
+            if report is None:
+                continue
+            try:
+                ReportProgressTracker(report).add_step_details(report_updates)
+                applied += len(report_updates)
+            except Exception as e:
+                errors += len(report_updates)
+                logger.error(f"❌ Bulk status update error for report {report_id}: {e}")
+        
+        if missing:
+            logger.warning(f"⚠️ Bulk status update: reports not found: {', '.join(missing)}")
+        logger.info(f"📡 Bulk status update: {applied} applied across {len(reports)} reports")
+        
+        return Response({
+            "status": "ok",
+            "applied": applied,
+            "invalid": invalid,
+            "errors": errors,
+            "resumed": resumed,
+            "missing_reports": missing,
+        })
+    
+    def _resume_parked(self, report_id, data):
+        """
+        Enqueue resume_report_stage if the report is parked on the finished task.
+        
+        Returns 1 if a resume was enqueued, else 0. resume_report_stage claims
+        the stage atomically, so a duplicate update cannot run it twice.
+        """
+        task_id = (data or {}).get('task_id')
+        if not task_id:
+            return 0
+        try:
+            parked = Report.objects.filter(id=report_id, pipeline_state__task_id=task_id).exists()
+        except (ValueError, ValidationError):
+            return 0
+        if not parked:
+            return 0
+        resume_report_stage.delay(str(report_id), task_id)
+        logger.info(f"▶️ Task {task_id} finished, resuming report {report_id}")
+        return 1
@@ -5,7 +5,7 @@ Includes robust database connection management to prevent pool exhaustion.
 
 import os
 from celery import Celery
-from celery.signals import task_prerun, task_postrun, task_failure, worker_process_init
+from celery.signals import task_prerun, task_postrun, task_failure, worker_process_init, worker_process_shutdown
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
@@ -25,6 +25,17 @@ def init_worker_process(**kwargs):
         conn.close()
 
 
+@worker_process_shutdown.connect
+def close_async_runtime(**kwargs):
+    """
+    Close the worker process's persistent event loop and its pooled clients.
+    Tasks share one loop per process (core.async_runtime) so connections are reused.
+    """
+    from core.async_runtime import shutdown
+    from services.llm_gateway import get_llm_gateway
+    shutdown(get_llm_gateway().aclose)
+
+
 @task_prerun.connect
 def close_old_connections_before_task(**kwargs):
     """
@@ -147,8 +147,18 @@ CACHE_TTL = {
     'research_results': 60 * 60 * 24,  # 24 hours
     'company_data': 60 * 60 * 24 * 7,  # 7 days
     'project_data': 60 * 60,  # 1 hour
+    'llm_response': 60 * 60 * 24 * 7,  # 7 days
+    'report_sections': 60 * 60 * 24 * 7,  # 7 days (completed versions never change)
+    'report_tenant': 60 * 10,  # 10 minutes (orchestrator fair-share tenant)
 }
 
+# Concurrent S3 reads when assembling a report's sections (per request)
+REPORT_STORAGE_FETCH_WORKERS = int(os.getenv('REPORT_STORAGE_FETCH_WORKERS', '8'))
+# Analysis sections are written once, as one bundle per version built from the
+# report's section rows. The opt-in journal also uploads each section as its
+# own object as it is generated (crash recovery of a run in progress)
+REPORT_SECTION_JOURNAL = os.getenv('REPORT_SECTION_JOURNAL', 'False').lower() == 'true'
+
 # Use Redis for session storage
 SESSION_ENGINE = 'django.contrib.sessions.backends.cache'
 SESSION_CACHE_ALIAS = 'sessions'
@@ -186,6 +196,19 @@ CELERY_TASK_SOFT_TIME_LIMIT = int(2.5 * 60 * 60)  # 2.5 hours soft limit
 CELERY_WORKER_MAX_TASKS_PER_CHILD = 100  # Restart worker after 100 tasks to release connections
 CELERY_WORKER_PREFETCH_MULTIPLIER = 1  # Don't prefetch tasks, reduces connection holding
 
+# Report pipelines don't hold a worker slot while remote scrapers run: the
+# search is submitted, the report parks its state, and the orchestrator's
+# task_terminal status update resumes it when the search finishes
+REPORT_PIPELINE_NONBLOCKING = os.getenv('REPORT_PIPELINE_NONBLOCKING', 'True').lower() == 'true'
+REPORT_REMOTE_TIMEOUT = int(os.getenv('REPORT_REMOTE_TIMEOUT', str(3 * 60 * 60)))
+# Beat sweep that re-checks parked reports in case their resume update was lost
+REPORT_PARKED_SWEEP_INTERVAL = int(os.getenv('REPORT_PARKED_SWEEP_INTERVAL', '300'))
+
+# Report progress write-behind: buffer detail/message updates in Redis and
+# flush them in one transaction (and one WebSocket broadcast) per interval
+PROGRESS_WRITE_BEHIND = os.getenv('PROGRESS_WRITE_BEHIND', 'True').lower() == 'true'
+PROGRESS_FLUSH_INTERVAL_MS = int(os.getenv('PROGRESS_FLUSH_INTERVAL_MS', '500'))
+
 # Celery Beat scheduled tasks
 CELERY_BEAT_SCHEDULE = {
     'cleanup-expired-tokens': {
@@ -196,6 +219,10 @@ CELERY_BEAT_SCHEDULE = {
         'task': 'apps.audit.tasks.cleanup_old_logs',
         'schedule': 60 * 60 * 24,  # Daily
     },
+    'sweep-parked-reports': {
+        'task': 'apps.reports.tasks.sweep_parked_reports',
+        'schedule': REPORT_PARKED_SWEEP_INTERVAL,
+    },
 }
 
 # =============================================================================
@@ -354,6 +381,23 @@ METIS_API_KEY = os.getenv('METIS_API_KEY', '')
 METIS_BASE_URL = os.getenv('METIS_BASE_URL', 'https://api.metisai.ir/openai/v1')
 METIS_MODEL = os.getenv('METIS_MODEL', 'gpt-4o-mini')
 
+# LLM call limits per provider (in-flight requests and request rate per report run)
+LLM_MAX_CONCURRENCY = int(os.getenv('LLM_MAX_CONCURRENCY', '5'))
+LLM_REQUESTS_PER_MINUTE = int(os.getenv('LLM_REQUESTS_PER_MINUTE', '60'))
+LIARA_MAX_CONCURRENCY = int(os.getenv('LIARA_MAX_CONCURRENCY', LLM_MAX_CONCURRENCY))
+LIARA_REQUESTS_PER_MINUTE = int(os.getenv('LIARA_REQUESTS_PER_MINUTE', LLM_REQUESTS_PER_MINUTE))
+METIS_MAX_CONCURRENCY = int(os.getenv('METIS_MAX_CONCURRENCY', LLM_MAX_CONCURRENCY))
+METIS_REQUESTS_PER_MINUTE = int(os.getenv('METIS_REQUESTS_PER_MINUTE', LLM_REQUESTS_PER_MINUTE))
+OPENAI_MAX_CONCURRENCY = int(os.getenv('OPENAI_MAX_CONCURRENCY', LLM_MAX_CONCURRENCY))
+OPENAI_REQUESTS_PER_MINUTE = int(os.getenv('OPENAI_REQUESTS_PER_MINUTE', LLM_REQUESTS_PER_MINUTE))
+
+# LLM gateway (services/llm_gateway): failover order, retries, pooling, response cache
+LLM_PROVIDER_ORDER = [p.strip() for p in os.getenv('LLM_PROVIDER_ORDER', 'liara,metis,openai').split(',') if p.strip()]
+LLM_MAX_RETRIES = int(os.getenv('LLM_MAX_RETRIES', '3'))
+LLM_TIMEOUT = float(os.getenv('LLM_TIMEOUT', '180'))
+LLM_MAX_CONNECTIONS = int(os.getenv('LLM_MAX_CONNECTIONS', '20'))
+LLM_CACHE_ENABLED = os.getenv('LLM_CACHE_ENABLED', 'True').lower() == 'true'
+
 CRUNCHBASE_API_KEY = os.getenv('CRUNCHBASE_API_KEY', '')
 CRUNCHBASE_API_URL = 'https://api.crunchbase.com/api/v4'
 
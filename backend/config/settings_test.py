@@ -0,0 +1,46 @@
+"""
+Django settings for running the backend test suite.
+
+Runs without PostgreSQL, Redis or MinIO: SQLite database, in-memory caches
+and channel layer, local file storage. Tests that need Redis semantics use
+fakeredis explicitly.
+
+Run from the backend directory:
+    DJANGO_SETTINGS_MODULE=config.settings_test python manage.py test
+"""
+import tempfile
+from pathlib import Path
+
+from .settings import *  # noqa: F401,F403
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': ':memory:',
+    }
+}
+
+CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'tests'},
+    'sessions': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'tests-sessions'},
+}
+
+CHANNEL_LAYERS = {
+    'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'},
+}
+
+USE_S3 = False
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+}
+MEDIA_ROOT = Path(tempfile.mkdtemp(prefix='mn2-test-media-'))
+
+CELERY_TASK_ALWAYS_EAGER = False
+CELERY_BROKER_URL = 'memory://'
+CELERY_RESULT_BACKEND = 'cache+memory://'
+
+PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+# Trackers write through unless a test opts into the write-behind buffer
+PROGRESS_WRITE_BEHIND = False
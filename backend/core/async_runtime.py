@@ -0,0 +1,94 @@
+"""
+Async runtime for synchronous callers (Celery tasks, sync services).
+
+Each thread (in practice: each Celery worker process) keeps one event loop
+for its lifetime instead of creating and closing a loop per call. Clients
+bound to a loop - the LLM gateway's pooled clients, the httpx clients from
+http_client() - therefore keep their connections (and TLS sessions) across
+stages and tasks.
+"""
+import asyncio
+import logging
+import os
+import threading
+import weakref
+from typing import Any, Awaitable, Callable, Dict
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+_local = threading.local()
+# Pooled httpx clients per event loop: {loop: {config key: AsyncClient}}
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, httpx.AsyncClient]]" = weakref.WeakKeyDictionary()
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """The calling thread's persistent event loop (recreated after a fork or close)."""
+    loop = getattr(_local, 'loop', None)
+    if loop is None or loop.is_closed() or _local.pid != os.getpid():
+        loop = asyncio.new_event_loop()
+        _local.loop = loop
+        _local.pid = os.getpid()
+    return loop
+
+
+def run(coro: Awaitable) -> Any:
+    """
+    Run a coroutine to completion on the thread's persistent loop.
+
+    Must be called from synchronous code (no loop running in this thread).
+    """
+    loop = get_loop()
+    asyncio.set_event_loop(loop)
+    return loop.run_until_complete(coro)
+
+
+def http_client(**kwargs) -> httpx.AsyncClient:
+    """
+    Shared httpx.AsyncClient for the running loop.
+
+    Clients are pooled per loop and per configuration (kwargs), so callers
+    with different timeouts get separate pools. Do not close the returned
+    client; shutdown() does.
+    """
+    loop = asyncio.get_running_loop()
+    clients = _clients.setdefault(loop, {})
+    key = repr(sorted(kwargs.items()))
+    client = clients.get(key)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(**kwargs)
+        clients[key] = client
+    return client
+
+
+def shutdown(*closers: Callable[[], Awaitable]):
+    """
+    Close the thread's loop and every client pooled on it.
+
+    Args:
+        closers: Extra async callables to run on the loop first
+            (e.g. the LLM gateway's aclose)
+    """
+    loop = getattr(_local, 'loop', None)
+    if loop is None or loop.is_closed():
+        return
+
+    async def _close():
+        for closer in closers:
+            try:
+                await closer()
+            except Exception as e:
+                logger.debug(f"Async runtime closer failed: {e}")
+        for client in _clients.pop(loop, {}).values():
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.debug(f"Error closing pooled HTTP client: {e}")
+
+    try:
+        loop.run_until_complete(_close())
+        loop.run_until_complete(loop.shutdown_asyncgens())
+    finally:
+        loop.close()
+        _local.loop = None
@@ -116,6 +116,22 @@ class StorageService:
             logger.error(f"Failed to download file from S3: {e}")
             raise
     
+    def download_range(self, key: str, start: int, length: int) -> bytes:
+        """Download `length` bytes of a file from S3, starting at `start`."""
+        if not self.use_s3:
+            return self._download_local(key)[start:start + length]
+        
+        try:
+            response = self.client.get_object(
+                Bucket=self.bucket_name,
+                Key=key,
+                Range=f"bytes={start}-{start + length - 1}"
+            )
+            return response['Body'].read()
+        except ClientError as e:
+            logger.error(f"Failed to download range from S3: {e}")
+            raise
+    
     def delete_file(self, key: str) -> bool:
         """Delete a file from S3."""
         if not self.use_s3:
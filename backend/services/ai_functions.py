@@ -273,15 +273,13 @@ async def generate_crunchbase_params_from_inputs(inputs) -> dict:
         Dict with 'keywords' (list of strings) and 'target_description' (string)
     """
     import json
-    from openai import AsyncOpenAI
-    from django.conf import settings
+    from services.llm_gateway import get_llm_gateway, get_provider_chain
     
-    api_key = getattr(settings, 'OPENAI_API_KEY', None)
-    if not api_key:
-        logger.error("OpenAI API key not configured")
-        return {"keywords": [], "target_description": "", "error": "OpenAI API key not configured"}
+    if not get_provider_chain():
+        logger.error("AI API key not configured")
+        return {"keywords": [], "target_description": "", "error": "AI API key not configured"}
     
-    client = AsyncOpenAI(api_key=api_key)
+    gateway = get_llm_gateway()
     
     # Build context from project inputs
     context = f"""Analyze this startup and generate INDUSTRY-SPECIFIC search keywords for Crunchbase competitive research.
@@ -314,19 +312,20 @@ IMPORTANT RULES:
 5. NEVER use single generic words like "platform", "strategic", "designed", "support", etc."""
 
     try:
-        response = await client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
+        # OpenAI first (OPENAI_MODEL), failing over to the other providers
+        response = await gateway.chat(
+            [
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": context}
             ],
+            provider='openai',
             tools=CRUNCHBASE_TOOLS,
             tool_choice={"type": "function", "function": {"name": "generate_crunchbase_params"}}
         )
         
-        if response.choices and response.choices[0].message.tool_calls:
-            tool_call = response.choices[0].message.tool_calls[0]
-            arguments = json.loads(tool_call.function.arguments)
+        if response.tool_calls:
+            tool_call = response.tool_calls[0]
+            arguments = json.loads(tool_call['arguments'])
             
             keywords = arguments.get("keywords", [])
             target_description = arguments.get("target_description", "")
@@ -8,10 +8,9 @@ import asyncio
 from typing import List, Dict, Any, Optional, Callable
 from datetime import datetime
 
-from openai import AsyncOpenAI
-from django.conf import settings
-
 from .crunchbase_prompts import CrunchbasePromptTemplates
+from .llm_gateway import get_llm_gateway, LLMGatewayError
+from .section_stream import SectionStreamPublisher
 
 logger = logging.getLogger(__name__)
 
@@ -30,7 +29,8 @@ class CrunchbaseAnalysisPipeline:
         self,
         target_market_description: str = "",
         progress_callback: Optional[Callable] = None,
-        model: str = None
+        model: str = None,
+        section_stream: Optional[SectionStreamPublisher] = None
     ):
         """
         Initialize the analysis pipeline.
@@ -39,51 +39,36 @@ class CrunchbaseAnalysisPipeline:
             target_market_description: Context for analysis
             progress_callback: Async function to call with progress updates
             model: Model to use (defaults to LIARA_MODEL)
+            section_stream: Optional publisher for streaming aggregate sections live
         """
         self.target_description = target_market_description
         self.progress_callback = progress_callback
+        self.section_stream = section_stream
         
-        # Use Liara AI (OpenAI-compatible API)
-        api_key = getattr(settings, 'LIARA_API_KEY', None)
-        base_url = getattr(settings, 'LIARA_BASE_URL', None)
-        
-        if not api_key or not base_url:
-            # Fallback to OpenAI if Liara not configured
-            api_key = getattr(settings, 'OPENAI_API_KEY', None)
-            base_url = None
-            self.model = model or "gpt-4o-mini"
-        else:
-            self.model = model or getattr(settings, 'LIARA_MODEL', 'google/gemini-2.5-flash')
-        
-        if not api_key:
-            raise ValueError("No AI API key configured (LIARA_API_KEY or OPENAI_API_KEY)")
+        # Model override for the primary provider; the gateway picks provider defaults otherwise
+        self.model = model
+        self.gateway = get_llm_gateway()
         
         # Initialize prompts
         self.prompts = CrunchbasePromptTemplates(target_market_description)
-        
-        # Initialize client with appropriate base URL
-        if base_url:
-            self.client = AsyncOpenAI(api_key=api_key, base_url=base_url)
-            logger.info(f"Initialized CrunchbaseAnalysisPipeline with Liara AI ({self.model})")
-        else:
-            self.client = AsyncOpenAI(api_key=api_key)
-            logger.info(f"Initialized CrunchbaseAnalysisPipeline with OpenAI ({self.model})")
+        logger.info("Initialized CrunchbaseAnalysisPipeline (LLM gateway)")
     
-    async def _call_ai(self, prompt: str, max_tokens: int = 4000) -> str:
-        """Call OpenAI API with the given prompt."""
+    async def _call_ai(self, prompt: str, max_tokens: int = 4000, section: str = None) -> str:
+        """
+        Call the LLM gateway with the given prompt.
+        
+        If `section` is given and a section stream is configured, the completion
+        is streamed to the project WebSocket as it is generated.
+        """
+        kwargs = {"model": self.model, "max_tokens": max_tokens, "temperature": 0.7}
         try:
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=max_tokens,
-                temperature=0.7
-            )
-            return response.choices[0].message.content or ""
-        except Exception as e:
+            if section and self.section_stream:
+                async with self.section_stream.section(section) as on_delta:
+                    return await self.gateway.complete(prompt, on_delta=on_delta, **kwargs)
+            return await self.gateway.complete(prompt, **kwargs)
+        except LLMGatewayError as e:
             logger.error(f"AI call failed: {e}")
-            return f"Error generating analysis: {str(e)}"
+            raise
     
     async def _update_progress(self, step: str, message: str, progress: int):
         """Send progress update if callback provided."""
@@ -93,6 +78,48 @@ class CrunchbaseAnalysisPipeline:
             except Exception as e:
                 logger.warning(f"Failed to send progress update: {e}")
     
+    async def analyze_companies(
+        self,
+        companies: List[Dict[str, Any]],
+        on_company_done: Optional[Callable] = None
+    ) -> List[Dict[str, str]]:
+        """
+        Run the per-company deep dives concurrently.
+        
+        Calls are bounded by the gateway's per-provider limiter, so a run takes roughly as long
+        as its slowest company rather than the sum of all of them.
+        
+        Args:
+            companies: Company data dictionaries to analyze
+            on_company_done: Optional async callback(index, report, completed_count)
+                             invoked as each company finishes
+            
+        Returns:
+            Deep dive reports ({company_name, content}) in the original company order;
+            a company whose AI call failed has "failed": True and a placeholder content
+        """
+        reports: List[Optional[Dict[str, str]]] = [None] * len(companies)
+        completed = 0
+        
+        async def _analyze(idx: int, company: Dict[str, Any]):
+            nonlocal completed
+            company_name = company.get("Company Name", company.get("name", f"Company {idx + 1}"))
+            try:
+                content = await self._call_ai(self.prompts.generate_company_summary(company))
+                reports[idx] = {"company_name": company_name, "content": content}
+            except Exception as e:
+                logger.error(f"Error analyzing {company_name}: {e}")
+                reports[idx] = {"company_name": company_name, "content": f"Analysis failed: {str(e)}", "failed": True}
+            completed += 1
+            if on_company_done:
+                try:
+                    await on_company_done(idx, reports[idx], completed)
+                except Exception as e:
+                    logger.warning(f"Company completion callback failed for {company_name}: {e}")
+        
+        await asyncio.gather(*[_analyze(idx, company) for idx, company in enumerate(companies)])
+        return reports
+    
     async def analyze(
         self,
         companies: List[Dict[str, Any]],
@@ -128,33 +155,15 @@ class CrunchbaseAnalysisPipeline:
             await self._update_progress("company_deep_dive", "Starting Company Deep Dive...", 10)
             logger.info("Part 1: Generating Company Deep Dive reports...")
             
-            deep_dive_reports = []
-            
-            for idx, company in enumerate(companies_for_analysis):
-                company_name = company.get("Company Name", company.get("name", f"Company {idx + 1}"))
-                
-                # Update progress
-                progress = 10 + int((idx / num_companies) * 60)  # 10% to 70%
+            async def on_company_done(idx, report, completed):
+                progress = 10 + int((completed / num_companies) * 60)  # 10% to 70%
                 await self._update_progress(
-                    "company_deep_dive", 
-                    f"Analyzing {company_name} ({idx+1}/{num_companies})", 
+                    "company_deep_dive",
+                    f"Analyzed {report['company_name']} ({completed}/{num_companies})",
                     progress
                 )
-                
-                try:
-                    report = await self._call_ai(
-                        self.prompts.generate_company_summary(company)
-                    )
-                    deep_dive_reports.append({
-                        "company_name": company_name,
-                        "content": report
-                    })
-                except Exception as e:
-                    logger.error(f"Error analyzing {company_name}: {e}")
-                    deep_dive_reports.append({
-                        "company_name": company_name,
-                        "content": f"Analysis failed: {str(e)}"
-                    })
+            
+            deep_dive_reports = await self.analyze_companies(companies_for_analysis, on_company_done)
             
             result["sections"]["company_deep_dive"] = deep_dive_reports
             
@@ -163,7 +172,8 @@ class CrunchbaseAnalysisPipeline:
             logger.info("Part 2: Generating Strategic Summary...")
             
             summary_content = await self._call_ai(
-                self.prompts.generate_strategic_summary(companies_for_analysis)
+                self.prompts.generate_strategic_summary(companies_for_analysis),
+                section="strategic_summary"
             )
             
             result["sections"]["strategic_summary"] = {
@@ -176,7 +186,8 @@ class CrunchbaseAnalysisPipeline:
             logger.info("Part 3: Generating Fast Analysis...")
             
             fast_analysis_content = await self._call_ai(
-                self.prompts.generate_fast_analysis(companies_for_analysis)
+                self.prompts.generate_fast_analysis(companies_for_analysis),
+                section="fast_analysis"
             )
             
             result["sections"]["fast_analysis"] = {
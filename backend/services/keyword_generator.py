@@ -2,23 +2,18 @@
 Keyword Generator Service using Liara AI with Function Calling.
 
 Forces AI to use the generate_keywords tool - NO FALLBACK.
-Uses Liara's Gemini 2.5 Flash model with tool_choice="required".
+Calls go through the shared LLM gateway (Liara first, with provider failover)
+with a forced tool_choice.
 """
 
-import os
 import json
 import logging
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List
 
-from openai import OpenAI
+from .llm_gateway import get_llm_gateway, get_provider_chain
 
 logger = logging.getLogger(__name__)
 
-# Liara AI Configuration
-LIARA_API_KEY = os.getenv("LIARA_API_KEY")
-LIARA_BASE_URL = os.getenv("LIARA_BASE_URL", "https://ai.liara.ir/api/6918348a8376cb0a3e18fdef/v1")
-LIARA_MODEL = os.getenv("LIARA_MODEL", "google/gemini-2.5-flash")
-
 
 # System prompt for the keyword generation AI
 KEYWORD_AI_SYSTEM_PROMPT = """You are a specialized Keyword Generation AI for Crunchbase competitive research.
@@ -231,23 +226,30 @@ class KeywordGenerator:
     NO FALLBACK - AI must always use the tool.
     """
     
-    def __init__(self, api_key: Optional[str] = None):
-        """Initialize the Liara AI client."""
-        self.api_key = api_key or LIARA_API_KEY
-        
-        if not self.api_key:
+    def __init__(self):
+        """Initialize against the shared LLM gateway."""
+        if not get_provider_chain():
             raise ValueError(
-                "Liara API key is required. Set LIARA_API_KEY environment variable."
+                "An AI API key is required. Set LIARA_API_KEY (or METIS_API_KEY / OPENAI_API_KEY)."
             )
         
-        self.client = OpenAI(
-            api_key=self.api_key,
-            base_url=LIARA_BASE_URL
-        )
+        self.gateway = get_llm_gateway()
         
-        logger.info(f"KeywordGenerator initialized with Liara AI ({LIARA_MODEL})")
+        logger.info("KeywordGenerator initialized (LLM gateway)")
     
     def generate(self, project_inputs: Dict[str, Any]) -> Dict[str, Any]:
+        """Blocking variant of agenerate() for synchronous callers."""
+        return self.gateway.run_sync(self.agenerate(project_inputs))
+    
+    def generate_social_keywords(self, project_inputs: Dict[str, Any]) -> Dict[str, Any]:
+        """Blocking variant of agenerate_social_keywords()."""
+        return self.gateway.run_sync(self.agenerate_social_keywords(project_inputs))
+    
+    def generate_tracxn_keywords(self, project_inputs: Dict[str, Any]) -> Dict[str, Any]:
+        """Blocking variant of agenerate_tracxn_keywords()."""
+        return self.gateway.run_sync(self.agenerate_tracxn_keywords(project_inputs))
+    
+    async def agenerate(self, project_inputs: Dict[str, Any]) -> Dict[str, Any]:
         """
         Generate keywords using AI with forced tool calling.
         
@@ -277,10 +279,9 @@ Use the generate_keywords tool to output 8-12 industry-specific search terms."""
 
         logger.info("🔑 Calling Liara AI with forced tool calling for keyword generation...")
         
-        # Call Liara API with tool_choice to force tool usage
-        response = self.client.chat.completions.create(
-            model=LIARA_MODEL,
-            messages=[
+        # Call the gateway with tool_choice to force tool usage
+        response = await self.gateway.chat(
+            [
                 {"role": "system", "content": KEYWORD_AI_SYSTEM_PROMPT},
                 {"role": "user", "content": user_message}
             ],
@@ -291,17 +292,17 @@ Use the generate_keywords tool to output 8-12 industry-specific search terms."""
         )
         
         # Extract tool call from response
-        if not response.choices or not response.choices[0].message.tool_calls:
+        if not response.tool_calls:
             raise Exception("AI did not call the generate_keywords tool - this should not happen with tool_choice=required")
         
-        tool_call = response.choices[0].message.tool_calls[0]
+        tool_call = response.tool_calls[0]
         
-        if tool_call.function.name != "generate_keywords":
-            raise Exception(f"AI called wrong tool: {tool_call.function.name}")
+        if tool_call['name'] != "generate_keywords":
+            raise Exception(f"AI called wrong tool: {tool_call['name']}")
         
         # Parse the tool arguments
         try:
-            arguments = json.loads(tool_call.function.arguments)
+            arguments = json.loads(tool_call['arguments'])
         except json.JSONDecodeError as e:
             raise Exception(f"Failed to parse tool arguments as JSON: {e}")
         
@@ -326,7 +327,7 @@ Use the generate_keywords tool to output 8-12 industry-specific search terms."""
             'target_description': target_description
         }
 
-    def generate_social_keywords(self, project_inputs: Dict[str, Any]) -> Dict[str, Any]:
+    async def agenerate_social_keywords(self, project_inputs: Dict[str, Any]) -> Dict[str, Any]:
         """
         Generate social media keywords (Twitter/X) using AI.
         """
@@ -343,9 +344,8 @@ Generate exactly 3 informal, conversational, and hashtag-based keywords."""
 
         logger.info("🔑 Calling Liara AI for social keywords...")
         
-        response = self.client.chat.completions.create(
-            model=LIARA_MODEL,
-            messages=[
+        response = await self.gateway.chat(
+            [
                 {"role": "system", "content": SOCIAL_KEYWORD_AI_SYSTEM_PROMPT},
                 {"role": "user", "content": user_message}
             ],
@@ -355,12 +355,12 @@ Generate exactly 3 informal, conversational, and hashtag-based keywords."""
             max_tokens=1000
         )
         
-        if not response.choices or not response.choices[0].message.tool_calls:
+        if not response.tool_calls:
             raise Exception("AI did not call generate_social_keywords")
             
-        tool_call = response.choices[0].message.tool_calls[0]
+        tool_call = response.tool_calls[0]
         try:
-            arguments = json.loads(tool_call.function.arguments)
+            arguments = json.loads(tool_call['arguments'])
         except:
             raise Exception("Failed to parse tool arguments")
             
@@ -372,7 +372,7 @@ Generate exactly 3 informal, conversational, and hashtag-based keywords."""
             'target_description': target_description
         }
 
-    def generate_tracxn_keywords(self, project_inputs: Dict[str, Any]) -> Dict[str, Any]:
+    async def agenerate_tracxn_keywords(self, project_inputs: Dict[str, Any]) -> Dict[str, Any]:
         """
         Generate Tracxn-specific keywords using AI.
         Uses startup ecosystem terminology for better Tracxn search results.
@@ -396,9 +396,8 @@ IMPORTANT: Generate 5-10 keyword combinations.
 
         logger.info("🔑 Calling Liara AI for Tracxn keywords...")
         
-        response = self.client.chat.completions.create(
-            model=LIARA_MODEL,
-            messages=[
+        response = await self.gateway.chat(
+            [
                 {"role": "system", "content": TRACXN_KEYWORD_AI_SYSTEM_PROMPT},
                 {"role": "user", "content": user_message}
             ],
@@ -408,16 +407,16 @@ IMPORTANT: Generate 5-10 keyword combinations.
             max_tokens=1000
         )
         
-        if not response.choices or not response.choices[0].message.tool_calls:
+        if not response.tool_calls:
             raise Exception("AI did not call generate_tracxn_keywords")
             
-        tool_call = response.choices[0].message.tool_calls[0]
+        tool_call = response.tool_calls[0]
         
-        if tool_call.function.name != "generate_tracxn_keywords":
-            raise Exception(f"AI called wrong tool: {tool_call.function.name}")
+        if tool_call['name'] != "generate_tracxn_keywords":
+            raise Exception(f"AI called wrong tool: {tool_call['name']}")
         
         try:
-            arguments = json.loads(tool_call.function.arguments)
+            arguments = json.loads(tool_call['arguments'])
         except json.JSONDecodeError as e:
             raise Exception(f"Failed to parse tool arguments as JSON: {e}")
             
@@ -438,39 +437,15 @@ IMPORTANT: Generate 5-10 keyword combinations.
         }
 
 
-# Async wrapper for use in async contexts
+# Async helpers for use in async contexts
 async def generate_keywords_async(project_inputs: Dict[str, Any]) -> Dict[str, Any]:
-    """Async wrapper for CRUD keyword generation."""
-    import asyncio
-    from functools import partial
-    
-    generator = KeywordGenerator()
-    loop = asyncio.get_event_loop()
-    return await loop.run_in_executor(
-        None,
-        partial(generator.generate, project_inputs)
-    )
+    """Async CRUD keyword generation."""
+    return await KeywordGenerator().agenerate(project_inputs)
 
 async def generate_social_keywords_async(project_inputs: Dict[str, Any]) -> Dict[str, Any]:
-    """Async wrapper for social keyword generation."""
-    import asyncio
-    from functools import partial
-    
-    generator = KeywordGenerator()
-    loop = asyncio.get_event_loop()
-    return await loop.run_in_executor(
-        None,
-        partial(generator.generate_social_keywords, project_inputs)
-    )
+    """Async social keyword generation."""
+    return await KeywordGenerator().agenerate_social_keywords(project_inputs)
 
 async def generate_tracxn_keywords_async(project_inputs: Dict[str, Any]) -> Dict[str, Any]:
-    """Async wrapper for Tracxn keyword generation."""
-    import asyncio
-    from functools import partial
-    
-    generator = KeywordGenerator()
-    loop = asyncio.get_event_loop()
-    return await loop.run_in_executor(
-        None,
-        partial(generator.generate_tracxn_keywords, project_inputs)
-    )
+    """Async Tracxn keyword generation."""
+    return await KeywordGenerator().agenerate_tracxn_keywords(project_inputs)
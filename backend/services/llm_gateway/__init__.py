@@ -0,0 +1,18 @@
+"""
+Shared LLM gateway used by every AI call in the backend.
+See gateway.py for pooling, limits, retries, failover and response caching.
+"""
+from .gateway import LLMGateway, LLMGatewayError, LLMResponse, get_llm_gateway
+from .limiter import LLMLimiter, get_llm_limiter
+from .providers import ProviderConfig, get_provider_chain
+
+__all__ = [
+    'LLMGateway',
+    'LLMGatewayError',
+    'LLMResponse',
+    'get_llm_gateway',
+    'LLMLimiter',
+    'get_llm_limiter',
+    'ProviderConfig',
+    'get_provider_chain',
+]
@@ -0,0 +1,367 @@
+"""
+Shared async LLM gateway.
+
+Every AI call in the backend goes through `LLMGateway.chat()`:
+
+- One pooled (HTTP/2 when available) client per provider, reused across calls
+- Per-provider concurrency and rate limits (see limiter.py)
+- Retry with jittered exponential backoff on 429/5xx and connection errors
+- Failover along LLM_PROVIDER_ORDER (Liara -> Metis -> OpenAI by default)
+- Redis response cache keyed by (model, prompt hash, params), so re-running a
+  report on unchanged inputs makes no provider calls; only responses from
+  the requested model are cached, never failover answers
+- Optional streaming: `on_delta` receives text deltas as they arrive
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import random
+import weakref
+from dataclasses import dataclass, field, asdict
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import httpx
+import openai
+from openai import AsyncOpenAI
+from django.conf import settings
+from django.core.cache import cache
+
+from core.cache import CacheService
+from core.exceptions import ExternalAPIError
+
+from .limiter import get_llm_limiter
+from .providers import ProviderConfig, get_provider_chain
+
+try:
+    import h2  # noqa: F401  (enables httpx HTTP/2 support)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+DeltaCallback = Callable[[str], Awaitable[None]]
+
+# Transient failures worth retrying on the same provider
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+
+class LLMGatewayError(ExternalAPIError):
+    """Raised when no provider could complete an AI request."""
+    default_message = "AI service unavailable"
+
+
+class _ProviderFailed(Exception):
+    """Internal: the current provider gave up, try the next one."""
+
+
+@dataclass
+class LLMResponse:
+    """Normalized chat completion result."""
+    content: str
+    tool_calls: List[Dict[str, Any]] = field(default_factory=list)  # [{id, name, arguments}]
+    provider: Optional[str] = None
+    model: Optional[str] = None
+    cached: bool = False
+
+
+class LLMGateway:
+    """
+    Process-wide entry point for chat completions.
+
+    Usage:
+        gateway = get_llm_gateway()
+        text = await gateway.complete(prompt, max_tokens=4000, temperature=0.7)
+        response = await gateway.chat(messages, tools=[...], tool_choice=...)
+    """
+
+    def __init__(self):
+        self.max_retries = getattr(settings, 'LLM_MAX_RETRIES', 3)
+        self.retry_base_delay = getattr(settings, 'LLM_RETRY_BASE_DELAY', 1.0)
+        self.retry_max_delay = getattr(settings, 'LLM_RETRY_MAX_DELAY', 30.0)
+        self.timeout = getattr(settings, 'LLM_TIMEOUT', 180.0)
+        self.max_connections = getattr(settings, 'LLM_MAX_CONNECTIONS', 20)
+        self.cache_enabled = getattr(settings, 'LLM_CACHE_ENABLED', True)
+        # Clients are bound to the event loop that created them: {loop: {provider: AsyncOpenAI}}
+        self._clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, AsyncOpenAI]]" = weakref.WeakKeyDictionary()
+        self._stats = {
+            'requests': 0,
+            'provider_calls': 0,
+            'cache_hits': 0,
+            'retries': 0,
+            'failovers': 0,
+            'errors': 0,
+        }
+
+    # =========================================================================
+    # Clients
+    # =========================================================================
+
+    def _client(self, provider: ProviderConfig) -> AsyncOpenAI:
+        loop = asyncio.get_running_loop()
+        clients = self._clients.setdefault(loop, {})
+        client = clients.get(provider.name)
+        if client is None:
+            http_client = httpx.AsyncClient(
+                http2=HTTP2_AVAILABLE,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+                timeout=httpx.Timeout(self.timeout, connect=10.0),
+            )
+            # Retries are handled here (with failover), not inside the SDK
+            client = AsyncOpenAI(
+                api_key=provider.api_key,
+                base_url=provider.base_url,
+                http_client=http_client,
+                max_retries=0,
+            )
+            clients[provider.name] = client
+        return client
+
+    async def aclose(self):
+        """Close the clients owned by the running event loop."""
+        clients = self._clients.pop(asyncio.get_running_loop(), {})
+        for client in clients.values():
+            try:
+                await client.close()
+            except Exception as e:
+                logger.debug(f"Error closing LLM client: {e}")
+
+    # =========================================================================
+    # Response cache
+    # =========================================================================
+
+    @staticmethod
+    def cache_key(model: str, messages: List[Dict[str, Any]], params: Dict[str, Any]) -> str:
+        """Cache key for a request: model + hash of the prompt and call parameters."""
+        payload = json.dumps({'messages': messages, 'params': params}, sort_keys=True, default=str)
+        prompt_hash = hashlib.sha256(payload.encode('utf-8')).hexdigest()
+        return CacheService.make_key('llm', model, prompt_hash)
+
+    async def _cache_get(self, key: str) -> Optional[LLMResponse]:
+        try:
+            cached = await cache.aget(key)
+        except Exception as e:
+            logger.warning(f"LLM cache read failed: {e}")
+            return None
+        if not cached:
+            return None
+        return LLMResponse(**{**cached, 'cached': True})
+
+    async def _cache_set(self, key: str, response: LLMResponse):
+        if not response.content and not response.tool_calls:
+            return
+        try:
+            await cache.aset(key, asdict(response), CacheService.get_ttl('llm_response'))
+        except Exception as e:
+            logger.warning(f"LLM cache write failed: {e}")
+
+    # =========================================================================
+    # Requests
+    # =========================================================================
+
+    def _backoff(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Jittered exponential backoff, honoring Retry-After when the provider sends one."""
+        if retry_after:
+            try:
+                return min(float(retry_after), self.retry_max_delay)
+            except ValueError:
+                pass
+        ceiling = min(self.retry_max_delay, self.retry_base_delay * (2 ** attempt))
+        return ceiling / 2 + random.uniform(0, ceiling / 2)
+
+    @staticmethod
+    def _to_response(completion, provider: str, model: str) -> LLMResponse:
+        message = completion.choices[0].message
+        tool_calls = [
+            {'id': tc.id, 'name': tc.function.name, 'arguments': tc.function.arguments}
+            for tc in (message.tool_calls or [])
+        ]
+        return LLMResponse(
+            content=message.content or "",
+            tool_calls=tool_calls,
+            provider=provider,
+            model=model,
+        )
+
+    async def _create(
+        self,
+        client: AsyncOpenAI,
+        provider: ProviderConfig,
+        model: str,
+        messages: List[Dict[str, Any]],
+        params: Dict[str, Any],
+        on_delta: Optional[DeltaCallback]
+    ) -> LLMResponse:
+        if on_delta is None:
+            completion = await client.chat.completions.create(
+                model=model,
+                messages=messages,
+                **params
+            )
+            return self._to_response(completion, provider.name, model)
+
+        stream = await client.chat.completions.create(
+            model=model,
+            messages=messages,
+            stream=True,
+            **params
+        )
+        parts = []
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                parts.append(delta)
+                await on_delta(delta)
+        return LLMResponse(content="".join(parts), provider=provider.name, model=model)
+
+    async def _call_provider(
+        self,
+        provider: ProviderConfig,
+        model: str,
+        messages: List[Dict[str, Any]],
+        params: Dict[str, Any],
+        on_delta: Optional[DeltaCallback] = None
+    ) -> LLMResponse:
+        """Call one provider, retrying transient failures; raises _ProviderFailed to fail over."""
+        client = self._client(provider)
+        error: Optional[Exception] = None
+        emitted = False
+
+        async def _track(delta: str):
+            nonlocal emitted
+            emitted = True
+            await on_delta(delta)
+
+        for attempt in range(self.max_retries + 1):
+            retry_after = None
+            try:
+                async with get_llm_limiter(provider.name):
+                    response = await self._create(
+                        client, provider, model, messages, params,
+                        _track if on_delta else None
+                    )
+                self._stats['provider_calls'] += 1
+                return response
+            except (openai.APIStatusError, openai.APIConnectionError) as e:
+                if emitted:
+                    # Deltas already reached the caller; a retry would duplicate them
+                    raise LLMGatewayError(f"{provider.name} stream interrupted: {e}")
+                if isinstance(e, openai.APIStatusError):
+                    if e.status_code not in RETRYABLE_STATUS:
+                        raise _ProviderFailed(f"{provider.name} returned {e.status_code}: {e.message}")
+                    retry_after = e.response.headers.get('retry-after') if e.response is not None else None
+                error = e
+
+            if attempt == self.max_retries:
+                break
+            delay = self._backoff(attempt, retry_after)
+            self._stats['retries'] += 1
+            logger.warning(
+                f"LLM call to {provider.name} failed ({type(error).__name__}: {error}), "
+                f"retry {attempt + 1}/{self.max_retries} in {delay:.1f}s"
+            )
+            await asyncio.sleep(delay)
+
+        raise _ProviderFailed(f"{provider.name} failed after {self.max_retries + 1} attempts: {error}")
+
+    async def chat(
+        self,
+        messages: List[Dict[str, Any]],
+        model: Optional[str] = None,
+        provider: Optional[str] = None,
+        use_cache: bool = True,
+        on_delta: Optional[DeltaCallback] = None,
+        **params
+    ) -> LLMResponse:
+        """
+        Run a chat completion with retries, failover and caching.
+
+        Args:
+            messages: OpenAI-style chat messages
+            model: Model for the primary provider (failover providers use their own default)
+            provider: Provider to try first (defaults to the first in LLM_PROVIDER_ORDER)
+            use_cache: Reuse/store the response in the Redis cache (responses
+                       served by a failover model are not stored)
+            on_delta: Stream the completion, awaiting on_delta(text) per delta
+                      (a cached response is delivered as a single delta)
+            **params: Extra completion parameters (max_tokens, temperature, tools, ...)
+
+        Raises:
+            LLMGatewayError: If every configured provider failed
+        """
+        self._stats['requests'] += 1
+        chain = get_provider_chain(provider)
+        if not chain:
+            self._stats['errors'] += 1
+            raise LLMGatewayError("No AI provider configured (LIARA_API_KEY, METIS_API_KEY or OPENAI_API_KEY)")
+
+        requested_model = model or chain[0].model
+        key = None
+        if use_cache and self.cache_enabled:
+            key = self.cache_key(requested_model, messages, params)
+            cached = await self._cache_get(key)
+            if cached:
+                self._stats['cache_hits'] += 1
+                if on_delta and cached.content:
+                    await on_delta(cached.content)
+                return cached
+
+        failures = []
+        for index, config in enumerate(chain):
+            call_model = requested_model if index == 0 else config.model
+            try:
+                response = await self._call_provider(config, call_model, messages, params, on_delta)
+            except _ProviderFailed as e:
+                failures.append(str(e))
+                if index + 1 < len(chain):
+                    self._stats['failovers'] += 1
+                    logger.warning(f"{e}; failing over to {chain[index + 1].name}")
+                continue
+            # A failover answer comes from another model; caching it under the
+            # requested model would keep serving it after the primary recovers
+            if key and call_model == requested_model:
+                await self._cache_set(key, response)
+            return response
+
+        self._stats['errors'] += 1
+        raise LLMGatewayError(f"All AI providers failed: {'; '.join(failures)}")
+
+    async def complete(self, prompt: str, system: Optional[str] = None, **kwargs) -> str:
+        """Single-prompt convenience wrapper around chat(); returns the message text."""
+        messages = []
+        if system:
+            messages.append({"role": "system", "content": system})
+        messages.append({"role": "user", "content": prompt})
+        response = await self.chat(messages, **kwargs)
+        return response.content
+
+    def run_sync(self, coro):
+        """
+        Run a coroutine that uses the gateway from synchronous code.
+
+        Runs on the thread's persistent event loop (core.async_runtime), so the
+        pooled clients of that loop are reused by later calls.
+        """
+        from core.async_runtime import run
+        return run(coro)
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self._stats, 'http2': HTTP2_AVAILABLE}
+
+
+# Global gateway instance
+_llm_gateway = None
+
+
+def get_llm_gateway() -> LLMGateway:
+    """Get or create the global LLM gateway."""
+    global _llm_gateway
+    if _llm_gateway is None:
+        _llm_gateway = LLMGateway()
+    return _llm_gateway
@@ -0,0 +1,95 @@
+"""
+Async concurrency limiter for LLM calls.
+
+Bounds in-flight requests per provider (semaphore) and smooths the request
+rate (token bucket) so analysis pipelines can fan out per-company calls
+without tripping provider rate limits.
+
+Limiters are kept per (event loop, provider). Report tasks share one
+persistent loop per worker process (core/async_runtime.py), so in practice
+there is one limiter per provider per process and the configured limits
+apply per process, not globally.
+"""
+import asyncio
+import logging
+import time
+import weakref
+from typing import Dict
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+class LLMLimiter:
+    """
+    Semaphore + token bucket for one provider.
+
+    Usage:
+        async with get_llm_limiter('liara'):
+            response = await client.chat.completions.create(...)
+
+    The gateway acquires the limiter around every provider request.
+    """
+
+    def __init__(self, provider: str, max_concurrency: int, requests_per_minute: int):
+        self.provider = provider
+        self.max_concurrency = max_concurrency
+        self.rate = requests_per_minute / 60.0  # tokens per second
+        self.capacity = max(1, max_concurrency)  # allow a burst of one full wave
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._bucket_lock = asyncio.Lock()
+
+    async def _take_token(self):
+        if self.rate <= 0:
+            return
+        async with self._bucket_lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    async def __aenter__(self):
+        await self._semaphore.acquire()
+        try:
+            await self._take_token()
+        except BaseException:
+            self._semaphore.release()
+            raise
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self._semaphore.release()
+        return False
+
+
+# {event loop: {provider: LLMLimiter}}
+_limiters: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, LLMLimiter]]" = weakref.WeakKeyDictionary()
+
+
+def get_llm_limiter(provider: str) -> LLMLimiter:
+    """
+    Get the limiter for a provider on the running event loop.
+
+    Limits come from `<PROVIDER>_MAX_CONCURRENCY` / `<PROVIDER>_REQUESTS_PER_MINUTE`
+    settings, falling back to LLM_MAX_CONCURRENCY / LLM_REQUESTS_PER_MINUTE.
+    """
+    loop = asyncio.get_running_loop()
+    loop_limiters = _limiters.setdefault(loop, {})
+    limiter = loop_limiters.get(provider)
+    if limiter is None:
+        prefix = provider.upper()
+        max_concurrency = getattr(settings, f'{prefix}_MAX_CONCURRENCY',
+                                  getattr(settings, 'LLM_MAX_CONCURRENCY', 5))
+        requests_per_minute = getattr(settings, f'{prefix}_REQUESTS_PER_MINUTE',
+                                      getattr(settings, 'LLM_REQUESTS_PER_MINUTE', 60))
+        limiter = LLMLimiter(provider, max_concurrency, requests_per_minute)
+        loop_limiters[provider] = limiter
+        logger.debug(f"Created LLM limiter for {provider}: {max_concurrency} concurrent, {requests_per_minute}/min")
+    return limiter
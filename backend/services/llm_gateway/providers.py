@@ -0,0 +1,67 @@
+"""
+LLM provider configuration.
+
+All providers expose an OpenAI-compatible chat completions API; they differ
+only in credentials, base URL and default model.
+"""
+from dataclasses import dataclass
+from typing import List, Optional
+
+from django.conf import settings
+
+
+@dataclass(frozen=True)
+class ProviderConfig:
+    """Connection settings for one OpenAI-compatible provider."""
+    name: str
+    api_key: str
+    base_url: Optional[str]
+    model: str
+
+
+def _provider_config(name: str) -> Optional[ProviderConfig]:
+    if name == 'liara':
+        return ProviderConfig(
+            name='liara',
+            api_key=getattr(settings, 'LIARA_API_KEY', ''),
+            base_url=getattr(settings, 'LIARA_BASE_URL', None),
+            model=getattr(settings, 'LIARA_MODEL', 'google/gemini-2.5-flash'),
+        )
+    if name == 'metis':
+        return ProviderConfig(
+            name='metis',
+            api_key=getattr(settings, 'METIS_API_KEY', ''),
+            base_url=getattr(settings, 'METIS_BASE_URL', 'https://api.metisai.ir/openai/v1'),
+            model=getattr(settings, 'METIS_MODEL', 'gpt-4o-mini'),
+        )
+    if name == 'openai':
+        return ProviderConfig(
+            name='openai',
+            api_key=getattr(settings, 'OPENAI_API_KEY', ''),
+            base_url=None,
+            model=getattr(settings, 'OPENAI_MODEL', 'gpt-4o-mini'),
+        )
+    return None
+
+
+def get_provider_chain(primary: Optional[str] = None) -> List[ProviderConfig]:
+    """
+    Configured providers in failover order (LLM_PROVIDER_ORDER).
+
+    Args:
+        primary: Provider to try first (e.g. 'metis' for chat); the rest follow
+                 in the configured order.
+
+    Returns:
+        Providers that have an API key, primary first
+    """
+    order = list(getattr(settings, 'LLM_PROVIDER_ORDER', ['liara', 'metis', 'openai']))
+    if primary:
+        order = [primary] + [name for name in order if name != primary]
+
+    chain = []
+    for name in order:
+        config = _provider_config(name)
+        if config and config.api_key:
+            chain.append(config)
+    return chain
@@ -8,42 +8,29 @@ Features:
 - Input extraction from chat
 - HTML report generation
 """
-from openai import OpenAI, AsyncOpenAI
-from django.conf import settings
 import logging
 from typing import Optional, List, Dict, Any
 import json
 
+from .llm_gateway import get_llm_gateway, get_provider_chain
+
 logger = logging.getLogger(__name__)
 
 
 class OpenAIService:
     """
     AI integration for chat and content generation.
-    Uses Liara AI (OpenAI-compatible) with fallback to OpenAI.
+    Uses the shared LLM gateway (Liara AI first, failing over to Metis/OpenAI).
     """
     
     def __init__(self):
-        # Try Liara AI first (OpenAI-compatible)
-        self.api_key = getattr(settings, 'LIARA_API_KEY', None)
-        self.base_url = getattr(settings, 'LIARA_BASE_URL', None)
-        
-        if self.api_key and self.base_url:
-            self.model = getattr(settings, 'LIARA_MODEL', 'google/gemini-2.5-flash')
-            self.client = AsyncOpenAI(api_key=self.api_key, base_url=self.base_url)
-            logger.info(f"OpenAIService initialized with Liara AI ({self.model})")
+        # Provider selection, retries and failover live in the LLM gateway
+        self.gateway = get_llm_gateway()
+        self.enabled = bool(get_provider_chain())
+        if self.enabled:
+            logger.info("OpenAIService initialized (LLM gateway)")
         else:
-            # Fallback to OpenAI
-            self.api_key = getattr(settings, 'OPENAI_API_KEY', '')
-            self.model = getattr(settings, 'OPENAI_MODEL', 'gpt-4o-mini')
-            self.base_url = None
-            
-            if self.api_key:
-                self.client = AsyncOpenAI(api_key=self.api_key)
-                logger.info(f"OpenAIService initialized with OpenAI ({self.model})")
-            else:
-                self.client = None
-                logger.warning("No AI API key configured (LIARA or OPENAI)")
+            logger.warning("No AI API key configured (LIARA, METIS or OPENAI)")
     
     # =========================================================================
     # Chat Assistance (per FINAL_ARCHITECTURE Chat System)
@@ -59,7 +46,7 @@ class OpenAIService:
         """
         Generate a chat completion.
         """
-        if not self.client:
+        if not self.enabled:
             return "AI service is not configured. Please set OPENAI_API_KEY."
         
         try:
@@ -70,14 +57,14 @@ class OpenAIService:
             
             full_messages.extend(messages)
             
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=full_messages,
+            response = await self.gateway.chat(
+                full_messages,
+                use_cache=False,
                 temperature=temperature,
                 max_tokens=max_tokens,
             )
             
-            return response.choices[0].message.content
+            return response.content
         except Exception as e:
             logger.error(f"OpenAI chat completion failed: {e}")
             return f"I'm sorry, I encountered an error: {str(e)}"
@@ -91,7 +78,7 @@ class OpenAIService:
         Extract project input fields from user's chat message.
         Per FINAL_ARCHITECTURE - AI Chat Extraction for 9 questions.
         """
-        if not self.client:
+        if not self.enabled:
             return {}
         
         system_prompt = """You are an AI assistant helping extract startup information from user messages.
@@ -119,9 +106,8 @@ Return JSON format:
 }"""
 
         try:
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=[
+            response = await self.gateway.chat(
+                [
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": f"User message: {user_message}\n\nExisting inputs: {json.dumps(existing_inputs or {})}"}
                 ],
@@ -130,7 +116,7 @@ Return JSON format:
                 response_format={"type": "json_object"},
             )
             
-            result = json.loads(response.choices[0].message.content)
+            result = json.loads(response.content)
             return result
         except Exception as e:
             logger.error(f"Input extraction failed: {e}")
@@ -149,7 +135,7 @@ Return JSON format:
         """
         Generate AI insights for a report.
         """
-        if not self.client:
+        if not self.enabled:
             return "AI insights not available."
         
         system_prompt = f"""You are a market research analyst generating insights for a {report_type} report.
@@ -164,9 +150,8 @@ Focus on:
 Be concise and business-focused. Use bullet points for clarity."""
 
         try:
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=[
+            response = await self.gateway.chat(
+                [
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": f"Project context: {json.dumps(project_inputs)}\n\nData: {json.dumps(data)}"}
                 ],
@@ -174,7 +159,7 @@ Be concise and business-focused. Use bullet points for clarity."""
                 max_tokens=1500,
             )
             
-            return response.choices[0].message.content
+            return response.content
         except Exception as e:
             logger.error(f"Report insights generation failed: {e}")
             return "Unable to generate insights at this time."
@@ -189,7 +174,7 @@ Be concise and business-focused. Use bullet points for clarity."""
         Generate pitch deck slide content.
         Per FINAL_ARCHITECTURE - Panel 4: Pitch Deck.
         """
-        if not self.client:
+        if not self.enabled:
             return {}
         
         system_prompt = """You are an expert pitch deck consultant. Generate content for a startup pitch deck.
@@ -218,9 +203,8 @@ Be concise - max 3-5 bullet points per slide."""
         }
 
         try:
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=[
+            response = await self.gateway.chat(
+                [
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": json.dumps(context)}
                 ],
@@ -229,7 +213,7 @@ Be concise - max 3-5 bullet points per slide."""
                 response_format={"type": "json_object"},
             )
             
-            return json.loads(response.choices[0].message.content)
+            return json.loads(response.content)
         except Exception as e:
             logger.error(f"Pitch deck generation failed: {e}")
             return {}
@@ -249,7 +233,7 @@ Be concise - max 3-5 bullet points per slide."""
         Answer questions about a generated report.
         Per FINAL_ARCHITECTURE - Chat Mode 2: Report Follow-up.
         """
-        if not self.client:
+        if not self.enabled:
             return "AI service is not configured."
         
         system_prompt = f"""You are an AI assistant helping users understand their {report_type} market research report.
@@ -278,14 +262,14 @@ Be concise but thorough."""
         messages.append({"role": "user", "content": question})
         
         try:
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=messages,
+            response = await self.gateway.chat(
+                messages,
+                use_cache=False,
                 temperature=0.7,
                 max_tokens=1000,
             )
             
-            return response.choices[0].message.content
+            return response.content
         except Exception as e:
             logger.error(f"Report Q&A failed: {e}")
             return "I couldn't process your question. Please try again."
@@ -2,13 +2,171 @@
 Orchestrator Client - client for submitting tasks to the API orchestrator.
 Used by backend to interact with the orchestration service.
 """
+import asyncio
 import logging
-from typing import Optional, Dict, Any
+import time
+from typing import Optional, Dict, Any, List
 import httpx
+from asgiref.sync import sync_to_async
 from django.conf import settings
+from django.core.cache import cache
+
+from core.cache import CacheService
 
 logger = logging.getLogger(__name__)
 
+TERMINAL_STATUSES = ("completed", "failed", "cancelled")
+
+# Long-poll window per /tasks/{id}/wait request (server caps it at 300s)
+WAIT_WINDOW = 60.0
+# Pause before retrying after a transport error or unexpected status
+WAIT_RETRY_DELAY = 5.0
+
+
+def _tenant_for_report(report_id: str) -> Optional[str]:
+    """
+    Organization (or project, if it has none) that owns a report.
+    
+    Resolved tenants are cached with a TTL, so a project moved to another
+    organization is picked up; a report that is not found is not cached
+    (it may simply not be committed yet).
+    """
+    from apps.reports.models import Report
+    
+    cache_key = CacheService.make_key('report_tenant', report_id)
+    try:
+        tenant = cache.get(cache_key)
+    except Exception as e:
+        logger.warning(f"Report tenant cache unavailable: {e}")
+        tenant = None
+    if tenant:
+        return tenant
+    
+    row = (
+        Report.objects.filter(id=report_id)
+        .values('project_id', 'project__organization_id')
+        .first()
+    )
+    if not row:
+        return None
+    if row['project__organization_id']:
+        tenant = f"org:{row['project__organization_id']}"
+    else:
+        tenant = f"project:{row['project_id']}"
+    
+    try:
+        cache.set(cache_key, tenant, CacheService.get_ttl('report_tenant'))
+    except Exception as e:
+        logger.warning(f"Failed to cache report tenant: {e}")
+    return tenant
+
+
+async def resolve_tenant(report_id: Optional[str]) -> Optional[str]:
+    """
+    Fair-share tenant for an orchestrator task.
+    
+    The orchestrator interleaves tenants' tasks and caps each tenant's
+    concurrency, so one organization starting many reports cannot starve
+    the others. Returns None (orchestrator falls back to per-report
+    fairness) if the report cannot be resolved.
+    """
+    if not report_id:
+        return None
+    try:
+        return await sync_to_async(_tenant_for_report)(str(report_id))
+    except Exception as e:
+        logger.warning(f"Could not resolve tenant for report {report_id}: {e}")
+        return None
+
+
+async def await_task_status(
+    client: httpx.AsyncClient,
+    base_url: str,
+    task_id: str,
+    timeout: float
+) -> Dict[str, Any]:
+    """
+    Block until an orchestrator task reaches a terminal state.
+    
+    Long-polls GET /tasks/{task_id}/wait, which returns as soon as the
+    orchestrator publishes the task's completion, so no polling interval is
+    added to the task's latency.
+    
+    Returns:
+        Final task status dict (status, result, error)
+        
+    Raises:
+        LookupError: Task is unknown to the orchestrator (expired or never submitted)
+        TimeoutError: Task did not finish within `timeout` seconds
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutError(f"Task {task_id} timed out after {timeout}s")
+        
+        window = min(WAIT_WINDOW, remaining)
+        try:
+            response = await client.get(
+                f"{base_url}/tasks/{task_id}/wait",
+                params={"timeout": window},
+                timeout=httpx.Timeout(window + 30.0, connect=30.0)
+            )
+        except httpx.HTTPError as e:
+            logger.warning(f"Waiting on orchestrator task {task_id} failed: {e}")
+            await asyncio.sleep(min(WAIT_RETRY_DELAY, remaining))
+            continue
+        
+        if response.status_code == 404:
+            raise LookupError(f"Task {task_id} not found")
+        if response.status_code != 200:
+            logger.warning(f"Orchestrator wait returned {response.status_code} for {task_id}")
+            await asyncio.sleep(min(WAIT_RETRY_DELAY, remaining))
+            continue
+        
+        data = response.json()
+        if data.get("status") in TERMINAL_STATUSES:
+            return data
+
+
+def fetch_task_status(task_id: str, timeout: float = 30.0) -> Optional[Dict[str, Any]]:
+    """
+    Current status of an orchestrator task, without waiting (sync).
+    
+    Used by Celery stages that poll between short tasks instead of holding
+    a worker for the whole remote scrape.
+    
+    Returns:
+        Task status dict (status, result, error), or None if the task is unknown
+        
+    Raises:
+        httpx.HTTPError: Orchestrator unreachable or returned an error
+    """
+    base_url = getattr(settings, 'ORCHESTRATOR_URL', 'http://orchestrator:8010')
+    response = httpx.get(f"{base_url}/tasks/{task_id}", timeout=timeout)
+    if response.status_code == 404:
+        return None
+    response.raise_for_status()
+    return response.json()
+
+
+def fetch_report_queue(report_id: str, timeout: float = 5.0) -> List[Dict[str, Any]]:
+    """
+    Queue positions and estimated waits of a report's unfinished tasks (sync).
+    
+    Returns:
+        List of {task_id, status, position, ahead, pending, eta_seconds, ...};
+        empty if none are queued or the orchestrator is unreachable
+    """
+    base_url = getattr(settings, 'ORCHESTRATOR_URL', 'http://orchestrator:8010')
+    try:
+        response = httpx.get(f"{base_url}/reports/{report_id}/queue", timeout=timeout)
+        if response.status_code == 200:
+            return response.json().get("tasks", [])
+        logger.error(f"Orchestrator returned {response.status_code}")
+    except Exception as e:
+        logger.error(f"Failed to get report queue: {e}")
+    return []
 
 class OrchestratorClient:
     """
@@ -53,7 +211,8 @@ class OrchestratorClient:
         action: str,
         report_id: str,
         payload: Dict[str, Any],
-        priority: int = 0
+        priority: int = 0,
+        tenant_id: Optional[str] = None
     ) -> Optional[str]:
         """
         Submit a task to the orchestrator for execution.
@@ -64,6 +223,7 @@ class OrchestratorClient:
             report_id: Report ID for status tracking
             payload: Task payload/parameters
             priority: Task priority (higher = more priority)
+            tenant_id: Fair-share tenant (resolved from the report if omitted)
             
         Returns:
             Task ID if submitted successfully, None otherwise
@@ -74,7 +234,8 @@ class OrchestratorClient:
                 "action": action,
                 "report_id": report_id,
                 "payload": payload,
-                "priority": priority
+                "priority": priority,
+                "tenant_id": tenant_id or await resolve_tenant(report_id)
             }
             
             response = await self.client.post(
@@ -120,8 +281,7 @@ class OrchestratorClient:
     async def wait_for_task(
         self,
         task_id: str,
-        timeout: float = 600.0,
-        poll_interval: float = 2.0
+        timeout: float = 600.0
     ) -> Optional[Dict[str, Any]]:
         """
         Wait for a task to complete.
@@ -129,32 +289,23 @@ class OrchestratorClient:
         Args:
             task_id: Task ID to wait for
             timeout: Maximum time to wait in seconds
-            poll_interval: Time between status checks
             
         Returns:
             Task result if completed, None if timed out or failed
         """
-        import asyncio
+        try:
+            status = await await_task_status(self.client, self.base_url, task_id, timeout)
+        except LookupError:
+            return None
+        except TimeoutError as e:
+            logger.error(str(e))
+            return None
         
-        elapsed = 0.0
-        while elapsed < timeout:
-            status = await self.get_task_status(task_id)
-            
-            if status is None:
-                return None
-            
-            task_status = status.get("status")
-            
-            if task_status == "completed":
-                return status.get("result")
-            elif task_status in ("failed", "cancelled"):
-                logger.error(f"Task {task_id} {task_status}: {status.get('error')}")
-                return None
-            
-            await asyncio.sleep(poll_interval)
-            elapsed += poll_interval
+        task_status = status.get("status")
+        if task_status == "completed":
+            return status.get("result")
         
-        logger.error(f"Task {task_id} timed out after {timeout}s")
+        logger.error(f"Task {task_id} {task_status}: {status.get('error')}")
         return None
     
     async def cancel_task(self, task_id: str) -> bool:
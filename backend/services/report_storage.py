@@ -11,16 +11,29 @@ organizations/{org_id}/projects/{project_id}/reports/{report_type}/v{version}/
 │   │   ├── {company_name}.json # Per-company analysis
 │   └── summaries/
 │       └── {summary_type}.json # Executive summaries
-└── metadata.json               # Report metadata
+├── metadata.json               # Report metadata
+├── bundle.jsonl.gz             # Metadata + all analysis docs, one gzip member each
+└── manifest.json               # Keys of the version's files + the bundle's offset index
+
+Analysis sections and summaries are staged in Redis as they arrive and
+written once, in the bundle, when the metadata is saved. The bundle is built
+from the report's ReportAnalysisSection rows (written before the metadata),
+so an evicted staging area loses nothing; staged docs only fill in fields
+the rows lack. The opt-in journal (REPORT_SECTION_JOURNAL) also uploads each
+doc as its own object as it arrives, for crash recovery of long runs.
 """
+import gzip
 import json
 import logging
 import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Dict, Any, Optional, List
 from io import BytesIO
 
 from django.conf import settings
+from django.core.cache import cache
+from core.cache import CacheService
 from core.storage import storage_service
 
 logger = logging.getLogger(__name__)
@@ -32,10 +45,30 @@ class ReportStorageService:
     Leverages the existing storage_service for S3 operations.
     """
     
+    MANIFEST_FILE = 'manifest.json'
+    BUNDLE_FILE = 'bundle.jsonl.gz'
+    # Section rows the pipelines store as summaries (analysis/summaries/), by report type
+    SUMMARY_SECTIONS = {
+        'crunchbase': ('strategic_summary', 'fast_analysis'),
+        'tracxn': ('executive_summary',),
+    }
+    STAGING_TTL = 60 * 60 * 24 * 2  # Staged docs of an abandoned version expire
+    
     def __init__(self):
         self.storage = storage_service
+        self._redis = None
         logger.info("Report storage initialized (using S3/MinIO)")
     
+    def _get_redis(self):
+        """Redis connection for staging analysis docs (None if unavailable)."""
+        if self._redis is None:
+            try:
+                from django_redis import get_redis_connection
+                self._redis = get_redis_connection('default')
+            except Exception as e:
+                logger.debug(f"Report staging unavailable, uploading sections directly: {e}")
+        return self._redis
+    
     def _sanitize_filename(self, name: str) -> str:
         """Sanitize a string for use as a filename."""
         # Replace spaces and special chars with underscores
@@ -59,7 +92,7 @@ class ReportStorageService:
     
     def _upload_json(self, key: str, data: Any, metadata: dict = None) -> str:
         """Upload JSON data to S3."""
-        json_bytes = json.dumps(data, indent=2, ensure_ascii=False, default=str).encode('utf-8')
+        json_bytes = json.dumps(data, separators=(',', ':'), ensure_ascii=False, default=str).encode('utf-8')
         file_obj = BytesIO(json_bytes)
         
         result = self.storage.upload_file(
@@ -166,7 +199,7 @@ class ReportStorageService:
             # Fallback for unknown structure
             key = f"{base_path}/analysis/{section_type}.json"
         
-        return self._upload_json(key, data, {'type': 'analysis', 'section': section_type})
+        return self._save_analysis_doc(base_path, key, data, {'type': 'analysis', 'section': section_type})
     
     def save_analysis_summary(
         self, 
@@ -205,7 +238,45 @@ class ReportStorageService:
             data['metadata'] = metadata
         
         key = f"{base_path}/analysis/summaries/{summary_type}.json"
-        return self._upload_json(key, data, {'type': 'summary', 'summary': summary_type})
+        return self._save_analysis_doc(base_path, key, data, {'type': 'summary', 'summary': summary_type})
+    
+    def _save_analysis_doc(self, base_path: str, key: str, data: Dict, metadata: dict) -> str:
+        """Stage an analysis doc for the version bundle; upload it too if journaling (or staging failed)."""
+        staged = self._stage(base_path, key[len(base_path) + 1:], data)
+        if settings.REPORT_SECTION_JOURNAL or not staged:
+            return self._upload_json(key, data, metadata)
+        return key
+    
+    def _staging_key(self, base_path: str) -> str:
+        return CacheService.make_key('report_bundle', base_path, 'staged')
+    
+    def _stage(self, base_path: str, rel_key: str, data: Dict) -> bool:
+        redis = self._get_redis()
+        if redis is None:
+            return False
+        try:
+            pipe = redis.pipeline()
+            pipe.hset(self._staging_key(base_path), rel_key, json.dumps(data, ensure_ascii=False, default=str))
+            pipe.expire(self._staging_key(base_path), self.STAGING_TTL)
+            pipe.execute()
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to stage {rel_key}, uploading it directly: {e}")
+            return False
+    
+    def _staged_docs(self, base_path: str) -> Dict[str, Dict]:
+        redis = self._get_redis()
+        if redis is None:
+            return {}
+        try:
+            staged = redis.hgetall(self._staging_key(base_path))
+        except Exception as e:
+            logger.warning(f"Failed to read staged report docs: {e}")
+            return {}
+        return {
+            (key.decode() if isinstance(key, bytes) else key): json.loads(value)
+            for key, value in staged.items()
+        }
     
     def save_report_metadata(
         self, 
@@ -233,7 +304,175 @@ class ReportStorageService:
         
         metadata['saved_at'] = datetime.utcnow().isoformat()
         
-        return self._upload_json(key, metadata, {'type': 'metadata', 'version': str(version)})
+        saved_key = self._upload_json(key, metadata, {'type': 'metadata', 'version': str(version)})
+        
+        # Metadata is saved last, so the version's files are final now
+        self._finalize_version(base_path, version, metadata, report_type)
+        try:
+            cache.delete(CacheService.make_key('report_sections', base_path))
+        except Exception as e:
+            logger.warning(f"Failed to clear cached report sections: {e}")
+        
+        return saved_key
+    
+    def _finalize_version(self, base_path: str, version: int, metadata: Dict[str, Any], report_type: str):
+        """
+        Write the version's bundle and manifest.
+        
+        Analysis docs come from the report's section rows, overlaid with the
+        Redis staging area and, with the journal on, the per-object uploads
+        not staged (one LIST plus concurrent GETs, once per version). Readers
+        then need the manifest and at most one GET. If a journaled doc cannot
+        be read no manifest is written, since it would hide that doc; readers
+        keep listing the version's objects instead.
+        """
+        journal = settings.REPORT_SECTION_JOURNAL
+        if journal and not self.storage.use_s3:
+            self._clear_staged(base_path)  # Local storage cannot list the journal
+            return
+        
+        docs = {}
+        try:
+            derived = {self.MANIFEST_FILE, self.BUNDLE_FILE}
+            listed = self.storage.list_files(prefix=f"{base_path}/", max_keys=1000) if self.storage.use_s3 else []
+            files = {
+                f['Key'][len(base_path) + 1:]: f.get('Size', 0)
+                for f in listed
+                if f['Key'].endswith('.json') and f['Key'][len(base_path) + 1:] not in derived
+            }
+            
+            docs = {**self._section_docs(metadata.get('report_id'), report_type), **self._staged_docs(base_path)}
+            journal_keys = [key for key in files if key.startswith('analysis/') and key not in docs]
+            docs.update(self._download_many(base_path, journal_keys))
+            unreadable = [key for key in journal_keys if docs.get(key) is None]
+            if unreadable:
+                raise RuntimeError(f"{len(unreadable)} journaled docs unreadable, e.g. {unreadable[0]}")
+            docs['metadata.json'] = metadata
+            
+            bundle, index = self._build_bundle(docs)
+            self.storage.upload_file(
+                file_obj=BytesIO(bundle),
+                key=f"{base_path}/{self.BUNDLE_FILE}",
+                content_type='application/gzip',
+                metadata={'type': 'bundle', 'version': str(version)}
+            )
+            
+            self._upload_json(
+                f"{base_path}/{self.MANIFEST_FILE}",
+                {
+                    'version': version,
+                    'files': [{'key': key, 'size': files.get(key, 0)} for key in sorted(set(files) | set(docs))],
+                    'bundle': {'key': self.BUNDLE_FILE, 'codec': 'gzip', 'size': len(bundle), 'index': index},
+                    'saved_at': datetime.utcnow().isoformat(),
+                },
+                {'type': 'manifest', 'version': str(version)}
+            )
+            logger.info(f"📦 Bundled {len(docs)} docs for {base_path} ({len(bundle)} bytes)")
+        except Exception as e:
+            logger.error(f"Failed to write report bundle for {base_path}: {e}")
+            if not journal:
+                self._journal_docs(base_path, docs or self._staged_docs(base_path))
+            return
+        
+        self._clear_staged(base_path)
+    
+    def _section_docs(self, report_id: Optional[str], report_type: str) -> Dict[str, Dict]:
+        """
+        Analysis docs rebuilt from the section rows of the report's current run.
+        
+        Keys follow save_analysis_section/save_analysis_summary, so they match
+        what the pipeline staged (or journaled) for the same section.
+        """
+        if not report_id:
+            return {}
+        from apps.reports.models import Report, ReportAnalysisSection
+        
+        started_at = Report.objects.filter(id=report_id).values_list('started_at', flat=True).first()
+        rows = ReportAnalysisSection.objects.filter(report_id=report_id)
+        if started_at:
+            rows = rows.filter(generated_at__gte=started_at)  # Rows of earlier versions are kept
+        
+        summaries = self.SUMMARY_SECTIONS.get(report_type, ())
+        docs = {}
+        for row in rows:
+            doc = {'content': row.content_markdown, 'saved_at': row.generated_at.isoformat()}
+            if row.section_type in summaries and not row.company_name:
+                docs[f"analysis/summaries/{row.section_type}.json"] = {'summary_type': row.section_type, **doc}
+                continue
+            
+            doc = {'section_type': row.section_type, **doc}
+            if row.company_name:
+                doc['company_name'] = row.company_name
+                key = f"analysis/{row.section_type}/{self._sanitize_filename(row.company_name)}.json"
+            elif row.section_type == 'company_overview':
+                key = "analysis/company_overview.json"
+            else:
+                key = f"analysis/{row.section_type}.json"
+            docs[key] = doc
+        return docs
+    
+    def _journal_docs(self, base_path: str, docs: Dict[str, Dict]):
+        """Upload docs individually, so they outlive the staging area."""
+        for rel_key, doc in docs.items():
+            if rel_key == 'metadata.json':
+                continue  # Already uploaded
+            try:
+                self._upload_json(f"{base_path}/{rel_key}", doc, {'type': 'analysis'})
+            except Exception as e:
+                logger.error(f"Failed to journal doc {rel_key} for {base_path}: {e}")
+                return
+        self._clear_staged(base_path)
+    
+    def _clear_staged(self, base_path: str):
+        redis = self._get_redis()
+        if redis is not None:
+            try:
+                redis.delete(self._staging_key(base_path))
+            except Exception as e:
+                logger.debug(f"Failed to clear staged report docs: {e}")
+    
+    @staticmethod
+    def _build_bundle(docs: Dict[str, Dict]):
+        """
+        Pack docs into one gzip stream of JSON lines ({"key", "doc"}).
+        
+        Each line is its own gzip member, so the whole bundle decompresses as
+        one stream and any line can be range-read by its [offset, length].
+        """
+        blob = BytesIO()
+        index = {}
+        for key in sorted(docs):
+            line = json.dumps({'key': key, 'doc': docs[key]}, ensure_ascii=False, default=str) + '\n'
+            member = gzip.compress(line.encode('utf-8'))
+            index[key] = [blob.tell(), len(member)]
+            blob.write(member)
+        return blob.getvalue(), index
+    
+    def _read_bundle(self, base_path: str, bundle: Dict[str, Any], rel_keys: List[str]) -> Dict[str, Optional[Dict]]:
+        """Docs from the version bundle: a range GET for one doc, else one full GET."""
+        index = bundle.get('index', {})
+        keys = [key for key in rel_keys if key in index]
+        if not keys:
+            return {}
+        
+        bundle_key = f"{base_path}/{bundle['key']}"
+        try:
+            if len(keys) == 1:
+                offset, length = index[keys[0]]
+                lines = [gzip.decompress(self.storage.download_range(bundle_key, offset, length))]
+            else:
+                lines = gzip.decompress(self.storage.download_file(bundle_key)).splitlines()
+        except Exception as e:
+            logger.warning(f"Failed to read report bundle {bundle_key}: {e}")
+            return self._download_many(base_path, keys)
+        
+        wanted = set(keys)
+        docs = {}
+        for line in lines:
+            entry = json.loads(line)
+            if entry['key'] in wanted:
+                docs[entry['key']] = entry['doc']
+        return docs
     
     def get_all_report_files(
         self, 
@@ -369,6 +608,67 @@ class ReportStorageService:
         key = f"{base_path}/raw_data.json"
         return self._download_json(key)
 
+    def get_section_file(
+        self,
+        project_id: str,
+        org_id: str,
+        report_type: str,
+        version: int,
+        file_path: str
+    ) -> Optional[Dict]:
+        """
+        Load one file of a report version, e.g. 'analysis/summaries/swot_summary.json'.
+        
+        Served by a range GET on the version bundle when there is one.
+        """
+        base_path = self._get_base_path(org_id, project_id, report_type, version)
+        _, bundle = self._version_files(base_path)
+        if bundle and file_path in bundle.get('index', {}):
+            return self._read_bundle(base_path, bundle, [file_path]).get(file_path)
+        
+        staged = self._staged_docs(base_path).get(file_path) if bundle is None else None
+        return staged or self._download_json(f"{base_path}/{file_path}")
+
+    def get_pending_docs(
+        self,
+        project_id: str,
+        org_id: str,
+        report_type: str,
+        version: int
+    ) -> Dict[str, Dict]:
+        """
+        Analysis docs saved so far for a version that is still being generated.
+
+        Journaled docs plus any still only staged, keyed relative to the
+        version folder. Used to resume
+        an interrupted generation without redoing finished sections.
+        """
+        base_path = self._get_base_path(org_id, project_id, report_type, version)
+        docs = {}
+        if self.storage.use_s3:
+            listed = self.storage.list_files(prefix=f"{base_path}/analysis/", max_keys=1000)
+            docs = self._download_many(
+                base_path,
+                [f['Key'][len(base_path) + 1:] for f in listed if f['Key'].endswith('.json')]
+            )
+        docs.update(self._staged_docs(base_path))
+        return {key: doc for key, doc in docs.items() if doc is not None}
+
+    def discard_version(
+        self,
+        project_id: str,
+        org_id: str,
+        report_type: str,
+        version: int
+    ):
+        """Drop everything saved for an unfinished version, so a new run starts clean."""
+        base_path = self._get_base_path(org_id, project_id, report_type, version)
+        self._clear_staged(base_path)
+
+        if self.storage.use_s3:
+            for f in self.storage.list_files(prefix=f"{base_path}/", max_keys=1000):
+                self.storage.delete_file(f['Key'])
+
     def get_all_sections(
         self,
         project_id: str,
@@ -378,38 +678,129 @@ class ReportStorageService:
     ) -> Dict[str, Any]:
         """
         Get all analysis sections for a report from S3.
+        
+        The version's manifest (or one LIST for versions saved before
+        manifests existed) says which files exist, and they are downloaded
+        concurrently. Completed versions (metadata saved) never change, so
+        their assembled payload is cached without invalidation.
         """
         base_path = self._get_base_path(org_id, project_id, report_type, version)
         logger.info(f"📂 get_all_sections: base_path = {base_path}")
         
+        cache_key = CacheService.make_key('report_sections', base_path)
+        try:
+            cached = cache.get(cache_key)
+        except Exception as e:
+            logger.warning(f"Report sections cache unavailable: {e}")
+            cached = None
+        if cached is not None:
+            logger.info("   ⚡ Sections served from cache")
+            return cached
+        
+        section_types, summary_types = self._section_layout(report_type)
+        files, bundle = self._version_files(base_path)
+        
+        # Until the bundle exists, in-progress docs live in the staging area
+        staged = {} if bundle else self._staged_docs(base_path)
+        if files is not None and staged:
+            files = files + [key for key in staged if key not in files]
+        
+        wanted = ['metadata.json']
+        if report_type == 'crunchbase':
+            wanted.append('analysis/company_overview.json')
+        wanted += [f"analysis/{section_type}.json" for section_type, _ in section_types]
+        wanted += [f"analysis/summaries/{summary_type}.json" for summary_type, _ in summary_types]
+        
+        # Per-company files only count when the section has no single file
+        company_keys: Dict[str, List[str]] = {}
+        if files is not None:
+            available = set(files)
+            wanted = [key for key in wanted if key in available]
+            if report_type in ['crunchbase', 'tracxn']:
+                for section_type, _ in section_types:
+                    if f"analysis/{section_type}.json" in available:
+                        continue
+                    prefix = f"analysis/{section_type}/"
+                    company_keys[section_type] = sorted(key for key in files if key.startswith(prefix))
+        
+        docs = self._load_docs(
+            base_path,
+            wanted + [key for keys in company_keys.values() for key in keys],
+            bundle,
+            staged
+        )
+        
         result = {
-            'metadata': None,
+            'metadata': docs.get('metadata.json'),
             'sections': []
         }
-        
-        # Get metadata
-        metadata_key = f"{base_path}/metadata.json"
-        logger.info(f"   Looking for metadata: {metadata_key}")
-        metadata = self._download_json(metadata_key)
-        if metadata:
-            result['metadata'] = metadata
+        if result['metadata']:
             logger.info(f"   ✅ Found metadata")
         else:
             logger.warning(f"   ❌ No metadata found")
         
-        # Get company overview (Crunchbase specific, but harmless to check or skip)
-        if report_type == 'crunchbase':
-            overview_key = f"{base_path}/analysis/company_overview.json"
-            overview = self._download_json(overview_key)
-            if overview:
+        # Company overview (Crunchbase specific)
+        overview = docs.get('analysis/company_overview.json') if report_type == 'crunchbase' else None
+        if overview:
+            result['sections'].append({
+                'id': 'overview',
+                'title': '📊 Company Overview',
+                'type': 'overview',
+                'content': overview.get('content', '')
+            })
+        
+        # Analysis sections: a single file (Social, overviews), else one file per company
+        for section_type, title in section_types:
+            data = docs.get(f"analysis/{section_type}.json")
+            if data:
                 result['sections'].append({
-                    'id': 'overview',
-                    'title': '📊 Company Overview',
-                    'type': 'overview',
-                    'content': overview.get('content', '')
+                    'id': section_type.replace('_', '-'),
+                    'title': title,
+                    'type': 'section', # Generic type
+                    'content': data.get('content', '')
+                })
+                continue
+            
+            companies = []
+            for key in company_keys.get(section_type, []):
+                company_data = docs.get(key)
+                if company_data:
+                    companies.append({
+                        'name': company_data.get('company_name', 'Unknown'),
+                        'content': company_data.get('content', '')
+                    })
+            
+            if companies:
+                result['sections'].append({
+                    'id': section_type.replace('_', '-'),
+                    'title': title,
+                    'type': 'company',
+                    'companies': companies
+                })
+        
+        # Summaries (mostly for Crunchbase)
+        for summary_type, title in summary_types:
+            summary = docs.get(f"analysis/summaries/{summary_type}.json")
+            if summary:
+                result['sections'].append({
+                    'id': summary_type.replace('_', '-'),
+                    'title': title,
+                    'type': 'summary',
+                    'content': summary.get('content', '')
                 })
         
-        # Define sections based on report type
+        logger.info(f"📊 Total sections found: {len(result['sections'])}")
+        
+        if result['metadata']:
+            try:
+                cache.set(cache_key, result, CacheService.get_ttl('report_sections'))
+            except Exception as e:
+                logger.warning(f"Failed to cache report sections: {e}")
+        return result
+    
+    @staticmethod
+    def _section_layout(report_type: str):
+        """(section_types, summary_types) as (type, title) pairs for a report type."""
         if report_type == 'crunchbase':
             section_types = [
                 ('tech_product', '💻 Technology & Product'),
@@ -470,64 +861,48 @@ class ReportStorageService:
             section_types = []
             summary_types = []
         
-        # Get analysis sections
-        for section_type, title in section_types:
-            # For Social, we saved them as single files (no company subdirs), unless I logic change in tasks.py
-            # In tasks.py: `section_type=key, content=content`.
-            # `save_analysis_section` implementation:
-            # if `company_name` is None: `key = f"{base_path}/analysis/{section_type}.json"` (Fallback)
-            # So for Social, they are single files.
-            
-            # Check for single file first
-            key = f"{base_path}/analysis/{section_type}.json"
-            data = self._download_json(key)
-            if data:
-                 result['sections'].append({
-                    'id': section_type.replace('_', '-'),
-                    'title': title,
-                    'type': 'section', # Generic type
-                    'content': data.get('content', '')
-                })
-                 continue
-
-            # Check for subdirectories (Per Company)
-            if report_type in ['crunchbase', 'tracxn']:
-                section_prefix = f"{base_path}/analysis/{section_type}/"
-                files = self.storage.list_files(prefix=section_prefix)
-                companies = []
-                for f in files:
-                    if f['Key'].endswith('.json'):
-                        company_data = self._download_json(f['Key'])
-                        if company_data:
-                            companies.append({
-                                'name': company_data.get('company_name', 'Unknown'),
-                                'content': company_data.get('content', '')
-                            })
-                
-                if companies:
-                    section_id = section_type.replace('_', '-')
-                    result['sections'].append({
-                        'id': section_id,
-                        'title': title,
-                        'type': 'company',
-                        'companies': companies
-                    })
-        
-        # Get summaries (mostly for Crunchbase)
-        for summary_type, title in summary_types:
-            summary_key = f"{base_path}/analysis/summaries/{summary_type}.json"
-            summary = self._download_json(summary_key)
-            if summary:
-                section_id = summary_type.replace('_', '-')
-                result['sections'].append({
-                    'id': section_id,
-                    'title': title,
-                    'type': 'summary',
-                    'content': summary.get('content', '')
-                })
+        return section_types, summary_types
+    
+    def _version_files(self, base_path: str):
+        """
+        Relative keys of a version's JSON files, and its bundle (or None).
         
-        logger.info(f"📊 Total sections found: {len(result['sections'])}")
-        return result
+        Read from the version's manifest; older versions without one cost a
+        single LIST. Keys are None when listing is unavailable (local storage).
+        """
+        manifest = self._download_json(f"{base_path}/{self.MANIFEST_FILE}")
+        if manifest and manifest.get('files') is not None:
+            return [entry['key'] for entry in manifest['files']], manifest.get('bundle')
+        
+        if not self.storage.use_s3:
+            return None, None
+        files = self.storage.list_files(prefix=f"{base_path}/", max_keys=1000)
+        return [f['Key'][len(base_path) + 1:] for f in files if f['Key'].endswith('.json')], None
+    
+    def _load_docs(
+        self,
+        base_path: str,
+        rel_keys: List[str],
+        bundle: Optional[Dict[str, Any]],
+        staged: Dict[str, Dict]
+    ) -> Dict[str, Optional[Dict]]:
+        """Docs by relative key, from the bundle if there is one, else staging + per-object GETs."""
+        if bundle:
+            return self._read_bundle(base_path, bundle, rel_keys)
+        
+        docs = {key: staged[key] for key in rel_keys if key in staged}
+        docs.update(self._download_many(base_path, [key for key in rel_keys if key not in staged]))
+        return docs
+    
+    def _download_many(self, base_path: str, rel_keys: List[str]) -> Dict[str, Optional[Dict]]:
+        """Download JSON files concurrently, bounded by REPORT_STORAGE_FETCH_WORKERS."""
+        if not rel_keys:
+            return {}
+        
+        workers = min(max(settings.REPORT_STORAGE_FETCH_WORKERS, 1), len(rel_keys))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            docs = pool.map(self._download_json, [f"{base_path}/{key}" for key in rel_keys])
+            return dict(zip(rel_keys, docs))
 
 
 # Singleton instance
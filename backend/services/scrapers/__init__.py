@@ -21,6 +21,7 @@ from tenacity import (
 )
 from core.cache import CacheService
 from core.exceptions import ExternalAPIError, RateLimitError
+from core.async_runtime import http_client
 import logging
 from typing import Optional, Dict, Any, List
 from datetime import datetime, timedelta
@@ -156,45 +157,45 @@ class BaseScraperClient(ABC):
         url = f"{self.base_url}/{endpoint.lstrip('/')}"
         
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.request(
-                    method=method,
-                    url=url,
-                    params=params if method == 'GET' else None,
-                    json=data if method == 'POST' else None,
-                    headers={
-                        'accept': 'application/json',
-                        'Content-Type': 'application/json',
-                    },
+            client = http_client(timeout=self.timeout)
+            response = await client.request(
+                method=method,
+                url=url,
+                params=params if method == 'GET' else None,
+                json=data if method == 'POST' else None,
+                headers={
+                    'accept': 'application/json',
+                    'Content-Type': 'application/json',
+                },
+            )
+            
+            if response.status_code == 429:
+                self.circuit_breaker.record_failure()
+                raise RateLimitError(f"{self.service_name} rate limit exceeded")
+            
+            if response.status_code >= 500:
+                self.circuit_breaker.record_failure()
+                raise ExternalAPIError(f"{self.service_name} server error: {response.status_code}")
+            
+            if response.status_code >= 400:
+                raise ExternalAPIError(f"{self.service_name} error: {response.status_code}")
+            
+            result = response.json()
+            
+            # Record success
+            self.circuit_breaker.record_success()
+            
+            # Cache result
+            if use_cache:
+                CacheService.set_api_response(
+                    self.service_name,
+                    {'key': cache_key},
+                    result,
+                    ttl=self.cache_ttl
                 )
-                
-                if response.status_code == 429:
-                    self.circuit_breaker.record_failure()
-                    raise RateLimitError(f"{self.service_name} rate limit exceeded")
-                
-                if response.status_code >= 500:
-                    self.circuit_breaker.record_failure()
-                    raise ExternalAPIError(f"{self.service_name} server error: {response.status_code}")
-                
-                if response.status_code >= 400:
-                    raise ExternalAPIError(f"{self.service_name} error: {response.status_code}")
-                
-                result = response.json()
-                
-                # Record success
-                self.circuit_breaker.record_success()
-                
-                # Cache result
-                if use_cache:
-                    CacheService.set_api_response(
-                        self.service_name,
-                        {'key': cache_key},
-                        result,
-                        ttl=self.cache_ttl
-                    )
-                
-                return result
-                
+            
+            return result
+            
         except httpx.RequestError as e:
             self.circuit_breaker.record_failure()
             logger.error(f"{self.service_name} request failed: {e}")
@@ -203,17 +204,17 @@ class BaseScraperClient(ABC):
     async def health_check(self) -> Dict[str, Any]:
         """Check health of the scraper service."""
         try:
-            async with httpx.AsyncClient(timeout=httpx.Timeout(10.0)) as client:
-                response = await client.get(f"{self.base_url}/health")
-                is_healthy = response.status_code < 500
-                
-                return {
-                    'service': self.service_name,
-                    'healthy': is_healthy,
-                    'status_code': response.status_code,
-                    'circuit_state': self.circuit_breaker.state.value,
-                    'failures': self.circuit_breaker.failures,
-                }
+            client = http_client(timeout=httpx.Timeout(10.0))
+            response = await client.get(f"{self.base_url}/health")
+            is_healthy = response.status_code < 500
+            
+            return {
+                'service': self.service_name,
+                'healthy': is_healthy,
+                'status_code': response.status_code,
+                'circuit_state': self.circuit_breaker.state.value,
+                'failures': self.circuit_breaker.failures,
+            }
         except Exception as e:
             return {
                 'service': self.service_name,
@@ -12,11 +12,12 @@ Endpoints:
 Per FINAL_ARCHITECTURE_SPECIFICATION.md - Panel 1: Crunchbase Analysis
 """
 import httpx
-import asyncio
 from django.conf import settings
 from services.scrapers import RetryableScraperClient
+from services.orchestrator_client import await_task_status, resolve_tenant
 from core.cache import CacheService
 from core.exceptions import ExternalAPIError
+from core.async_runtime import http_client
 import logging
 from typing import Dict, Any, List, Optional
 
@@ -57,22 +58,22 @@ class CrunchbaseScraperClient(RetryableScraperClient):
             return False
         
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                response = await client.get(f"{self.orchestrator_url}/workers/crunchbase/stats")
-                if response.status_code == 200:
-                    data = response.json()
-                    total_workers = data.get('total', 0)
-                    idle_workers = data.get('idle', 0)
-                    logger.info(f"🔍 Orchestrator: {total_workers} workers ({idle_workers} idle)")
-                    
-                    if total_workers == 0:
-                        logger.warning("⚠️ No workers connected - task will queue until worker connects")
-                    
-                    # Always use orchestrator if it's reachable (tasks will queue)
-                    return True
-                else:
-                    logger.warning(f"Orchestrator stats failed: {response.status_code}")
-                    return False
+            client = http_client(timeout=5.0)
+            response = await client.get(f"{self.orchestrator_url}/workers/crunchbase/stats")
+            if response.status_code == 200:
+                data = response.json()
+                total_workers = data.get('total', 0)
+                idle_workers = data.get('idle', 0)
+                logger.info(f"🔍 Orchestrator: {total_workers} workers ({idle_workers} idle)")
+                
+                if total_workers == 0:
+                    logger.warning("⚠️ No workers connected - task will queue until worker connects")
+                
+                # Always use orchestrator if it's reachable (tasks will queue)
+                return True
+            else:
+                logger.warning(f"Orchestrator stats failed: {response.status_code}")
+                return False
         except Exception as e:
             logger.error(f"❌ Orchestrator unreachable: {e}")
             return False
@@ -82,51 +83,58 @@ class CrunchbaseScraperClient(RetryableScraperClient):
         action: str,
         payload: Dict[str, Any],
         report_id: str,
-        timeout: float = 10800.0  # 3 hour timeout
+        timeout: float = 10800.0,  # 3 hour timeout
+        wait: bool = True
     ) -> Dict[str, Any]:
-        """Submit task to orchestrator and wait for result."""
-        async with httpx.AsyncClient(timeout=httpx.Timeout(timeout, connect=30.0)) as client:
-            # Submit task
-            submit_response = await client.post(
-                f"{self.orchestrator_url}/tasks/submit",
-                json={
-                    "api_type": "crunchbase",
-                    "action": action,
-                    "report_id": report_id,
-                    "payload": payload,
-                    "priority": 5
-                }
-            )
-            
-            if submit_response.status_code != 200:
-                raise Exception(f"Orchestrator submit failed: {submit_response.text}")
-            
-            task_data = submit_response.json()
-            task_id = task_data.get("task_id")
-            logger.info(f"📤 Task submitted to orchestrator: {task_id}")
-            
-            # Poll for completion
-            poll_interval = 5.0  # Check every 5 seconds
-            elapsed = 0.0
-            while elapsed < timeout:
-                await asyncio.sleep(poll_interval)
-                elapsed += poll_interval
-                
-                status_response = await client.get(f"{self.orchestrator_url}/tasks/{task_id}")
-                if status_response.status_code != 200:
-                    continue
-                
-                status_data = status_response.json()
-                task_status = status_data.get("status")
-                
-                if task_status == "completed":
-                    logger.info(f"✅ Orchestrator task completed: {task_id}")
-                    return status_data.get("result", {})
-                elif task_status in ("failed", "cancelled"):
-                    error_msg = status_data.get("error", "Unknown error")
-                    raise Exception(f"Orchestrator task {task_status}: {error_msg}")
-            
+        """
+        Submit task to orchestrator and wait for result.
+        
+        With wait=False, returns {"task_id": ...} right after submitting;
+        the caller collects the result later via task_result().
+        """
+        client = http_client(timeout=httpx.Timeout(timeout, connect=30.0))
+        # Submit task
+        submit_response = await client.post(
+            f"{self.orchestrator_url}/tasks/submit",
+            json={
+                "api_type": "crunchbase",
+                "action": action,
+                "report_id": report_id,
+                "payload": payload,
+                "priority": 5,
+                "tenant_id": await resolve_tenant(report_id)
+            }
+        )
+        
+        if submit_response.status_code != 200:
+            raise Exception(f"Orchestrator submit failed: {submit_response.text}")
+        
+        task_data = submit_response.json()
+        task_id = task_data.get("task_id")
+        logger.info(f"📤 Task submitted to orchestrator: {task_id}")
+        if not wait:
+            return {"task_id": task_id}
+        
+        # Long-poll the orchestrator; it answers as soon as the task finishes
+        try:
+            status_data = await await_task_status(client, self.orchestrator_url, task_id, timeout)
+        except TimeoutError:
             raise Exception(f"Orchestrator task timed out after {timeout}s")
+        except LookupError:
+            raise Exception(f"Orchestrator task {task_id} not found (expired)")
+        
+        return self.task_result(status_data)
+    
+    def task_result(self, status_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Result of a finished orchestrator task; raises if it did not complete."""
+        task_id = status_data.get("task_id")
+        task_status = status_data.get("status")
+        if task_status == "completed":
+            logger.info(f"✅ Orchestrator task completed: {task_id}")
+            return status_data.get("result", {})
+        
+        error_msg = status_data.get("error", "Unknown error")
+        raise Exception(f"Orchestrator task {task_status}: {error_msg}")
     
     async def search_similar_companies(
         self,
@@ -138,11 +146,14 @@ class CrunchbaseScraperClient(RetryableScraperClient):
         similarity_weight: float = 0.75,
         rank_weight: float = 0.25,
         report_id: str = None,  # For real-time status callbacks
+        wait: bool = True,
     ) -> Dict[str, Any]:
         """
         Search for companies using AI-powered similarity + rank scoring.
         
         Uses orchestrator remote workers if available, with fallback to direct API.
+        With wait=False only the orchestrator task id is returned
+        ({"task_id": ...}); pass its final status to search_result() later.
         """
         logger.info(f"Crunchbase similarity search: {len(keywords)} keywords")
         
@@ -175,21 +186,35 @@ class CrunchbaseScraperClient(RetryableScraperClient):
                 payload=request_data,
                 report_id=report_id or "direct-search",
                 # Use default 3-hour timeout - long tasks like scraping can take a while
+                wait=wait
             )
-            # Mark that orchestrator was used - Celery task will skip duplicate progress updates
-            if 'metadata' not in result:
-                result['metadata'] = {}
-            result['metadata']['used_orchestrator'] = True
-            logger.info(
-                f"Crunchbase (orchestrator) returned: "
-                f"{result.get('metadata', {}).get('all_companies_count', 0)} total, "
-                f"{result.get('metadata', {}).get('top_count_returned', 0)} top companies"
-            )
-            return result
+            if not wait:
+                return result
+            return self._orchestrated_result(result)
+        except Exception as e:
+            logger.error(f"Orchestrator task failed: {e}")
+            raise ExternalAPIError(f"Crunchbase scraper failed: {e}")
+    
+    def search_result(self, status_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Result of a search submitted with wait=False, from its final task status."""
+        try:
+            return self._orchestrated_result(self.task_result(status_data))
         except Exception as e:
             logger.error(f"Orchestrator task failed: {e}")
             raise ExternalAPIError(f"Crunchbase scraper failed: {e}")
     
+    def _orchestrated_result(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        # Mark that orchestrator was used - Celery task will skip duplicate progress updates
+        if 'metadata' not in result:
+            result['metadata'] = {}
+        result['metadata']['used_orchestrator'] = True
+        logger.info(
+            f"Crunchbase (orchestrator) returned: "
+            f"{result.get('metadata', {}).get('all_companies_count', 0)} total, "
+            f"{result.get('metadata', {}).get('top_count_returned', 0)} top companies"
+        )
+        return result
+    
     async def search_batch(
         self,
         keywords: List[str],
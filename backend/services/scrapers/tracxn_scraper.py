@@ -12,11 +12,12 @@ Endpoints:
 Per FINAL_ARCHITECTURE_SPECIFICATION.md - Panel 2: Tracxn Analysis
 """
 import httpx
-import asyncio
 from django.conf import settings
 from services.scrapers import RetryableScraperClient
+from services.orchestrator_client import await_task_status, resolve_tenant
 from core.cache import CacheService
 from core.exceptions import ExternalAPIError
+from core.async_runtime import http_client
 import logging
 from typing import Dict, Any, List, Optional
 
@@ -56,22 +57,22 @@ class TracxnScraperClient(RetryableScraperClient):
             return False
         
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                response = await client.get(f"{self.orchestrator_url}/workers/tracxn/stats")
-                if response.status_code == 200:
-                    data = response.json()
-                    total_workers = data.get('total', 0)
-                    idle_workers = data.get('idle', 0)
-                    logger.info(f"🔍 Tracxn Orchestrator: {total_workers} workers ({idle_workers} idle)")
-                    
-                    if total_workers == 0:
-                        logger.error("❌ No Tracxn workers connected to orchestrator")
-                        return False
-                    
-                    return True
-                else:
-                    logger.error(f"❌ Orchestrator stats failed: {response.status_code}")
+            client = http_client(timeout=5.0)
+            response = await client.get(f"{self.orchestrator_url}/workers/tracxn/stats")
+            if response.status_code == 200:
+                data = response.json()
+                total_workers = data.get('total', 0)
+                idle_workers = data.get('idle', 0)
+                logger.info(f"🔍 Tracxn Orchestrator: {total_workers} workers ({idle_workers} idle)")
+                
+                if total_workers == 0:
+                    logger.error("❌ No Tracxn workers connected to orchestrator")
                     return False
+                
+                return True
+            else:
+                logger.error(f"❌ Orchestrator stats failed: {response.status_code}")
+                return False
         except Exception as e:
             logger.error(f"❌ Orchestrator unreachable for Tracxn: {e}")
             return False
@@ -81,51 +82,58 @@ class TracxnScraperClient(RetryableScraperClient):
         action: str,
         payload: Dict[str, Any],
         report_id: str,
-        timeout: float = 10800.0  # 3 hour timeout for long-running Tracxn scrapes
+        timeout: float = 10800.0,  # 3 hour timeout for long-running Tracxn scrapes
+        wait: bool = True
     ) -> Dict[str, Any]:
-        """Submit task to orchestrator and wait for result."""
-        async with httpx.AsyncClient(timeout=httpx.Timeout(timeout, connect=30.0)) as client:
-            # Submit task
-            submit_response = await client.post(
-                f"{self.orchestrator_url}/tasks/submit",
-                json={
-                    "api_type": "tracxn",
-                    "action": action,
-                    "report_id": report_id,
-                    "payload": payload,
-                    "priority": 5
-                }
-            )
-            
-            if submit_response.status_code != 200:
-                raise Exception(f"Orchestrator submit failed: {submit_response.text}")
-            
-            task_data = submit_response.json()
-            task_id = task_data.get("task_id")
-            logger.info(f"📤 Tracxn task submitted to orchestrator: {task_id}")
-            
-            # Poll for completion
-            poll_interval = 5.0  # Check every 5 seconds
-            elapsed = 0.0
-            while elapsed < timeout:
-                await asyncio.sleep(poll_interval)
-                elapsed += poll_interval
-                
-                status_response = await client.get(f"{self.orchestrator_url}/tasks/{task_id}")
-                if status_response.status_code != 200:
-                    continue
-                
-                status_data = status_response.json()
-                task_status = status_data.get("status")
-                
-                if task_status == "completed":
-                    logger.info(f"✅ Tracxn orchestrator task completed: {task_id}")
-                    return status_data.get("result", {})
-                elif task_status in ("failed", "cancelled"):
-                    error_msg = status_data.get("error", "Unknown error")
-                    raise Exception(f"Tracxn orchestrator task {task_status}: {error_msg}")
-            
+        """
+        Submit task to orchestrator and wait for result.
+        
+        With wait=False, returns {"task_id": ...} right after submitting;
+        the caller collects the result later via task_result().
+        """
+        client = http_client(timeout=httpx.Timeout(timeout, connect=30.0))
+        # Submit task
+        submit_response = await client.post(
+            f"{self.orchestrator_url}/tasks/submit",
+            json={
+                "api_type": "tracxn",
+                "action": action,
+                "report_id": report_id,
+                "payload": payload,
+                "priority": 5,
+                "tenant_id": await resolve_tenant(report_id)
+            }
+        )
+        
+        if submit_response.status_code != 200:
+            raise Exception(f"Orchestrator submit failed: {submit_response.text}")
+        
+        task_data = submit_response.json()
+        task_id = task_data.get("task_id")
+        logger.info(f"📤 Tracxn task submitted to orchestrator: {task_id}")
+        if not wait:
+            return {"task_id": task_id}
+        
+        # Long-poll the orchestrator; it answers as soon as the task finishes
+        try:
+            status_data = await await_task_status(client, self.orchestrator_url, task_id, timeout)
+        except TimeoutError:
             raise Exception(f"Tracxn orchestrator task timed out after {timeout}s")
+        except LookupError:
+            raise Exception(f"Tracxn orchestrator task {task_id} not found (expired)")
+        
+        return self.task_result(status_data)
+    
+    def task_result(self, status_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Result of a finished orchestrator task; raises if it did not complete."""
+        task_id = status_data.get("task_id")
+        task_status = status_data.get("status")
+        if task_status == "completed":
+            logger.info(f"✅ Tracxn orchestrator task completed: {task_id}")
+            return status_data.get("result", {})
+        
+        error_msg = status_data.get("error", "Unknown error")
+        raise Exception(f"Tracxn orchestrator task {task_status}: {error_msg}")
     
     async def search_with_ranking(
         self,
@@ -138,6 +146,7 @@ class TracxnScraperClient(RetryableScraperClient):
         score_weight: float = 0.25,
         sort_by: str = "relevance",
         report_id: Optional[str] = None,
+        wait: bool = True,
     ) -> Dict[str, Any]:
         """
         Search for companies with AI similarity + Tracxn score ranking.
@@ -152,6 +161,8 @@ class TracxnScraperClient(RetryableScraperClient):
         
         Args:
             report_id: Optional report ID for status callback updates
+            wait: If False, return {"task_id": ...} right after submitting;
+                pass the task's final status to search_result() later
         
         Per mcp_server/main.py search_tracxn_companies function.
         
@@ -190,8 +201,17 @@ class TracxnScraperClient(RetryableScraperClient):
             action="search_with_rank",
             payload=request_data,
             report_id=report_id or "direct-search",
+            wait=wait
         )
-        
+        if not wait:
+            return result
+        return self._orchestrated_result(result)
+    
+    def search_result(self, status_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Result of a search submitted with wait=False, from its final task status."""
+        return self._orchestrated_result(self.task_result(status_data))
+    
+    def _orchestrated_result(self, result: Dict[str, Any]) -> Dict[str, Any]:
         # Mark that orchestrator was used
         if 'metadata' not in result:
             result['metadata'] = {}
@@ -5,10 +5,11 @@ Wraps the Twitter Worker Agent via Orchestrator.
 Supports remote workers via orchestrator when enabled.
 """
 import httpx
-import asyncio
 from django.conf import settings
 from services.scrapers import RetryableScraperClient
+from services.orchestrator_client import await_task_status, resolve_tenant
 from core.exceptions import ExternalAPIError
+from core.async_runtime import http_client
 import logging
 from typing import Dict, Any, List, Optional
 
@@ -41,17 +42,17 @@ class TwitterScraperClient(RetryableScraperClient):
             return False
         
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                response = await client.get(f"{self.orchestrator_url}/workers/social/stats")
-                if response.status_code == 200:
-                    data = response.json()
-                    total = data.get('total', 0)
-                    if total > 0:
-                        return True
-                    else:
-                        logger.warning("No Twitter workers connected")
-                        return True # Still return True so it queues
-                return False
+            client = http_client(timeout=5.0)
+            response = await client.get(f"{self.orchestrator_url}/workers/social/stats")
+            if response.status_code == 200:
+                data = response.json()
+                total = data.get('total', 0)
+                if total > 0:
+                    return True
+                else:
+                    logger.warning("No Twitter workers connected")
+                    return True # Still return True so it queues
+            return False
         except Exception:
             return False
     
@@ -60,60 +61,71 @@ class TwitterScraperClient(RetryableScraperClient):
         action: str,
         payload: Dict[str, Any],
         report_id: str,
-        timeout: float = 3600.0
+        timeout: float = 3600.0,
+        wait: bool = True
     ) -> Dict[str, Any]:
-        """Submit task to orchestrator and wait for result."""
-        async with httpx.AsyncClient(timeout=httpx.Timeout(timeout, connect=30.0)) as client:
-            # Submit task
-            submit_response = await client.post(
-                f"{self.orchestrator_url}/tasks/submit",
-                json={
-                    "api_type": "social",
-                    "action": action,
-                    "report_id": report_id,
-                    "payload": payload,
-                    "priority": 5
-                }
-            )
-            
-            if submit_response.status_code != 200:
-                raise Exception(f"Orchestrator submit failed: {submit_response.text}")
-            
-            task_data = submit_response.json()
-            task_id = task_data.get("task_id")
-            logger.info(f"📤 Twitter task submitted: {task_id}")
-            
-            # Poll for completion
-            poll_interval = 5.0
-            elapsed = 0.0
-            while elapsed < timeout:
-                await asyncio.sleep(poll_interval)
-                elapsed += poll_interval
-                
-                status_response = await client.get(f"{self.orchestrator_url}/tasks/{task_id}")
-                if status_response.status_code != 200:
-                    continue
-                
-                status_data = status_response.json()
-                task_status = status_data.get("status")
-                
-                if task_status == "completed":
-                    logger.info(f"✅ Twitter task completed: {task_id}")
-                    return status_data.get("result", {})
-                elif task_status in ("failed", "cancelled"):
-                    error_msg = status_data.get("error", "Unknown error")
-                    raise Exception(f"Twitter task {task_status}: {error_msg}")
-            
+        """
+        Submit task to orchestrator and wait for result.
+        
+        With wait=False, returns {"task_id": ...} right after submitting;
+        the caller collects the result later via task_result().
+        """
+        client = http_client(timeout=httpx.Timeout(timeout, connect=30.0))
+        # Submit task
+        submit_response = await client.post(
+            f"{self.orchestrator_url}/tasks/submit",
+            json={
+                "api_type": "social",
+                "action": action,
+                "report_id": report_id,
+                "payload": payload,
+                "priority": 5,
+                "tenant_id": await resolve_tenant(report_id)
+            }
+        )
+        
+        if submit_response.status_code != 200:
+            raise Exception(f"Orchestrator submit failed: {submit_response.text}")
+        
+        task_data = submit_response.json()
+        task_id = task_data.get("task_id")
+        logger.info(f"📤 Twitter task submitted: {task_id}")
+        if not wait:
+            return {"task_id": task_id}
+        
+        # Long-poll the orchestrator; it answers as soon as the task finishes
+        try:
+            status_data = await await_task_status(client, self.orchestrator_url, task_id, timeout)
+        except TimeoutError:
             raise Exception(f"Twitter task timed out after {timeout}s")
+        except LookupError:
+            raise Exception(f"Twitter task {task_id} not found (expired)")
+        
+        return self.task_result(status_data)
+    
+    def task_result(self, status_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Result of a finished orchestrator task; raises if it did not complete."""
+        task_id = status_data.get("task_id")
+        task_status = status_data.get("status")
+        if task_status == "completed":
+            logger.info(f"✅ Twitter task completed: {task_id}")
+            return status_data.get("result", {})
+        
+        error_msg = status_data.get("error", "Unknown error")
+        raise Exception(f"Twitter task {task_status}: {error_msg}")
 
     async def search_tweets(
         self,
         keywords: List[str],
         limit: int = 50,
-        report_id: str = None
+        report_id: str = None,
+        wait: bool = True
     ) -> Dict[str, Any]:
         """
         Search tweets for multiple keywords.
+        
+        With wait=False only the orchestrator task id is returned
+        ({"task_id": ...}); pass its final status to search_result() later.
         """
         logger.info(f"Twitter search: {len(keywords)} keywords")
         
@@ -129,12 +141,21 @@ class TwitterScraperClient(RetryableScraperClient):
             result = await self._submit_to_orchestrator(
                 action="search_tweets",
                 payload=request_data,
-                report_id=report_id or "direct-search"
+                report_id=report_id or "direct-search",
+                wait=wait
             )
             return result
         except Exception as e:
             logger.error(f"Twitter search failed: {e}")
             raise ExternalAPIError(f"Twitter search failed: {e}")
+    
+    def search_result(self, status_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Result of a search submitted with wait=False, from its final task status."""
+        try:
+            return self.task_result(status_data)
+        except Exception as e:
+            logger.error(f"Twitter search failed: {e}")
+            raise ExternalAPIError(f"Twitter search failed: {e}")
 
     async def get_tweet_replies(
         self,
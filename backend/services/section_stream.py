@@ -0,0 +1,114 @@
+"""
+Live streaming of AI-generated report sections over the project WebSocket.
+
+Long report steps (strategic/executive summaries, verdict axes) stream their
+completion through the LLM gateway; SectionStreamPublisher forwards the token
+deltas to the project channel group as `section_delta` events, coalesced to
+at most one message per interval (~5 Hz) per section.
+
+The streamed text is display-only: the final content is still persisted by
+the report task (report_storage.save_analysis_summary / save_analysis_section).
+"""
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from channels.layers import get_channel_layer
+
+logger = logging.getLogger(__name__)
+
+# Default flush interval: 5 messages per second per section
+STREAM_FLUSH_INTERVAL = 0.2
+
+
+class _SectionStream:
+    """Buffers deltas for one section and flushes them on a fixed cadence."""
+
+    def __init__(self, publisher: 'SectionStreamPublisher', section: str):
+        self.publisher = publisher
+        self.section = section
+        self._buffer = []
+        self._seq = 0
+        self._last_flush = 0.0
+        self._timer: Optional[asyncio.Task] = None
+
+    async def __call__(self, delta: str):
+        self._buffer.append(delta)
+        wait = self.publisher.interval - (time.monotonic() - self._last_flush)
+        if wait <= 0:
+            await self._flush()
+        elif self._timer is None:
+            self._timer = asyncio.create_task(self._flush_later(wait))
+
+    async def _flush_later(self, wait: float):
+        await asyncio.sleep(wait)
+        self._timer = None
+        await self._flush()
+
+    async def _flush(self, done: bool = False):
+        if not self._buffer and not done:
+            return
+        delta = "".join(self._buffer)
+        self._buffer = []
+        self._last_flush = time.monotonic()
+        self._seq += 1
+        await self.publisher.send(self.section, delta, self._seq, done)
+
+    async def close(self):
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+        await self._flush(done=True)
+
+
+class SectionStreamPublisher:
+    """
+    Publishes `section_delta` events for one report run.
+
+    Usage:
+        publisher = SectionStreamPublisher(project_id, 'crunchbase', report_id)
+        async with publisher.section('strategic_summary') as on_delta:
+            text = await gateway.complete(prompt, on_delta=on_delta)
+    """
+
+    def __init__(
+        self,
+        project_id: str,
+        report_type: str,
+        report_id: Optional[str] = None,
+        interval: float = STREAM_FLUSH_INTERVAL
+    ):
+        self.group = f"project_{project_id}"
+        self.report_type = report_type
+        self.report_id = report_id
+        self.interval = interval
+        self.channel_layer = get_channel_layer()
+
+    async def send(self, section: str, delta: str, seq: int, done: bool = False):
+        """Send one coalesced delta; streaming is best-effort and never fails the report."""
+        try:
+            await self.channel_layer.group_send(
+                self.group,
+                {
+                    "type": "section_delta",
+                    "report_type": self.report_type,
+                    "report_id": self.report_id,
+                    "section": section,
+                    "delta": delta,
+                    "seq": seq,
+                    "done": done,
+                }
+            )
+        except Exception as e:
+            logger.warning(f"Failed to send section delta for {section}: {e}")
+
+    @asynccontextmanager
+    async def section(self, section: str):
+        """Yield a delta callback for one section; sends the final `done` event on exit."""
+        stream = _SectionStream(self, section)
+        try:
+            yield stream
+        finally:
+            await stream.close()
@@ -0,0 +1,301 @@
+"""
+Tests for the report storage bundle format
+Runs ReportStorageService on local file storage (use_s3=False) with fakeredis
+as the staging area, to cover building a version bundle from section rows
+plus staged docs, range and full bundle reads, and where get_all_sections and
+get_section_file take their docs from before and after the manifest exists.
+
+Run from the backend directory:
+    DJANGO_SETTINGS_MODULE=config.settings_test python manage.py test services
+"""
+
+import gzip
+import json
+import shutil
+import tempfile
+from datetime import timedelta
+from pathlib import Path
+from unittest import mock
+
+import fakeredis
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from apps.organizations.models import Organization
+from apps.projects.models import Project
+from apps.reports.models import Report, ReportAnalysisSection
+from apps.users.models import User
+from core.storage import StorageService
+from services.report_storage import ReportStorageService
+
+
+VERSION = 1
+
+
+class ReportStorageTestCase(TestCase):
+    """A Crunchbase report being generated, local storage and a fresh staging Redis"""
+
+    def setUp(self):
+        media_root = Path(tempfile.mkdtemp(prefix="mn2-report-storage-"))
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        overrides = override_settings(USE_S3=False, MEDIA_ROOT=media_root, REPORT_SECTION_JOURNAL=False)
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        self.media_root = media_root
+        cache.clear()
+
+        user = User.objects.create(email="owner@example.com", username="owner", password="x")
+        org = Organization.objects.create(name="Acme", slug="acme")
+        project = Project.objects.create(organization=org, name="Widgets", created_by=user)
+        self.report = Report.objects.create(
+            project=project, report_type="crunchbase", status="running", started_at=timezone.now()
+        )
+        self.project_id = str(project.id)
+        self.org_id = str(org.id)
+
+        self.service = ReportStorageService()
+        self.service.storage = StorageService()
+        self.service._redis = fakeredis.FakeRedis(server=fakeredis.FakeServer())
+        self.base_path = self.service._get_base_path(self.org_id, self.project_id, "crunchbase", VERSION)
+
+    def add_row(self, section_type, content, company_name="", order=0):
+        return ReportAnalysisSection.objects.create(
+            report=self.report,
+            section_type=section_type,
+            company_name=company_name,
+            content_markdown=content,
+            order=order,
+        )
+
+    def save_section(self, section_type, content, company_name=None, **kwargs):
+        return self.service.save_analysis_section(
+            project_id=self.project_id,
+            org_id=self.org_id,
+            version=VERSION,
+            section_type=section_type,
+            content=content,
+            company_name=company_name,
+            **kwargs,
+        )
+
+    def save_metadata(self):
+        self.service.save_report_metadata(
+            project_id=self.project_id,
+            org_id=self.org_id,
+            version=VERSION,
+            metadata={"report_id": str(self.report.id), "status": "success"},
+        )
+
+    def generate_version(self):
+        """Rows for every section, one doc staged with extra fields, one staged only"""
+        self.add_row("tech_product", "Acme tech (row)", company_name="Acme Corp")
+        self.add_row("tech_product", "Beta tech (row)", company_name="Beta Inc")
+        self.add_row("strategic_summary", "Strategy (row)")
+        self.save_section("tech_product", "Acme tech (staged)", "Acme Corp", metadata={"model": "gpt"})
+        self.service.save_analysis_summary(
+            project_id=self.project_id,
+            org_id=self.org_id,
+            version=VERSION,
+            summary_type="swot_summary",
+            content="SWOT (staged only)",
+        )
+        self.save_metadata()
+
+    def read_json(self, rel_key):
+        return json.loads((self.media_root / self.base_path / rel_key).read_bytes())
+
+    def count_reads(self):
+        """Spy on the storage GETs: (full downloads, range downloads)"""
+        storage = self.service.storage
+        full = mock.patch.object(storage, "download_file", wraps=storage.download_file)
+        ranged = mock.patch.object(storage, "download_range", wraps=storage.download_range)
+        spies = full.start(), ranged.start()
+        self.addCleanup(full.stop)
+        self.addCleanup(ranged.stop)
+        return spies
+
+    def bundle_reads(self, spy):
+        bundle_key = f"{self.base_path}/{ReportStorageService.BUNDLE_FILE}"
+        return [c for c in spy.call_args_list if c.args[0] == bundle_key]
+
+
+class TestBuildBundle(ReportStorageTestCase):
+    def test_each_index_entry_is_one_gzip_member(self):
+        docs = {
+            "metadata.json": {"status": "success"},
+            "analysis/summaries/swot_summary.json": {"summary_type": "swot_summary", "content": "ü ✓"},
+            "analysis/tech_product/acme.json": {"section_type": "tech_product", "content": "x" * 5000},
+        }
+
+        bundle, index = ReportStorageService._build_bundle(docs)
+
+        self.assertEqual(list(index), sorted(docs))
+        offset = 0
+        for key in sorted(docs):
+            start, length = index[key]
+            self.assertEqual(start, offset)  # Members are contiguous
+            entry = json.loads(gzip.decompress(bundle[start:start + length]))
+            self.assertEqual(entry, {"key": key, "doc": docs[key]})
+            offset += length
+        self.assertEqual(offset, len(bundle))
+
+        # The whole bundle is also one valid multi-member gzip stream of JSON lines
+        lines = gzip.decompress(bundle).splitlines()
+        self.assertEqual([json.loads(line)["key"] for line in lines], sorted(docs))
+
+    def test_version_bundle_merges_section_rows_and_staged_docs(self):
+        earlier = self.add_row("tech_product", "Old version", company_name="Gamma LLC")
+        ReportAnalysisSection.objects.filter(id=earlier.id).update(
+            generated_at=self.report.started_at - timedelta(days=1)
+        )
+
+        self.generate_version()
+
+        manifest = self.read_json(ReportStorageService.MANIFEST_FILE)
+        self.assertEqual(manifest["version"], VERSION)
+        self.assertEqual(manifest["bundle"]["codec"], "gzip")
+        index = manifest["bundle"]["index"]
+        expected = {
+            "metadata.json",
+            "analysis/tech_product/acme_corp.json",
+            "analysis/tech_product/beta_inc.json",
+            "analysis/summaries/strategic_summary.json",
+            "analysis/summaries/swot_summary.json",
+        }
+        self.assertEqual(set(index), expected)
+        self.assertEqual({f["key"] for f in manifest["files"]}, expected)
+
+        bundle = (self.media_root / self.base_path / ReportStorageService.BUNDLE_FILE).read_bytes()
+        self.assertEqual(manifest["bundle"]["size"], len(bundle))
+        docs = {entry["key"]: entry["doc"] for entry in map(json.loads, gzip.decompress(bundle).splitlines())}
+
+        # A staged doc wins over its row (it has fields the row lacks)
+        self.assertEqual(docs["analysis/tech_product/acme_corp.json"]["content"], "Acme tech (staged)")
+        self.assertEqual(docs["analysis/tech_product/acme_corp.json"]["metadata"], {"model": "gpt"})
+        # Rows fill in what staging does not have, in the pipeline's key layout
+        beta = docs["analysis/tech_product/beta_inc.json"]
+        self.assertEqual(
+            (beta["section_type"], beta["company_name"], beta["content"]),
+            ("tech_product", "Beta Inc", "Beta tech (row)"),
+        )
+        self.assertEqual(docs["analysis/summaries/strategic_summary.json"]["summary_type"], "strategic_summary")
+        self.assertEqual(docs["analysis/summaries/swot_summary.json"]["content"], "SWOT (staged only)")
+        self.assertEqual(docs["metadata.json"]["report_id"], str(self.report.id))
+
+        # Sections were only staged (journal off), and staging is cleared once bundled
+        self.assertFalse((self.media_root / self.base_path / "analysis").exists())
+        self.assertEqual(self.service._staged_docs(self.base_path), {})
+
+    def test_rows_alone_survive_an_evicted_staging_area(self):
+        self.add_row("tech_product", "Acme tech (row)", company_name="Acme Corp")
+        self.save_section("tech_product", "Acme tech (staged)", "Acme Corp")
+        self.service._redis.flushall()
+
+        self.save_metadata()
+
+        doc = self.service.get_section_file(
+            self.project_id, self.org_id, "crunchbase", VERSION, "analysis/tech_product/acme_corp.json"
+        )
+        self.assertEqual(doc["content"], "Acme tech (row)")
+
+
+class TestReadBundle(ReportStorageTestCase):
+    def setUp(self):
+        super().setUp()
+        self.generate_version()
+        self.full, self.ranged = self.count_reads()
+
+    def test_single_doc_is_a_range_read(self):
+        doc = self.service.get_section_file(
+            self.project_id, self.org_id, "crunchbase", VERSION, "analysis/summaries/swot_summary.json"
+        )
+
+        self.assertEqual(doc["content"], "SWOT (staged only)")
+        self.assertEqual(len(self.bundle_reads(self.ranged)), 1)
+        self.assertEqual(self.bundle_reads(self.full), [])
+        index = self.read_json(ReportStorageService.MANIFEST_FILE)["bundle"]["index"]
+        _, start, length = self.ranged.call_args.args
+        self.assertEqual([start, length], index["analysis/summaries/swot_summary.json"])
+
+    def test_several_docs_are_one_full_read(self):
+        manifest = self.read_json(ReportStorageService.MANIFEST_FILE)
+        keys = ["analysis/tech_product/acme_corp.json", "analysis/tech_product/beta_inc.json", "missing.json"]
+
+        docs = self.service._read_bundle(self.base_path, manifest["bundle"], keys)
+
+        self.assertEqual(set(docs), set(keys[:2]))
+        self.assertEqual(docs["analysis/tech_product/beta_inc.json"]["content"], "Beta tech (row)")
+        self.assertEqual(len(self.bundle_reads(self.full)), 1)
+        self.assertEqual(self.ranged.call_args_list, [])
+
+    def test_file_outside_the_bundle_is_read_directly(self):
+        doc = self.service.get_section_file(
+            self.project_id, self.org_id, "crunchbase", VERSION, ReportStorageService.MANIFEST_FILE
+        )
+
+        self.assertEqual(doc["version"], VERSION)
+        self.assertEqual(self.bundle_reads(self.full) + self.bundle_reads(self.ranged), [])
+
+
+class TestGetAllSections(ReportStorageTestCase):
+    def get_all_sections(self):
+        return self.service.get_all_sections(self.project_id, self.org_id, VERSION, "crunchbase")
+
+    def test_version_with_manifest_is_read_from_the_bundle(self):
+        self.generate_version()
+        # Staged leftovers must not leak into a bundled version
+        self.service._stage(self.base_path, "analysis/summaries/swot_summary.json", {"content": "stale"})
+        full, ranged = self.count_reads()
+
+        result = self.get_all_sections()
+
+        self.assertEqual(result["metadata"]["report_id"], str(self.report.id))
+        sections = {s["id"]: s for s in result["sections"]}
+        self.assertEqual(
+            sections["tech-product"]["companies"],
+            [{"name": "Acme Corp", "content": "Acme tech (staged)"},
+             {"name": "Beta Inc", "content": "Beta tech (row)"}],
+        )
+        self.assertEqual(sections["swot-summary"]["content"], "SWOT (staged only)")
+        # Manifest, then one full bundle GET for everything
+        self.assertEqual(len(self.bundle_reads(full)), 1)
+        self.assertEqual(full.call_count, 2)
+        self.assertEqual(ranged.call_args_list, [])
+
+    def test_completed_version_is_served_from_cache(self):
+        self.generate_version()
+        first = self.get_all_sections()
+        full, ranged = self.count_reads()
+
+        self.assertEqual(self.get_all_sections(), first)
+
+        full.assert_not_called()
+        ranged.assert_not_called()
+
+    def test_version_in_progress_reads_staged_docs(self):
+        self.save_section("tech_product", "Acme tech (staged)", "Acme Corp")
+        self.service.save_analysis_summary(
+            project_id=self.project_id,
+            org_id=self.org_id,
+            version=VERSION,
+            summary_type="swot_summary",
+            content="SWOT (staged)",
+        )
+
+        result = self.get_all_sections()
+
+        self.assertIsNone(result["metadata"])
+        sections = {s["id"]: s for s in result["sections"]}
+        self.assertEqual(sections["swot-summary"]["content"], "SWOT (staged)")
+        self.assertEqual(
+            self.service.get_section_file(
+                self.project_id, self.org_id, "crunchbase", VERSION, "analysis/tech_product/acme_corp.json"
+            )["content"],
+            "Acme tech (staged)",
+        )
+
+        # Not cached while in progress: the finished version is read afresh
+        self.add_row("tech_product", "Acme tech (row)", company_name="Acme Corp")
+        self.save_metadata()
+        self.assertEqual(self.get_all_sections()["metadata"]["status"], "success")
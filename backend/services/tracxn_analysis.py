@@ -13,10 +13,9 @@ import asyncio
 from typing import List, Dict, Any, Optional, Callable
 from datetime import datetime
 
-from openai import AsyncOpenAI
-from django.conf import settings
-
 from .tracxn_prompts import TracxnPromptTemplates
+from .llm_gateway import get_llm_gateway
+from .section_stream import SectionStreamPublisher
 
 logger = logging.getLogger(__name__)
 
@@ -35,7 +34,8 @@ class TracxnAnalysisPipeline:
         self,
         target_market_description: str = "",
         progress_callback: Optional[Callable] = None,
-        model: str = None  # Will use LIARA_MODEL default if not specified
+        model: str = None,  # Will use LIARA_MODEL default if not specified
+        section_stream: Optional[SectionStreamPublisher] = None
     ):
         """
         Initialize the analysis pipeline.
@@ -44,39 +44,36 @@ class TracxnAnalysisPipeline:
             target_market_description: Context for analysis
             progress_callback: Async function to call with progress updates
             model: Model to use (defaults to LIARA_MODEL)
+            section_stream: Optional publisher for streaming summary sections live
         """
         self.target_market_description = target_market_description
         self.progress_callback = progress_callback
+        self.section_stream = section_stream
         
-        # Use Liara model by default (same as Crunchbase)
-        self.model = model or getattr(settings, 'LIARA_MODEL', 'gpt-4o-mini')
-        
-        # Initialize OpenAI client for Liara
-        liara_api_key = getattr(settings, 'LIARA_API_KEY', '')
-        liara_base_url = getattr(settings, 'LIARA_BASE_URL', 'https://ai.liara.ir/api/v1')
-        
-        self.client = AsyncOpenAI(
-            api_key=liara_api_key,
-            base_url=liara_base_url,
-        )
+        # Model override for the primary provider; the gateway picks provider defaults otherwise
+        self.model = model
+        self.gateway = get_llm_gateway()
         
         self.prompts = TracxnPromptTemplates()
         
         # Track timing
         self.step_times = {}
         
-        logger.info(f"Initialized TracxnAnalysisPipeline with model: {self.model}")
+        logger.info("Initialized TracxnAnalysisPipeline (LLM gateway)")
     
-    async def _call_ai(self, prompt: str, max_tokens: int = 4000) -> str:
-        """Call OpenAI API with the given prompt."""
+    async def _call_ai(self, prompt: str, max_tokens: int = 4000, section: str = None) -> str:
+        """
+        Call the LLM gateway with the given prompt.
+        
+        If `section` is given and a section stream is configured, the completion
+        is streamed to the project WebSocket as it is generated.
+        """
+        kwargs = {"model": self.model, "max_tokens": max_tokens, "temperature": 0.7}
         try:
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=max_tokens,
-                temperature=0.7,
-            )
-            return response.choices[0].message.content or ""
+            if section and self.section_stream:
+                async with self.section_stream.section(section) as on_delta:
+                    return await self.gateway.complete(prompt, on_delta=on_delta, **kwargs)
+            return await self.gateway.complete(prompt, **kwargs)
         except Exception as e:
             logger.error(f"AI call failed: {e}")
             raise
@@ -89,6 +86,48 @@ class TracxnAnalysisPipeline:
             except Exception as e:
                 logger.warning(f"Progress callback failed: {e}")
     
+    async def analyze_companies(
+        self,
+        companies: List[Dict[str, Any]],
+        on_company_done: Optional[Callable] = None
+    ) -> List[Dict[str, str]]:
+        """
+        Run the per-company deep dives concurrently under the gateway limiter.
+        
+        Args:
+            companies: Company data dictionaries to analyze
+            on_company_done: Optional async callback(index, report, completed_count)
+                             invoked as each company finishes
+            
+        Returns:
+            Company reports ({company_name, content}) in the original company order;
+            a company whose AI call failed has 'failed': True and a placeholder content
+        """
+        reports: List[Optional[Dict[str, str]]] = [None] * len(companies)
+        completed = 0
+        
+        async def _analyze(i: int, company: Dict[str, Any]):
+            nonlocal completed
+            company_name = company.get('name', company.get('Company Name', f'Company {i+1}'))
+            try:
+                prompt = self.prompts.generate_comprehensive_company_analysis(
+                    company, self.target_market_description
+                )
+                content = await self._call_ai(prompt, max_tokens=4000)
+                reports[i] = {'company_name': company_name, 'content': content}
+            except Exception as e:
+                logger.error(f"Company deep dive failed for {company_name}: {e}")
+                reports[i] = {'company_name': company_name, 'content': f"Analysis error: {str(e)}", 'failed': True}
+            completed += 1
+            if on_company_done:
+                try:
+                    await on_company_done(i, reports[i], completed)
+                except Exception as e:
+                    logger.warning(f"Company completion callback failed for {company_name}: {e}")
+        
+        await asyncio.gather(*[_analyze(i, company) for i, company in enumerate(companies)])
+        return reports
+    
     async def analyze(
         self,
         companies: List[Dict[str, Any]],
@@ -128,23 +167,7 @@ class TracxnAnalysisPipeline:
             logger.info("Step 1/3: Generating Company Deep Dive Reports...")
             await self._update_progress("company_deep_dive", "Generating comprehensive due diligence", 10)
             
-            for i, company in enumerate(companies_to_analyze):
-                company_name = company.get('name', company.get('Company Name', f'Company {i+1}'))
-                try:
-                    prompt = self.prompts.generate_comprehensive_company_analysis(
-                        company, self.target_market_description
-                    )
-                    report = await self._call_ai(prompt, max_tokens=4000)
-                    result['company_reports'].append({
-                        'company_name': company_name,
-                        'content': report
-                    })
-                except Exception as e:
-                    logger.error(f"Company deep dive failed for {company_name}: {e}")
-                    result['company_reports'].append({
-                        'company_name': company_name,
-                        'content': f"Analysis error: {str(e)}"
-                    })
+            result['company_reports'] = await self.analyze_companies(companies_to_analyze)
             
             # ===== Step 2: Executive Summary (5-page) =====
             logger.info("Step 2/3: Generating Executive Summary...")
@@ -154,7 +177,7 @@ class TracxnAnalysisPipeline:
             prompt = self.prompts.generate_executive_summary(
                 report_texts, num_companies, self.target_market_description
             )
-            result['executive_summary'] = await self._call_ai(prompt, max_tokens=5000)
+            result['executive_summary'] = await self._call_ai(prompt, max_tokens=5000, section='executive_summary')
             
             # ===== Step 3: Flash Analysis (2-page synthesis) =====
             logger.info("Step 3/3: Generating Flash Analysis Report...")
@@ -165,7 +188,7 @@ class TracxnAnalysisPipeline:
                 result['executive_summary'],
                 self.target_market_description
             )
-            result['flash_analysis'] = await self._call_ai(prompt, max_tokens=3000)
+            result['flash_analysis'] = await self._call_ai(prompt, max_tokens=3000, section='flash_analysis')
             
             # Calculate processing time
             result['processing_time'] = time.time() - start_time
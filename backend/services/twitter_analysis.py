@@ -5,11 +5,9 @@ Orchestrates AI analysis of Twitter data for Market Reporting.
 import logging
 import asyncio
 import json
-from typing import List, Dict, Any, Optional
-from django.conf import settings
-from openai import AsyncOpenAI
-
+from typing import List, Dict, Any, Optional, Callable
 from services.social_prompts import PromptTemplates
+from services.llm_gateway import get_llm_gateway
 
 logger = logging.getLogger(__name__)
 
@@ -20,36 +18,23 @@ class TwitterAnalysisPipeline:
     """
     
     def __init__(self, target_market_description: str = None, model: str = None):
-        self.api_key = getattr(settings, 'LIARA_API_KEY', None)
-        self.base_url = getattr(settings, 'LIARA_BASE_URL', "https://ai.liara.ir/api/6918348a8376cb0a3e18fdef/v1")
-        self.model = model or getattr(settings, 'LIARA_MODEL', "google/gemini-2.0-flash")
-        
-        if not self.api_key:
-            logger.warning("Liara API Key not found. Analysis will fail.")
-            
-        self.client = AsyncOpenAI(
-            api_key=self.api_key,
-            base_url=self.base_url
-        )
+        # Model override for the primary provider; the gateway picks provider defaults otherwise
+        self.model = model
+        self.gateway = get_llm_gateway()
         self.prompts = PromptTemplates(target_market_description=target_market_description)
 
     async def _call_ai(self, prompt: str) -> str:
         """Helper to call AI."""
         try:
-            # Construct kwargs dynamically
-            kwargs = {
-                "model": self.model,
-                "messages": [{"role": "user", "content": prompt}],
-                "temperature": 0.5, # Slightly lower temp for analytical tasks
-            }
-            
             # Note: Removed JSON mode as new prompts ask for Markdown output
-
-            response = await self.client.chat.completions.create(**kwargs)
-            return response.choices[0].message.content
+            return await self.gateway.complete(
+                prompt,
+                model=self.model,
+                temperature=0.5,  # Slightly lower temp for analytical tasks
+            )
         except Exception as e:
             logger.error(f"AI Call failed: {e}")
-            return "Error generating content."
+            raise
 
     def _prepare_data_context(self, tweets: List[Dict]) -> List[Dict[str, Any]]:
         """
@@ -68,51 +53,75 @@ class TwitterAnalysisPipeline:
         # Limit to reasonable size if needed, but for now passing all
         return context_data[:200] # Cap at 200 tweets to avoid token limits if list is huge
 
-    async def analyze(self, tweets: List[Dict], tracker = None) -> Dict[str, Any]:
+    async def analyze(
+        self,
+        tweets: List[Dict],
+        tracker = None,
+        saved_sections: Optional[Dict[str, str]] = None,
+        on_section_done: Optional[Callable] = None
+    ) -> Dict[str, Any]:
         """
         Run full analysis pipeline and return FORMATTED markdown content.
+        
+        Args:
+            tweets: Tweets to analyze
+            tracker: Optional async progress tracker
+            saved_sections: Content by section key from an earlier run; these
+                            sections are reused instead of generated again
+            on_section_done: Optional async callback(section_key, content)
+                             invoked as each newly generated section finishes
         """
         tweet_data = self._prepare_data_context(tweets)
+        saved_sections = saved_sections or {}
         results = {}
         
+        async def _run_section(key: str, message: str, build_prompt: Callable[[], str]):
+            if tracker:
+                await tracker.start_step(key)
+            content = saved_sections.get(key)
+            if content is not None:
+                if tracker:
+                    await tracker.update_step_message(key, f"Reused {key} from the previous run")
+            else:
+                if tracker:
+                    await tracker.update_step_message(key, message)
+                # Call AI (returns Markdown)
+                content = await self._call_ai(build_prompt())
+                if on_section_done:
+                    try:
+                        await on_section_done(key, content)
+                    except Exception as e:
+                        logger.warning(f"Section completion callback failed for {key}: {e}")
+            
+            # Store result using section key
+            results[key] = content
+            
+            if tracker:
+                await tracker.complete_step(key)
+        
         # 1. Run analysis for all 10 categories
         categories = PromptTemplates.get_all_categories()
         
         for category in categories:
-            if tracker:
-                await tracker.start_step(category)
-                await tracker.update_step_message(category, f"Analyzing {category}...")
-            
-            prompt = self.prompts.generate_category_report(
-                category=category,
-                data=tweet_data,
-                source="twitter"
+            await _run_section(
+                category,
+                f"Analyzing {category}...",
+                lambda category=category: self.prompts.generate_category_report(
+                    category=category,
+                    data=tweet_data,
+                    source="twitter"
+                )
             )
-            
-            # Call AI (returns Markdown)
-            content = await self._call_ai(prompt)
-            
-            # Store result using category as key
-            results[category] = content
-            
-            if tracker:
-                 await tracker.complete_step(category)
 
         # 2. Generate Cross-Cutting Insights
-        cross_cutting_key = 'Cross-Cutting Insights'
-        if tracker:
-            await tracker.start_step(cross_cutting_key)
-            await tracker.update_step_message(cross_cutting_key, "Generating Cross-Cutting Insights...")
-            
-        cross_cutting_prompt = self.prompts.generate_cross_cutting_insights(
-            data=tweet_data,
-            source="twitter"
+        await _run_section(
+            'Cross-Cutting Insights',
+            "Generating Cross-Cutting Insights...",
+            lambda: self.prompts.generate_cross_cutting_insights(
+                data=tweet_data,
+                source="twitter"
+            )
         )
-        cross_cutting_content = await self._call_ai(cross_cutting_prompt)
-        results['Cross-Cutting Insights'] = cross_cutting_content
-        
-        if tracker:
-            await tracker.complete_step(cross_cutting_key)
         
         return results
 
@@ -17,10 +17,9 @@ import asyncio
 from typing import List, Dict, Any, Optional, Callable
 from datetime import datetime
 
-from openai import AsyncOpenAI
-from django.conf import settings
-
 from .verdict_prompts import VerdictPromptTemplates
+from .llm_gateway import get_llm_gateway
+from .section_stream import SectionStreamPublisher
 
 logger = logging.getLogger(__name__)
 
@@ -37,7 +36,8 @@ class VerdictAnalysisPipeline:
         self,
         project_description: str = "",
         progress_callback: Optional[Callable] = None,
-        model: str = None
+        model: str = None,
+        section_stream: Optional[SectionStreamPublisher] = None
     ):
         """
         Initialize the verdict analysis pipeline.
@@ -46,44 +46,42 @@ class VerdictAnalysisPipeline:
             project_description: Context about the startup being analyzed
             progress_callback: Async function to call with progress updates
             model: Model to use (defaults to LIARA_MODEL)
+            section_stream: Optional publisher for streaming sections live
         """
         self.project_description = project_description
         self.progress_callback = progress_callback
+        self.section_stream = section_stream
         
-        # Use Liara model by default
-        self.model = model or getattr(settings, 'LIARA_MODEL', 'gpt-4o-mini')
-        
-        # Initialize OpenAI client for Liara
-        liara_api_key = getattr(settings, 'LIARA_API_KEY', '')
-        liara_base_url = getattr(settings, 'LIARA_BASE_URL', 'https://ai.liara.ir/api/v1')
-        
-        self.client = AsyncOpenAI(
-            api_key=liara_api_key,
-            base_url=liara_base_url,
-        )
+        # Model override for the primary provider; the gateway picks provider defaults otherwise
+        self.model = model
+        self.gateway = get_llm_gateway()
         
         self.prompts = VerdictPromptTemplates()
         
         # Track timing
         self.step_times = {}
         
-        logger.info(f"Initialized VerdictAnalysisPipeline with model: {self.model}")
+        logger.info("Initialized VerdictAnalysisPipeline (LLM gateway)")
     
-    async def _call_ai(self, prompt: str, system_message: str = None, max_tokens: int = 4000) -> str:
-        """Call OpenAI API with the given prompt."""
+    async def _call_ai(
+        self,
+        prompt: str,
+        system_message: str = None,
+        max_tokens: int = 4000,
+        section: str = None
+    ) -> str:
+        """
+        Call the LLM gateway with the given prompt.
+        
+        If `section` is given and a section stream is configured, the completion
+        is streamed to the project WebSocket as it is generated.
+        """
+        kwargs = {"system": system_message, "model": self.model, "max_tokens": max_tokens, "temperature": 0.7}
         try:
-            messages = []
-            if system_message:
-                messages.append({"role": "system", "content": system_message})
-            messages.append({"role": "user", "content": prompt})
-            
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                max_tokens=max_tokens,
-                temperature=0.7,
-            )
-            return response.choices[0].message.content or ""
+            if section and self.section_stream:
+                async with self.section_stream.section(section) as on_delta:
+                    return await self.gateway.complete(prompt, on_delta=on_delta, **kwargs)
+            return await self.gateway.complete(prompt, **kwargs)
         except Exception as e:
             logger.error(f"AI call failed: {e}")
             raise
@@ -176,7 +174,7 @@ class VerdictAnalysisPipeline:
                 crunchbase_data, tracxn_data, social_data, 
                 self.project_description, result['data_classification']
             )
-            result['executive_synthesis'] = await self._call_ai(prompt, system_prompt)
+            result['executive_synthesis'] = await self._call_ai(prompt, system_prompt, section='executive_synthesis')
             
             if tracker:
                 await tracker.complete_step('executive_synthesis')
@@ -199,7 +197,7 @@ class VerdictAnalysisPipeline:
                 prompt = self.prompts.generate_scoring_prompt(
                     axis_name, weight, crunchbase_data, tracxn_data, social_data, self.project_description
                 )
-                response = await self._call_ai(prompt, system_prompt)
+                response = await self._call_ai(prompt, system_prompt, section=step_key)
                 score_data = self._parse_json_safely(response, {"score": 50, "confidence": "low"})
                 result['scores'][axis_name] = score_data
                 
@@ -216,7 +214,7 @@ class VerdictAnalysisPipeline:
             prompt = self.prompts.generate_risk_synthesis_prompt(
                 result['scores'], crunchbase_data, tracxn_data, social_data, self.project_description
             )
-            response = await self._call_ai(prompt, system_prompt)
+            response = await self._call_ai(prompt, system_prompt, section='risk_synthesis')
             result['risks'] = self._parse_json_safely(response, {"killer_risks": [], "major_risks": [], "minor_risks": []})
             
             killer_count = result['risks'].get('total_killer_risks', len(result['risks'].get('killer_risks', [])))
@@ -233,7 +231,7 @@ class VerdictAnalysisPipeline:
                 await tracker.update_step_message('verdict_decision', "Determining GO/ITERATE/KILL verdict...")
             
             prompt = self.prompts.generate_verdict_prompt(result['scores'], result['risks'], self.project_description)
-            response = await self._call_ai(prompt, system_prompt)
+            response = await self._call_ai(prompt, system_prompt, section='verdict_decision')
             result['verdict'] = self._parse_json_safely(response, {"verdict": "ITERATE", "total_score": 50})
             
             if tracker:
@@ -255,7 +253,7 @@ class VerdictAnalysisPipeline:
             prompt = self.prompts.generate_roadmap_prompt(
                 result['verdict'], result['risks'], result['scores'], self.project_description
             )
-            response = await self._call_ai(prompt, system_prompt)
+            response = await self._call_ai(prompt, system_prompt, section='roadmap')
             result['roadmap'] = self._parse_json_safely(response)
             
             if tracker:
@@ -31,6 +31,12 @@ interface ProgressStep {
     error_message: string;
 }
 
+// Changed step in a report_progress_delta event (details are only the newly appended ones)
+type ProgressStepDelta = Omit<ProgressStep, 'details'> & {
+    new_details: ProgressStep['details'];
+    details_reset?: boolean;
+};
+
 // Time estimation for remaining report generation
 interface TimeEstimate {
     total_estimated_seconds: number;
@@ -200,6 +206,8 @@ export default function ProjectPage() {
 
     const wsRef = useRef<WebSocket | null>(null);
     const wsReconnectAttempts = useRef<number>(0);
+    // Last applied progress sequence number per report_id (delta protocol)
+    const progressSeqRef = useRef<Record<string, number>>({});
     const messagesEndRef = useRef<HTMLDivElement>(null);
     const textareaRef = useRef<HTMLTextAreaElement>(null);
 
@@ -346,6 +354,7 @@ export default function ProjectPage() {
         ws.onopen = () => {
             console.log('🔌 WebSocket connected');
             wsReconnectAttempts.current = 0; // Reset on successful connection
+            progressSeqRef.current = {}; // Server sends fresh snapshots on connect
             // Refresh data when reconnected to ensure UI is up to date
             fetchProjectData();
         };
@@ -360,7 +369,12 @@ export default function ProjectPage() {
             } else if (data.type === "status") {
                 setIsTyping(data.status === "thinking");
             } else if (data.type === "report_progress") {
+                if (data.report_id && typeof data.seq === "number") {
+                    progressSeqRef.current[data.report_id] = data.seq;
+                }
                 updateReportProgress(data);
+            } else if (data.type === "report_progress_delta") {
+                applyProgressDelta(data);
             } else if (data.type === "auto_fill") {
                 // Handle AI auto-fill event
                 handleAutoFill(data.field, data.value, data.confidence);
@@ -490,6 +504,63 @@ export default function ProjectPage() {
         }
     };
 
+    const requestProgressResync = (reportId: string) => {
+        if (wsRef.current && wsRef.current.readyState === WebSocket.OPEN) {
+            wsRef.current.send(JSON.stringify({ type: "progress_resync", report_id: reportId }));
+        }
+    };
+
+    const applyProgressDelta = (data: {
+        report_type: string;
+        report_id: string;
+        seq: number;
+        reset?: boolean;
+        progress: number;
+        current_step: string;
+        status?: string;
+        steps: ProgressStepDelta[];
+        time_estimate?: TimeEstimate;
+    }) => {
+        const lastSeq = progressSeqRef.current[data.report_id];
+        if (!data.reset && (lastSeq === undefined || data.seq !== lastSeq + 1)) {
+            if (lastSeq !== undefined && data.seq <= lastSeq) return; // Already applied
+            console.log(`📡 Progress gap for ${data.report_type} (have ${lastSeq}, got ${data.seq}), resyncing`);
+            requestProgressResync(data.report_id);
+            return;
+        }
+        progressSeqRef.current[data.report_id] = data.seq;
+
+        const mergeSteps = (current: ProgressStep[]): ProgressStep[] => {
+            const byKey = new Map(current.map((step) => [step.step_key, step]));
+            for (const { new_details, details_reset, ...fields } of data.steps) {
+                const existing = byKey.get(fields.step_key);
+                const details = details_reset || !existing
+                    ? new_details
+                    : [...existing.details, ...new_details].slice(-50);
+                byKey.set(fields.step_key, { ...existing, ...fields, details });
+            }
+            return Array.from(byKey.values()).sort((a, b) => a.step_number - b.step_number);
+        };
+
+        setReports((prev) =>
+            prev.map((r) =>
+                r.report_type === data.report_type
+                    ? {
+                        ...r,
+                        progress: data.progress,
+                        current_step: data.current_step,
+                        status: data.status || (data.progress === 100 ? "completed" : "running"),
+                        progress_steps: mergeSteps(data.reset ? [] : r.progress_steps || []),
+                        time_estimate: data.time_estimate || r.time_estimate
+                    }
+                    : r
+            )
+        );
+        if (data.progress === 100) {
+            setTimeout(fetchProjectData, 1000);
+        }
+    };
+
     const sendMessage = () => {
         if (!newMessage.trim() || !wsRef.current) return;
         wsRef.current.send(JSON.stringify({
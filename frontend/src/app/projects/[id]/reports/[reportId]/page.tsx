@@ -19,6 +19,14 @@ interface ReportSection {
     companies?: { name: string; content: string }[];
 }
 
+interface SectionDelta {
+    report_id: string | null;
+    section: string;
+    delta: string;
+    seq: number;
+    done: boolean;
+}
+
 interface Report {
     id: string;
     report_type: string;
@@ -76,6 +84,9 @@ export default function ReportPage() {
     const [mobileFullscreenPanel, setMobileFullscreenPanel] = useState<'sidebar' | 'chat' | null>(null);
 
     const wsRef = useRef<WebSocket | null>(null);
+    // Last applied section_delta seq per streaming section id
+    const streamSeqRef = useRef<Record<string, number>>({});
+    const reportStatusRef = useRef<string | null>(null);
     const messagesEndRef = useRef<HTMLDivElement>(null);
     const textareaRef = useRef<HTMLTextAreaElement>(null);
     const mainContentRef = useRef<HTMLDivElement>(null);
@@ -189,6 +200,43 @@ export default function ReportPage() {
         }
     };
 
+    // Live text of a section while the report generates. Each run of a section
+    // streams seq 1, 2, ... and ends with done; a stream joined midway is skipped.
+    const applySectionDelta = (data: SectionDelta) => {
+        if (data.report_id !== reportId || requestedVersion !== null) return;
+        const sectionId = data.section.replace(/_/g, '-');
+        const lastSeq = streamSeqRef.current[sectionId];
+        if (data.seq !== 1 && (lastSeq === undefined || data.seq <= lastSeq)) return;
+
+        if (data.done) {
+            delete streamSeqRef.current[sectionId];
+        } else {
+            streamSeqRef.current[sectionId] = data.seq;
+        }
+
+        setSections((prev) => {
+            const existing = prev.find((s) => s.id === sectionId);
+            if (!existing) {
+                const title = data.section.replace(/_/g, ' ').replace(/\b\w/g, (c) => c.toUpperCase());
+                return [...prev, { id: sectionId, title, type: 'summary', content: data.delta }];
+            }
+            // seq 1 starts a new run: drop the previous version's text
+            const content = data.seq === 1 ? data.delta : (existing.content || '') + data.delta;
+            return prev.map((s) => (s.id === sectionId ? { ...s, content } : s));
+        });
+    };
+
+    // Once the report completes, replace the streamed text with the persisted sections
+    const handleReportProgress = (data: { report_id: string; status?: string }) => {
+        if (data.report_id !== reportId || !data.status) return;
+        const previous = reportStatusRef.current;
+        reportStatusRef.current = data.status;
+        if (data.status === 'completed' && previous !== 'completed') {
+            streamSeqRef.current = {};
+            fetchData();
+        }
+    };
+
     const connectWebSocket = () => {
         const ws = new WebSocket(`${WS_URL}/ws/projects/${projectId}/chat/?token=${token}`);
         ws.onmessage = (event) => {
@@ -200,6 +248,10 @@ export default function ReportPage() {
                 setIsTyping(false);
             } else if (data.type === "status") {
                 setIsTyping(data.status === "thinking");
+            } else if (data.type === "section_delta") {
+                applySectionDelta(data);
+            } else if (data.type === "report_progress" || data.type === "report_progress_delta") {
+                handleReportProgress(data);
             }
         };
         wsRef.current = ws;
@@ -0,0 +1,52 @@
+"""
+Coalescing - identifies identical task requests.
+Reports on the same project (or projects sharing generated keywords) often
+submit the same scrape; TaskQueue runs one of them and fans the status
+updates and result out to every attached report.
+"""
+import hashlib
+import json
+from typing import Any, Dict, Optional
+
+import config
+
+
+# Payload keys that identify the requester rather than the work
+IGNORED_PAYLOAD_KEYS = ("report_id", "request_id")
+
+
+def canonical_payload(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Payload without requester-specific keys; strings trimmed."""
+    def normalize(value):
+        if isinstance(value, str):
+            return value.strip()
+        if isinstance(value, list):
+            return [normalize(v) for v in value]
+        if isinstance(value, dict):
+            return {k: normalize(v) for k, v in value.items()}
+        return value
+    
+    return {
+        key: normalize(value)
+        for key, value in payload.items()
+        if key not in IGNORED_PAYLOAD_KEYS
+    }
+
+
+def task_fingerprint(api_type: str, action: str, payload: Dict[str, Any]) -> Optional[str]:
+    """
+    Stable hash of a task request, or None if the action is not coalesced.
+    
+    Keys are sorted so dict ordering does not matter; list order does
+    (keyword order drives progress indices and ranking tie-breaks).
+    """
+    if not config.COALESCE_ENABLED or action not in config.COALESCE_ACTIONS:
+        return None
+    
+    canonical = json.dumps(
+        {"api_type": api_type, "action": action, "payload": canonical_payload(payload)},
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
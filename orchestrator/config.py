@@ -3,6 +3,7 @@ Orchestrator Configuration.
 Load settings from environment variables with sensible defaults.
 """
 import os
+import socket
 from typing import Dict, List
 
 
@@ -10,6 +11,10 @@ from typing import Dict, List
 ORCHESTRATOR_HOST = os.getenv("ORCHESTRATOR_HOST", "0.0.0.0")
 ORCHESTRATOR_PORT = int(os.getenv("ORCHESTRATOR_PORT", "8010"))
 
+# Node identity - must be unique per running orchestrator replica; workers
+# connected to this node are reached via the orchestrator:node:<NODE_ID> channel
+NODE_ID = os.getenv("ORCHESTRATOR_NODE_ID") or f"{socket.gethostname()}-{os.getpid()}"
+
 # Redis settings
 REDIS_URL = os.getenv("REDIS_URL", "redis://redis:6379/1")
 
@@ -18,6 +23,25 @@ BACKEND_STATUS_URL = os.getenv(
     "BACKEND_STATUS_URL", 
     "http://backend:8000/api/reports/status-update/"
 )
+# Bulk endpoint (JSON array of updates); defaults to BACKEND_STATUS_URL + "bulk/"
+BACKEND_STATUS_BULK_URL = os.getenv("BACKEND_STATUS_BULK_URL", "")
+
+# Status relay batching and backpressure
+STATUS_RELAY_QUEUE_SIZE = int(os.getenv("STATUS_RELAY_QUEUE_SIZE", "5000"))
+STATUS_RELAY_BATCH_SIZE = int(os.getenv("STATUS_RELAY_BATCH_SIZE", "200"))
+STATUS_RELAY_BATCH_WINDOW = float(os.getenv("STATUS_RELAY_BATCH_WINDOW", "0.1"))  # seconds
+# Detail types that may be merged (latest wins) or dropped under overload
+STATUS_RELAY_LOW_VALUE_TYPES = {
+    t.strip()
+    for t in os.getenv(
+        "STATUS_RELAY_LOW_VALUE_TYPES",
+        "status,progress,company_processing,fetching_details,sorting"
+    ).split(",")
+    if t.strip()
+}
+# Detail type of the update relayed when a report's task finishes; the
+# backend resumes the report parked on it instead of polling
+TASK_TERMINAL_DETAIL_TYPE = "task_terminal"
 
 # Worker authentication tokens (loaded from environment)
 # Format: WORKER_TOKENS_CRUNCHBASE=token1,token2,token3
@@ -43,6 +67,8 @@ WORKER_TOKENS: Dict[str, List[str]] = _load_tokens()
 # Worker health settings
 WORKER_HEARTBEAT_INTERVAL = int(os.getenv("WORKER_HEARTBEAT_INTERVAL", "10"))  # seconds
 WORKER_TIMEOUT = int(os.getenv("WORKER_TIMEOUT", "300"))  # 5 minutes for idle workers
+# Upper bound on the task slots a worker may advertise via auth metadata "capacity"
+WORKER_MAX_CAPACITY = int(os.getenv("WORKER_MAX_CAPACITY", "8"))
 
 # Task settings
 # TASK_TIMEOUT is the expected max duration for a task. Redis TTL is 2x this value.
@@ -50,5 +76,103 @@ WORKER_TIMEOUT = int(os.getenv("WORKER_TIMEOUT", "300"))  # 5 minutes for idle w
 TASK_TIMEOUT = int(os.getenv("TASK_TIMEOUT", "7200"))  # 2 hours default
 TASK_RETRY_LIMIT = int(os.getenv("TASK_RETRY_LIMIT", "3"))
 
+# Task leases - an assigned task must be acknowledged ("running") within the
+# dispatch timeout; after that each worker heartbeat extends its tasks' leases
+# by TASK_LEASE_SECONDS. The reaper requeues (or fails) tasks whose lease expired.
+TASK_DISPATCH_TIMEOUT = int(os.getenv("TASK_DISPATCH_TIMEOUT", "60"))
+TASK_LEASE_SECONDS = int(os.getenv("TASK_LEASE_SECONDS", "120"))
+TASK_REAPER_INTERVAL = int(os.getenv("TASK_REAPER_INTERVAL", "15"))
+
+
+# Per-action execution budgets (seconds from start) - leases are never renewed
+# past the budget. Format: TASK_ACTION_TIMEOUTS=search_with_rank=7200,tracxn:search=3600
+# Keys are "<api_type>:<action>" or "<action>"; unlisted actions use TASK_TIMEOUT.
+def _load_action_timeouts() -> Dict[str, int]:
+    """Load per-action timeout budgets from environment variables."""
+    timeouts = {
+        "enrich": 3600,
+        "health": 60,
+    }
+    
+    for entry in os.getenv("TASK_ACTION_TIMEOUTS", "").split(","):
+        key, _, seconds = entry.partition("=")
+        if key.strip() and seconds.strip().isdigit():
+            timeouts[key.strip()] = int(seconds)
+    
+    return timeouts
+
+
+TASK_ACTION_TIMEOUTS: Dict[str, int] = _load_action_timeouts()
+
+# Fair-share scheduling - tasks are ordered by their tenant's virtual clock,
+# which advances TASK_FAIR_SHARE_QUANTUM / weight per task, so a tenant with a
+# burst of tasks is interleaved with everyone else. One priority level is worth
+# TASK_PRIORITY_AGING_SECONDS of queue wait (backend 5 vs enrichment -10 =
+# 15 levels), so low-priority work still runs once it has waited long enough.
+TASK_FAIR_SHARE_QUANTUM = float(os.getenv("TASK_FAIR_SHARE_QUANTUM", "60"))
+TASK_PRIORITY_AGING_SECONDS = float(os.getenv("TASK_PRIORITY_AGING_SECONDS", "60"))
+# Max leased tasks per tenant per api_type (0 = unlimited)
+TENANT_MAX_CONCURRENCY = int(os.getenv("TENANT_MAX_CONCURRENCY", "4"))
+TASK_SCHEDULER_SCAN_DEPTH = int(os.getenv("TASK_SCHEDULER_SCAN_DEPTH", "50"))
+# ETA for the queue position API before an action has completed once
+TASK_ETA_DEFAULT_SECONDS = float(os.getenv("TASK_ETA_DEFAULT_SECONDS", "600"))
+
+
+# Tenant weights. Format: TENANT_WEIGHTS=org:<id>=2,enrichment=0.5
+def _load_tenant_weights() -> Dict[str, float]:
+    """Load fair-share tenant weights from environment variables."""
+    weights = {
+        "enrichment": 0.5,
+    }
+    
+    for entry in os.getenv("TENANT_WEIGHTS", "").split(","):
+        tenant, _, weight = entry.rpartition("=")
+        try:
+            if tenant.strip() and float(weight) > 0:
+                weights[tenant.strip()] = float(weight)
+        except ValueError:
+            continue
+    
+    return weights
+
+
+TENANT_WEIGHTS: Dict[str, float] = _load_tenant_weights()
+
+# Task completion push (/tasks/{id}/wait long-poll and /tasks/events SSE)
+TASK_WAIT_TIMEOUT = float(os.getenv("TASK_WAIT_TIMEOUT", "60"))  # default long-poll window
+TASK_WAIT_MAX_TIMEOUT = float(os.getenv("TASK_WAIT_MAX_TIMEOUT", "300"))
+TASK_EVENTS_KEEPALIVE = float(os.getenv("TASK_EVENTS_KEEPALIVE", "15"))  # seconds
+
+# Scatter/gather - multi-keyword searches are split into per-chunk collection
+# sub-tasks across free worker slots, then ranked by one gather task
+SCATTER_ENABLED = os.getenv("SCATTER_ENABLED", "true").lower() in ("true", "1", "yes")
+SCATTER_MIN_CHUNK = int(os.getenv("SCATTER_MIN_CHUNK", "2"))  # keywords per sub-task
+
+# Request coalescing - identical tasks (same api_type, action and payload) share
+# one execution: in-flight duplicates attach to the running task, and a result
+# completed within the freshness window is reused. Results are kept 1 hour, so
+# windows above 3600s are effectively capped.
+COALESCE_ENABLED = os.getenv("COALESCE_ENABLED", "true").lower() in ("true", "1", "yes")
+COALESCE_ACTIONS = [
+    a.strip()
+    for a in os.getenv("COALESCE_ACTIONS", "search_with_rank,search,search_batch,search_by_references").split(",")
+    if a.strip()
+]
+COALESCE_FRESHNESS_SECONDS = int(os.getenv("COALESCE_FRESHNESS_SECONDS", "900"))
+
+# Result offload - results larger than the threshold are compressed and stored
+# outside the task record: RESULT_STORE_BACKEND=redis (separate key, same TTL as
+# the task) or s3 (MinIO/S3 via boto3; expire objects with a bucket lifecycle rule)
+RESULT_OFFLOAD_THRESHOLD = int(os.getenv("RESULT_OFFLOAD_THRESHOLD", "32768"))  # bytes of JSON
+RESULT_STORE_BACKEND = os.getenv("RESULT_STORE_BACKEND", "redis").lower()
+RESULT_COMPRESSION = os.getenv("RESULT_COMPRESSION", "zstd").lower()  # zstd or gzip
+RESULT_COMPRESSION_LEVEL = int(os.getenv("RESULT_COMPRESSION_LEVEL", "6"))
+RESULT_S3_ENDPOINT_URL = os.getenv("RESULT_S3_ENDPOINT_URL", "http://minio:9000")
+RESULT_S3_BUCKET = os.getenv("RESULT_S3_BUCKET", "orchestrator-results")
+RESULT_S3_PREFIX = os.getenv("RESULT_S3_PREFIX", "task-results")
+RESULT_S3_ACCESS_KEY = os.getenv("RESULT_S3_ACCESS_KEY", "minioadmin")
+RESULT_S3_SECRET_KEY = os.getenv("RESULT_S3_SECRET_KEY", "minioadmin")
+RESULT_S3_REGION = os.getenv("RESULT_S3_REGION", "us-east-1")
+
 # Logging
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
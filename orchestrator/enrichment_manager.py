@@ -27,6 +27,7 @@ class EnrichmentManager:
       2. No pending backend tasks in queue
       3. Enrichment is not paused
     - Freezes on backend request, resumes when queue is empty
+    - Runs on one orchestrator node at a time (Redis leader lock)
     """
     
     # Backend URL for enrichment API
@@ -35,6 +36,10 @@ class EnrichmentManager:
     # Enrichment task parameters
     DAYS_THRESHOLD = 180  # Skip companies scraped within 180 days
     
+    # Only the node holding this lock dispatches enrichment
+    LEADER_KEY = "enrichment:leader"
+    LEADER_TTL = 90  # seconds; renewed every monitor cycle
+    
     def __init__(self, redis_client, registry, task_queue):
         self.redis = redis_client
         self.registry = registry
@@ -69,6 +74,9 @@ class EnrichmentManager:
             try:
                 await asyncio.sleep(30)  # Check every 30 seconds
                 
+                if not await self._hold_leadership():
+                    continue
+                
                 if await self.should_enrich():
                     await self.dispatch_next_enrichment()
                     
@@ -78,6 +86,17 @@ class EnrichmentManager:
                 logger.error(f"Enrichment monitor error: {e}")
                 await asyncio.sleep(60)  # Wait longer on error
     
+    async def _hold_leadership(self) -> bool:
+        """Acquire or renew the enrichment leader lock for this node."""
+        acquired = await self.redis.set(self.LEADER_KEY, config.NODE_ID, nx=True, ex=self.LEADER_TTL)
+        if acquired:
+            return True
+        
+        if await self.redis.get(self.LEADER_KEY) == config.NODE_ID:
+            await self.redis.expire(self.LEADER_KEY, self.LEADER_TTL)
+            return True
+        return False
+    
     async def should_enrich(self) -> bool:
         """
         Check if conditions allow dispatching an enrichment task.
@@ -96,7 +115,7 @@ class EnrichmentManager:
             return False
         
         # Check for idle workers
-        idle_workers = self.registry.get_idle_workers("crunchbase")
+        idle_workers = await self.registry.get_idle_workers("crunchbase")
         if not idle_workers:
             logger.debug("Skipping enrichment: no idle Crunchbase workers")
             return False
@@ -0,0 +1,110 @@
+"""
+Metrics - Prometheus instrumentation for the orchestrator.
+Histograms and counters are recorded where things happen (task_queue,
+registry, status_relay) and are per node; gauges are refreshed from Redis
+when /metrics is scraped, so they describe the whole cluster.
+"""
+from datetime import datetime
+from typing import Optional
+
+from prometheus_client import Counter, Gauge, Histogram, generate_latest
+
+
+# Task timings (seconds)
+TASK_QUEUE_WAIT = Histogram(
+    "orchestrator_task_queue_wait_seconds",
+    "Time from task creation to assignment to a worker",
+    ["api_type", "action"],
+    buckets=(0.1, 0.5, 1, 5, 15, 30, 60, 120, 300, 600, 1800, 3600),
+)
+TASK_DISPATCH_LATENCY = Histogram(
+    "orchestrator_task_dispatch_seconds",
+    "Time from assignment to the worker acknowledging (running)",
+    ["api_type", "action"],
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+)
+TASK_EXECUTION = Histogram(
+    "orchestrator_task_execution_seconds",
+    "Time from start of execution to completion or failure",
+    ["api_type", "action", "status"],
+    buckets=(1, 5, 15, 30, 60, 120, 300, 600, 1200, 1800, 3600, 7200),
+)
+
+# Task outcomes
+TASK_RETRIES = Counter(
+    "orchestrator_task_retries_total",
+    "Task attempts that failed and were requeued",
+    ["api_type", "action"],
+)
+TASK_FAILURES = Counter(
+    "orchestrator_task_failures_total",
+    "Tasks that failed permanently",
+    ["api_type", "action"],
+)
+TASKS_REAPED = Counter(
+    "orchestrator_tasks_reaped_total",
+    "Tasks reclaimed by the lease reaper",
+    ["api_type", "reason"],
+)
+
+# Queue and workers (refreshed on scrape)
+QUEUE_PENDING = Gauge(
+    "orchestrator_queue_pending",
+    "Tasks waiting in the queue",
+    ["api_type"],
+)
+TASKS_IN_FLIGHT = Gauge(
+    "orchestrator_tasks_in_flight",
+    "Leased tasks by status",
+    ["api_type", "status"],
+)
+WORKERS = Gauge(
+    "orchestrator_workers",
+    "Connected workers by status",
+    ["api_type", "status"],
+)
+WORKER_SLOTS = Gauge(
+    "orchestrator_worker_slots",
+    "Worker task slots by state",
+    ["api_type", "state"],
+)
+WEBSOCKET_CONNECTIONS = Gauge(
+    "orchestrator_websocket_connections",
+    "Worker WebSockets held by this node",
+)
+
+# Status relay
+STATUS_UPDATES = Counter(
+    "orchestrator_status_updates_total",
+    "Worker status updates by relay outcome",
+    ["outcome"],
+)
+STATUS_RELAY_LATENCY = Histogram(
+    "orchestrator_status_relay_latency_seconds",
+    "Time from receiving a status update to the backend accepting it",
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+STATUS_RELAY_QUEUE = Gauge(
+    "orchestrator_status_relay_queue",
+    "Status updates waiting to be relayed",
+)
+
+
+def seconds_between(start: Optional[datetime], end: Optional[datetime]) -> Optional[float]:
+    """Elapsed seconds between two task timestamps, or None if either is missing."""
+    if start is None or end is None:
+        return None
+    return max((end - start).total_seconds(), 0.0)
+
+
+def observe(histogram: Histogram, start: Optional[datetime], end: Optional[datetime], **labels):
+    """Record the interval between two task timestamps, if both are set."""
+    elapsed = seconds_between(start, end)
+    if elapsed is not None:
+        histogram.labels(**labels).observe(elapsed)
+
+
+def render() -> bytes:
+    """Current metrics in the Prometheus text format."""
+    return generate_latest()
+
@@ -16,11 +16,19 @@ class Worker(BaseModel):
     worker_id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     api_type: str  # crunchbase, tracxn, social, etc.
     status: Literal["idle", "working", "offline"] = "idle"
-    current_task_id: Optional[str] = None
+    current_task_id: Optional[str] = None  # First active task (single-slot view)
+    node_id: Optional[str] = None  # Orchestrator node holding the WebSocket
+    capacity: int = 1  # Concurrent task slots advertised by the worker
+    active_tasks: List[str] = Field(default_factory=list)
     last_heartbeat: datetime = Field(default_factory=datetime.utcnow)
     connected_at: datetime = Field(default_factory=datetime.utcnow)
     metadata: Dict[str, Any] = Field(default_factory=dict)
     
+    @property
+    def free_slots(self) -> int:
+        """Number of additional tasks this worker can take."""
+        return max(self.capacity - len(self.active_tasks), 0)
+    
     class Config:
         json_encoders = {
             datetime: lambda v: v.isoformat()
@@ -34,6 +42,8 @@ class WorkerStats(BaseModel):
     idle: int = 0
     working: int = 0
     offline: int = 0
+    slots: int = 0  # Sum of worker capacities
+    free_slots: int = 0
 
 
 # ============================================================================
@@ -52,6 +62,12 @@ class Task(BaseModel):
     target_worker_id: Optional[str] = None  # Preferred worker to route to
     priority: int = 0  # Higher = more priority
     source: Literal["backend", "enrichment"] = "backend"  # Task origin
+    parent_task_id: Optional[str] = None  # Set on scatter sub-tasks
+    subtask_ids: List[str] = Field(default_factory=list)  # Set on scattered parents
+    fingerprint: Optional[str] = None  # Canonical request hash (coalescing)
+    coalesced_into: Optional[str] = None  # Task whose execution this one shares
+    tenant_id: Optional[str] = None  # Fair-share unit (organization/project/report)
+    queue_score: Optional[float] = None  # Fair-share queue score, kept across retries
     retry_count: int = 0
     max_retries: int = 3
     created_at: datetime = Field(default_factory=datetime.utcnow)
@@ -59,6 +75,7 @@ class Task(BaseModel):
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
     result: Optional[Dict[str, Any]] = None
+    result_ref: Optional[Dict[str, Any]] = None  # Offloaded result (see ResultStore)
     error: Optional[str] = None
     
     class Config:
@@ -76,6 +93,7 @@ class TaskSubmitRequest(BaseModel):
     priority: int = 0
     target_worker_id: Optional[str] = None  # Route to specific worker by ID
     source: Literal["backend", "enrichment"] = "backend"  # Task origin
+    tenant_id: Optional[str] = None  # e.g. "org:<id>"; defaults to the report
 
 
 
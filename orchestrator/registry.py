@@ -1,6 +1,7 @@
 """
 Worker Registry - manages connected workers and their states.
-Uses Redis for persistent state that survives restarts.
+Uses Redis as the shared source of truth so several orchestrator nodes can
+serve one worker pool; each node only holds the WebSockets it accepted.
 """
 import asyncio
 import logging
@@ -11,41 +12,85 @@ import json
 from fastapi import WebSocket
 
 from models import Worker, WorkerStats
+import metrics
 import config
 
 logger = logging.getLogger(__name__)
 
 
+# Free a worker slot held by a task. Idempotent: the slot is only returned
+# if the task was still recorded on the worker, and never for a worker whose
+# presence key is gone (it is being or has been unregistered).
+RELEASE_SLOT_SCRIPT = """
+if redis.call('SREM', KEYS[1], ARGV[1]) == 1 and redis.call('EXISTS', KEYS[3]) == 1 then
+    redis.call('ZINCRBY', KEYS[2], 1, ARGV[2])
+    return 1
+end
+return 0
+"""
+
+# Re-create the slot entry of a worker whose presence key expired while it
+# stayed connected (assignment drops entries of workers without presence):
+# its free slots are its capacity minus the tasks it still holds.
+RESTORE_SLOTS_SCRIPT = """
+if redis.call('EXISTS', KEYS[3]) == 1 and not redis.call('ZSCORE', KEYS[2], ARGV[1]) then
+    local free = tonumber(ARGV[2]) - redis.call('SCARD', KEYS[1])
+    redis.call('ZADD', KEYS[2], math.max(free, 0), ARGV[1])
+    return 1
+end
+return 0
+"""
+
+
 class WorkerRegistry:
     """
     Manages connected workers and their states.
     
     Responsibilities:
-    - Track connected workers with WebSocket connections
-    - Persist worker state to Redis for durability
+    - Track locally connected workers with WebSocket connections
+    - Keep worker presence, capacity and active tasks in Redis (cluster-wide)
+    - Deliver messages to workers connected to other nodes via pub/sub
     - Monitor heartbeats and mark offline workers
-    - Provide idle worker selection for task assignment
+    
+    Redis layout:
+    - worker:{id}              Worker JSON (presence, owner node_id), TTL-bound
+    - workers:{api_type}       Set of worker ids
+    - worker_slots:{api_type}  Sorted set worker_id -> free slots (used by assignment)
+    - worker_tasks:{id}        Set of task ids occupying the worker's slots
+    - orchestrator:node:{id}   Pub/sub channel for messages to a node's workers
     """
     
+    WORKER_KEY = "worker"
+    WORKERS_KEY = "workers"
+    SLOTS_KEY = "worker_slots"
+    TASKS_KEY = "worker_tasks"
+    NODE_CHANNEL = "orchestrator:node"
+    
     def __init__(self, redis_client):
         self.redis = redis_client
-        self.workers: Dict[str, Worker] = {}  # worker_id -> Worker
+        self.node_id = config.NODE_ID
+        self.workers: Dict[str, Worker] = {}  # worker_id -> Worker (connected to this node)
         self.connections: Dict[str, WebSocket] = {}  # worker_id -> WebSocket
         self._cleanup_task: Optional[asyncio.Task] = None
+        self._delivery_task: Optional[asyncio.Task] = None
+        self._release_slot = self.redis.register_script(RELEASE_SLOT_SCRIPT)
+        self._restore_slots_script = self.redis.register_script(RESTORE_SLOTS_SCRIPT)
     
     async def start(self):
         """Start the worker registry background tasks."""
         self._cleanup_task = asyncio.create_task(self._heartbeat_monitor())
-        logger.info("Worker registry started")
+        self._delivery_task = asyncio.create_task(self._delivery_loop())
+        logger.info(f"Worker registry started on node {self.node_id}")
     
     async def stop(self):
         """Stop the worker registry and cleanup."""
-        if self._cleanup_task:
-            self._cleanup_task.cancel()
-            try:
-                await self._cleanup_task
-            except asyncio.CancelledError:
-                pass
+        for task in (self._cleanup_task, self._delivery_task):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
         
         # Mark all workers as offline
         for worker_id in list(self.workers.keys()):
@@ -54,10 +99,10 @@ class WorkerRegistry:
         logger.info("Worker registry stopped")
     
     async def register(
-        self, 
-        worker_id: str, 
-        api_type: str, 
-        token: str, 
+        self,
+        worker_id: str,
+        api_type: str,
+        token: str,
         websocket: WebSocket,
         metadata: Dict = None
     ) -> bool:
@@ -69,8 +114,9 @@ class WorkerRegistry:
             api_type: Type of API (crunchbase, tracxn, etc.)
             token: Authentication token
             websocket: WebSocket connection
-            metadata: Optional worker metadata
-            
+            metadata: Optional worker metadata; "capacity" sets the number
+                of tasks the worker runs concurrently (default 1)
+        
         Returns:
             True if registration successful, False if auth failed
         """
@@ -80,100 +126,144 @@ class WorkerRegistry:
             logger.warning(f"Invalid token for worker {worker_id} ({api_type})")
             return False
         
+        metadata = metadata or {}
+        try:
+            capacity = int(metadata.get("capacity", 1))
+        except (TypeError, ValueError):
+            capacity = 1
+        capacity = min(max(capacity, 1), config.WORKER_MAX_CAPACITY)
+        
         # Create worker record
         worker = Worker(
             worker_id=worker_id,
             api_type=api_type,
             status="idle",
-            metadata=metadata or {},
+            node_id=self.node_id,
+            capacity=capacity,
+            metadata=metadata,
             connected_at=datetime.utcnow(),
             last_heartbeat=datetime.utcnow()
         )
         
-        # Store in memory and Redis
+        # Store in memory and Redis; slots become assignable last
         self.workers[worker_id] = worker
         self.connections[worker_id] = websocket
+        metrics.WEBSOCKET_CONNECTIONS.set(len(self.connections))
         await self._persist_worker(worker)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.delete(self._tasks_key(worker_id))
+            pipe.zadd(self._slots_key(api_type), {worker_id: capacity})
+            await pipe.execute()
         
-        logger.info(f"✅ Worker registered: {worker_id} ({api_type})")
+        logger.info(f"✅ Worker registered: {worker_id} ({api_type}, {capacity} slot(s))")
         return True
     
     async def unregister(self, worker_id: str):
-        """Remove a worker from the registry."""
+        """Remove a worker connected to this node from the registry."""
         if worker_id in self.workers:
-            worker = self.workers[worker_id]
-            worker.status = "offline"
-            await self._persist_worker(worker)
-            
-            del self.workers[worker_id]
-            if worker_id in self.connections:
-                del self.connections[worker_id]
-            
-            # Remove from Redis
-            await self.redis.delete(f"worker:{worker_id}")
-            await self.redis.srem(f"workers:{worker.api_type}", worker_id)
-            
+            worker = self.workers.pop(worker_id)
+            self.connections.pop(worker_id, None)
+            metrics.WEBSOCKET_CONNECTIONS.set(len(self.connections))
+            await self._remove_presence(worker_id, worker.api_type)
             logger.info(f"🔌 Worker unregistered: {worker_id}")
     
     async def update_heartbeat(self, worker_id: str):
         """Update the last heartbeat time for a worker."""
         if worker_id in self.workers:
             self.workers[worker_id].last_heartbeat = datetime.utcnow()
-            await self._persist_worker(self.workers[worker_id])
-    
-    async def set_status(
-        self, 
-        worker_id: str, 
-        status: str, 
-        task_id: Optional[str] = None
-    ):
-        """Update worker status and optionally current task."""
+            await self._restore_presence(self.workers[worker_id])
+    
+    async def release_task(self, worker_id: str, task_id: str):
+        """Free the slot a task held on a worker (no-op if already released)."""
+        worker = self.workers.get(worker_id) or await self.get_worker(worker_id)
+        if not worker:
+            await self.redis.srem(self._tasks_key(worker_id), task_id)
+            return
+        
+        await self._release_slot(
+            keys=[
+                self._tasks_key(worker_id),
+                self._slots_key(worker.api_type),
+                self._worker_key(worker_id),
+            ],
+            args=[task_id, worker_id]
+        )
         if worker_id in self.workers:
-            self.workers[worker_id].status = status
-            self.workers[worker_id].current_task_id = task_id
-            await self._persist_worker(self.workers[worker_id])
-            logger.debug(f"Worker {worker_id} status: {status}, task: {task_id}")
+            # Still connected here: its presence may have expired mid-task
+            # (busy workers outlive the presence TTL between heartbeats)
+            await self._restore_presence(self.workers[worker_id])
     
-    def get_worker(self, worker_id: str) -> Optional[Worker]:
-        """Get a worker by ID."""
-        return self.workers.get(worker_id)
+    async def get_active_tasks(self, worker_id: str) -> List[str]:
+        """Task ids currently occupying the worker's slots."""
+        return list(await self.redis.smembers(self._tasks_key(worker_id)))
+    
+    async def get_worker(self, worker_id: str) -> Optional[Worker]:
+        """Get a worker by ID (from any node)."""
+        workers = await self._load_workers([worker_id])
+        return workers[0] if workers else None
     
     def get_connection(self, worker_id: str) -> Optional[WebSocket]:
-        """Get WebSocket connection for a worker."""
+        """Get WebSocket connection for a worker connected to this node."""
         return self.connections.get(worker_id)
     
-    def get_idle_workers(self, api_type: str) -> List[Worker]:
-        """Get all idle workers for a specific API type."""
-        return [
-            w for w in self.workers.values()
-            if w.api_type == api_type and w.status == "idle"
-        ]
+    async def send_to_worker(self, worker_id: str, message: dict) -> bool:
+        """
+        Deliver a message to a worker wherever it is connected.
+        
+        Local workers get it directly; otherwise it is published to the
+        owning node's channel.
+        
+        Returns:
+            True if delivered (or handed to a live owner node), False otherwise
+        """
+        ws = self.connections.get(worker_id)
+        if ws:
+            await ws.send_json(message)
+            return True
+        
+        worker = await self.get_worker(worker_id)
+        if not worker or not worker.node_id:
+            return False
+        
+        receivers = await self.redis.publish(
+            f"{self.NODE_CHANNEL}:{worker.node_id}",
+            json.dumps({"worker_id": worker_id, "message": message})
+        )
+        return receivers > 0
+    
+    async def get_idle_workers(self, api_type: str) -> List[Worker]:
+        """Get all idle workers (no active tasks) for a specific API type."""
+        return [w for w in await self.get_workers_by_type(api_type) if w.status == "idle"]
     
-    def get_workers_by_type(self, api_type: str) -> List[Worker]:
+    async def get_workers_by_type(self, api_type: str) -> List[Worker]:
         """Get all workers for a specific API type."""
-        return [w for w in self.workers.values() if w.api_type == api_type]
+        worker_ids = await self.redis.smembers(self._workers_key(api_type))
+        return await self._load_workers(sorted(worker_ids))
     
-    def get_all_workers(self) -> List[Worker]:
-        """Get all connected workers."""
-        return list(self.workers.values())
+    async def get_all_workers(self) -> List[Worker]:
+        """Get all connected workers across nodes."""
+        workers = []
+        for api_type in config.WORKER_TOKENS:
+            workers.extend(await self.get_workers_by_type(api_type))
+        return workers
     
-    def get_worker_stats(self, api_type: Optional[str] = None) -> Dict[str, WorkerStats]:
+    async def get_worker_stats(self, api_type: Optional[str] = None) -> Dict[str, WorkerStats]:
         """
         Get worker statistics, optionally filtered by API type.
         
         Returns dict: {api_type: WorkerStats}
         """
         stats: Dict[str, WorkerStats] = {}
+        workers = await self.get_workers_by_type(api_type) if api_type else await self.get_all_workers()
         
-        for worker in self.workers.values():
-            if api_type and worker.api_type != api_type:
-                continue
-            
+        for worker in workers:
             if worker.api_type not in stats:
                 stats[worker.api_type] = WorkerStats(api_type=worker.api_type)
             
             s = stats[worker.api_type]
             s.total += 1
+            s.slots += worker.capacity
+            s.free_slots += worker.free_slots
             if worker.status == "idle":
                 s.idle += 1
             elif worker.status == "working":
@@ -185,23 +275,128 @@ class WorkerRegistry:
     
     async def broadcast_to_type(self, api_type: str, message: dict):
         """Broadcast a message to all workers of a specific type."""
-        for worker in self.get_workers_by_type(api_type):
-            ws = self.connections.get(worker.worker_id)
-            if ws:
-                try:
-                    await ws.send_json(message)
-                except Exception as e:
-                    logger.error(f"Failed to broadcast to {worker.worker_id}: {e}")
+        for worker in await self.get_workers_by_type(api_type):
+            try:
+                await self.send_to_worker(worker.worker_id, message)
+            except Exception as e:
+                logger.error(f"Failed to broadcast to {worker.worker_id}: {e}")
     
     # =========================================================================
     # Private methods
     # =========================================================================
     
+    def _worker_key(self, worker_id: str) -> str:
+        return f"{self.WORKER_KEY}:{worker_id}"
+    
+    def _workers_key(self, api_type: str) -> str:
+        return f"{self.WORKERS_KEY}:{api_type}"
+    
+    def _slots_key(self, api_type: str) -> str:
+        return f"{self.SLOTS_KEY}:{api_type}"
+    
+    def _tasks_key(self, worker_id: str) -> str:
+        return f"{self.TASKS_KEY}:{worker_id}"
+    
+    async def _load_workers(self, worker_ids: List[str]) -> List[Worker]:
+        """Load workers from Redis, deriving load/status from their task sets."""
+        if not worker_ids:
+            return []
+        
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for worker_id in worker_ids:
+                pipe.get(self._worker_key(worker_id))
+                pipe.smembers(self._tasks_key(worker_id))
+            results = await pipe.execute()
+        
+        workers = []
+        for i in range(0, len(results), 2):
+            worker_json, active_tasks = results[i], results[i + 1]
+            if not worker_json:
+                continue
+            worker = Worker.model_validate_json(worker_json)
+            worker.active_tasks = sorted(active_tasks)
+            worker.status = "working" if worker.active_tasks else "idle"
+            worker.current_task_id = worker.active_tasks[0] if worker.active_tasks else None
+            workers.append(worker)
+        return workers
+    
     async def _persist_worker(self, worker: Worker):
-        """Persist worker state to Redis."""
-        key = f"worker:{worker.worker_id}"
-        await self.redis.set(key, worker.model_dump_json(), ex=config.WORKER_TIMEOUT * 2)
-        await self.redis.sadd(f"workers:{worker.api_type}", worker.worker_id)
+        """Persist worker presence to Redis."""
+        key = self._worker_key(worker.worker_id)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.set(key, worker.model_dump_json(exclude={"active_tasks"}), ex=config.WORKER_TIMEOUT * 2)
+            pipe.sadd(self._workers_key(worker.api_type), worker.worker_id)
+            await pipe.execute()
+    
+    async def _restore_presence(self, worker: Worker):
+        """Persist a local worker's presence and re-create its slot entry if it was dropped."""
+        await self._persist_worker(worker)
+        restored = await self._restore_slots_script(
+            keys=[
+                self._tasks_key(worker.worker_id),
+                self._slots_key(worker.api_type),
+                self._worker_key(worker.worker_id),
+            ],
+            args=[worker.worker_id, worker.capacity]
+        )
+        if restored:
+            logger.warning(f"⚠️ Restored slots of worker {worker.worker_id} after its presence expired")
+    
+    async def _remove_presence(self, worker_id: str, api_type: str):
+        """Drop a worker's presence, slots and task set from Redis."""
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.zrem(self._slots_key(api_type), worker_id)
+            pipe.delete(self._worker_key(worker_id))
+            pipe.srem(self._workers_key(api_type), worker_id)
+            pipe.delete(self._tasks_key(worker_id))
+            await pipe.execute()
+    
+    async def _delivery_loop(self):
+        """Relay messages published for this node's workers to their WebSockets."""
+        channel = f"{self.NODE_CHANNEL}:{self.node_id}"
+        while True:
+            pubsub = self.redis.pubsub()
+            try:
+                await pubsub.subscribe(channel)
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    try:
+                        envelope = json.loads(message["data"])
+                        ws = self.connections.get(envelope["worker_id"])
+                        if ws:
+                            await ws.send_json(envelope["message"])
+                        else:
+                            logger.warning(f"Dropping message for unknown local worker {envelope['worker_id']}")
+                    except (KeyError, TypeError, ValueError) as e:
+                        logger.warning(f"Ignoring malformed node message: {e}")
+                    except Exception as e:
+                        logger.error(f"Failed to deliver node message: {e}")
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Node delivery listener error: {e}")
+                await asyncio.sleep(1)
+            finally:
+                try:
+                    await pubsub.reset()
+                except Exception:
+                    pass
+    
+    async def _prune_stale_workers(self):
+        """Remove index entries for workers whose presence key expired (e.g. their node died)."""
+        for api_type in config.WORKER_TOKENS:
+            worker_ids = await self.redis.smembers(self._workers_key(api_type))
+            for worker_id in worker_ids:
+                if worker_id in self.workers:
+                    continue
+                if not await self.redis.exists(self._worker_key(worker_id)):
+                    logger.warning(f"⚠️ Pruning stale worker {worker_id} ({api_type})")
+                    # Task set is kept: its tasks are still leased and get requeued from there
+                    async with self.redis.pipeline(transaction=True) as pipe:
+                        pipe.zrem(self._slots_key(api_type), worker_id)
+                        pipe.srem(self._workers_key(api_type), worker_id)
+                        await pipe.execute()
     
     async def _heartbeat_monitor(self):
         """Background task to monitor worker heartbeats and mark offline."""
@@ -217,9 +412,10 @@ class WorkerRegistry:
                 
                 for worker_id, worker in list(self.workers.items()):
                     time_since_heartbeat = now - worker.last_heartbeat
+                    busy = await self.redis.scard(self._tasks_key(worker_id)) > 0
                     
                     # Use different timeouts based on worker status
-                    if worker.status == "working" or worker.current_task_id:
+                    if busy:
                         # Worker is executing a task - use long timeout
                         if time_since_heartbeat > working_timeout:
                             logger.warning(f"⚠️ Working worker {worker_id} timed out after {time_since_heartbeat.seconds}s, marking offline")
@@ -231,9 +427,10 @@ class WorkerRegistry:
                         if time_since_heartbeat > idle_timeout:
                             logger.warning(f"⚠️ Idle worker {worker_id} timed out, marking offline")
                             await self.unregister(worker_id)
-                        
+                
+                await self._prune_stale_workers()
+            
             except asyncio.CancelledError:
                 break
             except Exception as e:
                 logger.error(f"Heartbeat monitor error: {e}")
-
@@ -0,0 +1,172 @@
+"""
+Result Store - keeps large task results out of the task records.
+A completed search result can carry hundreds of companies and full scraped
+pages; above RESULT_OFFLOAD_THRESHOLD bytes it is compressed (zstd, or gzip
+when zstandard is not installed) and written to a separate Redis key or to
+S3/MinIO. The task record only keeps a small reference, so task reads and
+status polls stay the same size whatever the result.
+"""
+import asyncio
+import gzip
+import json
+import logging
+import zlib
+from typing import Any, AsyncIterator, Dict, Optional
+
+import config
+
+logger = logging.getLogger(__name__)
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+try:
+    import boto3
+    BOTO3_AVAILABLE = True
+except ImportError:
+    BOTO3_AVAILABLE = False
+
+
+class ResultStore:
+    """
+    Compressed, out-of-line storage for task results.
+    
+    References look like:
+        {"backend": "redis"|"s3", "key": ..., "codec": "zstd"|"gzip",
+         "size": <json bytes>, "stored_size": <compressed bytes>}
+    """
+    
+    RESULT_KEY = "task_result"  # Redis string: task_id -> compressed result
+    CHUNK_SIZE = 64 * 1024
+    
+    def __init__(self, redis_client, backend: str = None):
+        """
+        Args:
+            redis_client: Redis client created WITHOUT decode_responses
+                (results are stored as compressed bytes)
+            backend: "redis" or "s3"; defaults to RESULT_STORE_BACKEND
+        """
+        self.redis = redis_client
+        self.backend = backend or config.RESULT_STORE_BACKEND
+        self.codec = "zstd" if config.RESULT_COMPRESSION == "zstd" and ZSTD_AVAILABLE else "gzip"
+        self._s3 = None
+        
+        if self.backend == "s3" and not BOTO3_AVAILABLE:
+            logger.warning("boto3 not installed - storing offloaded results in Redis")
+            self.backend = "redis"
+    
+    async def offload(self, task_id: str, result: Dict[str, Any], ttl: int) -> Optional[Dict[str, Any]]:
+        """
+        Store a result out of line if it is large enough to be worth it.
+        
+        Returns:
+            Reference dict, or None if the result should stay inline
+        """
+        raw = json.dumps(result, separators=(",", ":"), default=str).encode("utf-8")
+        if len(raw) < config.RESULT_OFFLOAD_THRESHOLD:
+            return None
+        
+        blob = self._compress(raw)
+        if self.backend == "s3":
+            key = f"{config.RESULT_S3_PREFIX}/{task_id}.json.{'zst' if self.codec == 'zstd' else 'gz'}"
+            await asyncio.to_thread(
+                self._s3_client().put_object,
+                Bucket=config.RESULT_S3_BUCKET,
+                Key=key,
+                Body=blob,
+                ContentType="application/json",
+                ContentEncoding=self.codec
+            )
+        else:
+            key = f"{self.RESULT_KEY}:{task_id}"
+            await self.redis.set(key, blob, ex=ttl)
+        
+        logger.debug(f"Offloaded result of {task_id}: {len(raw)} -> {len(blob)} bytes ({self.codec}, {self.backend})")
+        return {
+            "backend": self.backend,
+            "key": key,
+            "codec": self.codec,
+            "size": len(raw),
+            "stored_size": len(blob),
+        }
+    
+    async def load(self, ref: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Load and decode an offloaded result (None if it expired)."""
+        blob = await self._read(ref)
+        if blob is None:
+            return None
+        
+        decompressor = self._decompressor(ref["codec"])
+        raw = b"".join(
+            decompressor(blob[i:i + self.CHUNK_SIZE])
+            for i in range(0, len(blob), self.CHUNK_SIZE)
+        )
+        return json.loads(raw)
+    
+    async def stream(self, ref: Dict[str, Any]) -> Optional[AsyncIterator[bytes]]:
+        """
+        Stream an offloaded result as JSON bytes.
+        
+        Decompresses chunk by chunk, so only the compressed blob is held
+        in memory. Returns None if the result expired.
+        """
+        blob = await self._read(ref)
+        if blob is None:
+            return None
+        
+        decompressor = self._decompressor(ref["codec"])
+        
+        async def chunks():
+            for i in range(0, len(blob), self.CHUNK_SIZE):
+                data = decompressor(blob[i:i + self.CHUNK_SIZE])
+                if data:
+                    yield data
+                await asyncio.sleep(0)  # Yield to the event loop between chunks
+        
+        return chunks()
+    
+    # =========================================================================
+    # Private methods
+    # =========================================================================
+    
+    def _compress(self, raw: bytes) -> bytes:
+        if self.codec == "zstd":
+            return zstandard.ZstdCompressor(level=config.RESULT_COMPRESSION_LEVEL).compress(raw)
+        return gzip.compress(raw, compresslevel=min(config.RESULT_COMPRESSION_LEVEL, 9))
+    
+    def _decompressor(self, codec: str):
+        """Incremental decompress function (bytes -> bytes) for a codec."""
+        if codec == "zstd":
+            if not ZSTD_AVAILABLE:
+                raise RuntimeError("Result was stored with zstd but zstandard is not installed")
+            return zstandard.ZstdDecompressor().decompressobj().decompress
+        return zlib.decompressobj(16 + zlib.MAX_WBITS).decompress
+    
+    async def _read(self, ref: Dict[str, Any]) -> Optional[bytes]:
+        if ref.get("backend") == "s3":
+            try:
+                response = await asyncio.to_thread(
+                    self._s3_client().get_object,
+                    Bucket=config.RESULT_S3_BUCKET,
+                    Key=ref["key"]
+                )
+                return await asyncio.to_thread(response["Body"].read)
+            except Exception as e:
+                logger.warning(f"Failed to read offloaded result {ref['key']}: {e}")
+                return None
+        return await self.redis.get(ref["key"])
+    
+    def _s3_client(self):
+        if self._s3 is None:
+            self._s3 = boto3.client(
+                "s3",
+                endpoint_url=config.RESULT_S3_ENDPOINT_URL,
+                aws_access_key_id=config.RESULT_S3_ACCESS_KEY,
+                aws_secret_access_key=config.RESULT_S3_SECRET_KEY,
+                region_name=config.RESULT_S3_REGION
+            )
+        return self._s3
+
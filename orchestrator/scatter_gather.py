@@ -0,0 +1,102 @@
+"""
+Scatter/Gather - splits multi-keyword searches across workers.
+A ranked Crunchbase search spends most of its time collecting companies per
+keyword; TaskQueue scatters that collection into sub-tasks any free worker
+can run, merges their partial company trackers, and requeues the parent with
+the merged collection as its gather stage (ranking + top-N scrape).
+"""
+import math
+from typing import Any, Dict, List, Optional
+
+import config
+
+
+# Parent "<api_type>:<action>" -> sub-task action that runs collection only
+SCATTER_ACTIONS: Dict[str, str] = {
+    "crunchbase:search_with_rank": "collect_with_rank",
+}
+
+
+def subtask_action(api_type: str, action: str) -> Optional[str]:
+    """Sub-task action for a scatterable parent action, else None."""
+    return SCATTER_ACTIONS.get(f"{api_type}:{action}")
+
+
+def split_keywords(keywords: List[str], slots: int) -> List[List[str]]:
+    """
+    Split keywords into contiguous chunks, one per sub-task.
+
+    Uses at most one chunk per available worker slot and never fewer than
+    SCATTER_MIN_CHUNK keywords per chunk (each sub-task pays a browser
+    round-trip), so a small search or a single-slot pool yields one chunk.
+    """
+    if not keywords:
+        return []
+
+    parts = min(slots, math.ceil(len(keywords) / max(config.SCATTER_MIN_CHUNK, 1)))
+    parts = max(parts, 1)
+    size = math.ceil(len(keywords) / parts)
+    return [keywords[i:i + size] for i in range(0, len(keywords), size)]
+
+
+def failed_part(keywords: List[str]) -> Dict[str, Any]:
+    """Partial collection standing in for a sub-task that failed or was cancelled."""
+    return {
+        "company_tracker": [],
+        "keyword_results": {},
+        "successful_keywords": 0,
+        "failed_keywords": len(keywords),
+        "collection_time_seconds": 0,
+    }
+
+
+def merge_collections(parts: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Merge partial collections from sub-tasks.
+
+    Companies are deduplicated by URL, keeping the best (lowest) CB rank,
+    summing appearance counts and unioning keywords. Collection time is the
+    slowest part, since the parts ran in parallel.
+    """
+    tracker: Dict[str, Dict[str, Any]] = {}
+    keyword_results: Dict[str, Any] = {}
+    successful = failed = 0
+    collection_time = 0.0
+
+    for part in parts:
+        for company in part.get("company_tracker", []):
+            url = company.get("url")
+            if not url:
+                continue
+
+            existing = tracker.get(url)
+            if existing is None:
+                tracker[url] = {
+                    **company,
+                    "keywords": list(company.get("keywords", [])),
+                }
+                continue
+
+            existing["appearance_count"] = existing.get("appearance_count", 1) + company.get("appearance_count", 1)
+            for keyword in company.get("keywords", []):
+                if keyword not in existing["keywords"]:
+                    existing["keywords"].append(keyword)
+            if company.get("cb_rank") is not None and (
+                existing.get("cb_rank") is None or company["cb_rank"] < existing["cb_rank"]
+            ):
+                existing["cb_rank"] = company["cb_rank"]
+            if not existing.get("description"):
+                existing["description"] = company.get("description", "")
+
+        keyword_results.update(part.get("keyword_results", {}))
+        successful += part.get("successful_keywords", 0)
+        failed += part.get("failed_keywords", 0)
+        collection_time = max(collection_time, part.get("collection_time_seconds", 0))
+
+    return {
+        "company_tracker": list(tracker.values()),
+        "keyword_results": keyword_results,
+        "successful_keywords": successful,
+        "failed_keywords": failed,
+        "collection_time_seconds": round(collection_time, 2),
+    }
@@ -11,7 +11,9 @@ import uuid
 
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 import redis.asyncio as redis
+from prometheus_client import CONTENT_TYPE_LATEST
 
 import config
 from models import (
@@ -21,6 +23,9 @@ from models import (
 )
 from registry import WorkerRegistry
 from task_queue import TaskQueue
+from task_events import TaskEventBus, TERMINAL_STATUSES
+from result_store import ResultStore
+import metrics
 from status_relay import StatusRelay
 from enrichment_manager import EnrichmentManager
 
@@ -33,8 +38,10 @@ logger = logging.getLogger(__name__)
 
 # Global instances
 redis_client: redis.Redis = None
+result_redis: redis.Redis = None  # Binary client for compressed results
 registry: WorkerRegistry = None
 task_queue: TaskQueue = None
+task_events: TaskEventBus = None
 status_relay: StatusRelay = None
 enrichment_manager: EnrichmentManager = None
 
@@ -42,7 +49,7 @@ enrichment_manager: EnrichmentManager = None
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager."""
-    global redis_client, registry, task_queue, status_relay, enrichment_manager
+    global redis_client, result_redis, registry, task_queue, task_events, status_relay, enrichment_manager
     
     # Startup
     logger.info("🚀 Starting API Orchestrator...")
@@ -51,17 +58,21 @@ async def lifespan(app: FastAPI):
     redis_client = redis.from_url(config.REDIS_URL, decode_responses=True)
     await redis_client.ping()
     logger.info(f"✅ Connected to Redis: {config.REDIS_URL}")
+    result_redis = redis.from_url(config.REDIS_URL)
     
     # Initialize components
     registry = WorkerRegistry(redis_client)
     await registry.start()
     
-    task_queue = TaskQueue(redis_client, registry)
-    await task_queue.start()
+    task_events = TaskEventBus(redis_client)
+    await task_events.start()
     
     status_relay = StatusRelay(config.BACKEND_STATUS_URL)
     await status_relay.start()
     
+    task_queue = TaskQueue(redis_client, registry, task_events, ResultStore(result_redis), status_relay)
+    await task_queue.start()
+    
     enrichment_manager = EnrichmentManager(redis_client, registry, task_queue)
     await enrichment_manager.start()
     
@@ -72,9 +83,11 @@ async def lifespan(app: FastAPI):
     # Shutdown
     logger.info("🛑 Shutting down API Orchestrator...")
     await enrichment_manager.stop()
-    await status_relay.stop()
     await task_queue.stop()
+    await status_relay.stop()
+    await task_events.stop()
     await registry.stop()
+    await result_redis.close()
     await redis_client.close()
     logger.info("✅ Orchestrator shutdown complete")
 
@@ -105,20 +118,23 @@ app.add_middleware(
 
 @app.get("/health")
 async def health_check():
-    """Orchestrator health check."""
+    """Orchestrator health check (per node)."""
     try:
         await redis_client.ping()
         redis_ok = True
     except:
         redis_ok = False
     
-    stats = registry.get_worker_stats() if registry else {}
+    stats = await registry.get_worker_stats() if registry and redis_ok else {}
     total_workers = sum(s.total for s in stats.values())
     
     return {
         "status": "healthy" if redis_ok else "degraded",
         "redis": "connected" if redis_ok else "disconnected",
         "workers_connected": total_workers,
+        "node_id": config.NODE_ID,
+        "local_workers": len(registry.connections) if registry else 0,
+        "status_relay": status_relay.get_stats() if status_relay else {},
         "timestamp": datetime.utcnow().isoformat()
     }
 
@@ -132,7 +148,7 @@ async def submit_task(request: TaskSubmitRequest):
     of the specified API type.
     """
     # Check if we have any workers for this API type
-    workers = registry.get_workers_by_type(request.api_type)
+    workers = await registry.get_workers_by_type(request.api_type)
     
     if not workers:
         logger.warning(f"⚠️ No workers available for {request.api_type}")
@@ -140,10 +156,59 @@ async def submit_task(request: TaskSubmitRequest):
     
     task = await task_queue.enqueue(request)
     
+    if task.coalesced_into and task.status == "completed":
+        message = f"Reused recent result of task {task.coalesced_into}"
+    elif task.coalesced_into:
+        message = f"Attached to in-flight task {task.coalesced_into}"
+    else:
+        message = f"Task queued for {request.api_type}"
+    
     return TaskResponse(
         task_id=task.task_id,
         status=task.status,
-        message=f"Task queued for {request.api_type}"
+        message=message
+    )
+
+
+@app.get("/tasks/events")
+async def stream_task_events(
+    task_id: Optional[str] = None,
+    report_id: Optional[str] = None,
+    api_type: Optional[str] = None
+):
+    """
+    Server-Sent Events stream of task state transitions.
+    
+    Optional filters narrow the stream to one task, report or API type.
+    Results are not included - fetch them from /tasks/{task_id} on a
+    terminal event.
+    """
+    filters = {"task_id": task_id, "report_id": report_id, "api_type": api_type}
+    filters = {k: v for k, v in filters.items() if v}
+    queue = task_events.subscribe()
+    
+    async def event_stream():
+        try:
+            while task_events.is_subscribed(queue):
+                try:
+                    event = await asyncio.wait_for(
+                        queue.get(),
+                        timeout=config.TASK_EVENTS_KEEPALIVE
+                    )
+                except asyncio.TimeoutError:
+                    # Comment line keeps proxies from closing an idle stream
+                    yield ": keepalive\n\n"
+                    continue
+                
+                if all(event.get(k) == v for k, v in filters.items()):
+                    yield f"event: task\ndata: {json.dumps(event)}\n\n"
+        finally:
+            task_events.unsubscribe(queue)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
     )
 
 
@@ -159,7 +224,92 @@ async def get_task_status(task_id: str):
         task_id=task.task_id,
         status=task.status,
         message=f"Task {task.status}",
-        result=task.result,
+        result=await task_queue.get_result(task),
+        error=task.error
+    )
+
+
+@app.get("/tasks/{task_id}/result")
+async def get_task_result(task_id: str):
+    """
+    Stream a task's result as JSON.
+    
+    Offloaded results are decompressed chunk by chunk instead of being
+    loaded and re-serialized whole.
+    """
+    task = await task_queue.get_task(task_id)
+    if not task:
+        raise HTTPException(status_code=404, detail="Task not found")
+    
+    if task.result_ref and task_queue.results:
+        chunks = await task_queue.results.stream(task.result_ref)
+        if chunks is None:
+            raise HTTPException(status_code=404, detail="Task result expired")
+        return StreamingResponse(
+            chunks,
+            media_type="application/json",
+            headers={"X-Result-Size": str(task.result_ref.get("size", ""))}
+        )
+    
+    if task.result is None:
+        raise HTTPException(status_code=404, detail=f"Task has no result ({task.status})")
+    return JSONResponse(task.result)
+
+
+@app.get("/tasks/{task_id}/position")
+async def get_task_position(task_id: str):
+    """Queue position and estimated wait for a task (for progress UIs)."""
+    task = await task_queue.get_task(task_id)
+    if not task:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return await task_queue.get_queue_position(task)
+
+
+@app.get("/reports/{report_id}/queue")
+async def get_report_queue(report_id: str):
+    """Queue positions and estimated waits for a report's unfinished tasks."""
+    return {
+        "report_id": report_id,
+        "tasks": await task_queue.get_report_queue(report_id)
+    }
+
+
+@app.get("/tasks/{task_id}/wait", response_model=TaskResponse)
+async def wait_for_task(
+    task_id: str,
+    timeout: float = Query(
+        default=config.TASK_WAIT_TIMEOUT,
+        gt=0,
+        le=config.TASK_WAIT_MAX_TIMEOUT
+    )
+):
+    """
+    Long-poll until the task reaches a terminal state or `timeout` elapses.
+    
+    Returns the same payload as GET /tasks/{task_id}; a non-terminal status
+    means the wait timed out and the client should call again.
+    """
+    # Register before reading so a transition in between is not missed
+    waiter = task_events.add_waiter(task_id)
+    try:
+        task = await task_queue.get_task(task_id)
+        if not task:
+            raise HTTPException(status_code=404, detail="Task not found")
+        
+        if task.status not in TERMINAL_STATUSES:
+            try:
+                await asyncio.wait_for(asyncio.shield(waiter), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+            task = await task_queue.get_task(task_id) or task
+    finally:
+        task_events.remove_waiter(task_id, waiter)
+    
+    return TaskResponse(
+        task_id=task.task_id,
+        status=task.status,
+        message=f"Task {task.status}",
+        result=await task_queue.get_result(task),
         error=task.error
     )
 
@@ -190,8 +340,8 @@ async def cancel_task(task_id: str):
 @app.get("/workers", response_model=WorkerListResponse)
 async def list_workers():
     """List all connected workers and their status."""
-    workers = registry.get_all_workers()
-    stats = registry.get_worker_stats()
+    workers = await registry.get_all_workers()
+    stats = await registry.get_worker_stats()
     
     return WorkerListResponse(workers=workers, stats=stats)
 
@@ -199,7 +349,7 @@ async def list_workers():
 @app.get("/workers/{api_type}/stats")
 async def get_worker_stats(api_type: str):
     """Get worker statistics for an API type."""
-    stats = registry.get_worker_stats(api_type)
+    stats = await registry.get_worker_stats(api_type)
     
     if api_type not in stats:
         return WorkerStats(api_type=api_type)
@@ -213,23 +363,50 @@ async def get_queue_stats():
     stats = await task_queue.get_queue_stats()
     
     pending = {}
+    assigned = {}
+    running = {}
     total_workers = {}
     idle_workers = {}
     
     for api_type, s in stats.items():
         pending[api_type] = s["pending"]
+        assigned[api_type] = s["assigned"]
+        running[api_type] = s["running"]
         total_workers[api_type] = s["total_workers"]
         idle_workers[api_type] = s["idle_workers"]
     
     return QueueStatsResponse(
         pending=pending,
-        assigned={},  # Could track this separately
-        running={},
+        assigned=assigned,
+        running=running,
         total_workers=total_workers,
         idle_workers=idle_workers
     )
 
 
+@app.get("/metrics")
+async def prometheus_metrics():
+    """
+    Prometheus metrics.
+    
+    Queue and worker gauges are refreshed from Redis on each scrape and
+    cover the whole cluster; histograms and counters are this node's.
+    """
+    for api_type, s in (await task_queue.get_queue_stats()).items():
+        metrics.QUEUE_PENDING.labels(api_type=api_type).set(s["pending"])
+        metrics.TASKS_IN_FLIGHT.labels(api_type=api_type, status="assigned").set(s["assigned"])
+        metrics.TASKS_IN_FLIGHT.labels(api_type=api_type, status="running").set(s["running"])
+        metrics.WORKERS.labels(api_type=api_type, status="idle").set(s["idle_workers"])
+        metrics.WORKERS.labels(api_type=api_type, status="working").set(s["working_workers"])
+        metrics.WORKERS.labels(api_type=api_type, status="offline").set(s["offline_workers"])
+        metrics.WORKER_SLOTS.labels(api_type=api_type, state="free").set(s["free_slots"])
+        metrics.WORKER_SLOTS.labels(api_type=api_type, state="busy").set(s["slots"] - s["free_slots"])
+    metrics.WEBSOCKET_CONNECTIONS.set(len(registry.connections))
+    metrics.STATUS_RELAY_QUEUE.set(status_relay.get_stats()["pending"])
+    
+    return Response(content=metrics.render(), media_type=CONTENT_TYPE_LATEST)
+
+
 # =============================================================================
 # WebSocket Endpoint (for workers)
 # =============================================================================
@@ -241,10 +418,12 @@ async def worker_websocket(websocket: WebSocket):
     
     Connection flow:
     1. Worker connects
-    2. Worker sends auth message: {"type": "auth", "api_type": "crunchbase", "token": "..."}
+    2. Worker sends auth message: {"type": "auth", "api_type": "crunchbase", "token": "...",
+       "metadata": {"capacity": 3}} - capacity is the number of concurrent task slots
     3. Orchestrator validates token and registers worker
     4. Worker sends heartbeats: {"type": "heartbeat"}
-    5. Orchestrator sends tasks: {"type": "task", ...}
+    5. Orchestrator sends tasks: {"type": "task", ...} (up to capacity at once)
+       and cancellations: {"type": "cancel", "task_id": "..."}
     6. Worker sends status updates: {"type": "status", ...}
     7. Worker sends completion: {"type": "complete", ...}
     """
@@ -308,6 +487,7 @@ async def worker_websocket(websocket: WebSocket):
         await websocket.send_json({
             "type": "auth_success",
             "worker_id": worker_id,
+            "capacity": registry.workers[worker_id].capacity,
             "message": f"Registered as {api_type} worker"
         })
         
@@ -340,13 +520,17 @@ async def worker_websocket(websocket: WebSocket):
                 
                 if msg_type == "heartbeat":
                     await registry.update_heartbeat(worker_id)
+                    # Heartbeats keep the leases of the worker's tasks alive
+                    await task_queue.renew_leases(worker_id)
                     # Send acknowledgement with worker status so worker can confirm it's recognized
-                    worker = registry.get_worker(worker_id)
+                    worker = await registry.get_worker(worker_id)
                     await websocket.send_json({
                         "type": "heartbeat_ack",
                         "worker_id": worker_id,
                         "status": worker.status if worker else "unknown",
-                        "current_task": worker.current_task_id if worker else None
+                        "current_task": worker.current_task_id if worker else None,
+                        "active_tasks": worker.active_tasks if worker else [],
+                        "capacity": worker.capacity if worker else None
                     })
                 
                 elif msg_type == "pong":
@@ -359,31 +543,33 @@ async def worker_websocket(websocket: WebSocket):
                     task = await task_queue.get_task(task_id)
                     
                     if task:
-                        # Forward to backend via status relay
-                        update = StatusUpdate(
-                            task_id=task_id,
-                            report_id=task.report_id,
-                            step_key=message.get("step_key", ""),
-                            detail_type=message.get("detail_type", "status"),
-                            message=message.get("message", ""),
-                            data=message.get("data", {})
-                        )
-                        await status_relay.relay(update)
+                        # Forward to backend via status relay, once per report
+                        # sharing this execution (coalesced duplicates)
+                        for report_id in await task_queue.get_report_ids(task):
+                            update = StatusUpdate(
+                                task_id=task_id,
+                                report_id=report_id,
+                                step_key=message.get("step_key", ""),
+                                detail_type=message.get("detail_type", "status"),
+                                message=message.get("message", ""),
+                                data=message.get("data", {})
+                            )
+                            await status_relay.relay(update)
                         
                 elif msg_type == "running":
                     # Worker started executing task
                     task_id = message.get("task_id")
-                    await task_queue.mark_running(task_id)
+                    await task_queue.mark_running(task_id, worker_id)
                     
                 elif msg_type == "complete":
                     # Worker completed task
                     task_id = message.get("task_id")
                     result = message.get("result", {})
                     task = await task_queue.get_task(task_id)
-                    await task_queue.mark_completed(task_id, result)
+                    accepted = await task_queue.mark_completed(task_id, result, worker_id)
                     
                     # Notify enrichment manager if this was an enrichment task
-                    if task and task.source == "enrichment":
+                    if accepted and task and task.source == "enrichment":
                         # Merge enrichment_keyword_id from original payload into result
                         enrichment_result = {
                             **result,
@@ -400,7 +586,7 @@ async def worker_websocket(websocket: WebSocket):
                     error = message.get("error", "Unknown error")
                     if task_id:
                         task = await task_queue.get_task(task_id)
-                        await task_queue.mark_failed(task_id, error)
+                        await task_queue.mark_failed(task_id, error, worker_id)
                         
                         # Notify enrichment manager if this was an enrichment task
                         if task and task.source == "enrichment":
@@ -425,12 +611,12 @@ async def worker_websocket(websocket: WebSocket):
     finally:
         # Cleanup worker registration
         if authenticated:
-            # Check if worker had an active task
-            worker = registry.get_worker(worker_id)
-            if worker and worker.current_task_id:
+            # Fail (and requeue) every task the worker had in flight
+            for task_id in await registry.get_active_tasks(worker_id):
                 await task_queue.mark_failed(
-                    worker.current_task_id,
-                    "Worker disconnected during task execution"
+                    task_id,
+                    "Worker disconnected during task execution",
+                    worker_id
                 )
             
             await registry.unregister(worker_id)
@@ -1,13 +1,19 @@
 """
 Status Relay - forwards status updates from workers to Django backend.
+Updates are queued without blocking the worker WebSocket loop and sent in
+batches to the backend's bulk status endpoint, which applies each report's
+details in one transaction and one broadcast.
 """
 import asyncio
 import logging
-from typing import List
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Tuple
 import httpx
 
 from models import StatusUpdate
 import config
+import metrics
 
 logger = logging.getLogger(__name__)
 
@@ -16,22 +22,34 @@ class StatusRelay:
     """
     Relays status updates from workers to the Django backend.
     
-    Uses fire-and-forget pattern to avoid blocking worker communication.
-    Batches updates when possible for efficiency.
+    relay() only enqueues; a background sender drains the bounded queue and
+    POSTs arrays of updates. Under overload, low-value updates (transient
+    progress chatter) are merged per report/step and then dropped before
+    anything else is.
     """
     
-    def __init__(self, backend_url: str = None):
+    def __init__(self, backend_url: str = None, bulk_url: str = None):
         self.backend_url = backend_url or config.BACKEND_STATUS_URL
+        self.bulk_url = bulk_url or config.BACKEND_STATUS_BULK_URL or f"{self.backend_url.rstrip('/')}/bulk/"
         self._client: httpx.AsyncClient = None
-        self._pending_updates: List[StatusUpdate] = []
+        self._queue: Deque[StatusUpdate] = deque()
+        self._wakeup = asyncio.Event()
         self._batch_task: asyncio.Task = None
-        self._lock = asyncio.Lock()
+        self._bulk_supported = True
+        self._counters: Dict[str, int] = {
+            "queued": 0,
+            "sent": 0,
+            "merged": 0,
+            "dropped": 0,
+            "failed": 0,
+            "batches": 0,
+        }
     
     async def start(self):
         """Start the status relay."""
         self._client = httpx.AsyncClient(timeout=10.0)
         self._batch_task = asyncio.create_task(self._batch_sender())
-        logger.info(f"Status relay started, forwarding to {self.backend_url}")
+        logger.info(f"Status relay started, forwarding to {self.bulk_url}")
     
     async def stop(self):
         """Stop the status relay."""
@@ -43,8 +61,8 @@ class StatusRelay:
                 pass
         
         # Flush remaining updates
-        if self._pending_updates:
-            await self._flush()
+        while self._queue:
+            await self._send_batch(self._take_batch())
         
         if self._client:
             await self._client.aclose()
@@ -55,66 +73,166 @@ class StatusRelay:
         """
         Queue a status update for relay to backend.
         
-        Uses async batching to reduce HTTP overhead.
+        Never waits on the backend. When the queue is full the update (or,
+        for an important update, the oldest low-value one) is dropped.
         """
-        async with self._lock:
-            self._pending_updates.append(update)
+        if len(self._queue) >= config.STATUS_RELAY_QUEUE_SIZE and not self._make_room(update):
+            self._count("dropped")
+            return
         
-        # If we have multiple updates queued, let batch sender handle them
-        # But if this is the first, send immediately
-        if len(self._pending_updates) == 1:
-            await self._flush()
+        self._queue.append(update)
+        self._count("queued")
+        self._wakeup.set()
     
     async def relay_immediate(self, update: StatusUpdate):
         """Immediately relay a status update (bypass batching)."""
-        await self._send_update(update)
+        await self._send_single(update)
     
-    async def _flush(self):
-        """Flush all pending updates to backend."""
-        async with self._lock:
-            updates = self._pending_updates.copy()
-            self._pending_updates.clear()
-        
+    def get_stats(self) -> Dict[str, int]:
+        """Relay counters plus the current queue depth."""
+        return {**self._counters, "pending": len(self._queue)}
+    
+    # =========================================================================
+    # Private methods
+    # =========================================================================
+    
+    def _count(self, outcome: str, n: int = 1):
+        """Bump a relay counter (and its Prometheus twin)."""
+        self._counters[outcome] += n
+        metrics.STATUS_UPDATES.labels(outcome=outcome).inc(n)
+        metrics.STATUS_RELAY_QUEUE.set(len(self._queue))
+    
+    def _sent(self, updates: List[StatusUpdate]):
+        """Count delivered updates and record their relay latency."""
+        self._count("sent", len(updates))
+        now = datetime.utcnow()
         for update in updates:
-            await self._send_update(update)
+            metrics.STATUS_RELAY_LATENCY.observe(max((now - update.timestamp).total_seconds(), 0.0))
+    
+    @staticmethod
+    def _is_low_value(update: StatusUpdate) -> bool:
+        return update.detail_type in config.STATUS_RELAY_LOW_VALUE_TYPES
+    
+    def _make_room(self, update: StatusUpdate) -> bool:
+        """Evict the oldest low-value update for an important one; False if none."""
+        if self._is_low_value(update):
+            return False
+        for queued in self._queue:
+            if self._is_low_value(queued):
+                self._queue.remove(queued)
+                self._count("dropped")
+                return True
+        return False
+    
+    def _take_batch(self) -> List[StatusUpdate]:
+        """
+        Pop the next batch, merging low-value updates when the queue is backed up.
+        
+        Merging keeps only the latest low-value update per
+        (report, step, detail type) in the batch.
+        """
+        overloaded = len(self._queue) >= config.STATUS_RELAY_QUEUE_SIZE // 2
+        batch: List[StatusUpdate] = []
+        while self._queue and len(batch) < config.STATUS_RELAY_BATCH_SIZE:
+            batch.append(self._queue.popleft())
+        
+        if not overloaded:
+            return batch
+        
+        latest: Dict[Tuple[str, str, str], int] = {}
+        for index, update in enumerate(batch):
+            if self._is_low_value(update):
+                latest[(update.report_id, update.step_key, update.detail_type)] = index
+        merged = [
+            update for index, update in enumerate(batch)
+            if not self._is_low_value(update)
+            or latest[(update.report_id, update.step_key, update.detail_type)] == index
+        ]
+        self._count("merged", len(batch) - len(merged))
+        return merged
+    
+    @staticmethod
+    def _payload(update: StatusUpdate) -> Dict[str, Any]:
+        return {
+            "report_id": update.report_id,
+            "step_key": update.step_key,
+            "detail_type": update.detail_type,
+            "message": update.message,
+            "data": update.data
+        }
     
-    async def _send_update(self, update: StatusUpdate):
+    async def _send_batch(self, batch: List[StatusUpdate]):
+        """POST one batch to the bulk endpoint (per-update fallback for old backends)."""
+        if not batch:
+            return
+        
+        if not self._bulk_supported:
+            for update in batch:
+                await self._send_single(update)
+            return
+        
+        try:
+            response = await self._client.post(
+                self.bulk_url,
+                json=[self._payload(update) for update in batch],
+                headers={"Content-Type": "application/json"}
+            )
+        except Exception as e:
+            self._count("failed", len(batch))
+            logger.error(f"❌ Failed to relay {len(batch)} status updates: {e}")
+            return
+        
+        if response.status_code in (404, 405):
+            logger.warning("Backend has no bulk status endpoint, falling back to single updates")
+            self._bulk_supported = False
+            for update in batch:
+                await self._send_single(update)
+        elif response.status_code != 200:
+            self._count("failed", len(batch))
+            logger.warning(
+                f"⚠️ Backend returned {response.status_code} for {len(batch)} status updates: "
+                f"{response.text[:100]}"
+            )
+        else:
+            self._sent(batch)
+            self._counters["batches"] += 1
+            logger.debug(f"📡 Relayed {len(batch)} status updates")
+    
+    async def _send_single(self, update: StatusUpdate):
         """Send a single status update to backend."""
         try:
-            payload = {
-                "report_id": update.report_id,
-                "step_key": update.step_key,
-                "detail_type": update.detail_type,
-                "message": update.message,
-                "data": update.data
-            }
-            
             response = await self._client.post(
                 self.backend_url,
-                json=payload,
+                json=self._payload(update),
                 headers={"Content-Type": "application/json"}
             )
             
             if response.status_code != 200:
+                self._count("failed")
                 logger.warning(
                     f"⚠️ Backend returned {response.status_code} for status update: "
                     f"{response.text[:100]}"
                 )
             else:
+                self._sent([update])
                 logger.debug(f"📡 Status relayed: {update.step_key}/{update.detail_type}")
-                
+        
         except Exception as e:
+            self._count("failed")
             logger.error(f"❌ Failed to relay status update: {e}")
     
     async def _batch_sender(self):
-        """Background task to batch and send pending updates."""
+        """Background task that drains the queue in batches."""
         while True:
             try:
-                await asyncio.sleep(0.1)  # 100ms batching window
+                await self._wakeup.wait()
+                # Batching window: let updates from the same burst join the batch
+                await asyncio.sleep(config.STATUS_RELAY_BATCH_WINDOW)
+                self._wakeup.clear()
                 
-                if self._pending_updates:
-                    await self._flush()
-                    
+                while self._queue:
+                    await self._send_batch(self._take_batch())
+            
             except asyncio.CancelledError:
                 break
             except Exception as e:
@@ -0,0 +1,160 @@
+"""
+Task Events - pushes task state transitions to waiting clients.
+TaskQueue publishes every stored transition on a Redis pub/sub channel; each
+orchestrator node listens once and fans events out to its long-poll waiters
+(/tasks/{id}/wait) and SSE subscribers (/tasks/events).
+"""
+import asyncio
+import json
+import logging
+from typing import Any, Dict, Optional, Set
+
+from models import Task
+
+logger = logging.getLogger(__name__)
+
+
+TASK_EVENTS_CHANNEL = "task_events"
+TERMINAL_STATUSES = ("completed", "failed", "cancelled")
+
+
+def task_event(task: Task) -> Dict[str, Any]:
+    """
+    Build the pub/sub payload for a task transition.
+
+    The result is left out on purpose - it can be large; clients fetch it
+    once the terminal event arrives.
+    """
+    return {
+        "task_id": task.task_id,
+        "report_id": task.report_id,
+        "api_type": task.api_type,
+        "status": task.status,
+        "error": task.error,
+        "retry_count": task.retry_count,
+        "assigned_worker_id": task.assigned_worker_id,
+    }
+
+
+class TaskEventBus:
+    """
+    Single Redis subscription per node, fanned out to in-process listeners.
+
+    Responsibilities:
+    - Publish task transitions (called from TaskQueue)
+    - Resolve long-poll waiters when their task reaches a terminal state
+    - Feed SSE subscriber queues
+    """
+
+    SUBSCRIBER_QUEUE_SIZE = 1000
+
+    def __init__(self, redis_client):
+        self.redis = redis_client
+        self._waiters: Dict[str, Set[asyncio.Future]] = {}  # task_id -> futures
+        self._subscribers: Set[asyncio.Queue] = set()
+        self._listen_task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        """Start listening for task events."""
+        self._listen_task = asyncio.create_task(self._listen_loop())
+        logger.info("Task event bus started")
+
+    async def stop(self):
+        """Stop listening and release all waiters."""
+        if self._listen_task:
+            self._listen_task.cancel()
+            try:
+                await self._listen_task
+            except asyncio.CancelledError:
+                pass
+
+        for futures in self._waiters.values():
+            for future in futures:
+                if not future.done():
+                    future.cancel()
+        self._waiters.clear()
+        logger.info("Task event bus stopped")
+
+    async def publish(self, task: Task):
+        """Publish a task transition to every orchestrator node."""
+        try:
+            await self.redis.publish(TASK_EVENTS_CHANNEL, json.dumps(task_event(task)))
+        except Exception as e:
+            # Waiters fall back to their timeout; never fail the transition itself
+            logger.error(f"Failed to publish task event for {task.task_id}: {e}")
+
+    def add_waiter(self, task_id: str) -> asyncio.Future:
+        """
+        Register interest in a task's terminal event.
+
+        Register before reading the task from Redis so a transition that
+        lands in between is not missed.
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(task_id, set()).add(future)
+        return future
+
+    def remove_waiter(self, task_id: str, future: asyncio.Future):
+        """Drop a waiter (after it resolved or timed out)."""
+        futures = self._waiters.get(task_id)
+        if futures:
+            futures.discard(future)
+            if not futures:
+                del self._waiters[task_id]
+
+    def subscribe(self) -> asyncio.Queue:
+        """Register an SSE subscriber queue."""
+        queue = asyncio.Queue(maxsize=self.SUBSCRIBER_QUEUE_SIZE)
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        """Remove an SSE subscriber queue."""
+        self._subscribers.discard(queue)
+
+    def is_subscribed(self, queue: asyncio.Queue) -> bool:
+        """False once a subscriber was dropped for falling behind."""
+        return queue in self._subscribers
+
+    # =========================================================================
+    # Private methods
+    # =========================================================================
+
+    def _dispatch(self, event: Dict[str, Any]):
+        """Deliver one event to local waiters and subscribers."""
+        if event.get("status") in TERMINAL_STATUSES:
+            for future in self._waiters.pop(event.get("task_id"), set()):
+                if not future.done():
+                    future.set_result(event)
+
+        for queue in list(self._subscribers):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # Slow consumer - drop it rather than grow without bound
+                logger.warning("Dropping slow task event subscriber")
+                self._subscribers.discard(queue)
+
+    async def _listen_loop(self):
+        """Background loop relaying the Redis channel to local listeners."""
+        while True:
+            pubsub = self.redis.pubsub()
+            try:
+                await pubsub.subscribe(TASK_EVENTS_CHANNEL)
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    try:
+                        self._dispatch(json.loads(message["data"]))
+                    except (TypeError, ValueError) as e:
+                        logger.warning(f"Ignoring malformed task event: {e}")
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Task event listener error: {e}")
+                await asyncio.sleep(1)
+            finally:
+                try:
+                    await pubsub.reset()
+                except Exception:
+                    pass
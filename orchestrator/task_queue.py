@@ -1,61 +1,239 @@
 """
 Task Queue - manages task distribution to workers.
-Uses Redis for persistence and priority-based queuing.
+Uses Redis for persistence and priority-based queuing. Assignment is a single
+Lua script, so any number of orchestrator nodes can share one queue.
 """
 import asyncio
 import logging
+import time
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 import json
 import uuid
 
-from models import Task, TaskSubmitRequest
+from coalescing import task_fingerprint
+from models import StatusUpdate, Task, TaskSubmitRequest
 from registry import WorkerRegistry
+import metrics
+from result_store import ResultStore
+from scatter_gather import failed_part, merge_collections, split_keywords, subtask_action
+from status_relay import StatusRelay
+from task_events import TERMINAL_STATUSES, TaskEventBus
 import config
 
 logger = logging.getLogger(__name__)
 
 
+# Atomically pick the next task whose tenant is under its concurrency cap,
+# a worker slot for it, and pop it.
+#
+# KEYS: queue zset, worker slots zset, task leases zset, lease owner hash,
+#       tenant running-count hash (per api_type), lease tenant hash
+# ARGV: task key prefix, worker key prefix, worker tasks key prefix, lease deadline,
+#       tenant concurrency cap (0 = unlimited), scan depth
+#
+# The task is only popped when a live worker with a free slot exists; the
+# pop, slot reservation, tenant count and lease are one step, so a node
+# crashing right after leaves a leased task rather than a lost one. Only the
+# first <scan depth> queue entries are considered, so a tenant at its cap
+# cannot make the script walk the whole queue. Worker/task keys are derived
+# from prefixes, which is fine on a single Redis (not Redis Cluster).
+#
+# Returns nil (nothing assignable), {task_id, ""} for a queue entry whose
+# task record expired (entry removed), or {task_id, worker_id}.
+ASSIGN_SCRIPT = """
+local function has_slot(worker_id)
+    local free = tonumber(redis.call('ZSCORE', KEYS[2], worker_id) or '0')
+    if free < 1 then
+        return false
+    end
+    if redis.call('EXISTS', ARGV[2] .. worker_id) == 0 then
+        redis.call('ZREM', KEYS[2], worker_id)
+        return false
+    end
+    return true
+end
+
+local function pick_worker(target)
+    if type(target) == 'string' and has_slot(target) then
+        return target
+    end
+    for _, candidate in ipairs(redis.call('ZREVRANGEBYSCORE', KEYS[2], '+inf', 1)) do
+        if has_slot(candidate) then
+            return candidate
+        end
+    end
+    return nil
+end
+
+local cap = tonumber(ARGV[5])
+for _, task_id in ipairs(redis.call('ZRANGE', KEYS[1], 0, tonumber(ARGV[6]) - 1)) do
+    local raw = redis.call('GET', ARGV[1] .. task_id)
+    if not raw then
+        redis.call('ZREM', KEYS[1], task_id)
+        return {task_id, ''}
+    end
+
+    local task = cjson.decode(raw)
+    local tenant = task['tenant_id']
+    if type(tenant) ~= 'string' then
+        tenant = ''
+    end
+
+    if tenant == '' or cap < 1 or tonumber(redis.call('HGET', KEYS[5], tenant) or '0') < cap then
+        local worker_id = pick_worker(task['target_worker_id'])
+        if not worker_id then
+            return nil
+        end
+
+        redis.call('ZREM', KEYS[1], task_id)
+        redis.call('ZINCRBY', KEYS[2], -1, worker_id)
+        redis.call('SADD', ARGV[3] .. worker_id, task_id)
+        redis.call('ZADD', KEYS[3], ARGV[4], task_id)
+        redis.call('HSET', KEYS[4], task_id, worker_id)
+        if tenant ~= '' then
+            redis.call('HINCRBY', KEYS[5], tenant, 1)
+            redis.call('HSET', KEYS[6], task_id, KEYS[5] .. '|' .. tenant)
+        end
+        return {task_id, worker_id}
+    end
+end
+return nil
+"""
+
+
+# Advance a tenant's virtual clock by one task's cost (weighted fair queuing).
+#
+# KEYS: tenant virtual clock hash (per api_type)
+# ARGV: tenant, now (epoch seconds), cost (quantum / tenant weight), TTL
+#
+# An idle tenant restarts from "now", so it cannot bank credit while idle.
+# Returns the task's virtual finish time (as a string; Lua numbers would be
+# truncated to integers on the way back).
+CLOCK_SCRIPT = """
+local clock = tonumber(redis.call('HGET', KEYS[1], ARGV[1]) or '0')
+local now = tonumber(ARGV[2])
+if clock < now then
+    clock = now
+end
+clock = clock + tonumber(ARGV[3])
+redis.call('HSET', KEYS[1], ARGV[1], tostring(clock))
+redis.call('EXPIRE', KEYS[1], ARGV[4])
+return tostring(clock)
+"""
+
+
+# Attach a duplicate request to the in-flight task for its fingerprint.
+#
+# KEYS: in-flight key for the fingerprint
+# ARGV: followers key prefix, follower task_id, follower report_id, TTL
+#
+# Returns the leader task_id, or nil if nothing is in flight.
+ATTACH_SCRIPT = """
+local leader = redis.call('GET', KEYS[1])
+if not leader then
+    return nil
+end
+local followers = ARGV[1] .. leader
+redis.call('HSET', followers, ARGV[2], ARGV[3])
+redis.call('EXPIRE', followers, ARGV[4])
+return leader
+"""
+
+
+# Close a leader's flight and take its followers, in one step, so a request
+# attaching concurrently either lands in the returned list or finds no flight.
+#
+# KEYS: in-flight key for the fingerprint, leader's followers hash
+# ARGV: leader task_id
+SETTLE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    redis.call('DEL', KEYS[1])
+end
+local followers = redis.call('HKEYS', KEYS[2])
+redis.call('DEL', KEYS[2])
+return followers
+"""
+
+
 class TaskQueue:
     """
     Priority queue with load-balanced task assignment.
     
     Responsibilities:
     - Maintain pending task queue per API type
-    - Assign tasks to idle workers (round-robin within type)
+    - Assign tasks to free worker slots (most free slots first), atomically
+    - Share slots fairly across tenants (weighted fair queuing, per-tenant caps)
     - Track task status and results
     - Handle task retries for failures
+    - Publish task state transitions (via TaskEventBus)
+    - Keep large results out of task records (via ResultStore)
+    - Scatter multi-keyword searches into sub-tasks and gather their results
+    - Coalesce identical requests onto one execution (and reuse fresh results)
     """
     
     # Redis key prefixes
-    QUEUE_KEY = "task_queue"  # Sorted set: priority -> task_id
+    QUEUE_KEY = "task_queue"  # Sorted set: task_id -> fair-share score (lowest first)
     TASK_KEY = "task"  # Hash: task_id -> task_json
+    LEASE_KEY = "task_leases"  # Sorted set: task_id -> lease deadline (epoch seconds)
+    LEASE_OWNER_KEY = "task_lease_owner"  # Hash: task_id -> worker_id
+    BUDGET_KEY = "task_budget"  # Hash: task_id -> execution budget deadline (epoch seconds)
+    SCATTER_KEY = "scatter"  # scatter:{parent_id} remaining counter, :parts list, :done set
+    FLIGHT_KEY = "task_flight"  # String: fingerprint -> in-flight leader task_id
+    FOLLOWERS_KEY = "task_followers"  # Hash per leader: follower task_id -> report_id
+    FRESH_KEY = "task_fresh"  # String: fingerprint -> recently completed task_id
+    TENANT_CLOCK_KEY = "tenant_clock"  # Hash per api_type: tenant -> virtual clock
+    TENANT_RUNNING_KEY = "tenant_running"  # Hash per api_type: tenant -> leased task count
+    LEASE_TENANT_KEY = "task_lease_tenant"  # Hash: task_id -> "<tenant_running key>|<tenant>"
+    REPORT_TASKS_KEY = "report_tasks"  # Set per report: queued task_ids (queue position API)
+    DURATION_KEY = "task_duration"  # Hash: "<api_type>:<action>" -> average execution seconds
     
-    def __init__(self, redis_client, registry: WorkerRegistry):
+    def __init__(
+        self,
+        redis_client,
+        registry: WorkerRegistry,
+        events: Optional[TaskEventBus] = None,
+        results: Optional[ResultStore] = None,
+        relay: Optional[StatusRelay] = None
+    ):
         self.redis = redis_client
         self.registry = registry
+        self.events = events
+        self.results = results
+        self.relay = relay
         self._assignment_task: Optional[asyncio.Task] = None
+        self._reaper_task: Optional[asyncio.Task] = None
         self._assignment_event = asyncio.Event()
+        self._assign_script = self.redis.register_script(ASSIGN_SCRIPT)
+        self._clock_script = self.redis.register_script(CLOCK_SCRIPT)
+        self._attach_script = self.redis.register_script(ATTACH_SCRIPT)
+        self._settle_script = self.redis.register_script(SETTLE_SCRIPT)
     
     async def start(self):
-        """Start the task queue background assignment loop."""
+        """Start the task queue background assignment and lease reaper loops."""
         self._assignment_task = asyncio.create_task(self._assignment_loop())
+        self._reaper_task = asyncio.create_task(self._reaper_loop())
         logger.info("Task queue started")
     
     async def stop(self):
         """Stop the task queue."""
-        if self._assignment_task:
-            self._assignment_task.cancel()
-            try:
-                await self._assignment_task
-            except asyncio.CancelledError:
-                pass
+        for task in (self._assignment_task, self._reaper_task):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
         logger.info("Task queue stopped")
     
     async def enqueue(self, request: TaskSubmitRequest) -> Task:
         """
         Add a new task to the queue.
         
+        Identical requests are coalesced: a fresh completed result is reused
+        (the task comes back "completed"), and a duplicate of an in-flight
+        task attaches to it instead of being queued.
+        
         Args:
             request: Task submission request
             
@@ -70,23 +248,108 @@ class TaskQueue:
             payload=request.payload,
             priority=request.priority,
             target_worker_id=request.target_worker_id,  # Route to specific worker
+            tenant_id=request.tenant_id or (
+                "enrichment" if request.source == "enrichment" else f"report:{request.report_id}"
+            ),
             max_retries=config.TASK_RETRY_LIMIT,
             created_at=datetime.utcnow()
         )
         
-        # Store task data
-        await self._store_task(task)
+        # Admin-routed and enrichment tasks are tracked by their own task_id
+        if request.source != "enrichment" and not request.target_worker_id:
+            task.fingerprint = task_fingerprint(task.api_type, task.action, task.payload)
         
-        # Add to priority queue (negated priority for descending order)
-        queue_key = f"{self.QUEUE_KEY}:{task.api_type}"
-        await self.redis.zadd(queue_key, {task.task_id: -task.priority})
+        if task.fingerprint:
+            if await self._reuse_fresh(task) or await self._attach(task):
+                return task
         
-        logger.info(f"📥 Task enqueued: {task.task_id} ({task.api_type}/{task.action})")
+        await self._queue(task)
+        return task
+    
+    async def get_result(self, task: Task) -> Optional[dict]:
+        """
+        A task's result, loading it from the result store if offloaded.
         
-        # Signal assignment loop
-        self._assignment_event.set()
+        Tasks returned by get_task carry only a reference for large
+        results; use this (or ResultStore.stream) when the result is needed.
+        """
+        if task.result is not None or not task.result_ref:
+            return task.result
+        if not self.results:
+            return None
+        try:
+            return await self.results.load(task.result_ref)
+        except Exception as e:
+            logger.error(f"Failed to load result of {task.task_id}: {e}")
+            return None
+    
+    async def get_queue_position(self, task: Task) -> Dict[str, Any]:
+        """
+        Queue position and rough ETA for a task.
         
-        return task
+        position is 1-based within the task's api_type queue, None once the
+        task has left the queue. The ETA assumes the tasks ahead run in waves
+        across all worker slots at the action's average duration; tenant
+        caps and fairer-scored later arrivals can still move it.
+        """
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.zrank(f"{self.QUEUE_KEY}:{task.api_type}", task.task_id)
+            pipe.zcard(f"{self.QUEUE_KEY}:{task.api_type}")
+            rank, pending = await pipe.execute()
+        
+        position = {
+            "task_id": task.task_id,
+            "report_id": task.report_id,
+            "api_type": task.api_type,
+            "action": task.action,
+            "status": task.status,
+            "position": None,
+            "ahead": None,
+            "pending": pending,
+            "eta_seconds": None,
+        }
+        if rank is None:
+            return position
+        position["position"] = rank + 1
+        position["ahead"] = rank
+        
+        stats = (await self.registry.get_worker_stats(task.api_type)).get(task.api_type)
+        if stats and stats.slots:
+            duration = await self.redis.hget(self.DURATION_KEY, f"{task.api_type}:{task.action}")
+            duration = float(duration) if duration else config.TASK_ETA_DEFAULT_SECONDS
+            waves = 0 if rank < stats.free_slots else (rank - stats.free_slots) // stats.slots + 1
+            position["eta_seconds"] = round(waves * duration)
+        return position
+    
+    async def get_report_queue(self, report_id: str) -> List[Dict[str, Any]]:
+        """Queue positions of a report's unfinished tasks (queued ones first)."""
+        report_key = f"{self.REPORT_TASKS_KEY}:{report_id}"
+        positions = []
+        for task_id in await self.redis.smembers(report_key):
+            task = await self.get_task(task_id)
+            if not task or task.status in ("completed", "failed", "cancelled"):
+                await self.redis.srem(report_key, task_id)
+                continue
+            positions.append(await self.get_queue_position(task))
+        
+        positions.sort(key=lambda p: (p["position"] is None, p["position"] or 0))
+        return positions
+    
+    async def get_report_ids(self, task: Task) -> List[str]:
+        """
+        Reports that should receive a task's status updates.
+        
+        The task's own report plus every report attached to it (for a
+        scatter sub-task, attached to its parent).
+        """
+        leader_id = task.parent_task_id or task.task_id
+        attached = await self.redis.hvals(f"{self.FOLLOWERS_KEY}:{leader_id}")
+        
+        report_ids = [task.report_id]
+        for report_id in attached:
+            if report_id not in report_ids:
+                report_ids.append(report_id)
+        return report_ids
     
     async def get_task(self, task_id: str) -> Optional[Task]:
         """Get a task by ID."""
@@ -97,115 +360,201 @@ class TaskQueue:
     
     async def assign_next(self, api_type: str) -> Optional[Tuple[Task, str]]:
         """
-        Assign the next pending task to an idle worker.
+        Assign the next pending task to a worker with a free slot.
+        
+        Safe to run concurrently on several orchestrator nodes: the pop,
+        slot reservation and lease happen in one Redis script.
         
         Returns:
             Tuple of (Task, worker_id) if assignment made, else None
         """
-        # Get idle workers
-        idle_workers = self.registry.get_idle_workers(api_type)
-        if not idle_workers:
-            return None
-        
-        # Get next task from queue (highest priority = lowest score)
         queue_key = f"{self.QUEUE_KEY}:{api_type}"
-        result = await self.redis.zpopmin(queue_key, count=1)
         
-        if not result:
-            return None
+        while True:
+            result = await self._assign_script(
+                keys=[
+                    queue_key,
+                    f"{self.registry.SLOTS_KEY}:{api_type}",
+                    self.LEASE_KEY,
+                    self.LEASE_OWNER_KEY,
+                    f"{self.TENANT_RUNNING_KEY}:{api_type}",
+                    self.LEASE_TENANT_KEY,
+                ],
+                args=[
+                    f"{self.TASK_KEY}:",
+                    f"{self.registry.WORKER_KEY}:",
+                    f"{self.registry.TASKS_KEY}:",
+                    time.time() + config.TASK_DISPATCH_TIMEOUT,
+                    config.TENANT_MAX_CONCURRENCY,
+                    config.TASK_SCHEDULER_SCAN_DEPTH,
+                ]
+            )
+            if not result:
+                return None
+            
+            task_id, worker_id = result
+            if worker_id:
+                break
+            logger.warning(f"Task {task_id} not found in store, dropped from queue")
         
-        task_id = result[0][0] if isinstance(result[0], tuple) else result[0]
         task = await self.get_task(task_id)
-        
         if not task:
-            logger.warning(f"Task {task_id} not found in store")
+            # Expired between the script and now - give the slot back
+            logger.warning(f"Task {task_id} expired during assignment")
+            await self._release(task_id, worker_id)
             return None
         
-        # Select worker - prioritize target_worker_id if specified
-        worker = None
         if task.target_worker_id:
-            # Try to find the target worker
-            for w in idle_workers:
-                if w.worker_id == task.target_worker_id:
-                    worker = w
-                    logger.info(f"📍 Routing to target worker: {task.target_worker_id}")
-                    break
-            if not worker:
-                logger.warning(f"Target worker {task.target_worker_id} not idle, using first available")
-        
-        # Fallback to first idle worker
-        if not worker:
-            worker = idle_workers[0]
+            if task.target_worker_id == worker_id:
+                logger.info(f"📍 Routing to target worker: {worker_id}")
+            else:
+                logger.warning(f"Target worker {task.target_worker_id} has no free slot, using {worker_id}")
         
         # Update task
         task.status = "assigned"
-        task.assigned_worker_id = worker.worker_id
+        task.assigned_worker_id = worker_id
         task.assigned_at = datetime.utcnow()
         await self._store_task(task)
+        metrics.observe(
+            metrics.TASK_QUEUE_WAIT, task.created_at, task.assigned_at,
+            api_type=task.api_type, action=task.action
+        )
         
-        # Update worker status
-        await self.registry.set_status(worker.worker_id, "working", task.task_id)
-        
-        logger.info(f"📤 Task {task_id} assigned to worker {worker.worker_id}")
+        logger.info(f"📤 Task {task_id} assigned to worker {worker_id}")
         
-        return task, worker.worker_id
+        return task, worker_id
     
-    async def mark_running(self, task_id: str):
-        """Mark a task as running (worker started execution)."""
+    async def mark_running(self, task_id: str, worker_id: Optional[str] = None):
+        """
+        Mark a task as running (worker started execution).
+        
+        Switches the task from the dispatch lease to a heartbeat-renewed
+        lease and starts its execution budget.
+        """
         task = await self.get_task(task_id)
-        if task:
-            task.status = "running"
-            task.started_at = datetime.utcnow()
-            await self._store_task(task)
-            logger.debug(f"Task {task_id} marked as running")
+        if not task or self._is_stale(task, worker_id):
+            return
+        
+        task.status = "running"
+        task.started_at = datetime.utcnow()
+        await self._store_task(task)
+        metrics.observe(
+            metrics.TASK_DISPATCH_LATENCY, task.assigned_at, task.started_at,
+            api_type=task.api_type, action=task.action
+        )
+        
+        now = time.time()
+        budget_deadline = now + self._action_budget(task)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hset(self.BUDGET_KEY, task_id, budget_deadline)
+            pipe.zadd(self.LEASE_KEY, {task_id: min(now + config.TASK_LEASE_SECONDS, budget_deadline)}, xx=True)
+            await pipe.execute()
+        logger.debug(f"Task {task_id} marked as running")
     
-    async def mark_completed(self, task_id: str, result: dict):
-        """Mark a task as completed with result."""
+    async def renew_leases(self, worker_id: str):
+        """
+        Extend the leases of every task on a worker (called on its heartbeats).
+        
+        Leases are capped at each task's execution budget and only updated
+        if still present, so a task the reaper already took is not revived.
+        """
+        task_ids = await self.registry.get_active_tasks(worker_id)
+        if not task_ids:
+            return
+        
+        budgets = await self.redis.hmget(self.BUDGET_KEY, task_ids)
+        lease_deadline = time.time() + config.TASK_LEASE_SECONDS
+        renewals = {
+            task_id: min(lease_deadline, float(budget))
+            for task_id, budget in zip(task_ids, budgets)
+            # Not acknowledged yet - keep the dispatch lease
+            if budget is not None
+        }
+        if renewals:
+            await self.redis.zadd(self.LEASE_KEY, renewals, xx=True)
+    
+    async def mark_completed(self, task_id: str, result: dict, worker_id: Optional[str] = None) -> bool:
+        """
+        Mark a task as completed with result.
+        
+        Returns:
+            False if the completion was ignored (unknown, cancelled or stale)
+        """
         task = await self.get_task(task_id)
         if task:
+            if task.status == "cancelled":
+                # Late result for a cancelled task - slot was already freed
+                logger.info(f"Ignoring completion of cancelled task {task_id}")
+                return False
+            if self._is_stale(task, worker_id):
+                return False
+            
             task.status = "completed"
             task.result = result
             task.completed_at = datetime.utcnow()
             await self._store_task(task)
+            metrics.observe(
+                metrics.TASK_EXECUTION, task.started_at, task.completed_at,
+                api_type=task.api_type, action=task.action, status="completed"
+            )
+            await self._record_duration(task)
             
-            # Release worker
-            if task.assigned_worker_id:
-                await self.registry.set_status(task.assigned_worker_id, "idle", None)
+            # Release worker slot
+            await self._release(task_id, task.assigned_worker_id)
             
             logger.info(f"✅ Task {task_id} completed")
+            
+            await self._settle(task)
+            if task.parent_task_id:
+                await self._gather_part(task, result)
+            return True
+        return False
     
-    async def mark_failed(self, task_id: str, error: str):
+    async def mark_failed(
+        self,
+        task_id: str,
+        error: str,
+        worker_id: Optional[str] = None,
+        retry: bool = True
+    ):
         """
         Mark a task as failed. May retry if within limits.
         
         Args:
             task_id: Task ID
             error: Error message
+            worker_id: Reporting worker; reports from a worker that no longer
+                holds the task (it was reaped and reassigned) are ignored
+            retry: False to fail permanently regardless of retries left
         """
         task = await self.get_task(task_id)
-        if not task:
+        if not task or task.status in ("completed", "failed", "cancelled"):
+            return
+        if self._is_stale(task, worker_id):
             return
         
         task.retry_count += 1
         task.error = error
+        metrics.observe(
+            metrics.TASK_EXECUTION, task.started_at, datetime.utcnow(),
+            api_type=task.api_type, action=task.action, status="failed"
+        )
         
-        # Release worker first
-        if task.assigned_worker_id:
-            await self.registry.set_status(task.assigned_worker_id, "idle", None)
-            task.assigned_worker_id = None
+        # Release worker slot first
+        await self._release(task_id, task.assigned_worker_id)
+        task.assigned_worker_id = None
         
-        if task.retry_count < task.max_retries:
+        if retry and task.retry_count < task.max_retries:
             # Re-queue for retry
             task.status = "pending"
             task.assigned_at = None
             task.started_at = None
-            await self._store_task(task)
             
-            # Add back to queue with same priority
-            queue_key = f"{self.QUEUE_KEY}:{task.api_type}"
-            await self.redis.zadd(queue_key, {task.task_id: -task.priority})
+            # Add back to queue, keeping its place
+            await self._push(task)
             
             logger.warning(f"⟳ Task {task_id} failed, retrying ({task.retry_count}/{task.max_retries})")
+            metrics.TASK_RETRIES.labels(api_type=task.api_type, action=task.action).inc()
             self._assignment_event.set()
         else:
             # Max retries exceeded
@@ -213,6 +562,11 @@ class TaskQueue:
             task.completed_at = datetime.utcnow()
             await self._store_task(task)
             logger.error(f"❌ Task {task_id} failed permanently: {error}")
+            metrics.TASK_FAILURES.labels(api_type=task.api_type, action=task.action).inc()
+            
+            await self._settle(task)
+            if task.parent_task_id:
+                await self._gather_part(task, None)
     
     async def cancel_task(self, task_id: str) -> bool:
         """
@@ -243,23 +597,44 @@ class TaskQueue:
         task.completed_at = datetime.utcnow()
         await self._store_task(task)
         
-        # Release worker if assigned
+        # Stop the worker's execution (on whichever node) and free its slot
         if task.assigned_worker_id:
-            await self.registry.set_status(task.assigned_worker_id, "idle", None)
+            try:
+                await self.registry.send_to_worker(
+                    task.assigned_worker_id,
+                    {"type": "cancel", "task_id": task_id}
+                )
+            except Exception as e:
+                logger.warning(f"Failed to send cancel for {task_id}: {e}")
+        await self._release(task_id, task.assigned_worker_id)
         
         logger.info(f"🚫 Task {task_id} cancelled")
+        
+        # A cancelled follower just detaches; a cancelled leader hands its
+        # execution to the reports still attached
+        if task.coalesced_into:
+            await self.redis.hdel(f"{self.FOLLOWERS_KEY}:{task.coalesced_into}", task_id)
+        await self._settle(task)
+        
+        # Cancelling a scattered parent cancels its sub-tasks; a cancelled
+        # sub-task counts as a failed part so the parent still gathers
+        for subtask_id in task.subtask_ids:
+            await self.cancel_task(subtask_id)
+        if task.parent_task_id:
+            await self._gather_part(task, None)
         return True
     
     async def get_queue_stats(self) -> Dict[str, Dict[str, int]]:
         """Get queue statistics by API type."""
         stats = {}
         api_types = ["crunchbase", "tracxn", "social","linkedin"]
+        in_flight = await self._in_flight_counts()
         
         for api_type in api_types:
             queue_key = f"{self.QUEUE_KEY}:{api_type}"
             pending_count = await self.redis.zcard(queue_key)
             
-            worker_stats = self.registry.get_worker_stats(api_type)
+            worker_stats = await self.registry.get_worker_stats(api_type)
             ws = worker_stats.get(api_type)
             
             stats[api_type] = {
@@ -267,6 +642,11 @@ class TaskQueue:
                 "total_workers": ws.total if ws else 0,
                 "idle_workers": ws.idle if ws else 0,
                 "working_workers": ws.working if ws else 0,
+                "free_slots": ws.free_slots if ws else 0,
+                "slots": ws.slots if ws else 0,
+                "offline_workers": ws.offline if ws else 0,
+                "assigned": in_flight.get(api_type, {}).get("assigned", 0),
+                "running": in_flight.get(api_type, {}).get("running", 0),
             }
         
         return stats
@@ -302,6 +682,9 @@ class TaskQueue:
                 task.error = "Manually cleared by admin"
                 await self._store_task(task)
                 count += 1
+                await self._settle(task, promote=False)
+                if task.parent_task_id:
+                    await self._gather_part(task, None)
                 
         logger.info(f"🧹 Cleared {count} pending tasks for {api_type}")
         return count
@@ -310,16 +693,385 @@ class TaskQueue:
     # Private methods
     # =========================================================================
     
+    def _action_budget(self, task: Task) -> int:
+        """Execution budget (seconds) for a task's api_type/action."""
+        return config.TASK_ACTION_TIMEOUTS.get(
+            f"{task.api_type}:{task.action}",
+            config.TASK_ACTION_TIMEOUTS.get(task.action, config.TASK_TIMEOUT)
+        )
+    
+    async def _in_flight_counts(self) -> Dict[str, Dict[str, int]]:
+        """Leased (assigned/running) task counts: {api_type: {status: count}}."""
+        task_ids = await self.redis.zrange(self.LEASE_KEY, 0, -1)
+        counts: Dict[str, Dict[str, int]] = {}
+        if not task_ids:
+            return counts
+        
+        # Only two fields are needed - skip full model validation
+        for raw in await self.redis.mget([f"{self.TASK_KEY}:{task_id}" for task_id in task_ids]):
+            if not raw:
+                continue
+            data = json.loads(raw)
+            by_status = counts.setdefault(data.get("api_type"), {})
+            by_status[data.get("status")] = by_status.get(data.get("status"), 0) + 1
+        return counts
+    
+    def _is_stale(self, task: Task, worker_id: Optional[str]) -> bool:
+        """True if a worker reports on a task it no longer holds."""
+        if worker_id and task.assigned_worker_id != worker_id:
+            logger.warning(
+                f"Ignoring report for task {task.task_id} from {worker_id} "
+                f"(assigned to {task.assigned_worker_id}, {task.status})"
+            )
+            return True
+        return False
+    
+    async def _release(self, task_id: str, worker_id: Optional[str]):
+        """Drop a task's lease and free the worker slot it held."""
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.zrem(self.LEASE_KEY, task_id)
+            pipe.hget(self.LEASE_OWNER_KEY, task_id)
+            pipe.hdel(self.LEASE_OWNER_KEY, task_id)
+            pipe.hdel(self.BUDGET_KEY, task_id)
+            pipe.hget(self.LEASE_TENANT_KEY, task_id)
+            pipe.hdel(self.LEASE_TENANT_KEY, task_id)
+            _, lease_owner, _, _, lease_tenant, tenant_released = await pipe.execute()
+        
+        # Only the caller that removed the lease tenant gives the tenant slot back
+        if lease_tenant and tenant_released:
+            running_key, _, tenant = lease_tenant.partition("|")
+            await self.redis.hincrby(running_key, tenant, -1)
+        
+        worker_id = worker_id or lease_owner
+        if worker_id:
+            await self.registry.release_task(worker_id, task_id)
+    
+    async def _queue(self, task: Task):
+        """
+        Queue (or scatter) a task for execution.
+        
+        A coalescible task first claims the in-flight slot for its
+        fingerprint; losing that race to an identical request means
+        attaching to the winner instead.
+        """
+        if task.fingerprint:
+            flight_key = f"{self.FLIGHT_KEY}:{task.fingerprint}"
+            claimed = await self.redis.set(flight_key, task.task_id, nx=True, ex=config.TASK_TIMEOUT * 2)
+            if not claimed and await self._attach(task):
+                return
+        
+        if await self._scatter(task):
+            return
+        
+        await self._push(task)
+        
+        logger.info(f"📥 Task enqueued: {task.task_id} ({task.api_type}/{task.action})")
+        
+        # Signal assignment loop
+        self._assignment_event.set()
+    
+    @staticmethod
+    def _aged_score(virtual_time: float, priority: int) -> float:
+        """Queue score: virtual time, pulled forward by priority (lower runs first)."""
+        return virtual_time - priority * config.TASK_PRIORITY_AGING_SECONDS
+    
+    async def _push(self, task: Task):
+        """
+        Store a pending task and add it to its api_type queue.
+        
+        The score is the tenant's virtual finish time (each task costs
+        TASK_FAIR_SHARE_QUANTUM / tenant weight) minus a priority offset.
+        Tenants are therefore served round-robin by weight, whatever their
+        backlog; priority moves a task ahead by a bounded amount of time; and
+        a waiting low-priority task ages past newer high-priority ones. A
+        requeued task keeps its score, and so its place.
+        """
+        if task.queue_score is None:
+            tenant = task.tenant_id or ""
+            weight = config.TENANT_WEIGHTS.get(tenant, 1.0)
+            finish = await self._clock_script(
+                keys=[f"{self.TENANT_CLOCK_KEY}:{task.api_type}"],
+                args=[tenant, time.time(), config.TASK_FAIR_SHARE_QUANTUM / weight, 86400]
+            )
+            task.queue_score = self._aged_score(float(finish), task.priority)
+        
+        await self._store_task(task)
+        
+        report_key = f"{self.REPORT_TASKS_KEY}:{task.report_id}"
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.zadd(f"{self.QUEUE_KEY}:{task.api_type}", {task.task_id: task.queue_score})
+            pipe.sadd(report_key, task.task_id)
+            pipe.expire(report_key, config.TASK_TIMEOUT * 2)
+            await pipe.execute()
+    
+    async def _record_duration(self, task: Task):
+        """Fold a completed task's execution time into its action's moving average."""
+        if not task.started_at or not task.completed_at:
+            return
+        elapsed = (task.completed_at - task.started_at).total_seconds()
+        field = f"{task.api_type}:{task.action}"
+        previous = await self.redis.hget(self.DURATION_KEY, field)
+        average = elapsed if previous is None else 0.8 * float(previous) + 0.2 * elapsed
+        await self.redis.hset(self.DURATION_KEY, field, average)
+    
+    async def _reuse_fresh(self, task: Task) -> bool:
+        """Complete a task from an identical one finished within the freshness window."""
+        source_id = await self.redis.get(f"{self.FRESH_KEY}:{task.fingerprint}")
+        if not source_id:
+            return False
+        
+        source = await self.get_task(source_id)
+        if not source or source.status != "completed":
+            return False
+        result = await self.get_result(source)
+        if result is None:
+            return False
+        
+        now = datetime.utcnow()
+        task.status = "completed"
+        task.result = result
+        task.coalesced_into = source_id
+        task.started_at = now
+        task.completed_at = now
+        await self._store_task(task)
+        
+        logger.info(f"♻️ Task {task.task_id} reused result of {source_id} ({task.api_type}/{task.action})")
+        return True
+    
+    async def _attach(self, task: Task) -> bool:
+        """Attach a task to the in-flight execution of an identical one."""
+        flight_key = f"{self.FLIGHT_KEY}:{task.fingerprint}"
+        leader_id = await self._attach_script(
+            keys=[flight_key],
+            args=[f"{self.FOLLOWERS_KEY}:", task.task_id, task.report_id, config.TASK_TIMEOUT * 2]
+        )
+        if not leader_id:
+            return False
+        
+        leader = await self.get_task(leader_id)
+        if not leader or leader.status in ("completed", "failed", "cancelled"):
+            # Flight outlived its leader's record - drop it and run this one
+            await self.redis.hdel(f"{self.FOLLOWERS_KEY}:{leader_id}", task.task_id)
+            await self.redis.delete(flight_key)
+            return False
+        
+        task.coalesced_into = leader_id
+        task.status = "running" if leader.status == "running" else "pending"
+        await self._store_task(task)
+        
+        logger.info(f"🔗 Task {task.task_id} attached to in-flight {leader_id} ({task.api_type}/{task.action})")
+        return True
+    
+    async def _settle(self, task: Task, promote: bool = True):
+        """
+        Pass a leader's terminal state on to its attached tasks.
+        
+        Followers get the leader's result or error. If the leader was
+        cancelled, its followers still want the work: with promote they are
+        queued again (the first becomes the new leader), otherwise they are
+        cancelled too.
+        """
+        if not task.fingerprint or task.coalesced_into:
+            return
+        
+        follower_ids = await self._settle_script(
+            keys=[f"{self.FLIGHT_KEY}:{task.fingerprint}", f"{self.FOLLOWERS_KEY}:{task.task_id}"],
+            args=[task.task_id]
+        )
+        
+        if task.status == "completed" and config.COALESCE_FRESHNESS_SECONDS > 0:
+            await self.redis.set(
+                f"{self.FRESH_KEY}:{task.fingerprint}",
+                task.task_id,
+                ex=config.COALESCE_FRESHNESS_SECONDS
+            )
+        
+        for follower_id in follower_ids:
+            follower = await self.get_task(follower_id)
+            if not follower or follower.status in ("completed", "failed", "cancelled"):
+                continue
+            
+            if task.status == "cancelled" and promote:
+                follower.coalesced_into = None
+                follower.status = "pending"
+                await self._queue(follower)
+                continue
+            
+            follower.status = task.status
+            follower.result = task.result
+            follower.error = task.error
+            follower.completed_at = datetime.utcnow()
+            await self._store_task(follower)
+        
+        if follower_ids:
+            logger.info(f"Task {task.task_id} {task.status}: settled {len(follower_ids)} attached task(s)")
+    
+    async def _scatter(self, task: Task) -> bool:
+        """
+        Split a multi-keyword search into collection sub-tasks.
+        
+        The parent is stored as "running" without being queued; it is queued
+        again as the gather stage once every sub-task has reported. Returns
+        False (caller enqueues the task as-is) when the action cannot be
+        scattered or there are not enough keywords/worker slots to bother.
+        """
+        action = subtask_action(task.api_type, task.action)
+        keywords = task.payload.get("keywords") or []
+        if (
+            not config.SCATTER_ENABLED
+            or not action
+            or task.target_worker_id
+            or "collected" in task.payload
+            or len(keywords) < 2
+        ):
+            return False
+        
+        # Size the fan-out to slots that can start a part now; busy slots
+        # would only leave parts queued behind other work
+        stats = (await self.registry.get_worker_stats(task.api_type)).get(task.api_type)
+        chunks = split_keywords(keywords, max(stats.free_slots if stats else 0, 1))
+        if len(chunks) < 2:
+            return False
+        
+        now = datetime.utcnow()
+        subtasks = []
+        offset = 0
+        for chunk in chunks:
+            subtasks.append(Task(
+                task_id=str(uuid.uuid4()),
+                report_id=task.report_id,
+                api_type=task.api_type,
+                action=action,
+                payload={
+                    "keywords": chunk,
+                    "num_companies": task.payload.get("num_companies", 10),
+                    "keyword_offset": offset,
+                    "total_keywords": len(keywords),
+                },
+                priority=task.priority,
+                source=task.source,
+                tenant_id=task.tenant_id,
+                parent_task_id=task.task_id,
+                max_retries=task.max_retries,
+                created_at=now
+            ))
+            offset += len(chunk)
+        
+        task.status = "running"
+        task.started_at = now
+        task.subtask_ids = [subtask.task_id for subtask in subtasks]
+        
+        scatter_key = f"{self.SCATTER_KEY}:{task.task_id}"
+        await self.redis.set(scatter_key, len(subtasks), ex=config.TASK_TIMEOUT * 2)
+        await self._store_task(task)
+        
+        for subtask in subtasks:
+            await self._push(subtask)
+        
+        logger.info(
+            f"📥 Task scattered: {task.task_id} ({task.api_type}/{task.action}) "
+            f"into {len(subtasks)} x {action} sub-tasks"
+        )
+        self._assignment_event.set()
+        return True
+    
+    async def _gather_part(self, subtask: Task, result: Optional[dict]):
+        """
+        Record a finished sub-task's partial collection.
+        
+        A failed, cancelled or malformed part counts as all of its keywords
+        failing. The last part to arrive merges them into the parent payload
+        and queues the parent for its gather stage (ranking + top-N scrape).
+        """
+        parent_id = subtask.parent_task_id
+        scatter_key = f"{self.SCATTER_KEY}:{parent_id}"
+        parts_key = f"{scatter_key}:parts"
+        done_key = f"{scatter_key}:done"
+        ttl = config.TASK_TIMEOUT * 2
+        
+        if not result or "company_tracker" not in result:
+            result = failed_part(subtask.payload.get("keywords", []))
+        
+        # Each sub-task is counted once, even if reported twice
+        if not await self.redis.sadd(done_key, subtask.task_id):
+            return
+        
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.expire(done_key, ttl)
+            pipe.rpush(parts_key, json.dumps(result))
+            pipe.expire(parts_key, ttl)
+            pipe.decr(scatter_key)
+            remaining = (await pipe.execute())[-1]
+        
+        if remaining > 0:
+            logger.info(f"Scatter {parent_id}: {remaining} sub-task(s) outstanding")
+            return
+        
+        parts = [json.loads(part) for part in await self.redis.lrange(parts_key, 0, -1)]
+        await self.redis.delete(scatter_key, parts_key, done_key)
+        
+        parent = await self.get_task(parent_id)
+        if not parent or parent.status != "running":
+            return
+        
+        merged = merge_collections(parts)
+        parent.payload = {**parent.payload, "collected": merged}
+        parent.status = "pending"
+        if parent.queue_score is None:
+            # Ranked as of its original submission - it has waited for its parts
+            parent.queue_score = self._aged_score(parent.created_at.timestamp(), parent.priority)
+        await self._push(parent)
+        
+        logger.info(
+            f"📦 Scatter {parent_id} gathered: {len(merged['company_tracker'])} companies "
+            f"from {len(parts)} parts, queued for ranking"
+        )
+        self._assignment_event.set()
+    
     async def _store_task(self, task: Task):
-        """Store task in Redis."""
+        """Store task in Redis and publish the transition."""
         key = f"{self.TASK_KEY}:{task.task_id}"
         # Keep completed tasks for 1 hour for result retrieval
         ttl = 3600 if task.status in ("completed", "failed", "cancelled") else config.TASK_TIMEOUT * 2
-        await self.redis.set(key, task.model_dump_json(), ex=ttl)
+        
+        # Large results live in the result store; the record keeps a reference
+        record = task
+        if task.result is not None and self.results:
+            try:
+                ref = await self.results.offload(task.task_id, task.result, ttl)
+                if ref:
+                    record = task.model_copy(update={"result": None, "result_ref": ref})
+            except Exception as e:
+                logger.error(f"Failed to offload result of {task.task_id}, storing inline: {e}")
+        
+        await self.redis.set(key, record.model_dump_json(), ex=ttl)
+        
+        if self.events:
+            await self.events.publish(task)
+        if self.relay and task.status in TERMINAL_STATUSES:
+            await self._relay_terminal(task)
+    
+    async def _relay_terminal(self, task: Task):
+        """
+        Tell the backend a report's task finished (resumes a parked report).
+        
+        Sent only by the node that made the transition. Sub-tasks and
+        enrichment tasks have no report waiting on them.
+        """
+        if not task.report_id or task.parent_task_id or task.source == "enrichment":
+            return
+        await self.relay.relay(StatusUpdate(
+            task_id=task.task_id,
+            report_id=task.report_id,
+            step_key="orchestrator",
+            detail_type=config.TASK_TERMINAL_DETAIL_TYPE,
+            message=f"Task {task.status}",
+            data={"task_id": task.task_id, "status": task.status}
+        ))
     
     async def _assignment_loop(self):
         """
-        Background loop that assigns pending tasks to idle workers.
+        Background loop that fills free worker slots with pending tasks.
         """
         api_types = ["crunchbase", "tracxn", "social","linkedin"]
         
@@ -343,24 +1095,94 @@ class TaskQueue:
                         if not result:
                             break
                         
-                        # Send task to worker
+                        # Send task to worker (directly or via its node)
                         task, worker_id = result
-                        ws = self.registry.get_connection(worker_id)
-                        if ws:
-                            try:
-                                await ws.send_json({
-                                    "type": "task",
-                                    "task_id": task.task_id,
-                                    "report_id": task.report_id,
-                                    "action": task.action,
-                                    "payload": task.payload
-                                })
-                            except Exception as e:
-                                logger.error(f"Failed to send task to worker: {e}")
-                                await self.mark_failed(task.task_id, f"Failed to send task: {e}")
+                        try:
+                            delivered = await self.registry.send_to_worker(worker_id, {
+                                "type": "task",
+                                "task_id": task.task_id,
+                                "report_id": task.report_id,
+                                "action": task.action,
+                                "payload": task.payload
+                            })
+                        except Exception as e:
+                            logger.error(f"Failed to send task to worker: {e}")
+                            await self.mark_failed(task.task_id, f"Failed to send task: {e}")
+                            continue
+                        
+                        if not delivered:
+                            logger.error(f"Worker {worker_id} unreachable for task {task.task_id}")
+                            await self.mark_failed(task.task_id, "Worker unreachable")
                         
             except asyncio.CancelledError:
                 break
             except Exception as e:
                 logger.error(f"Assignment loop error: {e}")
                 await asyncio.sleep(1)
+    
+    async def _reap_expired(self) -> int:
+        """
+        Requeue or fail tasks whose lease expired.
+        
+        ZREM claims each expired task, so with several orchestrator nodes
+        only one of them reaps it.
+        
+        Returns:
+            Number of tasks reaped
+        """
+        now = time.time()
+        expired = await self.redis.zrangebyscore(self.LEASE_KEY, "-inf", now)
+        reaped = 0
+        
+        for task_id in expired:
+            if not await self.redis.zrem(self.LEASE_KEY, task_id):
+                continue  # Renewed, released or claimed by another node
+            
+            owner = await self.redis.hget(self.LEASE_OWNER_KEY, task_id)
+            budget = await self.redis.hget(self.BUDGET_KEY, task_id)
+            task = await self.get_task(task_id)
+            reaped += 1
+            
+            if not task or task.status in ("completed", "failed", "cancelled"):
+                await self._release(task_id, owner)
+                continue
+            
+            # Ask the (possibly hung) worker to stop before the task moves on
+            if owner:
+                try:
+                    await self.registry.send_to_worker(owner, {"type": "cancel", "task_id": task_id})
+                except Exception as e:
+                    logger.debug(f"Could not send cancel for reaped task {task_id}: {e}")
+            
+            if budget is not None and now >= float(budget):
+                budget_seconds = self._action_budget(task)
+                logger.error(f"⏱️ Task {task_id} exceeded its {budget_seconds}s budget ({task.action})")
+                reason = "budget_exceeded"
+                await self.mark_failed(task_id, f"Task exceeded {budget_seconds}s execution budget", retry=False)
+            elif task.status == "assigned":
+                logger.warning(f"⏱️ Task {task_id} not acknowledged by worker {owner}, requeueing")
+                reason = "not_acknowledged"
+                await self.mark_failed(task_id, "Worker did not acknowledge task")
+            else:
+                logger.warning(f"⏱️ Lease expired for task {task_id} on worker {owner} (missed heartbeats)")
+                reason = "lease_expired"
+                await self.mark_failed(task_id, "Task lease expired (worker stopped heartbeating)")
+            metrics.TASKS_REAPED.labels(api_type=task.api_type, reason=reason).inc()
+            
+            # Requeued tasks are visible to the assignment loop
+            self._assignment_event.set()
+        
+        return reaped
+    
+    async def _reaper_loop(self):
+        """Background loop that reclaims tasks with expired leases."""
+        while True:
+            try:
+                await asyncio.sleep(config.TASK_REAPER_INTERVAL)
+                reaped = await self._reap_expired()
+                if reaped:
+                    logger.info(f"🧹 Reaped {reaped} task(s) with expired leases")
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Lease reaper error: {e}")
@@ -0,0 +1,460 @@
+"""
+Unit tests for the task queue
+Runs TaskQueue and WorkerRegistry against fakeredis (with Lua scripting) to
+cover assignment, leases, slot accounting, scatter/gather and coalescing.
+
+Run from the orchestrator directory: python -m pytest tests
+"""
+
+import time
+import unittest
+
+import fakeredis
+
+import config
+from models import TaskSubmitRequest
+from registry import WorkerRegistry
+from task_queue import TaskQueue
+
+
+API_TYPE = "crunchbase"
+TOKEN = f"dev-{API_TYPE}-token"
+
+
+class FakeWebSocket:
+    """Records the messages the orchestrator sends to a worker"""
+
+    def __init__(self):
+        self.sent = []
+
+    async def send_json(self, message):
+        self.sent.append(message)
+
+
+class FakeRelay:
+    """Records the status updates the queue relays to the backend"""
+
+    def __init__(self):
+        self.updates = []
+
+    async def relay(self, update):
+        self.updates.append(update)
+
+
+class TaskQueueTestCase(unittest.IsolatedAsyncioTestCase):
+    """Fresh Redis, registry and queue per test"""
+
+    async def asyncSetUp(self):
+        self.redis = fakeredis.FakeAsyncRedis(server=fakeredis.FakeServer(), decode_responses=True)
+        self.registry = WorkerRegistry(self.redis)
+        self.relay = FakeRelay()
+        self.queue = TaskQueue(self.redis, self.registry, relay=self.relay)
+        self.sockets = {}
+
+    async def asyncTearDown(self):
+        await self.redis.aclose()
+
+    async def register_worker(self, worker_id, capacity=1):
+        self.sockets[worker_id] = FakeWebSocket()
+        registered = await self.registry.register(
+            worker_id, API_TYPE, TOKEN, self.sockets[worker_id], {"capacity": capacity}
+        )
+        self.assertTrue(registered)
+
+    async def submit(self, report_id="report-1", action="search", payload=None):
+        return await self.queue.enqueue(TaskSubmitRequest(
+            api_type=API_TYPE,
+            action=action,
+            report_id=report_id,
+            payload=payload if payload is not None else {"keywords": [report_id]},
+        ))
+
+    async def free_slots(self, worker_id):
+        return int(await self.redis.zscore(f"{self.registry.SLOTS_KEY}:{API_TYPE}", worker_id))
+
+    async def tenant_running(self, task):
+        count = await self.redis.hget(f"{self.queue.TENANT_RUNNING_KEY}:{API_TYPE}", task.tenant_id)
+        return int(count or 0)
+
+    async def queued_ids(self):
+        return await self.redis.zrange(f"{self.queue.QUEUE_KEY}:{API_TYPE}", 0, -1)
+
+    async def expire_lease(self, task_id, budget_spent=False):
+        await self.redis.zadd(self.queue.LEASE_KEY, {task_id: 0})
+        if budget_spent:
+            await self.redis.hset(self.queue.BUDGET_KEY, task_id, 0)
+
+
+class TestAssignment(TaskQueueTestCase):
+    """Test the assign -> complete / fail / reap lifecycle"""
+
+    async def test_assign_and_complete(self):
+        """Test that a completed task gives back its worker slot and tenant count"""
+        await self.register_worker("w1")
+        task = await self.submit()
+
+        task, worker_id = await self.queue.assign_next(API_TYPE)
+        self.assertEqual(worker_id, "w1")
+        self.assertEqual(await self.free_slots("w1"), 0)
+        self.assertEqual(await self.tenant_running(task), 1)
+        self.assertEqual(await self.queued_ids(), [])
+        self.assertIsNone(await self.queue.assign_next(API_TYPE))
+
+        await self.queue.mark_running(task.task_id, "w1")
+        self.assertTrue(await self.queue.mark_completed(task.task_id, {"companies": []}, "w1"))
+
+        stored = await self.queue.get_task(task.task_id)
+        self.assertEqual(stored.status, "completed")
+        self.assertEqual(stored.result, {"companies": []})
+        self.assertEqual(await self.free_slots("w1"), 1)
+        self.assertEqual(await self.tenant_running(task), 0)
+        self.assertIsNone(await self.redis.zscore(self.queue.LEASE_KEY, task.task_id))
+
+    async def test_failure_requeues_until_retries_run_out(self):
+        """Test that a failed task is retried in place, then failed permanently"""
+        await self.register_worker("w1")
+        task = await self.submit()
+
+        for attempt in range(1, task.max_retries + 1):
+            assigned, _ = await self.queue.assign_next(API_TYPE)
+            self.assertEqual(assigned.task_id, task.task_id)
+            await self.queue.mark_failed(task.task_id, "boom", "w1")
+            self.assertEqual(await self.free_slots("w1"), 1)
+
+            stored = await self.queue.get_task(task.task_id)
+            self.assertEqual(stored.retry_count, attempt)
+            if attempt < task.max_retries:
+                self.assertEqual(stored.status, "pending")
+                self.assertEqual(await self.queued_ids(), [task.task_id])
+
+        self.assertEqual(stored.status, "failed")
+        self.assertEqual(await self.queued_ids(), [])
+        self.assertEqual(await self.tenant_running(task), 0)
+
+    async def test_reaper_requeues_unacknowledged_task(self):
+        """Test that an expired dispatch lease requeues the task and cancels it on the worker"""
+        await self.register_worker("w1")
+        task = await self.submit()
+        await self.queue.assign_next(API_TYPE)
+
+        await self.expire_lease(task.task_id)
+        self.assertEqual(await self.queue._reap_expired(), 1)
+
+        stored = await self.queue.get_task(task.task_id)
+        self.assertEqual(stored.status, "pending")
+        self.assertIsNone(stored.assigned_worker_id)
+        self.assertEqual(await self.queued_ids(), [task.task_id])
+        self.assertEqual(await self.free_slots("w1"), 1)
+        self.assertEqual(await self.tenant_running(task), 0)
+        self.assertIn({"type": "cancel", "task_id": task.task_id}, self.sockets["w1"].sent)
+
+    async def test_reaper_fails_task_over_budget(self):
+        """Test that a running task past its execution budget fails without retry"""
+        await self.register_worker("w1")
+        task = await self.submit()
+        await self.queue.assign_next(API_TYPE)
+        await self.queue.mark_running(task.task_id, "w1")
+
+        await self.expire_lease(task.task_id, budget_spent=True)
+        self.assertEqual(await self.queue._reap_expired(), 1)
+
+        stored = await self.queue.get_task(task.task_id)
+        self.assertEqual(stored.status, "failed")
+        self.assertEqual(await self.queued_ids(), [])
+        self.assertEqual(await self.free_slots("w1"), 1)
+
+    async def test_renewed_lease_is_not_reaped(self):
+        """Test that heartbeats keep a running task's lease alive"""
+        await self.register_worker("w1")
+        task = await self.submit()
+        await self.queue.assign_next(API_TYPE)
+        await self.queue.mark_running(task.task_id, "w1")
+
+        await self.queue.renew_leases("w1")
+        self.assertGreater(await self.redis.zscore(self.queue.LEASE_KEY, task.task_id), time.time())
+        self.assertEqual(await self.queue._reap_expired(), 0)
+
+
+class TestTerminalRelay(TaskQueueTestCase):
+    """Test the completion update that resumes a parked report"""
+
+    def terminal_updates(self):
+        return [
+            (update.report_id, update.data["task_id"], update.data["status"])
+            for update in self.relay.updates
+            if update.detail_type == config.TASK_TERMINAL_DETAIL_TYPE
+        ]
+
+    async def test_terminal_state_is_relayed_once(self):
+        """Test that completion is relayed, and retries are not"""
+        await self.register_worker("w1")
+        task = await self.submit()
+        await self.queue.assign_next(API_TYPE)
+        await self.queue.mark_failed(task.task_id, "boom", "w1")
+        self.assertEqual(self.terminal_updates(), [])
+
+        await self.queue.assign_next(API_TYPE)
+        await self.queue.mark_completed(task.task_id, {"companies": []}, "w1")
+        self.assertEqual(self.terminal_updates(), [("report-1", task.task_id, "completed")])
+
+    async def test_scatter_relays_only_the_parent(self):
+        """Test that sub-tasks finishing does not resume the report"""
+        await self.register_worker("w1", capacity=2)
+        parent = await self.submit(
+            action="search_with_rank",
+            payload={"keywords": ["ai", "ml", "nlp", "cv"], "num_companies": 5},
+        )
+        for _ in parent.subtask_ids:
+            subtask, _ = await self.queue.assign_next(API_TYPE)
+            await self.queue.mark_completed(subtask.task_id, {"company_tracker": []}, "w1")
+        self.assertEqual(self.terminal_updates(), [])
+
+        await self.queue.assign_next(API_TYPE)
+        await self.queue.mark_completed(parent.task_id, {"companies": []}, "w1")
+        self.assertEqual(self.terminal_updates(), [("report-1", parent.task_id, "completed")])
+
+
+class TestRelease(TaskQueueTestCase):
+    """Test that slot and tenant accounting survives duplicate releases"""
+
+    async def test_release_is_idempotent(self):
+        """Test that releasing a task twice frees one slot and one tenant count"""
+        await self.register_worker("w1", capacity=2)
+        task = await self.submit()
+        await self.queue.assign_next(API_TYPE)
+        self.assertEqual(await self.free_slots("w1"), 1)
+
+        await self.queue._release(task.task_id, "w1")
+        await self.queue._release(task.task_id, "w1")
+        await self.registry.release_task("w1", task.task_id)
+
+        self.assertEqual(await self.free_slots("w1"), 2)
+        self.assertEqual(await self.tenant_running(task), 0)
+
+    async def test_completion_after_reap_does_not_double_release(self):
+        """Test that the reaper and a late completion together free the slot once"""
+        await self.register_worker("w1", capacity=2)
+        task = await self.submit()
+        await self.queue.assign_next(API_TYPE)
+
+        await self.expire_lease(task.task_id)
+        await self.queue._reap_expired()
+        await self.queue.mark_completed(task.task_id, {"companies": []})
+
+        self.assertEqual(await self.free_slots("w1"), 2)
+        self.assertEqual(await self.tenant_running(task), 0)
+
+
+class TestPresenceExpiry(TaskQueueTestCase):
+    """Test that a connected worker whose presence expired mid-task keeps its slots"""
+
+    async def expire_presence(self, worker_id):
+        """Drop the presence key, then let assignment prune the slot entry as it would"""
+        await self.redis.delete(self.registry._worker_key(worker_id))
+        await self.submit(report_id="report-2")
+        self.assertIsNone(await self.queue.assign_next(API_TYPE))
+        self.assertIsNone(await self.redis.zscore(f"{self.registry.SLOTS_KEY}:{API_TYPE}", worker_id))
+
+    async def test_release_restores_slots(self):
+        """Test that completing the task re-creates the dropped slot entry"""
+        await self.register_worker("w1", capacity=2)
+        task = await self.submit()
+        await self.queue.assign_next(API_TYPE)
+        await self.expire_presence("w1")
+
+        await self.queue.mark_completed(task.task_id, {"companies": []}, "w1")
+        self.assertEqual(await self.free_slots("w1"), 2)
+        assigned, worker_id = await self.queue.assign_next(API_TYPE)
+        self.assertEqual(worker_id, "w1")
+
+    async def test_heartbeat_restores_free_slots(self):
+        """Test that a heartbeat re-creates the entry with the slots not held by tasks"""
+        await self.register_worker("w1", capacity=2)
+        await self.submit()
+        await self.queue.assign_next(API_TYPE)
+        await self.expire_presence("w1")
+
+        await self.registry.update_heartbeat("w1")
+        self.assertEqual(await self.free_slots("w1"), 1)
+
+
+class TestStaleReports(TaskQueueTestCase):
+    """Test that reports from a worker that lost its task are ignored"""
+
+    async def test_late_reports_after_reassignment_are_ignored(self):
+        """Test that the reaped worker cannot complete or fail the reassigned task"""
+        await self.register_worker("w1")
+        task = await self.submit()
+        await self.queue.assign_next(API_TYPE)
+
+        await self.expire_lease(task.task_id)
+        await self.queue._reap_expired()
+        await self.registry.unregister("w1")
+        await self.register_worker("w2")
+        _, worker_id = await self.queue.assign_next(API_TYPE)
+        self.assertEqual(worker_id, "w2")
+
+        self.assertFalse(await self.queue.mark_completed(task.task_id, {"companies": []}, "w1"))
+        await self.queue.mark_failed(task.task_id, "late failure", "w1")
+        await self.queue.mark_running(task.task_id, "w1")
+
+        stored = await self.queue.get_task(task.task_id)
+        self.assertEqual(stored.status, "assigned")
+        self.assertEqual(stored.assigned_worker_id, "w2")
+        self.assertEqual(stored.retry_count, 1)
+        self.assertEqual(await self.free_slots("w2"), 0)
+
+        self.assertTrue(await self.queue.mark_completed(task.task_id, {"companies": []}, "w2"))
+        self.assertEqual(await self.free_slots("w2"), 1)
+
+
+class TestScatterGather(TaskQueueTestCase):
+    """Test splitting a ranked search into collection sub-tasks"""
+
+    @staticmethod
+    def part(keyword, url, cb_rank):
+        return {
+            "company_tracker": [
+                {"url": url, "name": url, "cb_rank": cb_rank, "keywords": [keyword], "appearance_count": 1}
+            ],
+            "keyword_results": {keyword: [url]},
+            "successful_keywords": 1,
+            "failed_keywords": 0,
+            "collection_time_seconds": 3,
+        }
+
+    async def test_parent_requeued_after_all_parts(self):
+        """Test that the parent waits for every part, then is queued with the merged collection"""
+        await self.register_worker("w1", capacity=2)
+        parent = await self.submit(
+            action="search_with_rank",
+            payload={"keywords": ["ai", "ml", "nlp", "cv"], "num_companies": 5},
+        )
+
+        self.assertEqual(parent.status, "running")
+        self.assertEqual(len(parent.subtask_ids), 2)
+        self.assertCountEqual(await self.queued_ids(), parent.subtask_ids)
+
+        first, _ = await self.queue.assign_next(API_TYPE)
+        second, _ = await self.queue.assign_next(API_TYPE)
+        self.assertEqual(first.action, "collect_with_rank")
+        self.assertEqual(first.parent_task_id, parent.task_id)
+
+        await self.queue.mark_completed(first.task_id, self.part("ai", "acme", 10), "w1")
+        stored = await self.queue.get_task(parent.task_id)
+        self.assertEqual(stored.status, "running")
+        self.assertEqual(await self.queued_ids(), [])
+
+        await self.queue.mark_completed(second.task_id, self.part("nlp", "acme", 4), "w1")
+        # A repeated report of a finished part is not counted again
+        await self.queue._gather_part(second, self.part("nlp", "acme", 4))
+
+        stored = await self.queue.get_task(parent.task_id)
+        self.assertEqual(stored.status, "pending")
+        self.assertEqual(await self.queued_ids(), [parent.task_id])
+        collected = stored.payload["collected"]
+        self.assertEqual(len(collected["company_tracker"]), 1)
+        self.assertEqual(collected["company_tracker"][0]["cb_rank"], 4)
+        self.assertEqual(collected["company_tracker"][0]["appearance_count"], 2)
+        self.assertEqual(collected["successful_keywords"], 2)
+
+    async def test_failed_part_still_gathers(self):
+        """Test that a permanently failed part counts as failed keywords"""
+        await self.register_worker("w1", capacity=2)
+        parent = await self.submit(
+            action="search_with_rank",
+            payload={"keywords": ["ai", "ml", "nlp", "cv"], "num_companies": 5},
+        )
+        first, _ = await self.queue.assign_next(API_TYPE)
+        second, _ = await self.queue.assign_next(API_TYPE)
+
+        await self.queue.mark_completed(first.task_id, self.part("ai", "acme", 10), "w1")
+        await self.queue.mark_failed(second.task_id, "blocked", "w1", retry=False)
+
+        stored = await self.queue.get_task(parent.task_id)
+        self.assertEqual(stored.status, "pending")
+        self.assertEqual(stored.payload["collected"]["failed_keywords"], 2)
+
+    async def test_single_slot_pool_does_not_scatter(self):
+        """Test that a search is queued whole when only one slot exists"""
+        await self.register_worker("w1")
+        parent = await self.submit(
+            action="search_with_rank",
+            payload={"keywords": ["ai", "ml", "nlp", "cv"], "num_companies": 5},
+        )
+
+        self.assertEqual(parent.status, "pending")
+        self.assertEqual(parent.subtask_ids, [])
+        self.assertEqual(await self.queued_ids(), [parent.task_id])
+
+    async def test_split_sized_to_free_slots(self):
+        """Test that busy slots are not counted when splitting a search"""
+        await self.register_worker("w1", capacity=3)
+        await self.submit("report-0")
+        await self.queue.assign_next(API_TYPE)
+
+        parent = await self.submit(
+            action="search_with_rank",
+            payload={"keywords": ["ai", "ml", "nlp", "cv", "iot", "ar"], "num_companies": 5},
+        )
+
+        self.assertEqual(len(parent.subtask_ids), 2)
+
+
+class TestCoalescing(TaskQueueTestCase):
+    """Test identical requests attaching to one execution"""
+
+    PAYLOAD = {"keywords": ["fintech"], "num_companies": 5}
+
+    async def test_followers_get_leader_result(self):
+        """Test that an attached task completes with its leader"""
+        await self.register_worker("w1")
+        leader = await self.submit("report-1", payload=dict(self.PAYLOAD))
+        follower = await self.submit("report-2", payload=dict(self.PAYLOAD))
+
+        self.assertEqual(follower.coalesced_into, leader.task_id)
+        self.assertEqual(await self.queued_ids(), [leader.task_id])
+
+        await self.queue.assign_next(API_TYPE)
+        await self.queue.mark_completed(leader.task_id, {"companies": ["acme"]}, "w1")
+
+        stored = await self.queue.get_task(follower.task_id)
+        self.assertEqual(stored.status, "completed")
+        self.assertEqual(stored.result, {"companies": ["acme"]})
+
+    async def test_leader_cancel_promotes_follower(self):
+        """Test that cancelling the leader queues its follower as the new leader"""
+        await self.register_worker("w1")
+        leader = await self.submit("report-1", payload=dict(self.PAYLOAD))
+        follower = await self.submit("report-2", payload=dict(self.PAYLOAD))
+        late = await self.submit("report-3", payload=dict(self.PAYLOAD))
+        await self.queue.assign_next(API_TYPE)
+
+        self.assertTrue(await self.queue.cancel_task(leader.task_id))
+
+        promoted = await self.queue.get_task(follower.task_id)
+        self.assertEqual(promoted.status, "pending")
+        self.assertIsNone(promoted.coalesced_into)
+        self.assertEqual(await self.free_slots("w1"), 1)
+        self.assertIn({"type": "cancel", "task_id": leader.task_id}, self.sockets["w1"].sent)
+
+        # The second follower re-attaches to the promoted one
+        reattached = await self.queue.get_task(late.task_id)
+        self.assertEqual(reattached.coalesced_into, follower.task_id)
+        self.assertEqual(await self.queued_ids(), [follower.task_id])
+
+    async def test_cleared_leader_cancels_followers(self):
+        """Test that an admin clear cancels attached tasks instead of promoting them"""
+        leader = await self.submit("report-1", payload=dict(self.PAYLOAD))
+        follower = await self.submit("report-2", payload=dict(self.PAYLOAD))
+
+        self.assertEqual(await self.queue.clear_pending(API_TYPE), 1)
+
+        stored = await self.queue.get_task(follower.task_id)
+        self.assertEqual(stored.status, "cancelled")
+        self.assertEqual(await self.queued_ids(), [])
+        self.assertIsNone(await self.redis.get(f"{self.queue.FLIGHT_KEY}:{leader.fingerprint}"))
+
+
+if __name__ == '__main__':
+    unittest.main()
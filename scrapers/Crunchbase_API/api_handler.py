@@ -1,24 +1,73 @@
 import asyncio
 import time
-import json
 import sys
 import os
+from contextlib import asynccontextmanager, aclosing
 from fastapi import FastAPI, Query, HTTPException, Body
 from typing import Dict, List
 
-from search_tag import run_scraper, collect_companies_with_descriptions, collect_companies_with_rank, scrape_top_companies
-from database import get_all_companies, get_companies_by_names, get_companies_summary, delete_all_companies, delete_company
+from search_tag import run_scraper, collect_companies_with_descriptions, collect_companies_with_rank_concurrent, scrape_top_companies
+from database import get_all_companies, get_companies_by_names, get_companies_summary, delete_all_companies, delete_company, add_save_listener
 
-# Add Crunchbase Data folder to path for similarity_search import
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), "Crunchbase Data"))
+# Shared scraper modules live in scrapers/shared (copied to /shared in the images)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "shared"))
 try:
-    from similarity_search import find_similar_companies
+    from embedding_service import get_embedding_service, close_embedding_service
+    from vector_index import CompanyVectorIndex
     SIMILARITY_SEARCH_AVAILABLE = True
 except ImportError:
     SIMILARITY_SEARCH_AVAILABLE = False
-    print("Warning: similarity_search module not available. /search/crunchbase/top-similar endpoint will be disabled.")
+    print("Warning: embedding_service module not available. /search/crunchbase/top-similar endpoint will be disabled.")
 
-app = FastAPI()
+# Semantic index over every company stored in the database (built at startup)
+company_index = CompanyVectorIndex("crunchbase") if SIMILARITY_SEARCH_AVAILABLE else None
+
+
+def _index_item(company: dict):
+    """Map a stored company (full data or summary row) to a (key, text, metadata) index item."""
+    url = company.get("url")
+    name = company.get("Company Name") or company.get("company_name")
+    about = company.get("About") or company.get("about")
+    if about == "N/A":
+        about = None
+    return url, about, {"url": url, "company_name": name, "description": about}
+
+
+def _load_index_corpus():
+    return [_index_item(row) for row in get_companies_summary()]
+
+
+async def _start_company_index():
+    try:
+        await company_index.start(_load_index_corpus)
+    except Exception as e:
+        print(f"⚠️ Company vector index failed to build: {e}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Startup: load the embedding model once so ranking requests don't pay for it
+    index_task = None
+    if SIMILARITY_SEARCH_AVAILABLE:
+        try:
+            await get_embedding_service().start()
+            add_save_listener(lambda data: company_index.schedule_upsert(*_index_item(data)))
+            # Build/sync the corpus index in the background so the API is available immediately
+            index_task = asyncio.create_task(_start_company_index())
+        except Exception as e:
+            print(f"⚠️ Embedding model failed to load at startup: {e}")
+
+    yield
+
+    # Shutdown
+    if SIMILARITY_SEARCH_AVAILABLE:
+        if index_task and not index_task.done():
+            index_task.cancel()
+        company_index.save()
+        close_embedding_service()
+
+
+app = FastAPI(lifespan=lifespan)
 
 # Status callback URL for progress updates
 # In local deployment, calls backend directly
@@ -32,7 +81,11 @@ active_requests = {}
 @app.get("/health")
 async def health_check():
     """Health check endpoint for worker agent to verify API is ready."""
-    return {"status": "healthy", "api": "crunchbase"}
+    response = {"status": "healthy", "api": "crunchbase"}
+    if SIMILARITY_SEARCH_AVAILABLE:
+        response["embedding"] = get_embedding_service().health()
+        response["vector_index"] = company_index.stats()
+    return response
 
 @app.post("/cancel/{request_id}")
 async def cancel_request(request_id: str):
@@ -237,6 +290,45 @@ async def search_top_companies(
         raise HTTPException(status_code=500, detail={"error": str(e)})
 
 
+@app.post("/search/crunchbase/semantic")
+async def search_semantic_companies(
+    target_description: str = Body(..., description="Target description to compare stored companies against"),
+    top_k: int = Body(20, description="Number of similar companies to return")
+) -> Dict:
+    """
+    Return the stored companies most similar to a target description.
+
+    Searches the local vector index built over every company in the database,
+    so no browser work is involved. Reports can start from these results and
+    only fall back to keyword collection for gaps.
+    """
+    if not SIMILARITY_SEARCH_AVAILABLE:
+        raise HTTPException(
+            status_code=503,
+            detail={"error": "Similarity search functionality is not available. Please ensure the shared embedding_service module is available."}
+        )
+    if top_k < 1:
+        raise HTTPException(status_code=400, detail={"error": "top_k must be at least 1"})
+
+    try:
+        start_time = time.time()
+        results = await company_index.search(target_description, top_k=top_k)
+        for result in results:
+            result.pop("key", None)
+        return {
+            "results": results,
+            "metadata": {
+                "target_description": target_description,
+                "top_k_requested": top_k,
+                "returned": len(results),
+                "index": company_index.stats(),
+                "search_time_ms": round((time.time() - start_time) * 1000, 2)
+            }
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail={"error": str(e)})
+
+
 @app.post("/search/crunchbase/top-similar")
 async def search_top_similar_companies(
     keywords: List[str] = Body(..., description="List of keywords/hashtags to search"),
@@ -267,7 +359,7 @@ async def search_top_similar_companies(
     if not SIMILARITY_SEARCH_AVAILABLE:
         raise HTTPException(
             status_code=503,
-            detail={"error": "Similarity search functionality is not available. Please ensure the similarity_search module is installed."}
+            detail={"error": "Similarity search functionality is not available. Please ensure the shared embedding_service module is available."}
         )
     
     try:
@@ -350,12 +442,11 @@ async def search_top_similar_companies(
         
         # Perform similarity search
         similarity_start = time.time()
-        companies_json = json.dumps(companies_for_similarity)
         
         try:
-            similar_companies = find_similar_companies(
-                companies_json=companies_json,
-                target_description=target_description,
+            similar_companies = await get_embedding_service().rank(
+                target_description,
+                companies_for_similarity,
                 top_k=None  # Get all, we'll filter to top_count for scraping
             )
             similarity_time = time.time() - similarity_start
@@ -463,7 +554,7 @@ async def search_top_similar_companies_full(
     if not SIMILARITY_SEARCH_AVAILABLE:
         raise HTTPException(
             status_code=503,
-            detail={"error": "Similarity search functionality is not available. Please ensure the similarity_search module is installed."}
+            detail={"error": "Similarity search functionality is not available. Please ensure the shared embedding_service module is available."}
         )
     
     try:
@@ -548,12 +639,11 @@ async def search_top_similar_companies_full(
         
         # Perform similarity search on ALL companies
         similarity_start = time.time()
-        companies_json = json.dumps(companies_for_similarity)
         
         try:
-            similar_companies = find_similar_companies(
-                companies_json=companies_json,
-                target_description=target_description,
+            similar_companies = await get_embedding_service().rank(
+                target_description,
+                companies_for_similarity,
                 top_k=None  # Get ALL companies sorted
             )
             similarity_time = time.time() - similarity_start
@@ -649,6 +739,201 @@ async def search_top_similar_companies_full(
         raise HTTPException(status_code=500, detail={"error": str(e)})
 
 
+def _make_status_sender(report_id: str):
+    """
+    Build a fire-and-forget status sender for one report.
+    
+    Status updates go via HTTP callback to the backend (or the worker agent's
+    status proxy); each call creates a background task and returns immediately.
+    """
+    async def _do_status_update(step_key: str, detail_type: str, message: str, data: dict = None):
+        """Internal function that actually sends the HTTP request."""
+        try:
+            import httpx
+            async with httpx.AsyncClient(timeout=10.0) as client:
+                payload = {
+                    "report_id": report_id,
+                    "step_key": step_key,
+                    "detail_type": detail_type,
+                    "message": message,
+                    "data": data or {}
+                }
+                response = await client.post(
+                    f"{STATUS_CALLBACK_URL}/api/reports/status-update/",
+                    json=payload,
+                    headers={"Content-Type": "application/json"}
+                )
+                if response.status_code != 200:
+                    print(f"⚠️ Status callback returned {response.status_code}: {response.text[:200]}")
+        except Exception as e:
+            print(f"⚠️ Status callback failed: {type(e).__name__}: {e}")
+    
+    def send_status_update(step_key: str, detail_type: str, message: str, data: dict = None):
+        """Fire-and-forget status update - creates background task, returns immediately."""
+        if not report_id:
+            return
+        asyncio.create_task(_do_status_update(step_key, detail_type, message, data))
+    
+    return send_status_update
+
+
+async def _collect_companies_with_rank(
+    keywords: List[str],
+    num_companies: int,
+    send_status_update,
+    request_id: str = None,
+    keyword_offset: int = 0,
+    total_keywords: int = None
+):
+    """
+    Step 1 of the ranked search: collect URL, description and CB rank per keyword.
+    
+    Keywords run in parallel browser tabs; results are merged as each one
+    finishes. keyword_offset/total_keywords let a scatter sub-task report
+    progress against the whole keyword list.
+    
+    Returns:
+        Dict with company_tracker (list), keyword_results, keyword counts and
+        collection time, or None if the request was cancelled
+    """
+    total_keywords = total_keywords or len(keywords)
+    
+    # Dictionary to track companies: {url: {description, cb_rank, keywords, count}}
+    company_tracker = {}
+    # Dictionary to track per-keyword results: {keyword: {count: int, top_companies: [{name, cb_rank}]}}
+    keyword_results = {}
+    successful_keywords = 0
+    failed_keywords = 0
+    
+    print(f"\n=== Step 1: Collecting companies with CB rank from {len(keywords)} keywords ===")
+    collection_start = time.time()
+    async with aclosing(collect_companies_with_rank_concurrent(keywords, num_companies=num_companies)) as results:
+        async for idx, keyword, companies_data, elapsed_time, error in results:
+            # Check for cancellation (closing the generator cancels pending keywords)
+            if request_id and request_id in active_requests and active_requests[request_id]["cancelled"]:
+                print(f"🛑 Request {request_id} cancelled during company collection")
+                return None
+            
+            if error:
+                failed_keywords += 1
+                print(f"❌ Error collecting from keyword '{keyword}': {error}")
+                continue
+            
+            successful_keywords += 1
+            
+            # Track each company found in this keyword search
+            for company in companies_data:
+                url = company.get("url")
+                description = company.get("description", "")
+                cb_rank = company.get("cb_rank")
+                
+                if not url or not description or cb_rank is None:
+                    continue
+                    
+                if url in company_tracker:
+                    # Company already seen - increment count and add keyword
+                    company_tracker[url]["appearance_count"] += 1
+                    if keyword not in company_tracker[url]["keywords"]:
+                        company_tracker[url]["keywords"].append(keyword)
+                    # Keep the best (lowest) rank if company appears multiple times
+                    if cb_rank < company_tracker[url]["cb_rank"]:
+                        company_tracker[url]["cb_rank"] = cb_rank
+                else:
+                    # First time seeing this company
+                    company_tracker[url] = {
+                        "description": description,
+                        "cb_rank": cb_rank,
+                        "appearance_count": 1,
+                        "keywords": [keyword],
+                        "url": url
+                    }
+            
+            print(f"✅ Collected from '{keyword}': {len(companies_data)} companies in {elapsed_time:.2f}s")
+            
+            # Sort companies by CB rank (ascending - lower is better) and get top 5
+            sorted_companies = sorted(
+                [c for c in companies_data if c.get("cb_rank") is not None],
+                key=lambda x: x.get("cb_rank", float('inf'))
+            )[:5]
+            
+            # Build top 5 companies list with name and CB rank
+            top_5_companies = []
+            for company in sorted_companies:
+                url = company.get("url", "")
+                name = url.split("/")[-1].replace("-", " ").title() if url else "Unknown"
+                top_5_companies.append({
+                    "name": name,
+                    "cb_rank": company.get("cb_rank")
+                })
+            
+            # Store in keyword_results for metadata
+            keyword_results[keyword] = {
+                "count": len(companies_data),
+                "top_companies": top_5_companies
+            }
+            
+            send_status_update(
+                "api_search",
+                "search_result",
+                f"'{keyword}' → {len(companies_data)} companies found",
+                {
+                    "keyword": keyword,
+                    "company_count": len(companies_data),
+                    "top_companies": top_5_companies,
+                    "index": keyword_offset + idx,
+                    "total": total_keywords
+                }
+            )
+    
+    return {
+        "company_tracker": list(company_tracker.values()),
+        "keyword_results": keyword_results,
+        "successful_keywords": successful_keywords,
+        "failed_keywords": failed_keywords,
+        "collection_time_seconds": round(time.time() - collection_start, 2)
+    }
+
+
+@app.post("/search/crunchbase/collect-with-rank")
+async def collect_companies_with_rank_endpoint(
+    keywords: List[str] = Body(..., description="Keywords/hashtags to collect companies for"),
+    num_companies: int = Body(10, description="Number of companies to collect per keyword from search table"),
+    keyword_offset: int = Body(0, description="Index of the first keyword within the full report keyword list"),
+    total_keywords: int = Body(None, description="Size of the full report keyword list (for progress)"),
+    request_id: str = Body(None, description="Request ID for tracking and cancellation"),
+    report_id: str = Body(None, description="Report ID (UUID) for real-time status updates to backend")
+) -> Dict:
+    """
+    Collection-only step of /search/crunchbase/top-similar-with-rank.
+    
+    Used by the orchestrator to scatter a ranked search's keywords across
+    workers; the merged outputs are passed back to top-similar-with-rank as
+    `collected` for ranking and top-N scraping.
+    """
+    if request_id:
+        active_requests[request_id] = {"cancelled": False, "created_at": time.time()}
+    
+    try:
+        collected = await _collect_companies_with_rank(
+            keywords,
+            num_companies,
+            _make_status_sender(report_id),
+            request_id=request_id,
+            keyword_offset=keyword_offset,
+            total_keywords=total_keywords
+        )
+        if collected is None:
+            return {"error": "Request was cancelled", "cancelled": True}
+        return collected
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail={"error": str(e)})
+    except Exception as e:
+        raise HTTPException(status_code=500, detail={"error": str(e)})
+    finally:
+        if request_id and request_id in active_requests:
+            del active_requests[request_id]
+
+
 @app.post("/search/crunchbase/top-similar-with-rank")
 async def search_top_similar_companies_with_rank(
     keywords: List[str] = Body(..., description="List of keywords/hashtags to search"),
@@ -659,7 +944,8 @@ async def search_top_similar_companies_with_rank(
     similarity_weight: float = Body(0.75, description="Weight for similarity score (0-1)"),
     rank_weight: float = Body(0.25, description="Weight for rank score (0-1)"),
     request_id: str = Body(None, description="Request ID for tracking and cancellation"),
-    report_id: str = Body(None, description="Report ID (UUID) for real-time status updates to backend")
+    report_id: str = Body(None, description="Report ID (UUID) for real-time status updates to backend"),
+    collected: Dict = Body(None, description="Pre-collected step 1 output (from /search/crunchbase/collect-with-rank sub-tasks); skips collection")
 ) -> Dict:
     """
     Enhanced similarity search that combines AI-powered similarity scoring with Crunchbase rank scoring.
@@ -688,7 +974,7 @@ async def search_top_similar_companies_with_rank(
     if not SIMILARITY_SEARCH_AVAILABLE:
         raise HTTPException(
             status_code=503,
-            detail={"error": "Similarity search functionality is not available. Please ensure the similarity_search module is installed."}
+            detail={"error": "Similarity search functionality is not available. Please ensure the shared embedding_service module is available."}
         )
     
     # Validate weights
@@ -704,37 +990,7 @@ async def search_top_similar_companies_with_rank(
             detail={"error": f"Weights must sum to 1.0. Current sum: {similarity_weight + rank_weight}"}
         )
     
-    # Helper function to send status updates via HTTP callback to backend
-    # Uses TRUE fire-and-forget pattern - creates background task, doesn't wait
-    async def _do_status_update(step_key: str, detail_type: str, message: str, data: dict = None):
-        """Internal function that actually sends the HTTP request."""
-        try:
-            import httpx
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                payload = {
-                    "report_id": report_id,
-                    "step_key": step_key,
-                    "detail_type": detail_type,
-                    "message": message,
-                    "data": data or {}
-                }
-                response = await client.post(
-                    f"{STATUS_CALLBACK_URL}/api/reports/status-update/",
-                    json=payload,
-                    headers={"Content-Type": "application/json"}
-                )
-                if response.status_code != 200:
-                    print(f"⚠️ Status callback returned {response.status_code}: {response.text[:200]}")
-        except Exception as e:
-            print(f"⚠️ Status callback failed: {type(e).__name__}: {e}")
-    
-    def send_status_update(step_key: str, detail_type: str, message: str, data: dict = None):
-        """Fire-and-forget status update - creates background task, returns immediately."""
-        if not report_id:
-            return
-        # Create task in background, don't await - truly non-blocking
-        import asyncio
-        asyncio.create_task(_do_status_update(step_key, detail_type, message, data))
+    send_status_update = _make_status_sender(report_id)
     
     # Track request for cancellation
     if request_id:
@@ -742,108 +998,27 @@ async def search_top_similar_companies_with_rank(
         print(f"📝 Tracking request {request_id}")
     
     try:
-        # Note: Keywords are already shown in the init step, so we skip showing them again
-        # Just log locally that we're starting the search
-        print(f"\n=== Step 1: Collecting companies with CB rank from {len(keywords)} keywords ===")
+        if collected is not None:
+            # Gather stage of an orchestrator scatter/gather: keywords were
+            # collected by sub-tasks on several workers and merged already
+            print(f"\n=== Step 1: Using {len(collected.get('company_tracker', []))} pre-collected companies from {len(keywords)} keywords ===")
+        else:
+            collected = await _collect_companies_with_rank(
+                keywords,
+                num_companies,
+                send_status_update,
+                request_id=request_id
+            )
+            if collected is None:
+                return {"error": "Request was cancelled", "cancelled": True}
         
         # Dictionary to track companies: {url: {description, cb_rank, keywords, count}}
-        company_tracker = {}
+        company_tracker = {company["url"]: company for company in collected.get("company_tracker", [])}
         # Dictionary to track per-keyword results: {keyword: {count: int, top_companies: [{name, cb_rank}]}}
-        keyword_results = {}
-        collection_time = 0
-        successful_keywords = 0
-        failed_keywords = 0
-        
-        # Step 1: Collect company URLs, descriptions, and CB ranks from search tables
-        print(f"\n=== Step 1: Collecting companies with CB rank from {len(keywords)} keywords ===")
-        for idx, keyword in enumerate(keywords, 1):
-            # Check for cancellation
-            if request_id and request_id in active_requests and active_requests[request_id]["cancelled"]:
-                print(f"🛑 Request {request_id} cancelled during company collection")
-                return {"error": "Request was cancelled", "cancelled": True}
-            
-            # Log locally (no pre-search callback - we send result after search completes)
-            print(f"🔍 Searching keyword {idx}/{len(keywords)}: '{keyword}'...")
-            
-            start_time = time.time()
-            try:
-                companies_data = await collect_companies_with_rank(
-                    keyword,
-                    num_companies=num_companies
-                )
-                elapsed_time = time.time() - start_time
-                collection_time += elapsed_time
-                successful_keywords += 1
-                
-                # Track each company found in this keyword search
-                for company in companies_data:
-                    url = company.get("url")
-                    description = company.get("description", "")
-                    cb_rank = company.get("cb_rank")
-                    
-                    if not url or not description or cb_rank is None:
-                        continue
-                        
-                    if url in company_tracker:
-                        # Company already seen - increment count and add keyword
-                        company_tracker[url]["appearance_count"] += 1
-                        if keyword not in company_tracker[url]["keywords"]:
-                            company_tracker[url]["keywords"].append(keyword)
-                        # Keep the best (lowest) rank if company appears multiple times
-                        if cb_rank < company_tracker[url]["cb_rank"]:
-                            company_tracker[url]["cb_rank"] = cb_rank
-                    else:
-                        # First time seeing this company
-                        company_tracker[url] = {
-                            "description": description,
-                            "cb_rank": cb_rank,
-                            "appearance_count": 1,
-                            "keywords": [keyword],
-                            "url": url
-                        }
-                
-                print(f"✅ Collected from '{keyword}': {len(companies_data)} companies in {elapsed_time:.2f}s")
-                
-                # Sort companies by CB rank (ascending - lower is better) and get top 5
-                sorted_companies = sorted(
-                    [c for c in companies_data if c.get("cb_rank") is not None],
-                    key=lambda x: x.get("cb_rank", float('inf'))
-                )[:5]
-                
-                # Build top 5 companies list with name and CB rank
-                top_5_companies = []
-                for company in sorted_companies:
-                    url = company.get("url", "")
-                    name = url.split("/")[-1].replace("-", " ").title() if url else "Unknown"
-                    top_5_companies.append({
-                        "name": name,
-                        "cb_rank": company.get("cb_rank")
-                    })
-                
-                # Store in keyword_results for metadata
-                keyword_results[keyword] = {
-                    "count": len(companies_data),
-                    "top_companies": top_5_companies
-                }
-                
-                send_status_update(
-                    "api_search",
-                    "search_result",
-                    f"'{keyword}' → {len(companies_data)} companies found",
-                    {
-                        "keyword": keyword,
-                        "company_count": len(companies_data),
-                        "top_companies": top_5_companies,
-                        "index": idx,
-                        "total": len(keywords)
-                    }
-                )
-                
-            except Exception as e:
-                elapsed_time = time.time() - start_time
-                collection_time += elapsed_time
-                failed_keywords += 1
-                print(f"❌ Error collecting from keyword '{keyword}': {e}")
+        keyword_results = collected.get("keyword_results", {})
+        collection_time = collected.get("collection_time_seconds", 0)
+        successful_keywords = collected.get("successful_keywords", 0)
+        failed_keywords = collected.get("failed_keywords", 0)
         
         # Check if we found any companies
         if not company_tracker:
@@ -895,12 +1070,11 @@ async def search_top_similar_companies_with_rank(
         
         # Perform similarity search on ALL companies
         similarity_start = time.time()
-        companies_json = json.dumps(companies_for_similarity)
         
         try:
-            similar_companies = find_similar_companies(
-                companies_json=companies_json,
-                target_description=target_description,
+            similar_companies = await get_embedding_service().rank(
+                target_description,
+                companies_for_similarity,
                 top_k=None  # Get ALL companies sorted
             )
             similarity_time = time.time() - similarity_start
@@ -1239,6 +1413,8 @@ async def delete_all_companies_endpoint() -> Dict:
     """
     try:
         deleted_count = delete_all_companies()
+        if company_index:
+            company_index.remove(company_index.keys())
         return {
             "message": "All companies deleted successfully",
             "deleted_count": deleted_count
@@ -1273,10 +1449,14 @@ async def delete_company_endpoint(
             deleted_count = delete_company(url, by="url")
             identifier_type = "URL"
             identifier = url
+            if company_index:
+                company_index.remove([url])
         else:
             deleted_count = delete_company(name, by="name")
             identifier_type = "name"
             identifier = name
+            if company_index:
+                company_index.remove(company_index.keys(company_name=name))
         
         if deleted_count > 0:
             return {
@@ -1,16 +1,18 @@
 """
 Persistent browser manager for Crunchbase scraping.
 Maintains a single browser instance across multiple operations.
-Uses a queue system to handle concurrent requests safely.
+Uses a queue system to handle concurrent requests safely, and a bounded
+tab pool so independent operations can run in parallel tabs.
 """
 
 import os
+import time
 import asyncio
 import random
 from typing import Callable, Any
 from playwright.async_api import async_playwright, Browser, BrowserContext, Page
 from playwright.async_api import TimeoutError as PlaywrightTimeoutError, expect
-from config import DEBUG, HEADLESS, USERNAME, PASSWORD, STATE_PATH, SLEEP_DELAY, get_playwright_proxy_config
+from config import DEBUG, HEADLESS, USERNAME, PASSWORD, STATE_PATH, SLEEP_DELAY, MAX_TABS, TAB_PACING, LOGIN_DRAIN_TIMEOUT, get_playwright_proxy_config
 
 
 class CrunchbaseBrowserManager:
@@ -20,11 +22,13 @@ class CrunchbaseBrowserManager:
     - Opens browser once and keeps it alive
     - Creates new tabs for each operation
     - Handles login/session validation
-    - Automatically recovers from session expiry
+    - Automatically recovers from session expiry (re-logs in on a fresh browser,
+      letting tabs still open on the old one finish before it is closed)
     - Queues concurrent requests to prevent interference
+    - Runs pooled operations in up to MAX_TABS parallel tabs with paced starts
     """
     
-    def __init__(self):
+    def __init__(self, max_tabs: int = MAX_TABS, tab_pacing: float = TAB_PACING):
         self.playwright = None
         self.browser: Browser = None
         self.context: BrowserContext = None
@@ -32,6 +36,14 @@ class CrunchbaseBrowserManager:
         self._queue = asyncio.Queue()  # Queue for concurrent requests
         self._processing = False  # Flag to track if queue processor is running
         self._active_operations = 0  # Counter for active operations
+        self.max_tabs = max_tabs
+        self.tab_pacing = tab_pacing
+        self._tab_semaphore = asyncio.Semaphore(max_tabs)  # Bounds concurrent tabs
+        self._pacing_lock = asyncio.Lock()
+        self._last_tab_start = 0.0
+        self._active_tabs = 0
+        self._login_generation = 0  # Bumped on every re-login so parallel tabs don't repeat it
+        self._retiring = set()  # Drain tasks for browsers replaced by a re-login
         
     async def initialize(self):
         """Start playwright and create browser instance."""
@@ -92,11 +104,13 @@ class CrunchbaseBrowserManager:
                 return False
                 
     async def _perform_login(self):
-        """Perform login and save session state."""
-        print("🔐 Performing login...")
+        """
+        Perform login on a fresh browser and save session state.
         
-        # Close existing browser if any
-        await self._close_browser()
+        The current browser stays open while logging in; on success the new
+        one replaces it and the old one is closed once its tabs finish.
+        """
+        print("🔐 Performing login...")
         
         # Create fresh browser without saved state
         proxy_config = get_playwright_proxy_config()
@@ -104,13 +118,44 @@ class CrunchbaseBrowserManager:
         if proxy_config:
             launch_options["proxy"] = proxy_config
         
-        self.browser = await self.playwright.chromium.launch(**launch_options)
-        self.context = await self.browser.new_context(
+        browser = await self.playwright.chromium.launch(**launch_options)
+        context = await browser.new_context(
             user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
                        "(KHTML, like Gecko) Chrome/108.0.0.0 Safari/537.36"
         )
         
-        page = await self.context.new_page()
+        if await self._login(context):
+            old_browser, old_context = self.browser, self.context
+            self.browser, self.context = browser, context
+            self._login_generation += 1
+            if old_browser:
+                task = asyncio.create_task(self._retire_browser(old_browser, old_context))
+                self._retiring.add(task)
+                task.add_done_callback(self._retiring.discard)
+            return True
+        
+        await context.close()
+        await browser.close()
+        return False
+    
+    async def _retire_browser(self, browser: Browser, context: BrowserContext):
+        """Close a replaced browser once its open tabs are done (or LOGIN_DRAIN_TIMEOUT passes)."""
+        deadline = time.monotonic() + LOGIN_DRAIN_TIMEOUT
+        try:
+            while context and context.pages and time.monotonic() < deadline:
+                await asyncio.sleep(1)
+        finally:
+            try:
+                if context:
+                    await context.close()
+                await browser.close()
+            except Exception as e:
+                print(f"⚠️ Failed to close replaced browser: {e}")
+            print("🔄 Replaced browser instance closed")
+    
+    async def _login(self, context: BrowserContext) -> bool:
+        """Log in within the given context and save its session state."""
+        page = await context.new_page()
         await page.add_init_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
 
         try:
@@ -130,7 +175,7 @@ class CrunchbaseBrowserManager:
             # Verify login
             if await self.is_logged_in(page):
                 print("✅ Login successful! Saving session state...")
-                await self.context.storage_state(path=STATE_PATH)
+                await context.storage_state(path=STATE_PATH)
                 await page.close()
                 return True
             else:
@@ -158,7 +203,15 @@ class CrunchbaseBrowserManager:
         Returns:
             True if logged in (or successfully logged in), False otherwise
         """
+        generation = self._login_generation
         async with self._lock:  # Prevent concurrent login attempts
+            if page.is_closed():
+                return True
+            if self._login_generation != generation or page.context is not self.context:
+                # Another tab re-logged in; this page is on the replaced context,
+                # so close it and let the caller open a fresh page
+                await page.close()
+                return True
             if await self.is_logged_in(page):
                 return True
             
@@ -192,9 +245,11 @@ class CrunchbaseBrowserManager:
                 func, args, kwargs, result_future = operation
                 
                 try:
-                    # Execute the operation
+                    # A queued operation holds one tab permit for its whole run,
+                    # so it must keep at most one page open and must not lease
+                    # tabs itself via run_in_tab (the lease would nest)
                     self._active_operations += 1
-                    result = await func(*args, **kwargs)
+                    result = await self.run_in_tab(func, *args, **kwargs)
                     result_future.set_result(result)
                 except Exception as e:
                     result_future.set_exception(e)
@@ -209,6 +264,8 @@ class CrunchbaseBrowserManager:
         """
         Queue an operation to be executed sequentially.
         
+        The operation runs in the tab pool, counting as one of max_tabs.
+        
         Args:
             func: The async function to execute
             *args: Positional arguments for the function
@@ -229,6 +286,37 @@ class CrunchbaseBrowserManager:
         # Wait for result
         return await result_future
             
+    async def _pace(self):
+        """Space out tab starts by at least tab_pacing seconds (with jitter)."""
+        async with self._pacing_lock:
+            wait = self._last_tab_start + random.uniform(self.tab_pacing, 1.5 * self.tab_pacing) - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self._last_tab_start = time.monotonic()
+
+    async def run_in_tab(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        Run an operation in the tab pool.
+        
+        Up to max_tabs operations run concurrently, sharing the logged-in
+        context; each start is paced so parallel tabs don't burst requests.
+        
+        Args:
+            func: The async function to execute (opens its own page via new_page)
+            *args: Positional arguments for the function
+            **kwargs: Keyword arguments for the function
+            
+        Returns:
+            The result of the function execution
+        """
+        async with self._tab_semaphore:
+            await self._pace()
+            self._active_tabs += 1
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                self._active_tabs -= 1
+
     async def new_page(self) -> Page:
         """
         Create a new page (tab) in the persistent browser.
@@ -253,7 +341,9 @@ class CrunchbaseBrowserManager:
         return {
             "queue_size": self._queue.qsize(),
             "active_operations": self._active_operations,
-            "is_processing": self._processing
+            "is_processing": self._processing,
+            "active_tabs": self._active_tabs,
+            "max_tabs": self.max_tabs
         }
         
     async def close(self):
@@ -263,11 +353,16 @@ class CrunchbaseBrowserManager:
         
         # Wait for active operations to complete (max 30 seconds)
         wait_time = 0
-        while self._active_operations > 0 and wait_time < 30:
-            print(f"⏳ Waiting for {self._active_operations} active operations to complete...")
+        while (self._active_operations > 0 or self._active_tabs > 0) and wait_time < 30:
+            print(f"⏳ Waiting for {self._active_operations + self._active_tabs} active operations to complete...")
             await asyncio.sleep(1)
             wait_time += 1
         
+        for task in list(self._retiring):
+            task.cancel()  # Cancelling a drain closes its browser right away
+        if self._retiring:
+            await asyncio.gather(*self._retiring, return_exceptions=True)
+        
         await self._close_browser()
         if self.playwright:
             await self.playwright.stop()
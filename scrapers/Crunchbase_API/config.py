@@ -15,6 +15,13 @@ DB_CONFIG_USER = os.getenv("DB_CONFIG_USER", "root")
 DB_CONFIG_PASSWORD = os.getenv("DB_CONFIG_PASSWORD")
 DB_CONFIG_CRUNCHBASE_DATABASE = os.getenv("DB_CONFIG_CRUNCHBASE_DATABASE")
 SLEEP_DELAY = float(os.getenv("CRUNCHBASE_SLEEP_DELAY"))
+# Tab pool: max concurrent tabs sharing the logged-in context, and the minimum
+# gap (seconds) between two tabs starting work so we stay polite to Crunchbase
+MAX_TABS = int(os.getenv("CRUNCHBASE_MAX_TABS", 3))
+TAB_PACING = float(os.getenv("CRUNCHBASE_TAB_PACING", SLEEP_DELAY))
+# After a re-login, tabs still open on the old browser get this long (seconds)
+# to finish before it is closed
+LOGIN_DRAIN_TIMEOUT = float(os.getenv("CRUNCHBASE_LOGIN_DRAIN_TIMEOUT", 300))
 
 PROXY_SERVER = os.getenv("PROXY_SERVER")
 PROXY_USERNAME = os.getenv("PROXY_USERNAME")
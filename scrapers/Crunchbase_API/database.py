@@ -11,10 +11,19 @@ DB_CONFIG = {
     "database": DB_CONFIG_CRUNCHBASE_DATABASE,
 }
 
+# Callbacks invoked with the company dict after every successful save_company
+_save_listeners = []
+
+
 def get_connection():
     return mysql.connector.connect(**DB_CONFIG)
 
 
+def add_save_listener(callback):
+    """Register a callback(data) run after each company insert/update (e.g. vector index upserts)."""
+    _save_listeners.append(callback)
+
+
 def save_company(data: dict):
     """Insert or update company row."""
     url = data.get("url")
@@ -37,6 +46,12 @@ def save_company(data: dict):
         cur.close()
         conn.close()
 
+    for callback in _save_listeners:
+        try:
+            callback(data)
+        except Exception as e:
+            print(f"⚠️ Save listener failed for {url}: {e}")
+
 
 def already_scraped_urls():
     """Return dict {url: updated_at} from DB."""
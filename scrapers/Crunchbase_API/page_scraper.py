@@ -6,9 +6,6 @@ from config import SLEEP_DELAY, TEST_JSON_OUTPUT
 import random
 import os
 
-async def scrape_company_page2(url):
-    pass
-
 async def scrape_company_page(page):
     """
     Scrapes all the detailed information from a company's profile page.
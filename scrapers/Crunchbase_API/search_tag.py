@@ -1,9 +1,10 @@
 import os
+import time
 import asyncio
 import random
 from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 from config import SLEEP_DELAY
-from page_scraper import scrape_company_page,scrape_company_page2
+from page_scraper import scrape_company_page
 from browser_manager import get_browser_manager
 from database import save_company, already_scraped_urls, get_company
 from datetime import datetime, timedelta
@@ -530,7 +531,8 @@ async def _collect_companies_with_rank_impl(search_hashtag, num_companies=5, use
 async def collect_companies_with_rank(search_hashtag, num_companies=5, use_ai_search=False):
     """
     Collects company URLs, full descriptions, and CB rank from the search table.
-    Uses persistent browser manager with queuing for concurrent request safety.
+    Runs in the browser manager's tab pool, so concurrent calls share the
+    logged-in context in parallel tabs (bounded and paced).
     
     Args:
         search_hashtag: The search keyword/phrase
@@ -542,11 +544,10 @@ async def collect_companies_with_rank(search_hashtag, num_companies=5, use_ai_se
     browser_mgr = await get_browser_manager()
     status = browser_mgr.get_queue_status()
     
-    if status["queue_size"] > 0 or status["active_operations"] > 0:
-        print(f"⏳ Request queued. Queue: {status['queue_size']}, Active: {status['active_operations']}")
+    if status["active_tabs"] >= status["max_tabs"]:
+        print(f"⏳ Waiting for a free tab. Active tabs: {status['active_tabs']}/{status['max_tabs']}")
     
-    # Queue the operation to prevent concurrent browser access
-    return await browser_mgr.queue_operation(
+    return await browser_mgr.run_in_tab(
         _collect_companies_with_rank_impl,
         search_hashtag,
         num_companies,
@@ -554,6 +555,41 @@ async def collect_companies_with_rank(search_hashtag, num_companies=5, use_ai_se
     )
 
 
+async def collect_companies_with_rank_concurrent(keywords, num_companies=5, use_ai_search=False):
+    """
+    Collects companies for several keywords in parallel across the tab pool.
+    
+    Async generator yielding results in completion order so callers can merge
+    them as they arrive. Pending keywords are cancelled when the generator is
+    closed early (wrap it in contextlib.aclosing).
+    
+    Args:
+        keywords: List of search keywords/phrases
+        num_companies: Number of companies to collect per keyword
+        use_ai_search: If True, use AI keyword search. If False, use standard search bar.
+    
+    Yields:
+        (index, keyword, companies_data, elapsed_seconds, error) tuples where
+        index is the 1-based position of the keyword and error is None on success.
+    """
+    async def _collect(index, keyword):
+        start_time = time.time()
+        try:
+            companies_data = await collect_companies_with_rank(keyword, num_companies, use_ai_search)
+            return index, keyword, companies_data, time.time() - start_time, None
+        except Exception as e:
+            return index, keyword, [], time.time() - start_time, e
+
+    tasks = [asyncio.create_task(_collect(i, keyword)) for i, keyword in enumerate(keywords, 1)]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+
+
 async def _run_scraper_impl(search_hashtag, num_companies=5, days_threshold=0, use_ai_search=False):
     """
     Internal implementation of run_scraper.
@@ -647,6 +683,10 @@ async def _run_scraper_impl(search_hashtag, num_companies=5, days_threshold=0, u
                     print(f"⚠️ Pagination timeout. Collected {len(company_links)} company links.")
                     break
 
+        # Done with the search tab: this run holds a single tab permit, and
+        # each company page below opens its own
+        await page.close()
+
         # Scrape companies
         # Handle days_threshold=0 to always re-scrape
         if days_threshold == 0:
@@ -666,43 +706,9 @@ async def _run_scraper_impl(search_hashtag, num_companies=5, days_threshold=0, u
                 results.append(get_company(url))
                 continue
 
-            print(f"\n--- Scraping {i}/{num_companies}: {url} ---")
-            
-            # Open new tab for each company
-            company_page = await browser_mgr.new_page()
-
-            try:
-                try:
-                    await company_page.goto(url, wait_until="domcontentloaded", timeout=60000)
-                except PlaywrightTimeoutError:
-                    pass
-                    
-                await asyncio.sleep(random.uniform(SLEEP_DELAY, 2 * SLEEP_DELAY))
-                
-                # Check if still logged in
-                if not await browser_mgr.is_logged_in(company_page):
-                    print("⚠️ Session expired, re-logging in...")
-                    await browser_mgr.ensure_logged_in(company_page)
-                    # Retry the company page after login
-                    if company_page.is_closed():
-                        company_page = await browser_mgr.new_page()
-                    await company_page.goto(url, wait_until="domcontentloaded", timeout=60000)
-                    await asyncio.sleep(random.uniform(SLEEP_DELAY, 2 * SLEEP_DELAY))
-
-                data = await scrape_company_page(company_page)
-                if data:
-                    data["url"] = url
-                    save_company(data)
-                    print(f"✅ Saved {data.get('Company Name', 'Unknown')}")
-                    results.append(data)
-                    
-            except PlaywrightTimeoutError:
-                print(f"❌ Timeout while loading {url}. Skipping.")
-            except Exception as e:
-                print(f"❌ Error scraping {url}: {e}")
-            finally:
-                if not company_page.is_closed():
-                    await company_page.close()
+            data = await _scrape_company_impl(url, i, num_companies)
+            if data:
+                results.append(data)
                     
     except Exception as e:
         print(f"❌ Critical error: {e}")
@@ -741,11 +747,72 @@ async def run_scraper(search_hashtag, num_companies=5, days_threshold=0, use_ai_
     )
 
 
+async def _scrape_company_impl(url, index, total, status_callback=None):
+    """
+    Scrapes and saves a single company page in its own tab.
+    Runs inside the browser manager's tab pool.
+    
+    Returns:
+        Scraped company data, or None if the page could not be scraped
+    """
+    browser_mgr = await get_browser_manager()
+    
+    # Send status update if callback provided
+    if status_callback:
+        company_name = url.split("/")[-1].replace("-", " ").title()
+        try:
+            status_callback(
+                "fetching_details",
+                "company_processing",
+                f"Scraping: {company_name} ({index}/{total})",
+                {"company": company_name, "index": index, "total": total}
+            )
+        except Exception as e:
+            print(f"⚠️ Status callback failed (non-blocking): {e}")
+    
+    print(f"\n--- Scraping {index}/{total}: {url} ---")
+    company_page = await browser_mgr.new_page()
+
+    try:
+        try:
+            await company_page.goto(url, wait_until="domcontentloaded", timeout=60000)
+        except PlaywrightTimeoutError:
+            pass
+            
+        await asyncio.sleep(random.uniform(SLEEP_DELAY, 2 * SLEEP_DELAY))
+        
+        # Check if still logged in
+        if not await browser_mgr.is_logged_in(company_page):
+            print("⚠️ Session expired, re-logging in...")
+            await browser_mgr.ensure_logged_in(company_page)
+            # Retry the company page after login
+            if company_page.is_closed():
+                company_page = await browser_mgr.new_page()
+            await company_page.goto(url, wait_until="domcontentloaded", timeout=60000)
+            await asyncio.sleep(random.uniform(SLEEP_DELAY, 2 * SLEEP_DELAY))
+
+        data = await scrape_company_page(company_page)
+        if data:
+            data["url"] = url
+            save_company(data)
+            print(f"✅ Saved {data.get('Company Name', 'Unknown')}")
+            return data
+            
+    except PlaywrightTimeoutError:
+        print(f"❌ Timeout while loading {url}. Skipping.")
+    except Exception as e:
+        print(f"❌ Error scraping {url}: {e}")
+    finally:
+        if not company_page.is_closed():
+            await company_page.close()
+    return None
+
+
 async def _scrape_top_companies_impl(company_urls, days_threshold=0, status_callback=None):
     """
     Scrapes company pages for a list of URLs (already sorted by similarity).
     Only scrapes if the company is not fresh in the database.
-    Uses persistent browser manager - opens new tab for each company.
+    Stale companies are scraped in parallel across the browser manager's tab pool.
     
     Args:
         company_urls: List of company URLs (already sorted by similarity)
@@ -753,7 +820,7 @@ async def _scrape_top_companies_impl(company_urls, days_threshold=0, status_call
         status_callback: Optional async function to call with status updates
         
     Returns:
-        List of scraped company data
+        List of scraped company data, in the order of company_urls
     """
     scraped_info = already_scraped_urls()
     browser_mgr = await get_browser_manager()
@@ -775,13 +842,15 @@ async def _scrape_top_companies_impl(company_urls, days_threshold=0, status_call
         if not page.is_closed():
             await page.close()
 
-    results = []
-    
     # Handle days_threshold=0 to always re-scrape
     if days_threshold == 0:
         expiry_time = datetime.max  # All companies will be considered stale
     else:
         expiry_time = datetime.now() - timedelta(days=days_threshold)
+    
+    # One slot per URL keeps results in the original (similarity) order
+    slots = [None] * len(company_urls)
+    tasks = []
         
     try:
         for i, url in enumerate(company_urls, 1):
@@ -793,72 +862,30 @@ async def _scrape_top_companies_impl(company_urls, days_threshold=0, status_call
                 print(f"   Last scraped: {last_scraped}")
                 print(f"   Time since scrape: {time_since_scrape}")
                 print(f"   Threshold: {days_threshold} days")
-                results.append(get_company(url))
+                slots[i - 1] = get_company(url)
                 continue
 
-            print(f"\n--- Scraping {i}/{len(company_urls)}: {url} ---")
-            
-            # Send status update if callback provided
-            if status_callback:
-                company_name = url.split("/")[-1].replace("-", " ").title()
-                try:
-                    status_callback(
-                        "fetching_details",
-                        "company_processing",
-                        f"Scraping: {company_name} ({i}/{len(company_urls)})",
-                        {"company": company_name, "index": i, "total": len(company_urls)}
-                    )
-                except Exception as e:
-                    print(f"⚠️ Status callback failed (non-blocking): {e}")
-            
-            # Open new tab for each company
-            company_page = await browser_mgr.new_page()
-
-            try:
-                try:
-                    await company_page.goto(url, wait_until="domcontentloaded", timeout=60000)
-                except PlaywrightTimeoutError:
-                    pass
-                    
-                await asyncio.sleep(random.uniform(SLEEP_DELAY, 2 * SLEEP_DELAY))
-                
-                # Check if still logged in
-                if not await browser_mgr.is_logged_in(company_page):
-                    print("⚠️ Session expired, re-logging in...")
-                    await browser_mgr.ensure_logged_in(company_page)
-                    # Retry the company page after login
-                    if company_page.is_closed():
-                        company_page = await browser_mgr.new_page()
-                    await company_page.goto(url, wait_until="domcontentloaded", timeout=60000)
-                    await asyncio.sleep(random.uniform(SLEEP_DELAY, 2 * SLEEP_DELAY))
-
-                data = await scrape_company_page(company_page)
-                data2 = await scrape_company_page2(url)
-                if data:
-                    data["url"] = url
-                    save_company(data)
-                    print(f"✅ Saved {data.get('Company Name', 'Unknown')}")
-                    results.append(data)
-                    
-            except PlaywrightTimeoutError:
-                print(f"❌ Timeout while loading {url}. Skipping.")
-            except Exception as e:
-                print(f"❌ Error scraping {url}: {e}")
-            finally:
-                if not company_page.is_closed():
-                    await company_page.close()
+            tasks.append((i - 1, asyncio.create_task(browser_mgr.run_in_tab(
+                _scrape_company_impl, url, i, len(company_urls), status_callback
+            ))))
+        
+        for position, task in tasks:
+            slots[position] = await task
                 
     except Exception as e:
         print(f"❌ Critical error: {e}")
+        for _, task in tasks:
+            if not task.done():
+                task.cancel()
 
-    return results
+    return [data for data in slots if data]
 
 
 async def scrape_top_companies(company_urls, days_threshold=0, status_callback=None):
     """
     Scrapes company pages for a list of URLs (already sorted by similarity).
     Only scrapes if the company is not fresh in the database.
-    Uses persistent browser manager with queuing for concurrent request safety.
+    Company pages are scraped in parallel tabs from the browser manager's pool.
     
     Args:
         company_urls: List of company URLs (already sorted by similarity)
@@ -868,15 +895,8 @@ async def scrape_top_companies(company_urls, days_threshold=0, status_callback=N
     Returns:
         List of scraped company data
     """
-    browser_mgr = await get_browser_manager()
-    status = browser_mgr.get_queue_status()
-    
-    if status["queue_size"] > 0 or status["active_operations"] > 0:
-        print(f"⏳ Request queued. Queue: {status['queue_size']}, Active: {status['active_operations']}")
-    
-    # Queue the operation to prevent concurrent browser access
-    return await browser_mgr.queue_operation(
-        _scrape_top_companies_impl,
+    # Not queued: each company page is leased from the tab pool individually
+    return await _scrape_top_companies_impl(
         company_urls,
         days_threshold,
         status_callback
@@ -4,6 +4,7 @@ Worker Agent - Robust connection to orchestrator with task execution.
 Key reliability features:
 - No ping timeout during task execution (disables WebSocket keepalive during API calls)
 - Tracks task state to prevent duplicate execution
+- Runs up to WORKER_CAPACITY tasks concurrently, each cancellable by task_id
 - Graceful reconnection without task restart
 - Resilient status updates that don't crash on connection loss
 """
@@ -46,12 +47,14 @@ class WorkerAgent:
         
         self.websocket: Optional[websockets.WebSocketClientProtocol] = None
         self.worker_id: Optional[str] = None
-        self.current_task_id: Optional[str] = None
-        self.current_task_data: Optional[Dict] = None
+        self.capacity = max(config.WORKER_CAPACITY, 1)
+        
+        # task_id -> running execution, and the report it sends status for
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._task_reports: Dict[str, str] = {}
         
         # Track tasks we've already worked on to prevent re-execution
         self._completed_tasks: Set[str] = set()
-        self._in_progress_task: Optional[str] = None
         
         self._running = False
         self._reconnect_attempts = 0
@@ -132,6 +135,12 @@ class WorkerAgent:
         logger.info("🛑 Stopping worker agent...")
         self._running = False
         
+        executions = list(self._tasks.values())
+        for execution in executions:
+            execution.cancel()
+        if executions:
+            await asyncio.gather(*executions, return_exceptions=True)
+        
         if self.websocket:
             try:
                 await self.websocket.close()
@@ -212,8 +221,9 @@ class WorkerAgent:
                 "name": config.WORKER_NAME,
                 "version": config.WORKER_VERSION,
                 "local_api_url": self.local_api_url,
-                # Tell orchestrator about any task we're currently executing
-                "in_progress_task": self._in_progress_task
+                "capacity": self.capacity,
+                # Tell orchestrator about any tasks we're currently executing
+                "in_progress_tasks": list(self._tasks)
             }
         }
         
@@ -224,7 +234,7 @@ class WorkerAgent:
         
         if data.get("type") == "auth_success":
             self.worker_id = data.get("worker_id")
-            logger.info(f"✅ Authenticated as {self.worker_id}")
+            logger.info(f"✅ Authenticated as {self.worker_id} ({data.get('capacity', self.capacity)} slot(s))")
             return True
         else:
             logger.error(f"❌ Authentication failed: {data}")
@@ -286,8 +296,9 @@ class WorkerAgent:
                 msg_type = data.get("type")
                 
                 if msg_type == "task":
-                    # Run task in background so we don't block heartbeats/pings
-                    asyncio.create_task(self._handle_task(data))
+                    # Run task in background so we don't block heartbeats,
+                    # cancels or further assignments
+                    self._start_task(data)
                 elif msg_type == "ping":
                     # Server ping to keep connection alive - respond with pong
                     try:
@@ -309,8 +320,8 @@ class WorkerAgent:
                     
             except asyncio.TimeoutError:
                 # Check if connection is still alive
-                if self._in_progress_task:
-                    logger.debug("Receive timeout but task in progress, continuing...")
+                if self._tasks:
+                    logger.debug("Receive timeout but tasks in progress, continuing...")
                 else:
                     logger.warning("Receive timeout, checking connection...")
                     # Try a ping to check connection
@@ -328,35 +339,58 @@ class WorkerAgent:
     async def _handle_cancel(self, data: dict):
         """Handle task cancellation request."""
         task_id = data.get("task_id")
-        if self._in_progress_task == task_id:
-            logger.warning(f"⚠️ Task {task_id} cancellation requested (will complete current API call)")
-            # Note: We can't easily cancel the HTTP request mid-flight
-            # But we can mark it for cleanup after current call completes
+        execution = self._tasks.get(task_id)
+        if execution:
+            # Cancelling drops the in-flight HTTP call to the local API
+            logger.warning(f"🚫 Task {task_id} cancelled by orchestrator")
+            execution.cancel()
     
-    async def _handle_task(self, data: dict):
-        """Handle an incoming task from orchestrator."""
+    def _start_task(self, data: dict):
+        """Schedule a task in its own asyncio task, tracked by task_id."""
         task_id = data.get("task_id")
-        report_id = data.get("report_id")
-        action = data.get("action")
-        payload = data.get("payload", {})
         
         # CRITICAL: Prevent duplicate task execution
         if task_id in self._completed_tasks:
             logger.warning(f"⚠️ Task {task_id} already completed, skipping duplicate")
             return
         
-        if self._in_progress_task == task_id:
+        if task_id in self._tasks:
             logger.warning(f"⚠️ Task {task_id} already in progress, skipping")
             return
         
-        if self._in_progress_task is not None:
-            logger.warning(f"⚠️ Already working on {self._in_progress_task}, cannot accept {task_id}")
-            return
+        if len(self._tasks) >= self.capacity:
+            logger.warning(f"⚠️ Received task {task_id} with all {self.capacity} slot(s) busy; running it anyway")
         
-        logger.info(f"📥 Received task: {task_id} ({action})")
-        self.current_task_id = task_id
-        self._in_progress_task = task_id
-        self.current_task_data = data
+        execution = asyncio.create_task(self._handle_task(data))
+        self._tasks[task_id] = execution
+        self._task_reports[task_id] = data.get("report_id")
+        execution.add_done_callback(lambda done: self._on_task_done(task_id, done))
+    
+    def _on_task_done(self, task_id: str, execution: asyncio.Task):
+        """Free the slot and surface errors raised outside _handle_task's handlers."""
+        self._tasks.pop(task_id, None)
+        self._task_reports.pop(task_id, None)
+        if not execution.cancelled() and execution.exception():
+            logger.error(f"Task {task_id} handler error: {execution.exception()}")
+    
+    def task_for_report(self, report_id: Optional[str]) -> Optional[str]:
+        """Find the running task a local API status update belongs to."""
+        for task_id, task_report_id in self._task_reports.items():
+            if task_report_id == report_id:
+                return task_id
+        # Updates without a known report go to the only running task, if unambiguous
+        if len(self._tasks) == 1:
+            return next(iter(self._tasks))
+        return None
+    
+    async def _handle_task(self, data: dict):
+        """Handle an incoming task from orchestrator."""
+        task_id = data.get("task_id")
+        report_id = data.get("report_id")
+        action = data.get("action")
+        payload = data.get("payload", {})
+        
+        logger.info(f"📥 Received task: {task_id} ({action}) [{len(self._tasks)}/{self.capacity} slots]")
         
         # Notify orchestrator we're starting
         await self._send_safe({
@@ -379,6 +413,11 @@ class WorkerAgent:
             })
             logger.info(f"✅ Task {task_id} completed successfully")
             
+        except asyncio.CancelledError:
+            # Orchestrator already marked it cancelled or requeued it; it may
+            # be assigned here again, so it is not recorded as completed
+            logger.info(f"🚫 Task {task_id} stopped")
+            raise
         except Exception as e:
             # Mark as completed even on failure to prevent retry loop
             self._completed_tasks.add(task_id)
@@ -392,10 +431,6 @@ class WorkerAgent:
                 "error": error_msg
             })
         finally:
-            self.current_task_id = None
-            self._in_progress_task = None
-            self.current_task_data = None
-            
             # Clean up old completed tasks (keep last 100)
             if len(self._completed_tasks) > 100:
                 # Convert to list, remove oldest entries
@@ -436,6 +471,7 @@ class WorkerAgent:
         endpoints = {
             # Crunchbase endpoints
             "search_with_rank": "/search/crunchbase/top-similar-with-rank",
+            "collect_with_rank": "/search/crunchbase/collect-with-rank",  # Scatter sub-task (keyword collection only)
             "search_similar": "/search/crunchbase/top-similar",
             "search_batch": "/search/crunchbase/batch",
             "enrich": "/search/crunchbase/batch",  # Enrichment uses batch endpoint
@@ -468,6 +504,7 @@ class WorkerAgent:
     
     async def send_status(
         self,
+        task_id: str,
         step_key: str,
         detail_type: str,
         message: str,
@@ -478,12 +515,12 @@ class WorkerAgent:
         
         This is designed to NEVER crash or block, even if connection is lost.
         """
-        if not self.current_task_id:
+        if task_id not in self._tasks:
             return
         
         status_msg = {
             "type": "status",
-            "task_id": self.current_task_id,
+            "task_id": task_id,
             "step_key": step_key,
             "detail_type": detail_type,
             "message": message,
@@ -532,7 +569,8 @@ class StatusProxyServer:
         return web.json_response({
             "status": "ok",
             "connected": self.agent._connection_healthy,
-            "current_task": self.agent.current_task_id
+            "active_tasks": list(self.agent._tasks),
+            "capacity": self.agent.capacity
         })
     
     async def handle_status(self, request):
@@ -548,9 +586,10 @@ class StatusProxyServer:
             status_data = data.get('data', {})
             
             # Fire and forget - create task but don't await
-            if self.agent.current_task_id:
+            task_id = self.agent.task_for_report(data.get('report_id'))
+            if task_id:
                 asyncio.create_task(
-                    self._send_status_safe(step_key, detail_type, message, status_data)
+                    self._send_status_safe(task_id, step_key, detail_type, message, status_data)
                 )
             
             return web.json_response({"success": True})
@@ -559,10 +598,10 @@ class StatusProxyServer:
             logger.error(f"Status proxy error: {e}")
             return web.json_response({"error": str(e)}, status=500)
     
-    async def _send_status_safe(self, step_key: str, detail_type: str, message: str, data: dict):
+    async def _send_status_safe(self, task_id: str, step_key: str, detail_type: str, message: str, data: dict):
         """Safely send status, catching all errors."""
         try:
-            await self.agent.send_status(step_key, detail_type, message, data)
+            await self.agent.send_status(task_id, step_key, detail_type, message, data)
         except Exception as e:
             logger.debug(f"Status relay failed (non-critical): {e}")
 
@@ -18,6 +18,10 @@ API_TYPE = os.getenv("API_TYPE", "crunchbase")
 # Local API endpoint (the actual scraper API this agent wraps)
 LOCAL_API_URL = os.getenv("LOCAL_API_URL", "http://localhost:8003")
 
+# Concurrent task slots advertised to the orchestrator; defaults to the
+# browser tabs the local API drives in parallel (its MAX_TABS)
+WORKER_CAPACITY = int(os.getenv("WORKER_CAPACITY", os.getenv("CRUNCHBASE_MAX_TABS", "3")))
+
 # Connection settings
 HEARTBEAT_INTERVAL = int(os.getenv("HEARTBEAT_INTERVAL", "10"))  # seconds
 RECONNECT_DELAY = int(os.getenv("RECONNECT_DELAY", "5"))  # seconds
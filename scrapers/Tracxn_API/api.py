@@ -5,7 +5,6 @@ Provides REST API endpoints for scraping and retrieving company data
 """
 
 import asyncio
-import json
 import logging
 import os
 import sys
@@ -20,16 +19,19 @@ from playwright.async_api import async_playwright
 from pydantic import BaseModel, Field
 
 from tracxn_scrapper import TracxnBot
+from context_pool import get_context_pool, close_context_pool, SessionUnavailableError
 from database import DatabaseManager
 from config import DB_CONFIG
 
-# Try to import similarity search module
+# Shared scraper modules live in scrapers/shared (copied to /shared in the images)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "shared"))
 try:
-    from similarity_search import find_similar_companies
+    from embedding_service import get_embedding_service, close_embedding_service
+    from vector_index import CompanyVectorIndex
     SIMILARITY_SEARCH_AVAILABLE = True
 except ImportError:
     SIMILARITY_SEARCH_AVAILABLE = False
-    print("Warning: similarity_search module not available. /scrape-batch-api-with-rank endpoint will be disabled.")
+    print("Warning: embedding_service module not available. /scrape-batch-api-with-rank endpoint will be disabled.")
 
 # Configure logging
 logging.basicConfig(
@@ -44,6 +46,44 @@ db_manager = DatabaseManager()
 # Global dictionary to track active requests and cancellation flags
 active_requests = {}
 
+# Logged-in browser contexts shared by all scraping requests
+context_pool = get_context_pool()
+
+# Semantic index over every company stored in the database (built at startup)
+company_index = CompanyVectorIndex("tracxn") if SIMILARITY_SEARCH_AVAILABLE else None
+
+def _index_item(company_reference: str, data: Any):
+    """Map stored company sections to a (key, text, metadata) index item"""
+    name, description = None, None
+    for section in data if isinstance(data, list) else []:
+        if not isinstance(section, dict):
+            continue
+        if section.get('section') == 'company_name':
+            name = section.get('data')
+        elif section.get('section') == 'about' and isinstance(section.get('data'), dict):
+            description = section['data'].get('description')
+    return company_reference, description, {
+        "reference": company_reference,
+        "name": name,
+        "description": description
+    }
+
+def _load_index_corpus():
+    """Load the indexable corpus on a dedicated connection (runs in a worker thread)"""
+    db = DatabaseManager()
+    if not db.connect():
+        raise Exception("Database connection failed")
+    try:
+        return [_index_item(c['company_reference'], c['company_data']) for c in db.get_all_companies()]
+    finally:
+        db.disconnect()
+
+async def _start_company_index():
+    try:
+        await company_index.start(_load_index_corpus)
+    except Exception as e:
+        logger.error(f"Company vector index failed to build: {e}")
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
@@ -58,9 +98,35 @@ async def lifespan(app: FastAPI):
         logger.error(f"Startup error: {e}")
         raise
     
+    # Load the embedding model once so ranking requests don't pay for it
+    index_task = None
+    if SIMILARITY_SEARCH_AVAILABLE:
+        try:
+            await get_embedding_service().start()
+            db_manager.save_listeners.append(
+                lambda ref, data: company_index.schedule_upsert(*_index_item(ref, data))
+            )
+            # Build/sync the corpus index in the background so the API is available immediately
+            index_task = asyncio.create_task(_start_company_index())
+        except Exception as e:
+            logger.warning(f"Embedding model failed to load at startup: {e}")
+    
+    # Restore saved sessions (or log in) for the browser context pool in the background
+    try:
+        await context_pool.start()
+        context_pool.start_warm_up()
+    except Exception as e:
+        logger.error(f"Browser context pool failed to start: {e}")
+    
     yield
     
     # Shutdown
+    await close_context_pool()
+    if SIMILARITY_SEARCH_AVAILABLE:
+        if index_task and not index_task.done():
+            index_task.cancel()
+        company_index.save()
+        close_embedding_service()
     db_manager.disconnect()
     logger.info("Application shutdown complete")
 
@@ -125,6 +191,10 @@ class ManualBulkScrapeRequest(BaseModel):
     freshness_days: int = Field(default=180, ge=0, le=365, description="Database freshness in days")
     save_to_db: bool = Field(default=True, description="Whether to save scraped data to database")
 
+class SemanticSearchRequest(BaseModel):
+    target_description: str = Field(..., description="Target description to compare stored companies against")
+    top_k: int = Field(default=20, ge=1, le=500, description="Number of similar companies to return")
+
 class CompanyData(BaseModel):
     company_reference: str
     data: List[Dict[str, Any]]
@@ -158,189 +228,108 @@ async def scrape_companies_background(
             logger.error("Failed to establish database connection")
             raise Exception("Failed to establish database connection")
         
-        async with async_playwright() as playwright:
-            # Step 1: Search for companies with retry logic
-            company_references = []
-            search_max_retries = 3
-            search_retry_count = 0
-            
-            while search_retry_count < search_max_retries:
-                search_bot = None
-                try:
-                    search_bot = TracxnBot(playwright, debug=False)
-                    login_success = await search_bot.login()
-                    
-                    if not login_success:
-                        logger.warning(f"Search bot login failed, attempt {search_retry_count + 1}/{search_max_retries}")
-                        search_retry_count += 1
-                        if search_retry_count < search_max_retries:
-                            await asyncio.sleep(5)
-                        continue
-                    
-                    # Login successful, perform search
+        # Step 1: Search for companies with retry logic
+        company_references = []
+        search_max_retries = 3
+        search_retry_count = 0
+        
+        while search_retry_count < search_max_retries:
+            try:
+                async with context_pool.lease() as search_bot:
                     company_references = await search_bot.search_companies(query=search_term, sort_by=sort_by)
-                    logger.info(f"Search successful on attempt {search_retry_count + 1}, found {len(company_references)} companies")
-                    break
-                    
-                except Exception as e:
-                    logger.error(f"Error during search attempt {search_retry_count + 1}: {e}")
-                    search_retry_count += 1
-                    if search_retry_count < search_max_retries:
-                        await asyncio.sleep(5)
-                        
-                finally:
-                    # Always close search bot
-                    if search_bot:
-                        try:
-                            await search_bot.close()
-                        except Exception as e:
-                            logger.error(f"Error closing search bot: {e}")
-            
-            # If search failed after all retries
-            if search_retry_count >= search_max_retries or not company_references:
-                raise Exception(f"Failed to search companies after {search_max_retries} attempts")
-            
-            # Limit number of companies
-            company_references = company_references[:num_companies]
-            
-            # Step 2: Check which companies are fresh in database
-            fresh_result = db_manager.get_fresh_companies(company_references, freshness_days)
-            fresh_data = fresh_result['fresh_data']
-            need_scraping = fresh_result['need_scraping']
-            
-            logger.info(f"Found {len(fresh_data)} fresh companies in DB, need to scrape {len(need_scraping)}")
-            
-            # Step 3: Scrape companies that need updating
-            newly_scraped = {}
-            if need_scraping:
-                # Split into chunks of 4 for concurrent scraping (max 4 browsers)
-                chunks = [need_scraping[i:i+4] for i in range(0, len(need_scraping), 4)]
+                logger.info(f"Search successful on attempt {search_retry_count + 1}, found {len(company_references)} companies")
+                break
                 
-                # Create semaphore to limit concurrent browsers to 4
-                semaphore = asyncio.Semaphore(4)
-                
-                async def scrape_batch(batch):
-                    """Scrape one batch of up to 4 companies with login retry logic"""
-                    async with semaphore:  # Limit concurrent browsers
-                        max_retries = 3
-                        retry_count = 0
-                        b = None
-                        
-                        while retry_count < max_retries:
-                            login_success = False  # Initialize login_success
-                            try:
-                                # Create new bot instance for each retry
-                                if b:
-                                    try:
-                                        await b.close()
-                                    except Exception as e:
-                                        logger.error(f"Error closing bot during retry: {e}")
-                                    b = None
-                                
-                                b = TracxnBot(playwright, debug=False)
-                                
-                                # Attempt login
-                                login_success = await b.login()
-                                if not login_success:
-                                    logger.warning(f"Login failed for batch, attempt {retry_count + 1}/{max_retries}")
-                                    retry_count += 1
-                                    if retry_count < max_retries:
-                                        await asyncio.sleep(5)  # Wait before retry
-                                    continue
-                                
-                                # Login successful, proceed with scraping
-                                logger.info(f"Login successful for batch on attempt {retry_count + 1}")
-                                break
-                                
-                            except Exception as e:
-                                logger.error(f"Error during login attempt {retry_count + 1}: {e}")
-                                retry_count += 1
-                                if retry_count < max_retries:
-                                    await asyncio.sleep(5)
-                            finally:
-                                # Always close bot if login failed and we're retrying
-                                if retry_count < max_retries and b and not login_success:
-                                    try:
-                                        await b.close()
-                                    except Exception as e:
-                                        logger.error(f"Error closing failed login bot: {e}")
-                                    b = None
-                        
-                        # If all login attempts failed, close bot and return empty results
-                        if retry_count >= max_retries or not b:
-                            logger.error(f"Failed to login after {max_retries} attempts, skipping batch")
-                            if b:
-                                try:
-                                    await b.close()
-                                except Exception as e:
-                                    logger.error(f"Error closing bot after failed login: {e}")
-                            return []
-                        
+            except Exception as e:
+                logger.error(f"Error during search attempt {search_retry_count + 1}: {e}")
+                search_retry_count += 1
+                if search_retry_count < search_max_retries:
+                    await asyncio.sleep(5)
+        
+        # If search failed after all retries
+        if search_retry_count >= search_max_retries or not company_references:
+            raise Exception(f"Failed to search companies after {search_max_retries} attempts")
+        
+        # Limit number of companies
+        company_references = company_references[:num_companies]
+        
+        # Step 2: Check which companies are fresh in database
+        fresh_result = db_manager.get_fresh_companies(company_references, freshness_days)
+        fresh_data = fresh_result['fresh_data']
+        need_scraping = fresh_result['need_scraping']
+        
+        logger.info(f"Found {len(fresh_data)} fresh companies in DB, need to scrape {len(need_scraping)}")
+        
+        # Step 3: Scrape companies that need updating
+        newly_scraped = {}
+        if need_scraping:
+            # Split into chunks of 4; concurrency is bounded by the context pool size
+            chunks = [need_scraping[i:i+4] for i in range(0, len(need_scraping), 4)]
+            
+            async def scrape_batch(batch):
+                """Scrape one batch of up to 4 companies on a pooled, logged-in context"""
+                try:
+                    async with context_pool.lease() as b:
                         # Scrape companies in this batch
                         results = []
-                        try:
-                            for ref in batch:
-                                try:
-                                    data = await b.scrape_company(ref)
+                        for ref in batch:
+                            try:
+                                data = await b.scrape_company(ref)
+                                
+                                # Validate data before saving
+                                if data and b.is_data_valid(data):
+                                    # Save to database
+                                    db_manager.save_company_data(ref, data, search_term)
+                                    results.append({'reference': ref, 'data': data})
+                                    logger.info(f"Successfully scraped and saved data for {ref}")
+                                else:
+                                    logger.warning(f"Scraped data for {ref} is empty or invalid, not saving to database")
+                                    results.append({'reference': ref, 'data': None, 'error': 'Empty or invalid data'})
                                     
-                                    # Validate data before saving
-                                    if data and b.is_data_valid(data):
-                                        # Save to database
-                                        db_manager.save_company_data(ref, data, search_term)
-                                        results.append({'reference': ref, 'data': data})
-                                        logger.info(f"Successfully scraped and saved data for {ref}")
-                                    else:
-                                        logger.warning(f"Scraped data for {ref} is empty or invalid, not saving to database")
-                                        results.append({'reference': ref, 'data': None, 'error': 'Empty or invalid data'})
-                                        
-                                except Exception as e:
-                                    logger.error(f"Error scraping company {ref}: {e}")
-                                    results.append({'reference': ref, 'data': None, 'error': str(e)})
-                        finally:
-                            # Always close the bot instance
-                            if b:
-                                try:
-                                    await b.close()
-                                except Exception as e:
-                                    logger.error(f"Error closing bot after scraping: {e}")
-                        
-                        return results
-                
-                # Run all batches concurrently with max 4 browsers
-                all_results = await asyncio.gather(*[scrape_batch(chunk) for chunk in chunks])
+                            except Exception as e:
+                                logger.error(f"Error scraping company {ref}: {e}")
+                                results.append({'reference': ref, 'data': None, 'error': str(e)})
+                except SessionUnavailableError as e:
+                    logger.error(f"{e}, skipping batch")
+                    return []
                 
-                # Flatten results and only include valid data
-                for batch in all_results:
-                    for result in batch:
-                        if result['data'] is not None:
-                            newly_scraped[result['reference']] = result['data']
-            
-            # Step 4: Combine fresh and newly scraped data
-            all_company_data = []
+                return results
             
-            # Add fresh data from database
-            for ref, data in fresh_data.items():
-                all_company_data.append({
-                    'company_reference': ref,
-                    'data': data,
-                    'source': 'database'
-                })
-            
-            # Add newly scraped data
-            for ref, data in newly_scraped.items():
-                all_company_data.append({
-                    'company_reference': ref,
-                    'data': data,
-                    'source': 'scraped'
-                })
-            
-            return {
-                'total_companies': len(company_references),
-                'fresh_from_db': len(fresh_data),
-                'newly_scraped': len(newly_scraped),
-                'companies': all_company_data
-            }
+            # Run all batches concurrently on pooled contexts
+            all_results = await asyncio.gather(*[scrape_batch(chunk) for chunk in chunks])
             
+            # Flatten results and only include valid data
+            for batch in all_results:
+                for result in batch:
+                    if result['data'] is not None:
+                        newly_scraped[result['reference']] = result['data']
+        
+        # Step 4: Combine fresh and newly scraped data
+        all_company_data = []
+        
+        # Add fresh data from database
+        for ref, data in fresh_data.items():
+            all_company_data.append({
+                'company_reference': ref,
+                'data': data,
+                'source': 'database'
+            })
+        
+        # Add newly scraped data
+        for ref, data in newly_scraped.items():
+            all_company_data.append({
+                'company_reference': ref,
+                'data': data,
+                'source': 'scraped'
+            })
+        
+        return {
+            'total_companies': len(company_references),
+            'fresh_from_db': len(fresh_data),
+            'newly_scraped': len(newly_scraped),
+            'companies': all_company_data
+        }
+        
     except Exception as e:
         logger.error(f"Error in background scraping task: {e}")
         raise
@@ -357,30 +346,16 @@ async def scrape_batch_companies_background(
             logger.error("Failed to establish database connection")
             raise Exception("Failed to establish database connection")
         
-        async with async_playwright() as playwright:
-            # Step 1: Search for each company and get their links
-            company_references = []
-            search_results = {}  # Track which search term led to which reference
-            
-            search_max_retries = 3
-            search_retry_count = 0
-            
-            while search_retry_count < search_max_retries:
-                search_bot = None
-                try:
-                    search_bot = TracxnBot(playwright, debug=False)
-                    login_success = await search_bot.login()
-                    
-                    if not login_success:
-                        logger.warning(f"Search bot login failed, attempt {search_retry_count + 1}/{search_max_retries}")
-                        search_retry_count += 1
-                        if search_retry_count < search_max_retries:
-                            await asyncio.sleep(5)
-                        continue
-                    
-                    # Login successful, search for each company
-                    logger.info(f"Search bot login successful, searching for {len(company_names)} companies")
-                    
+        # Step 1: Search for each company and get their links
+        company_references = []
+        search_results = {}  # Track which search term led to which reference
+        
+        search_max_retries = 3
+        search_retry_count = 0
+        
+        while search_retry_count < search_max_retries:
+            try:
+                async with context_pool.lease() as search_bot:
                     for company_name in company_names:
                         try:
                             logger.info(f"Searching for company: {company_name}")
@@ -399,254 +374,185 @@ async def scrape_batch_companies_background(
                                         logger.info(f"Found company reference #{idx+1} for '{company_name}': {result}")
                                     else:
                                         logger.warning(f"Invalid reference at position {idx} for '{company_name}'")
-                                
+                            
                                 if top_results:
                                     logger.info(f"Found {len(top_results)} company references for '{company_name}'")
                                 else:
                                     logger.warning(f"No valid references found for '{company_name}'")
                             else:
                                 logger.warning(f"No search results found for '{company_name}'")
-                            
+                        
                             # Small delay between searches to be respectful
                             await asyncio.sleep(2)
-                            
+                        
                         except Exception as e:
                             logger.error(f"Error searching for company '{company_name}': {e}")
                             continue
-                    
+                
                     logger.info(f"Search successful, found {len(company_references)} company references")
                     logger.info(f"Company references: {company_references}")
-                    break
-                    
-                except Exception as e:
-                    logger.error(f"Error during search attempt {search_retry_count + 1}: {e}")
-                    search_retry_count += 1
-                    if search_retry_count < search_max_retries:
-                        await asyncio.sleep(5)
-                        
-                finally:
-                    # Always close search bot
-                    if search_bot:
-                        try:
-                            await search_bot.close()
-                        except Exception as e:
-                            logger.error(f"Error closing search bot: {e}")
-            
-            # If search failed after all retries
-            if search_retry_count >= search_max_retries:
-                raise Exception(f"Failed to search companies after {search_max_retries} attempts")
-            
-            if not company_references:
-                logger.warning("No company references found for any of the provided names")
-                return {
-                    'total_companies': 0,
-                    'fresh_from_db': 0,
-                    'newly_scraped': 0,
-                    'companies': []
-                }
-            
-            # Remove duplicates while preserving the first search term for each reference
-            original_count = len(company_references)
-            unique_references = []
-            seen_references = set()
-            unique_search_results = {}
-            
-            for ref in company_references:
-                if ref not in seen_references:
-                    seen_references.add(ref)
-                    unique_references.append(ref)
-                    # Keep the first search query that found this reference
-                    if ref in search_results and ref not in unique_search_results:
-                        unique_search_results[ref] = search_results[ref]
-            
-            company_references = unique_references
-            search_results = unique_search_results
-            
-            if original_count > len(company_references):
-                logger.info(f"Removed {original_count - len(company_references)} duplicate company references. Unique companies: {len(company_references)}")
-            
-            # Step 2: Scrape companies with per-company freshness check
-            # This handles concurrent scraping across multiple servers
-            newly_scraped = {}
-            fresh_data = {}
-            
-            # Split into chunks of 4 for concurrent scraping (max 4 browsers)
-            chunks = [company_references[i:i+4] for i in range(0, len(company_references), 4)]
-            
-            # Create semaphore to limit concurrent browsers to 4
-            semaphore = asyncio.Semaphore(4)
-            
-            async def scrape_batch(batch):
-                """Scrape one batch of up to 4 companies with per-company freshness check"""
-                async with semaphore:  # Limit concurrent browsers
-                    max_retries = 3
-                    retry_count = 0
-                    b = None
-                    
-                    while retry_count < max_retries:
-                        login_success = False
-                        try:
-                            # Create new bot instance for each retry
-                            if b:
-                                try:
-                                    await b.close()
-                                except Exception as e:
-                                    logger.error(f"Error closing bot during retry: {e}")
-                                b = None
-                            
-                            b = TracxnBot(playwright, debug=False)
-                            
-                            # Attempt login
-                            login_success = await b.login()
-                            if not login_success:
-                                logger.warning(f"Login failed for batch, attempt {retry_count + 1}/{max_retries}")
-                                retry_count += 1
-                                if retry_count < max_retries:
-                                    await asyncio.sleep(5)
-                                continue
-                            
-                            # Login successful, proceed with scraping
-                            logger.info(f"Login successful for batch on attempt {retry_count + 1}")
-                            break
-                            
-                        except Exception as e:
-                            logger.error(f"Error during login attempt {retry_count + 1}: {e}")
-                            retry_count += 1
-                            if retry_count < max_retries:
-                                await asyncio.sleep(5)
-                        finally:
-                            # Always close bot if login failed and we're retrying
-                            if retry_count < max_retries and b and not login_success:
-                                try:
-                                    await b.close()
-                                except Exception as e:
-                                    logger.error(f"Error closing failed login bot: {e}")
-                                b = None
-                    
-                    # If all login attempts failed, close bot and return empty results
-                    if retry_count >= max_retries or not b:
-                        logger.error(f"Failed to login after {max_retries} attempts, skipping batch")
-                        if b:
-                            try:
-                                await b.close()
-                            except Exception as e:
-                                logger.error(f"Error closing bot after failed login: {e}")
-                        return []
-                    
+                break
+                
+            except Exception as e:
+                logger.error(f"Error during search attempt {search_retry_count + 1}: {e}")
+                search_retry_count += 1
+                if search_retry_count < search_max_retries:
+                    await asyncio.sleep(5)
+        
+        # If search failed after all retries
+        if search_retry_count >= search_max_retries:
+            raise Exception(f"Failed to search companies after {search_max_retries} attempts")
+        
+        if not company_references:
+            logger.warning("No company references found for any of the provided names")
+            return {
+                'total_companies': 0,
+                'fresh_from_db': 0,
+                'newly_scraped': 0,
+                'companies': []
+            }
+        
+        # Remove duplicates while preserving the first search term for each reference
+        original_count = len(company_references)
+        unique_references = []
+        seen_references = set()
+        unique_search_results = {}
+        
+        for ref in company_references:
+            if ref not in seen_references:
+                seen_references.add(ref)
+                unique_references.append(ref)
+                # Keep the first search query that found this reference
+                if ref in search_results and ref not in unique_search_results:
+                    unique_search_results[ref] = search_results[ref]
+        
+        company_references = unique_references
+        search_results = unique_search_results
+        
+        if original_count > len(company_references):
+            logger.info(f"Removed {original_count - len(company_references)} duplicate company references. Unique companies: {len(company_references)}")
+        
+        # Step 2: Scrape companies with per-company freshness check
+        # This handles concurrent scraping across multiple servers
+        newly_scraped = {}
+        fresh_data = {}
+        
+        # Split into chunks of 4; concurrency is bounded by the context pool size
+        chunks = [company_references[i:i+4] for i in range(0, len(company_references), 4)]
+        
+        async def scrape_batch(batch):
+            """Scrape one batch of up to 4 companies on a pooled, logged-in context"""
+            try:
+                async with context_pool.lease() as b:
                     # Scrape companies in this batch
                     results = []
-                    try:
-                        for ref in batch:
-                            # Check freshness before scraping each company
-                            fresh_check = db_manager.get_fresh_companies([ref], freshness_days)
+                    for ref in batch:
+                        # Check freshness before scraping each company
+                        fresh_check = db_manager.get_fresh_companies([ref], freshness_days)
+                        
+                        if ref in fresh_check['fresh_data']:
+                            # Company is fresh in database, use cached data
+                            logger.info(f"Using fresh data from database for {ref}")
+                            results.append({
+                                'reference': ref,
+                                'data': fresh_check['fresh_data'][ref],
+                                'duration': 0,
+                                'from_cache': True
+                            })
+                            continue
+                        
+                        # Company needs scraping
+                        scrape_start_time = datetime.now()
+                        try:
+                            data = await b.scrape_company(ref)
+                            scrape_duration = (datetime.now() - scrape_start_time).total_seconds()
                             
-                            if ref in fresh_check['fresh_data']:
-                                # Company is fresh in database, use cached data
-                                logger.info(f"Using fresh data from database for {ref}")
+                            # Validate data before saving
+                            if data and b.is_data_valid(data):
+                                # Get original search query for this reference
+                                search_query = search_results.get(ref, None)
+                                # Save to database
+                                db_manager.save_company_data(ref, data, search_query)
                                 results.append({
-                                    'reference': ref,
-                                    'data': fresh_check['fresh_data'][ref],
-                                    'duration': 0,
-                                    'from_cache': True
+                                    'reference': ref, 
+                                    'data': data,
+                                    'duration': scrape_duration,
+                                    'from_cache': False
                                 })
-                                continue
-                            
-                            # Company needs scraping
-                            scrape_start_time = datetime.now()
-                            try:
-                                data = await b.scrape_company(ref)
-                                scrape_duration = (datetime.now() - scrape_start_time).total_seconds()
-                                
-                                # Validate data before saving
-                                if data and b.is_data_valid(data):
-                                    # Get original search query for this reference
-                                    search_query = search_results.get(ref, None)
-                                    # Save to database
-                                    db_manager.save_company_data(ref, data, search_query)
-                                    results.append({
-                                        'reference': ref, 
-                                        'data': data,
-                                        'duration': scrape_duration,
-                                        'from_cache': False
-                                    })
-                                    logger.info(f"Successfully scraped and saved data for {ref} in {scrape_duration:.2f}s")
-                                else:
-                                    logger.warning(f"Scraped data for {ref} is empty or invalid, not saving to database")
-                                    results.append({
-                                        'reference': ref, 
-                                        'data': None, 
-                                        'error': 'Empty or invalid data',
-                                        'duration': scrape_duration,
-                                        'from_cache': False
-                                    })
-                                    
-                            except Exception as e:
-                                scrape_duration = (datetime.now() - scrape_start_time).total_seconds()
-                                logger.error(f"Error scraping company {ref}: {e}")
+                                logger.info(f"Successfully scraped and saved data for {ref} in {scrape_duration:.2f}s")
+                            else:
+                                logger.warning(f"Scraped data for {ref} is empty or invalid, not saving to database")
                                 results.append({
                                     'reference': ref, 
                                     'data': None, 
-                                    'error': str(e),
+                                    'error': 'Empty or invalid data',
                                     'duration': scrape_duration,
                                     'from_cache': False
                                 })
-                    finally:
-                        # Always close the bot instance
-                        if b:
-                            try:
-                                await b.close()
-                            except Exception as e:
-                                logger.error(f"Error closing bot after scraping: {e}")
-                    
-                    return results
-            
-            # Run all batches concurrently with max 4 browsers
-            all_results = await asyncio.gather(*[scrape_batch(chunk) for chunk in chunks])
-            
-            # Flatten results and separate fresh vs newly scraped
-            for batch in all_results:
-                for result in batch:
-                    if result['data'] is not None:
-                        if result.get('from_cache', False):
-                            fresh_data[result['reference']] = result['data']
-                        else:
-                            newly_scraped[result['reference']] = {
-                                'data': result['data'],
-                                'duration': result.get('duration', 0)
-                            }
-            
-            logger.info(f"Scraping complete: {len(fresh_data)} from cache, {len(newly_scraped)} newly scraped")
-            
-            # Step 4: Combine fresh and newly scraped data
-            all_company_data = []
-            
-            # Add fresh data from database
-            for ref, data in fresh_data.items():
-                all_company_data.append({
-                    'company_reference': ref,
-                    'data': data,
-                    'source': 'database',
-                    'search_query': search_results.get(ref, None),
-                    'scraping_duration': 0  # No scraping time for cached data
-                })
-            
-            # Add newly scraped data
-            for ref, scraped_info in newly_scraped.items():
-                all_company_data.append({
-                    'company_reference': ref,
-                    'data': scraped_info['data'],
-                    'source': 'scraped',
-                    'search_query': search_results.get(ref, None),
-                    'scraping_duration': scraped_info.get('duration', 0)
-                })
-            
-            return {
-                'total_companies': len(company_references),
-                'fresh_from_db': len(fresh_data),
-                'newly_scraped': len(newly_scraped),
-                'companies': all_company_data
-            }
-            
+                                
+                        except Exception as e:
+                            scrape_duration = (datetime.now() - scrape_start_time).total_seconds()
+                            logger.error(f"Error scraping company {ref}: {e}")
+                            results.append({
+                                'reference': ref, 
+                                'data': None, 
+                                'error': str(e),
+                                'duration': scrape_duration,
+                                'from_cache': False
+                            })
+            except SessionUnavailableError as e:
+                logger.error(f"{e}, skipping batch")
+                return []
+            
+            return results
+        
+        # Run all batches concurrently on pooled contexts
+        all_results = await asyncio.gather(*[scrape_batch(chunk) for chunk in chunks])
+        
+        # Flatten results and separate fresh vs newly scraped
+        for batch in all_results:
+            for result in batch:
+                if result['data'] is not None:
+                    if result.get('from_cache', False):
+                        fresh_data[result['reference']] = result['data']
+                    else:
+                        newly_scraped[result['reference']] = {
+                            'data': result['data'],
+                            'duration': result.get('duration', 0)
+                        }
+        
+        logger.info(f"Scraping complete: {len(fresh_data)} from cache, {len(newly_scraped)} newly scraped")
+        
+        # Step 4: Combine fresh and newly scraped data
+        all_company_data = []
+        
+        # Add fresh data from database
+        for ref, data in fresh_data.items():
+            all_company_data.append({
+                'company_reference': ref,
+                'data': data,
+                'source': 'database',
+                'search_query': search_results.get(ref, None),
+                'scraping_duration': 0  # No scraping time for cached data
+            })
+        
+        # Add newly scraped data
+        for ref, scraped_info in newly_scraped.items():
+            all_company_data.append({
+                'company_reference': ref,
+                'data': scraped_info['data'],
+                'source': 'scraped',
+                'search_query': search_results.get(ref, None),
+                'scraping_duration': scraped_info.get('duration', 0)
+            })
+        
+        return {
+            'total_companies': len(company_references),
+            'fresh_from_db': len(fresh_data),
+            'newly_scraped': len(newly_scraped),
+            'companies': all_company_data
+        }
+        
     except Exception as e:
         logger.error(f"Error in batch scraping task: {e}")
         raise
@@ -664,32 +570,16 @@ async def scrape_batch_companies_via_api_background(
             logger.error("Failed to establish database connection")
             raise Exception("Failed to establish database connection")
         
-        async with async_playwright() as playwright:
-            # Step 1: Initialize bot and login once
-            company_references = []
-            search_results = {}  # Track which search term led to which reference
-            
-            search_max_retries = 3
-            search_retry_count = 0
-            
-            while search_retry_count < search_max_retries:
-                search_bot = None
-                try:
-                    logger.info(f"Initializing bot for API-based batch search (attempt {search_retry_count + 1}/{search_max_retries})")
-                    search_bot = TracxnBot(playwright, debug=False)
-                    
-                    # Login (this handles: open page, email signup, captcha, verification)
-                    login_success = await search_bot.login()
-                    
-                    if not login_success:
-                        logger.warning(f"Login failed, attempt {search_retry_count + 1}/{search_max_retries}")
-                        search_retry_count += 1
-                        if search_retry_count < search_max_retries:
-                            await asyncio.sleep(5)
-                        continue
-                    
-                    logger.info("Login successful, starting API searches")
-                    
+        # Step 1: Lease a logged-in context and run the API searches
+        company_references = []
+        search_results = {}  # Track which search term led to which reference
+        
+        search_max_retries = 3
+        search_retry_count = 0
+        
+        while search_retry_count < search_max_retries:
+            try:
+                async with context_pool.lease() as search_bot:
                     # Search for each company using the API method
                     for idx, company_name in enumerate(company_names):
                         logger.info(f"Searching via API for '{company_name}' ({idx + 1}/{len(company_names)})...")
@@ -701,7 +591,7 @@ async def scrape_batch_companies_via_api_background(
                                 size=num_companies_per_search,
                                 sort_by=sort_by
                             )
-                            
+                        
                             if company_data_list:
                                 # Extract references and track which search term found which companies
                                 for company_data in company_data_list:
@@ -714,202 +604,169 @@ async def scrape_batch_companies_via_api_background(
                                     else:
                                         # Old format - just a string reference
                                         ref = company_data
-                                    
+                                
                                     company_references.append(ref)
                                     search_results[ref] = company_name
-                                    
+                                
                                 logger.info(f"Found {len(company_data_list)} companies for '{company_name}' via API")
                             else:
                                 logger.warning(f"No companies found for '{company_name}' via API")
-                            
+                        
                             # Small delay between searches to be polite to the API
                             await asyncio.sleep(random.uniform(0.5, 1.0))
-                            
+                        
                         except Exception as e:
                             logger.error(f"Error searching for '{company_name}' via API: {e}")
                             continue
-                    
+                
                     # If we got here, searches were successful
-                    break
-                    
-                except Exception as e:
-                    logger.error(f"Error during API search attempt {search_retry_count + 1}: {e}")
-                    search_retry_count += 1
-                    await asyncio.sleep(2)
-                        
-                finally:
-                    if search_bot:
-                        await search_bot.close()
-            
-            # If search failed after all retries
-            if search_retry_count >= search_max_retries:
-                raise Exception(f"Failed to search companies via API after {search_max_retries} attempts")
-            
-            if not company_references:
-                logger.warning("No company references found for any of the provided names via API")
-                return {
-                    'total_companies': 0,
-                    'fresh_from_db': 0,
-                    'newly_scraped': 0,
-                    'companies': []
-                }
-            
-            # Remove duplicates while preserving the first search term for each reference
-            original_count = len(company_references)
-            unique_references = []
-            seen_references = set()
-            unique_search_results = {}
-            
-            for ref in company_references:
-                if ref not in seen_references:
-                    seen_references.add(ref)
-                    unique_references.append(ref)
-                    unique_search_results[ref] = search_results[ref]
-            
-            company_references = unique_references
-            search_results = unique_search_results
-            
-            if original_count > len(company_references):
-                logger.info(f"Removed {original_count - len(company_references)} duplicate company references. Unique companies: {len(company_references)}")
-            
-            # Step 2: Scrape companies with per-company freshness check
-            newly_scraped = {}
-            fresh_data = {}
-            
-            # Split into chunks of 4 for concurrent scraping (max 4 browsers)
-            chunks = [company_references[i:i+4] for i in range(0, len(company_references), 4)]
-            
-            # Create semaphore to limit concurrent browsers to 4
-            semaphore = asyncio.Semaphore(4)
-            
-            async def scrape_batch(batch):
-                """Scrape one batch of up to 4 companies with per-company freshness check"""
-                async with semaphore:
-                    results = []
-                    scrape_bot = None
-                    max_retries = 2
-                    retry_count = 0
-                    
-                    while retry_count < max_retries:
+                break
+                
+            except Exception as e:
+                logger.error(f"Error during API search attempt {search_retry_count + 1}: {e}")
+                search_retry_count += 1
+                await asyncio.sleep(2)
+        
+        # If search failed after all retries
+        if search_retry_count >= search_max_retries:
+            raise Exception(f"Failed to search companies via API after {search_max_retries} attempts")
+        
+        if not company_references:
+            logger.warning("No company references found for any of the provided names via API")
+            return {
+                'total_companies': 0,
+                'fresh_from_db': 0,
+                'newly_scraped': 0,
+                'companies': []
+            }
+        
+        # Remove duplicates while preserving the first search term for each reference
+        original_count = len(company_references)
+        unique_references = []
+        seen_references = set()
+        unique_search_results = {}
+        
+        for ref in company_references:
+            if ref not in seen_references:
+                seen_references.add(ref)
+                unique_references.append(ref)
+                unique_search_results[ref] = search_results[ref]
+        
+        company_references = unique_references
+        search_results = unique_search_results
+        
+        if original_count > len(company_references):
+            logger.info(f"Removed {original_count - len(company_references)} duplicate company references. Unique companies: {len(company_references)}")
+        
+        # Step 2: Scrape companies with per-company freshness check
+        newly_scraped = {}
+        fresh_data = {}
+        
+        # Split into chunks of 4; concurrency is bounded by the context pool size
+        chunks = [company_references[i:i+4] for i in range(0, len(company_references), 4)]
+        
+        async def scrape_batch(batch):
+            """Scrape one batch of up to 4 companies on a pooled, logged-in context"""
+            results = []
+            try:
+                async with context_pool.lease() as scrape_bot:
+                    # Check freshness for each company in the batch
+                    for ref in batch:
                         try:
-                            scrape_bot = TracxnBot(playwright, debug=False)
-                            
-                            # Login (this handles: open page, email signup, captcha, verification)
-                            login_success = await scrape_bot.login()
-                            
-                            if not login_success:
-                                logger.warning(f"Login failed for batch, retry {retry_count + 1}")
-                                retry_count += 1
-                                if retry_count < max_retries:
-                                    await asyncio.sleep(5)
+                            # Check if company data is fresh in DB
+                            is_fresh = db_manager.is_company_fresh(ref, freshness_days)
+                                
+                            if is_fresh:
+                                # Get data from database
+                                company_data = db_manager.get_company_data(ref)
+                                if company_data:
+                                    results.append({
+                                        'reference': ref,
+                                        'data': company_data['data'],
+                                        'source': 'database',
+                                        'search_query': search_results.get(ref)
+                                    })
+                                    logger.info(f"Using cached data for {ref}")
                                 continue
-                            
-                            # Check freshness for each company in the batch
-                            for ref in batch:
-                                try:
-                                    # Check if company data is fresh in DB
-                                    is_fresh = db_manager.is_company_fresh(ref, freshness_days)
-                                    
-                                    if is_fresh:
-                                        # Get data from database
-                                        company_data = db_manager.get_company_data(ref)
-                                        if company_data:
-                                            results.append({
-                                                'reference': ref,
-                                                'data': company_data['data'],
-                                                'source': 'database',
-                                                'search_query': search_results.get(ref)
-                                            })
-                                            logger.info(f"Using cached data for {ref}")
-                                        continue
-                                    
-                                    # Need to scrape this company
-                                    scrape_start = asyncio.get_event_loop().time()
-                                    logger.info(f"Scraping company: {ref}")
-                                    company_data = await scrape_bot.scrape_company(ref)
-                                    scrape_duration = asyncio.get_event_loop().time() - scrape_start
-                                    
-                                    if scrape_bot.is_data_valid(company_data):
-                                        # Save to database
-                                        if db_manager.save_company_data(ref, company_data, search_results.get(ref)):
-                                            results.append({
-                                                'reference': ref,
-                                                'data': company_data,
-                                                'source': 'scraped',
-                                                'search_query': search_results.get(ref),
-                                                'scraping_duration': scrape_duration
-                                            })
-                                            logger.info(f"Successfully scraped and saved: {ref} (took {scrape_duration:.2f}s)")
-                                        else:
-                                            logger.error(f"Failed to save data for {ref}")
-                                    else:
-                                        logger.warning(f"Invalid data scraped for {ref}")
-                                    
-                                    await asyncio.sleep(random.uniform(1, 2))
-                                    
-                                except Exception as e:
-                                    logger.error(f"Error processing company {ref}: {e}")
-                                    continue
-                            
-                            break  # Success, exit retry loop
-                            
+                                
+                            # Need to scrape this company
+                            scrape_start = asyncio.get_event_loop().time()
+                            logger.info(f"Scraping company: {ref}")
+                            company_data = await scrape_bot.scrape_company(ref)
+                            scrape_duration = asyncio.get_event_loop().time() - scrape_start
+                                
+                            if scrape_bot.is_data_valid(company_data):
+                                # Save to database
+                                if db_manager.save_company_data(ref, company_data, search_results.get(ref)):
+                                    results.append({
+                                        'reference': ref,
+                                        'data': company_data,
+                                        'source': 'scraped',
+                                        'search_query': search_results.get(ref),
+                                        'scraping_duration': scrape_duration
+                                    })
+                                    logger.info(f"Successfully scraped and saved: {ref} (took {scrape_duration:.2f}s)")
+                                else:
+                                    logger.error(f"Failed to save data for {ref}")
+                            else:
+                                logger.warning(f"Invalid data scraped for {ref}")
+                                
+                            await asyncio.sleep(random.uniform(1, 2))
+                                
                         except Exception as e:
-                            logger.error(f"Error in scrape batch (retry {retry_count + 1}): {e}")
-                            retry_count += 1
-                            await asyncio.sleep(2)
-                            
-                        finally:
-                            if scrape_bot:
-                                await scrape_bot.close()
-                    
-                    return results
-            
-            # Run all batches concurrently with max 4 browsers
-            all_results = await asyncio.gather(*[scrape_batch(chunk) for chunk in chunks])
-            
-            # Flatten results and separate fresh vs newly scraped
-            for batch in all_results:
-                for result in batch:
-                    if result['source'] == 'database':
-                        fresh_data[result['reference']] = result['data']
-                    else:
-                        newly_scraped[result['reference']] = {
-                            'data': result['data'],
-                            'search_query': result['search_query'],
-                            'scraping_duration': result.get('scraping_duration', 0)
-                        }
-            
-            logger.info(f"API-based scraping complete: {len(fresh_data)} from cache, {len(newly_scraped)} newly scraped")
-            
-            # Step 3: Combine fresh and newly scraped data
-            all_company_data = []
-            
-            # Add fresh data from database
-            for ref, data in fresh_data.items():
-                all_company_data.append({
-                    'company_reference': ref,
-                    'data': data,
-                    'source': 'database',
-                    'search_query': search_results.get(ref)
-                })
-            
-            # Add newly scraped data
-            for ref, scraped_info in newly_scraped.items():
-                all_company_data.append({
-                    'company_reference': ref,
-                    'data': scraped_info['data'],
-                    'source': 'scraped',
-                    'search_query': scraped_info['search_query'],
-                    'scraping_duration_seconds': scraped_info['scraping_duration']
-                })
-            
-            return {
-                'total_companies': len(company_references),
-                'fresh_from_db': len(fresh_data),
-                'newly_scraped': len(newly_scraped),
-                'companies': all_company_data
-            }
+                            logger.error(f"Error processing company {ref}: {e}")
+                            continue
+            except SessionUnavailableError as e:
+                logger.error(f"{e}, skipping batch")
             
+            return results
+        
+        # Run all batches concurrently on pooled contexts
+        all_results = await asyncio.gather(*[scrape_batch(chunk) for chunk in chunks])
+        
+        # Flatten results and separate fresh vs newly scraped
+        for batch in all_results:
+            for result in batch:
+                if result['source'] == 'database':
+                    fresh_data[result['reference']] = result['data']
+                else:
+                    newly_scraped[result['reference']] = {
+                        'data': result['data'],
+                        'search_query': result['search_query'],
+                        'scraping_duration': result.get('scraping_duration', 0)
+                    }
+        
+        logger.info(f"API-based scraping complete: {len(fresh_data)} from cache, {len(newly_scraped)} newly scraped")
+        
+        # Step 3: Combine fresh and newly scraped data
+        all_company_data = []
+        
+        # Add fresh data from database
+        for ref, data in fresh_data.items():
+            all_company_data.append({
+                'company_reference': ref,
+                'data': data,
+                'source': 'database',
+                'search_query': search_results.get(ref)
+            })
+        
+        # Add newly scraped data
+        for ref, scraped_info in newly_scraped.items():
+            all_company_data.append({
+                'company_reference': ref,
+                'data': scraped_info['data'],
+                'source': 'scraped',
+                'search_query': scraped_info['search_query'],
+                'scraping_duration_seconds': scraped_info['scraping_duration']
+            })
+        
+        return {
+            'total_companies': len(company_references),
+            'fresh_from_db': len(fresh_data),
+            'newly_scraped': len(newly_scraped),
+            'companies': all_company_data
+        }
+        
     except Exception as e:
         logger.error(f"Error in API-based batch scraping task: {e}")
         raise
@@ -929,37 +786,23 @@ async def scrape_batch_companies_with_year_filter_background(
             logger.error("Failed to establish database connection")
             raise Exception("Failed to establish database connection")
         
-        async with async_playwright() as playwright:
-            # Step 1: Search for each company across all years and get their links
-            company_references = []
-            search_results = {}  # Track which search term and year led to which reference
-            
-            search_max_retries = 3
-            search_retry_count = 0
-            
-            # Validate year range
-            if from_year > to_year:
-                raise ValueError(f"from_year ({from_year}) cannot be greater than to_year ({to_year})")
-            
-            years_to_search = list(range(from_year, to_year + 1))
-            logger.info(f"Will search {len(company_names)} keywords across {len(years_to_search)} years ({from_year}-{to_year})")
-            
-            while search_retry_count < search_max_retries:
-                search_bot = None
-                try:
-                    search_bot = TracxnBot(playwright, debug=False)
-                    login_success = await search_bot.login()
-                    
-                    if not login_success:
-                        logger.warning(f"Search bot login failed, attempt {search_retry_count + 1}/{search_max_retries}")
-                        search_retry_count += 1
-                        if search_retry_count < search_max_retries:
-                            await asyncio.sleep(5)
-                        continue
-                    
-                    # Login successful, search for each company across all years
-                    logger.info(f"Search bot login successful, searching for {len(company_names)} companies across {len(years_to_search)} years")
-                    
+        # Step 1: Search for each company across all years and get their links
+        company_references = []
+        search_results = {}  # Track which search term and year led to which reference
+        
+        search_max_retries = 3
+        search_retry_count = 0
+        
+        # Validate year range
+        if from_year > to_year:
+            raise ValueError(f"from_year ({from_year}) cannot be greater than to_year ({to_year})")
+        
+        years_to_search = list(range(from_year, to_year + 1))
+        logger.info(f"Will search {len(company_names)} keywords across {len(years_to_search)} years ({from_year}-{to_year})")
+        
+        while search_retry_count < search_max_retries:
+            try:
+                async with context_pool.lease() as search_bot:
                     for company_name in company_names:
                         for year in years_to_search:
                             try:
@@ -975,7 +818,7 @@ async def scrape_batch_companies_with_year_filter_background(
                                 except Exception as e:
                                     logger.error(f"Error during search for '{company_name}' (year {year}): {e}")
                                     results = []
-                                
+                            
                                 if results and len(results) > 0:
                                     # Take the top N results based on num_companies_per_search
                                     top_results = results[:num_companies_per_search]
@@ -986,256 +829,187 @@ async def scrape_batch_companies_with_year_filter_background(
                                             logger.info(f"Found company reference #{idx+1} for '{company_name}' (year {year}): {result}")
                                         else:
                                             logger.warning(f"Invalid reference at position {idx} for '{company_name}' (year {year})")
-                                    
+                                
                                     if top_results:
                                         logger.info(f"Found {len(top_results)} company references for '{company_name}' (year {year})")
                                     else:
                                         logger.warning(f"No valid references found for '{company_name}' (year {year})")
                                 else:
                                     logger.warning(f"No search results found for '{company_name}' (year {year})")
-                                
+                            
                                 # Small delay between searches to be respectful
                                 await asyncio.sleep(2)
-                                
+                            
                             except Exception as e:
                                 logger.error(f"Error searching for company '{company_name}' (year {year}): {e}")
                                 continue
-                    
+                
                     logger.info(f"Search successful, found {len(company_references)} company references across all years")
                     logger.info(f"Company references: {company_references}")
-                    break
-                    
-                except Exception as e:
-                    logger.error(f"Error during search attempt {search_retry_count + 1}: {e}")
-                    search_retry_count += 1
-                    if search_retry_count < search_max_retries:
-                        await asyncio.sleep(5)
-                        
-                finally:
-                    # Always close search bot
-                    if search_bot:
-                        try:
-                            await search_bot.close()
-                        except Exception as e:
-                            logger.error(f"Error closing search bot: {e}")
-            
-            # If search failed after all retries
-            if search_retry_count >= search_max_retries:
-                raise Exception(f"Failed to search companies after {search_max_retries} attempts")
-            
-            if not company_references:
-                logger.warning("No company references found for any of the provided names and years")
-                return {
-                    'total_companies': 0,
-                    'fresh_from_db': 0,
-                    'newly_scraped': 0,
-                    'companies': []
-                }
-            
-            # Remove duplicates while preserving the first search term for each reference
-            original_count = len(company_references)
-            unique_references = []
-            seen_references = set()
-            unique_search_results = {}
-            
-            for ref in company_references:
-                if ref not in seen_references:
-                    seen_references.add(ref)
-                    unique_references.append(ref)
-                    # Keep the first search query that found this reference
-                    if ref in search_results and ref not in unique_search_results:
-                        unique_search_results[ref] = search_results[ref]
-            
-            company_references = unique_references
-            search_results = unique_search_results
-            
-            if original_count > len(company_references):
-                logger.info(f"Removed {original_count - len(company_references)} duplicate company references. Unique companies: {len(company_references)}")
-            
-            # Step 2: Scrape companies with per-company freshness check
-            newly_scraped = {}
-            fresh_data = {}
-            
-            # Split into chunks of 4 for concurrent scraping (max 4 browsers)
-            chunks = [company_references[i:i+4] for i in range(0, len(company_references), 4)]
-            
-            # Create semaphore to limit concurrent browsers to 4
-            semaphore = asyncio.Semaphore(4)
-            
-            async def scrape_batch(batch):
-                """Scrape one batch of up to 4 companies with per-company freshness check"""
-                async with semaphore:  # Limit concurrent browsers
-                    max_retries = 3
-                    retry_count = 0
-                    b = None
-                    
-                    while retry_count < max_retries:
-                        login_success = False
-                        try:
-                            # Create new bot instance for each retry
-                            if b:
-                                try:
-                                    await b.close()
-                                except Exception as e:
-                                    logger.error(f"Error closing bot during retry: {e}")
-                                b = None
-                            
-                            b = TracxnBot(playwright, debug=False)
-                            
-                            # Attempt login
-                            login_success = await b.login()
-                            if not login_success:
-                                logger.warning(f"Login failed for batch, attempt {retry_count + 1}/{max_retries}")
-                                retry_count += 1
-                                if retry_count < max_retries:
-                                    await asyncio.sleep(5)
-                                continue
-                            
-                            # Login successful, proceed with scraping
-                            logger.info(f"Login successful for batch on attempt {retry_count + 1}")
-                            break
-                            
-                        except Exception as e:
-                            logger.error(f"Error during login attempt {retry_count + 1}: {e}")
-                            retry_count += 1
-                            if retry_count < max_retries:
-                                await asyncio.sleep(5)
-                        finally:
-                            # Always close bot if login failed and we're retrying
-                            if retry_count < max_retries and b and not login_success:
-                                try:
-                                    await b.close()
-                                except Exception as e:
-                                    logger.error(f"Error closing failed login bot: {e}")
-                                b = None
-                    
-                    # If all login attempts failed, close bot and return empty results
-                    if retry_count >= max_retries or not b:
-                        logger.error(f"Failed to login after {max_retries} attempts, skipping batch")
-                        if b:
-                            try:
-                                await b.close()
-                            except Exception as e:
-                                logger.error(f"Error closing bot after failed login: {e}")
-                        return []
-                    
+                break
+                
+            except Exception as e:
+                logger.error(f"Error during search attempt {search_retry_count + 1}: {e}")
+                search_retry_count += 1
+                if search_retry_count < search_max_retries:
+                    await asyncio.sleep(5)
+        
+        # If search failed after all retries
+        if search_retry_count >= search_max_retries:
+            raise Exception(f"Failed to search companies after {search_max_retries} attempts")
+        
+        if not company_references:
+            logger.warning("No company references found for any of the provided names and years")
+            return {
+                'total_companies': 0,
+                'fresh_from_db': 0,
+                'newly_scraped': 0,
+                'companies': []
+            }
+        
+        # Remove duplicates while preserving the first search term for each reference
+        original_count = len(company_references)
+        unique_references = []
+        seen_references = set()
+        unique_search_results = {}
+        
+        for ref in company_references:
+            if ref not in seen_references:
+                seen_references.add(ref)
+                unique_references.append(ref)
+                # Keep the first search query that found this reference
+                if ref in search_results and ref not in unique_search_results:
+                    unique_search_results[ref] = search_results[ref]
+        
+        company_references = unique_references
+        search_results = unique_search_results
+        
+        if original_count > len(company_references):
+            logger.info(f"Removed {original_count - len(company_references)} duplicate company references. Unique companies: {len(company_references)}")
+        
+        # Step 2: Scrape companies with per-company freshness check
+        newly_scraped = {}
+        fresh_data = {}
+        
+        # Split into chunks of 4; concurrency is bounded by the context pool size
+        chunks = [company_references[i:i+4] for i in range(0, len(company_references), 4)]
+        
+        async def scrape_batch(batch):
+            """Scrape one batch of up to 4 companies on a pooled, logged-in context"""
+            try:
+                async with context_pool.lease() as b:
                     # Scrape companies in this batch
                     results = []
-                    try:
-                        for ref in batch:
-                            # Check freshness before scraping each company
-                            fresh_check = db_manager.get_fresh_companies([ref], freshness_days)
+                    for ref in batch:
+                        # Check freshness before scraping each company
+                        fresh_check = db_manager.get_fresh_companies([ref], freshness_days)
+                        
+                        if ref in fresh_check['fresh_data']:
+                            # Company is fresh in database, use cached data
+                            logger.info(f"Using fresh data from database for {ref}")
+                            results.append({
+                                'reference': ref,
+                                'data': fresh_check['fresh_data'][ref],
+                                'duration': 0,
+                                'from_cache': True
+                            })
+                            continue
+                        
+                        # Company needs scraping
+                        scrape_start_time = datetime.now()
+                        try:
+                            data = await b.scrape_company(ref)
+                            scrape_duration = (datetime.now() - scrape_start_time).total_seconds()
                             
-                            if ref in fresh_check['fresh_data']:
-                                # Company is fresh in database, use cached data
-                                logger.info(f"Using fresh data from database for {ref}")
+                            # Validate data before saving
+                            if data and b.is_data_valid(data):
+                                # Get original search query for this reference
+                                search_info = search_results.get(ref, {})
+                                search_query = f"{search_info.get('keyword', 'unknown')}_{search_info.get('year', 'unknown')}"
+                                # Save to database
+                                db_manager.save_company_data(ref, data, search_query)
                                 results.append({
-                                    'reference': ref,
-                                    'data': fresh_check['fresh_data'][ref],
-                                    'duration': 0,
-                                    'from_cache': True
+                                    'reference': ref, 
+                                    'data': data,
+                                    'duration': scrape_duration,
+                                    'from_cache': False
                                 })
-                                continue
-                            
-                            # Company needs scraping
-                            scrape_start_time = datetime.now()
-                            try:
-                                data = await b.scrape_company(ref)
-                                scrape_duration = (datetime.now() - scrape_start_time).total_seconds()
-                                
-                                # Validate data before saving
-                                if data and b.is_data_valid(data):
-                                    # Get original search query for this reference
-                                    search_info = search_results.get(ref, {})
-                                    search_query = f"{search_info.get('keyword', 'unknown')}_{search_info.get('year', 'unknown')}"
-                                    # Save to database
-                                    db_manager.save_company_data(ref, data, search_query)
-                                    results.append({
-                                        'reference': ref, 
-                                        'data': data,
-                                        'duration': scrape_duration,
-                                        'from_cache': False
-                                    })
-                                    logger.info(f"Successfully scraped and saved data for {ref} in {scrape_duration:.2f}s")
-                                else:
-                                    logger.warning(f"Scraped data for {ref} is empty or invalid, not saving to database")
-                                    results.append({
-                                        'reference': ref, 
-                                        'data': None, 
-                                        'error': 'Empty or invalid data',
-                                        'duration': scrape_duration,
-                                        'from_cache': False
-                                    })
-                                    
-                            except Exception as e:
-                                scrape_duration = (datetime.now() - scrape_start_time).total_seconds()
-                                logger.error(f"Error scraping company {ref}: {e}")
+                                logger.info(f"Successfully scraped and saved data for {ref} in {scrape_duration:.2f}s")
+                            else:
+                                logger.warning(f"Scraped data for {ref} is empty or invalid, not saving to database")
                                 results.append({
                                     'reference': ref, 
                                     'data': None, 
-                                    'error': str(e),
+                                    'error': 'Empty or invalid data',
                                     'duration': scrape_duration,
                                     'from_cache': False
                                 })
-                    finally:
-                        # Always close the bot instance
-                        if b:
-                            try:
-                                await b.close()
-                            except Exception as e:
-                                logger.error(f"Error closing bot after scraping: {e}")
-                    
-                    return results
-            
-            # Run all batches concurrently with max 4 browsers
-            all_results = await asyncio.gather(*[scrape_batch(chunk) for chunk in chunks])
-            
-            # Flatten results and separate fresh vs newly scraped
-            for batch in all_results:
-                for result in batch:
-                    if result['data'] is not None:
-                        if result.get('from_cache', False):
-                            fresh_data[result['reference']] = result['data']
-                        else:
-                            newly_scraped[result['reference']] = {
-                                'data': result['data'],
-                                'duration': result.get('duration', 0)
-                            }
-            
-            logger.info(f"Scraping complete: {len(fresh_data)} from cache, {len(newly_scraped)} newly scraped")
-            
-            # Step 3: Combine fresh and newly scraped data
-            all_company_data = []
-            
-            # Add fresh data from database
-            for ref, data in fresh_data.items():
-                search_info = search_results.get(ref, {})
-                all_company_data.append({
-                    'company_reference': ref,
-                    'data': data,
-                    'source': 'database',
-                    'search_query': f"{search_info.get('keyword', 'unknown')}_{search_info.get('year', 'unknown')}",
-                    'scraping_duration': 0  # No scraping time for cached data
-                })
-            
-            # Add newly scraped data
-            for ref, scraped_info in newly_scraped.items():
-                search_info = search_results.get(ref, {})
-                all_company_data.append({
-                    'company_reference': ref,
-                    'data': scraped_info['data'],
-                    'source': 'scraped',
-                    'search_query': f"{search_info.get('keyword', 'unknown')}_{search_info.get('year', 'unknown')}",
-                    'scraping_duration': scraped_info.get('duration', 0)
-                })
-            
-            return {
-                'total_companies': len(company_references),
-                'fresh_from_db': len(fresh_data),
-                'newly_scraped': len(newly_scraped),
-                'companies': all_company_data
-            }
-            
+                                
+                        except Exception as e:
+                            scrape_duration = (datetime.now() - scrape_start_time).total_seconds()
+                            logger.error(f"Error scraping company {ref}: {e}")
+                            results.append({
+                                'reference': ref, 
+                                'data': None, 
+                                'error': str(e),
+                                'duration': scrape_duration,
+                                'from_cache': False
+                            })
+            except SessionUnavailableError as e:
+                logger.error(f"{e}, skipping batch")
+                return []
+            
+            return results
+        
+        # Run all batches concurrently on pooled contexts
+        all_results = await asyncio.gather(*[scrape_batch(chunk) for chunk in chunks])
+        
+        # Flatten results and separate fresh vs newly scraped
+        for batch in all_results:
+            for result in batch:
+                if result['data'] is not None:
+                    if result.get('from_cache', False):
+                        fresh_data[result['reference']] = result['data']
+                    else:
+                        newly_scraped[result['reference']] = {
+                            'data': result['data'],
+                            'duration': result.get('duration', 0)
+                        }
+        
+        logger.info(f"Scraping complete: {len(fresh_data)} from cache, {len(newly_scraped)} newly scraped")
+        
+        # Step 3: Combine fresh and newly scraped data
+        all_company_data = []
+        
+        # Add fresh data from database
+        for ref, data in fresh_data.items():
+            search_info = search_results.get(ref, {})
+            all_company_data.append({
+                'company_reference': ref,
+                'data': data,
+                'source': 'database',
+                'search_query': f"{search_info.get('keyword', 'unknown')}_{search_info.get('year', 'unknown')}",
+                'scraping_duration': 0  # No scraping time for cached data
+            })
+        
+        # Add newly scraped data
+        for ref, scraped_info in newly_scraped.items():
+            search_info = search_results.get(ref, {})
+            all_company_data.append({
+                'company_reference': ref,
+                'data': scraped_info['data'],
+                'source': 'scraped',
+                'search_query': f"{search_info.get('keyword', 'unknown')}_{search_info.get('year', 'unknown')}",
+                'scraping_duration': scraped_info.get('duration', 0)
+            })
+        
+        return {
+            'total_companies': len(company_references),
+            'fresh_from_db': len(fresh_data),
+            'newly_scraped': len(newly_scraped),
+            'companies': all_company_data
+        }
+        
     except Exception as e:
         logger.error(f"Error in batch scraping with year filter task: {e}")
         raise
@@ -1251,147 +1025,85 @@ async def scrape_references_background(
             logger.error("Failed to establish database connection")
             raise Exception("Failed to establish database connection")
         
-        async with async_playwright() as playwright:
-            logger.info(f"Starting scrape for {len(company_references)} company references")
-            
-            # Step 1: Check which companies are fresh in database
-            fresh_result = db_manager.get_fresh_companies(company_references, freshness_days)
-            fresh_data = fresh_result['fresh_data']
-            need_scraping = fresh_result['need_scraping']
-            
-            logger.info(f"Found {len(fresh_data)} fresh companies in DB, need to scrape {len(need_scraping)}")
+        logger.info(f"Starting scrape for {len(company_references)} company references")
+        
+        # Step 1: Check which companies are fresh in database
+        fresh_result = db_manager.get_fresh_companies(company_references, freshness_days)
+        fresh_data = fresh_result['fresh_data']
+        need_scraping = fresh_result['need_scraping']
+        
+        logger.info(f"Found {len(fresh_data)} fresh companies in DB, need to scrape {len(need_scraping)}")
+        
+        # Step 2: Scrape companies that need updating
+        newly_scraped = {}
+        if need_scraping:
+            # Split into chunks of 4; concurrency is bounded by the context pool size
+            chunks = [need_scraping[i:i+4] for i in range(0, len(need_scraping), 4)]
             
-            # Step 2: Scrape companies that need updating
-            newly_scraped = {}
-            if need_scraping:
-                # Split into chunks of 4 for concurrent scraping (max 4 browsers)
-                chunks = [need_scraping[i:i+4] for i in range(0, len(need_scraping), 4)]
-                
-                # Create semaphore to limit concurrent browsers to 4
-                semaphore = asyncio.Semaphore(4)
-                
-                async def scrape_batch(batch):
-                    """Scrape one batch of up to 4 companies with login retry logic"""
-                    async with semaphore:  # Limit concurrent browsers
-                        max_retries = 3
-                        retry_count = 0
-                        b = None
-                        
-                        while retry_count < max_retries:
-                            login_success = False
-                            try:
-                                # Create new bot instance for each retry
-                                if b:
-                                    try:
-                                        await b.close()
-                                    except Exception as e:
-                                        logger.error(f"Error closing bot during retry: {e}")
-                                    b = None
-                                
-                                b = TracxnBot(playwright, debug=False)
-                                
-                                # Attempt login
-                                login_success = await b.login()
-                                if not login_success:
-                                    logger.warning(f"Login failed for batch, attempt {retry_count + 1}/{max_retries}")
-                                    retry_count += 1
-                                    if retry_count < max_retries:
-                                        await asyncio.sleep(5)
-                                    continue
-                                
-                                # Login successful, proceed with scraping
-                                logger.info(f"Login successful for batch on attempt {retry_count + 1}")
-                                break
-                                
-                            except Exception as e:
-                                logger.error(f"Error during login attempt {retry_count + 1}: {e}")
-                                retry_count += 1
-                                if retry_count < max_retries:
-                                    await asyncio.sleep(5)
-                            finally:
-                                # Always close bot if login failed and we're retrying
-                                if retry_count < max_retries and b and not login_success:
-                                    try:
-                                        await b.close()
-                                    except Exception as e:
-                                        logger.error(f"Error closing failed login bot: {e}")
-                                    b = None
-                        
-                        # If all login attempts failed, close bot and return empty results
-                        if retry_count >= max_retries or not b:
-                            logger.error(f"Failed to login after {max_retries} attempts, skipping batch")
-                            if b:
-                                try:
-                                    await b.close()
-                                except Exception as e:
-                                    logger.error(f"Error closing bot after failed login: {e}")
-                            return []
-                        
+            async def scrape_batch(batch):
+                """Scrape one batch of up to 4 companies on a pooled, logged-in context"""
+                try:
+                    async with context_pool.lease() as b:
                         # Scrape companies in this batch
                         results = []
-                        try:
-                            for ref in batch:
-                                try:
-                                    data = await b.scrape_company(ref)
+                        for ref in batch:
+                            try:
+                                data = await b.scrape_company(ref)
+                                
+                                # Validate data before saving
+                                if data and b.is_data_valid(data):
+                                    # Save to database (no search query for direct references)
+                                    db_manager.save_company_data(ref, data, None)
+                                    results.append({'reference': ref, 'data': data})
+                                    logger.info(f"Successfully scraped and saved data for {ref}")
+                                else:
+                                    logger.warning(f"Scraped data for {ref} is empty or invalid, not saving to database")
+                                    results.append({'reference': ref, 'data': None, 'error': 'Empty or invalid data'})
                                     
-                                    # Validate data before saving
-                                    if data and b.is_data_valid(data):
-                                        # Save to database (no search query for direct references)
-                                        db_manager.save_company_data(ref, data, None)
-                                        results.append({'reference': ref, 'data': data})
-                                        logger.info(f"Successfully scraped and saved data for {ref}")
-                                    else:
-                                        logger.warning(f"Scraped data for {ref} is empty or invalid, not saving to database")
-                                        results.append({'reference': ref, 'data': None, 'error': 'Empty or invalid data'})
-                                        
-                                except Exception as e:
-                                    logger.error(f"Error scraping company {ref}: {e}")
-                                    results.append({'reference': ref, 'data': None, 'error': str(e)})
-                        finally:
-                            # Always close the bot instance
-                            if b:
-                                try:
-                                    await b.close()
-                                except Exception as e:
-                                    logger.error(f"Error closing bot after scraping: {e}")
-                        
-                        return results
-                
-                # Run all batches concurrently with max 4 browsers
-                all_results = await asyncio.gather(*[scrape_batch(chunk) for chunk in chunks])
+                            except Exception as e:
+                                logger.error(f"Error scraping company {ref}: {e}")
+                                results.append({'reference': ref, 'data': None, 'error': str(e)})
+                except SessionUnavailableError as e:
+                    logger.error(f"{e}, skipping batch")
+                    return []
                 
-                # Flatten results and only include valid data
-                for batch in all_results:
-                    for result in batch:
-                        if result['data'] is not None:
-                            newly_scraped[result['reference']] = result['data']
-            
-            # Step 3: Combine fresh and newly scraped data
-            all_company_data = []
-            
-            # Add fresh data from database
-            for ref, data in fresh_data.items():
-                all_company_data.append({
-                    'company_reference': ref,
-                    'data': data,
-                    'source': 'database'
-                })
-            
-            # Add newly scraped data
-            for ref, data in newly_scraped.items():
-                all_company_data.append({
-                    'company_reference': ref,
-                    'data': data,
-                    'source': 'scraped'
-                })
+                return results
             
-            return {
-                'total_companies': len(company_references),
-                'fresh_from_db': len(fresh_data),
-                'newly_scraped': len(newly_scraped),
-                'companies': all_company_data
-            }
+            # Run all batches concurrently on pooled contexts
+            all_results = await asyncio.gather(*[scrape_batch(chunk) for chunk in chunks])
             
+            # Flatten results and only include valid data
+            for batch in all_results:
+                for result in batch:
+                    if result['data'] is not None:
+                        newly_scraped[result['reference']] = result['data']
+        
+        # Step 3: Combine fresh and newly scraped data
+        all_company_data = []
+        
+        # Add fresh data from database
+        for ref, data in fresh_data.items():
+            all_company_data.append({
+                'company_reference': ref,
+                'data': data,
+                'source': 'database'
+            })
+        
+        # Add newly scraped data
+        for ref, data in newly_scraped.items():
+            all_company_data.append({
+                'company_reference': ref,
+                'data': data,
+                'source': 'scraped'
+            })
+        
+        return {
+            'total_companies': len(company_references),
+            'fresh_from_db': len(fresh_data),
+            'newly_scraped': len(newly_scraped),
+            'companies': all_company_data
+        }
+        
     except Exception as e:
         logger.error(f"Error in reference scraping task: {e}")
         raise
@@ -1514,7 +1226,7 @@ async def scrape_batch_companies_api(request: BatchCompaniesAPIRequest):
     and headers, making it significantly faster than the UI-based scraping approach.
     
     This endpoint will:
-    1. Login once and extract browser cookies/headers
+    1. Lease a logged-in pooled context and extract browser cookies/headers
     2. Search for each company name using TracXN API directly
     3. Take the top N results from each search (based on num_companies_per_search)
     4. Check database for fresh data (within freshness_days)
@@ -1944,6 +1656,43 @@ async def export_companies(
             detail=f"Export failed: {str(e)}"
         )
 
+@app.post("/semantic-search")
+async def semantic_search(request: SemanticSearchRequest):
+    """
+    Return the stored companies most similar to a target description
+    
+    Searches the local vector index built over every company in the database,
+    so no browser or login is involved. Reports can start from these results
+    and only fall back to the scraping endpoints for gaps.
+    """
+    if not SIMILARITY_SEARCH_AVAILABLE:
+        raise HTTPException(
+            status_code=503,
+            detail={"error": "Similarity search functionality is not available. Please ensure the shared embedding_service module is available."}
+        )
+    
+    try:
+        start_time = time.time()
+        results = await company_index.search(request.target_description, top_k=request.top_k)
+        for result in results:
+            result.pop('key', None)
+        return {
+            "results": results,
+            "metadata": {
+                "target_description": request.target_description,
+                "top_k_requested": request.top_k,
+                "returned": len(results),
+                "index": company_index.stats(),
+                "search_time_ms": round((time.time() - start_time) * 1000, 2)
+            }
+        }
+    except Exception as e:
+        logger.error(f"Error in semantic search: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Semantic search failed: {str(e)}"
+        )
+
 @app.post("/scrape-batch-api-with-rank")
 async def scrape_batch_companies_api_with_rank(request: BatchCompaniesAPIWithRankRequest):
     """
@@ -2018,7 +1767,7 @@ async def scrape_batch_companies_api_with_rank(request: BatchCompaniesAPIWithRan
         if not SIMILARITY_SEARCH_AVAILABLE:
             raise HTTPException(
                 status_code=503,
-                detail={"error": "Similarity search functionality is not available. Please ensure the similarity_search module is installed."}
+                detail={"error": "Similarity search functionality is not available. Please ensure the shared embedding_service module is available."}
             )
         
         # Validate weights
@@ -2045,59 +1794,43 @@ async def scrape_batch_companies_api_with_rank(request: BatchCompaniesAPIWithRan
         )
         
         # Step 1: Search companies via API and collect metadata
-        async with async_playwright() as playwright:
-            company_tracker = {}  # {reference: {name, description, tracxn_score, keywords}}
-            search_retry_count = 0
-            search_max_retries = 3
-            
-            while search_retry_count < search_max_retries:
-                try:
-                    browser = await playwright.chromium.launch(headless=True)
-                    ua = "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/140.0.0.0 Safari/537.36"
-                    context = await browser.new_context(user_agent=ua)
-                    page = await context.new_page()
-                    bot = TracxnBot(playwright, debug=False)
-                    
-                    # Login once
-                    if not await bot.login():
-                        logger.error("Login failed")
-                        await browser.close()
-                        search_retry_count += 1
-                        continue
-                    
-                    logger.info("✅ Login successful, starting API searches")
-                    
+        company_tracker = {}  # {reference: {name, description, tracxn_score, keywords}}
+        search_retry_count = 0
+        search_max_retries = 3
+        
+        while search_retry_count < search_max_retries:
+            try:
+                async with context_pool.lease() as bot:
                     # Search each keyword
                     for idx, keyword in enumerate(request.company_names, 1):
                         # Check for cancellation
                         if request_id and request_id in active_requests and active_requests[request_id]["cancelled"]:
                             logger.info(f"🛑 Request {request_id} cancelled during keyword search")
-                            await browser.close()
                             return {"error": "Request was cancelled", "cancelled": True}
-                        
-                        
+                    
+                    
                         logger.info(f"Searching via API: '{keyword}'")
-                        
+                    
                         # Use API search to get company data with descriptions
                         company_data_list = await bot.search_companies_via_api(
                             query=keyword,
                             size=request.num_companies_per_search,
                             sort_by=request.sort_by
                         )
-                        
+                    
                         logger.info(f"API returned {len(company_data_list)} companies for '{keyword}'")
-                        
+                    
                         # Generate preview of found companies for status update
                         found_names = []
                         if company_data_list:
                             for c in company_data_list[:5]:
                                 if isinstance(c, dict):
                                     found_names.append(c.get('name', 'Unknown'))
-                        
+                    
                         preview_msg = ", ".join(found_names)
                         if len(company_data_list) > 5:
                             preview_msg += f" +{len(company_data_list)-5} more"
-                            
+                        
                         # Send updated status with results
                         await send_status_update(
                             "api_search",
@@ -2119,7 +1852,7 @@ async def scrape_batch_companies_api_with_rank(request: BatchCompaniesAPIWithRan
                                 name = company_data.get('name', '')
                                 description = company_data.get('detailedDescription', '')
                                 tracxn_score = company_data.get('tracxnScore', 0)
-                                
+                            
                                 if ref:
                                     if ref not in company_tracker:
                                         company_tracker[ref] = {
@@ -2133,167 +1866,152 @@ async def scrape_batch_companies_api_with_rank(request: BatchCompaniesAPIWithRan
                                     else:
                                         company_tracker[ref]['keywords'].append(keyword)
                                         company_tracker[ref]['appearance_count'] += 1
-                        
+                    
                         # Rate limiting
                         await asyncio.sleep(random.uniform(1.0, 2.0))
-                    
-                    await browser.close()
-                    logger.info(f"✅ API search complete: found {len(company_tracker)} unique companies")
-                    break
-                    
-                except Exception as e:
-                    logger.error(f"Error during API search (attempt {search_retry_count + 1}/{search_max_retries}): {e}")
-                    try:
-                        await browser.close()
-                    except:
-                        pass
-                    search_retry_count += 1
-                    if search_retry_count < search_max_retries:
-                        await asyncio.sleep(5)
-            
-            if not company_tracker:
-                return {
-                    "all_companies": [],
-                    "top_companies_full_data": [],
-                    "metadata": {
-                        "total_keywords_searched": len(request.company_names),
-                        "total_unique_companies": 0,
-                        "top_count_requested": request.top_count,
-                        "top_count_returned": 0,
-                        "similarity_weight": request.similarity_weight,
-                        "score_weight": request.score_weight
-                    }
+                
+                logger.info(f"✅ API search complete: found {len(company_tracker)} unique companies")
+                break
+                
+            except Exception as e:
+                logger.error(f"Error during API search (attempt {search_retry_count + 1}/{search_max_retries}): {e}")
+                search_retry_count += 1
+                if search_retry_count < search_max_retries:
+                    await asyncio.sleep(5)
+        
+        if not company_tracker:
+            return {
+                "all_companies": [],
+                "top_companies_full_data": [],
+                "metadata": {
+                    "total_keywords_searched": len(request.company_names),
+                    "total_unique_companies": 0,
+                    "top_count_requested": request.top_count,
+                    "top_count_returned": 0,
+                    "similarity_weight": request.similarity_weight,
+                    "score_weight": request.score_weight
                 }
+            }
+        
+        
+        # Step 2: Calculate similarity scores
+        logger.info(f"\\n=== Step 2: Calculating similarity scores for {len(company_tracker)} companies ===")
+        
+        # Prepare companies for similarity search
+        companies_for_similarity = []
+        for ref, tracker_data in company_tracker.items():
+            companies_for_similarity.append({
+                "reference": ref,
+                "name": tracker_data['name'],
+                "description": tracker_data['description'] or tracker_data['name']
+            })
+        
+        try:
+            similar_companies = await get_embedding_service().rank(
+                request.target_description,
+                companies_for_similarity,
+                top_k=None  # Get all companies ranked
+            )
             
+            logger.info(f"✅ Similarity scores calculated")
             
-            # Step 2: Calculate similarity scores
-            logger.info(f"\\n=== Step 2: Calculating similarity scores for {len(company_tracker)} companies ===")
+            # Send status: Companies ranked
+            await send_status_update(
+                "sorting",
+                "company_ranked",
+                f"Ranked {len(similar_companies)} startups by combined score",
+                {"total_companies": len(similar_companies), "top_company": similar_companies[0]['name'] if similar_companies else None}
+            )
             
-            # Prepare companies for similarity search
-            companies_for_similarity = []
-            for ref, tracker_data in company_tracker.items():
-                companies_for_similarity.append({
-                    "reference": ref,
-                    "name": tracker_data['name'],
-                    "description": tracker_data['description'] or tracker_data['name']
-                })
+            # Step 3: Convert TracXN scores (0-100) to 0-1 range and combine with similarity
+            logger.info(f"\\n=== Step 3: Converting TracXN scores and calculating combined scores ===")
             
-            companies_json = json.dumps(companies_for_similarity)
+            # Get TracXN score range for logging
+            all_tracxn_scores = [company_tracker[comp['reference']]['tracxn_score'] for comp in similar_companies]
+            min_score = min(all_tracxn_scores) if all_tracxn_scores else 0
+            max_score = max(all_tracxn_scores) if all_tracxn_scores else 100
             
-            try:
-                similar_companies = find_similar_companies(
-                    companies_json=companies_json,
-                    target_description=request.target_description,
-                    top_k=None  # Get all companies ranked
-                )
-                
-                logger.info(f"✅ Similarity scores calculated")
-                
-                # Send status: Companies ranked
-                await send_status_update(
-                    "sorting",
-                    "company_ranked",
-                    f"Ranked {len(similar_companies)} startups by combined score",
-                    {"total_companies": len(similar_companies), "top_company": similar_companies[0]['name'] if similar_companies else None}
-                )
-                
-                # Step 3: Convert TracXN scores (0-100) to 0-1 range and combine with similarity
-                logger.info(f"\\n=== Step 3: Converting TracXN scores and calculating combined scores ===")
-                
-                # Get TracXN score range for logging
-                all_tracxn_scores = [company_tracker[comp['reference']]['tracxn_score'] for comp in similar_companies]
-                min_score = min(all_tracxn_scores) if all_tracxn_scores else 0
-                max_score = max(all_tracxn_scores) if all_tracxn_scores else 100
-                
-                logger.info(f"TracXN Score range: {min_score:.2f} (lowest) to {max_score:.2f} (highest)")
-                
-                # Calculate combined scores
-                all_companies_with_scores = []
-                for sim_comp in similar_companies:
-                    ref = sim_comp['reference']
-                    tracker_data = company_tracker[ref]
-                    
-                    # Convert TracXN score from 0-100 to 0-1 range
-                    normalized_tracxn_score = tracker_data['tracxn_score'] / 100.0
-                    
-                    # Calculate combined score
-                    combined_score = (
-                        sim_comp['similarity_score'] * request.similarity_weight +
-                        normalized_tracxn_score * request.score_weight
-                    )
-                    
-                    all_companies_with_scores.append({
-                        'reference': ref,
-                        'name': tracker_data['name'],
-                        'description': tracker_data['description'],
-                        'similarity_score': sim_comp['similarity_score'],
-                        'tracxn_score': tracker_data['tracxn_score'],
-                        'normalized_tracxn_score': normalized_tracxn_score,
-                        'combined_score': combined_score,
-                        'appearance_count': tracker_data['appearance_count'],
-                        'keywords': tracker_data['keywords']
-                    })
-                
-                # Sort by combined score (descending)
-                all_companies_with_scores.sort(key=lambda x: x['combined_score'], reverse=True)
-                
-                # Add rank
-                for i, company in enumerate(all_companies_with_scores):
-                    company['rank'] = i + 1
-                
-                logger.info(f"✅ Combined scores calculated, top company: {all_companies_with_scores[0]['name']} (score: {all_companies_with_scores[0]['combined_score']:.4f})")
+            logger.info(f"TracXN Score range: {min_score:.2f} (lowest) to {max_score:.2f} (highest)")
+            
+            # Calculate combined scores
+            all_companies_with_scores = []
+            for sim_comp in similar_companies:
+                ref = sim_comp['reference']
+                tracker_data = company_tracker[ref]
                 
-                # Extract company names for status update
-                top_company_names = [comp['name'] for comp in all_companies_with_scores[:request.top_count]]
+                # Convert TracXN score from 0-100 to 0-1 range
+                normalized_tracxn_score = tracker_data['tracxn_score'] / 100.0
                 
-                # Send status: Top companies selected
-                await send_status_update(
-                    "sorting",
-                    "top_selected",
-                    f"Selected top {request.top_count} startups for detailed scraping",
-                    {"top_count": request.top_count, "top_companies": top_company_names[:5]}
+                # Calculate combined score
+                combined_score = (
+                    sim_comp['similarity_score'] * request.similarity_weight +
+                    normalized_tracxn_score * request.score_weight
                 )
                 
-                # Step 4: Scrape top N companies for full data
-                logger.info(f"\\n=== Step 4: Scraping top {request.top_count} companies for full data ===")
-                
-                top_references = [comp['reference'] for comp in all_companies_with_scores[:request.top_count]]
-                
-                # Check freshness and scrape
-                fresh_result = db_manager.get_fresh_companies(top_references, request.freshness_days)
-                fresh_data = fresh_result['fresh_data']
-                need_scraping = fresh_result['need_scraping']
+                all_companies_with_scores.append({
+                    'reference': ref,
+                    'name': tracker_data['name'],
+                    'description': tracker_data['description'],
+                    'similarity_score': sim_comp['similarity_score'],
+                    'tracxn_score': tracker_data['tracxn_score'],
+                    'normalized_tracxn_score': normalized_tracxn_score,
+                    'combined_score': combined_score,
+                    'appearance_count': tracker_data['appearance_count'],
+                    'keywords': tracker_data['keywords']
+                })
+            
+            # Sort by combined score (descending)
+            all_companies_with_scores.sort(key=lambda x: x['combined_score'], reverse=True)
+            
+            # Add rank
+            for i, company in enumerate(all_companies_with_scores):
+                company['rank'] = i + 1
+            
+            logger.info(f"✅ Combined scores calculated, top company: {all_companies_with_scores[0]['name']} (score: {all_companies_with_scores[0]['combined_score']:.4f})")
+            
+            # Extract company names for status update
+            top_company_names = [comp['name'] for comp in all_companies_with_scores[:request.top_count]]
+            
+            # Send status: Top companies selected
+            await send_status_update(
+                "sorting",
+                "top_selected",
+                f"Selected top {request.top_count} startups for detailed scraping",
+                {"top_count": request.top_count, "top_companies": top_company_names[:5]}
+            )
+            
+            # Step 4: Scrape top N companies for full data
+            logger.info(f"\\n=== Step 4: Scraping top {request.top_count} companies for full data ===")
+            
+            top_references = [comp['reference'] for comp in all_companies_with_scores[:request.top_count]]
+            
+            # Check freshness and scrape
+            fresh_result = db_manager.get_fresh_companies(top_references, request.freshness_days)
+            fresh_data = fresh_result['fresh_data']
+            need_scraping = fresh_result['need_scraping']
+            
+            logger.info(f"Found {len(fresh_data)} fresh in DB, need to scrape {len(need_scraping)}")
+            
+            # Scrape companies that need updating
+            newly_scraped = {}
+            if need_scraping:
+                # Chunks of 4; concurrency is bounded by the context pool size
+                chunks = [need_scraping[i:i+4] for i in range(0, len(need_scraping), 4)]
                 
-                logger.info(f"Found {len(fresh_data)} fresh in DB, need to scrape {len(need_scraping)}")
+                # Track scraping progress
+                total_to_scrape = len(need_scraping)
+                scraped_count = 0
                 
-                # Scrape companies that need updating
-                newly_scraped = {}
-                if need_scraping:
-                    chunks = [need_scraping[i:i+4] for i in range(0, len(need_scraping), 4)]
-                    semaphore = asyncio.Semaphore(4)
-                    
-                    # Track scraping progress
-                    total_to_scrape = len(need_scraping)
-                    scraped_count = 0
-                    
-                    async def scrape_batch(batch):
-                        nonlocal scraped_count
-                        async with semaphore:
-                            browser = await playwright.chromium.launch(headless=True)
-                            context = await browser.new_context()
-                            page = await context.new_page()
-                            bot = TracxnBot(playwright, debug=False)
-                            
-                            if not await bot.login():
-                                await browser.close()
-                                return {}
-                            
+                async def scrape_batch(batch):
+                    nonlocal scraped_count
+                    try:
+                        async with context_pool.lease() as bot:
                             batch_results = {}
                             for ref in batch:
                                 try:
                                     # Get company name from tracker
                                     company_name = company_tracker.get(ref, {}).get('name', 'Unknown')
-                                    
+                                
                                     # Send scraping status for this company
                                     await send_status_update(
                                         "fetching_details",
@@ -2301,7 +2019,7 @@ async def scrape_batch_companies_api_with_rank(request: BatchCompaniesAPIWithRan
                                         f"Scraped: {company_name} ({scraped_count + 1}/{total_to_scrape})",
                                         {"company_name": company_name, "scraped_count": scraped_count + 1, "total": total_to_scrape}
                                     )
-                                    
+                                
                                     scraped_data = await bot.scrape_company(ref)
                                     if scraped_data:
                                         batch_results[ref] = {
@@ -2313,96 +2031,98 @@ async def scrape_batch_companies_api_with_rank(request: BatchCompaniesAPIWithRan
                                 except Exception as e:
                                     logger.error(f"Error scraping {ref}: {e}")
                                     scraped_count += 1
-                            
-                            await browser.close()
-                            return batch_results
+                    except SessionUnavailableError as e:
+                        logger.error(f"{e}, skipping batch")
+                        return {}
                     
-                    all_results = await asyncio.gather(*[scrape_batch(chunk) for chunk in chunks])
-                    for batch in all_results:
-                        newly_scraped.update(batch)
-                
-                # Send final scraping complete status
-                await send_status_update(
-                    "fetching_details",
-                    "scraping_complete",
-                    f"Completed scraping: {len(newly_scraped)} new, {len(fresh_data)} from cache",
-                    {"newly_scraped": len(newly_scraped), "from_cache": len(fresh_data)}
-                )
-                
-                logger.info(f"✅ Scraping complete: {len(fresh_data)} from cache, {len(newly_scraped)} newly scraped")
+                    return batch_results
                 
-                # Step 5: Format response
-                # All companies with scores
-                all_companies_response = []
-                for comp in all_companies_with_scores:
-                    all_companies_response.append({
-                        'rank': comp['rank'],
-                        'reference': comp['reference'],
-                        'name': comp['name'],
-                        'description': comp['description'],
-                        'similarity_score': round(comp['similarity_score'], 4),
-                        'tracxn_score': comp['tracxn_score'],
-                        'normalized_tracxn_score': round(comp['normalized_tracxn_score'], 4),
-                        'combined_score': round(comp['combined_score'], 4),
-                        'appearance_count': comp['appearance_count'],
-                        'keywords': comp['keywords']
-                    })
+                all_results = await asyncio.gather(*[scrape_batch(chunk) for chunk in chunks])
+                for batch in all_results:
+                    newly_scraped.update(batch)
+            
+            # Send final scraping complete status
+            await send_status_update(
+                "fetching_details",
+                "scraping_complete",
+                f"Completed scraping: {len(newly_scraped)} new, {len(fresh_data)} from cache",
+                {"newly_scraped": len(newly_scraped), "from_cache": len(fresh_data)}
+            )
+            
+            logger.info(f"✅ Scraping complete: {len(fresh_data)} from cache, {len(newly_scraped)} newly scraped")
+            
+            # Step 5: Format response
+            # All companies with scores
+            all_companies_response = []
+            for comp in all_companies_with_scores:
+                all_companies_response.append({
+                    'rank': comp['rank'],
+                    'reference': comp['reference'],
+                    'name': comp['name'],
+                    'description': comp['description'],
+                    'similarity_score': round(comp['similarity_score'], 4),
+                    'tracxn_score': comp['tracxn_score'],
+                    'normalized_tracxn_score': round(comp['normalized_tracxn_score'], 4),
+                    'combined_score': round(comp['combined_score'], 4),
+                    'appearance_count': comp['appearance_count'],
+                    'keywords': comp['keywords']
+                })
+            
+            # Top companies with full data
+            top_companies_full_data = []
+            for comp in all_companies_with_scores[:request.top_count]:
+                ref = comp['reference']
                 
-                # Top companies with full data
-                top_companies_full_data = []
-                for comp in all_companies_with_scores[:request.top_count]:
-                    ref = comp['reference']
-                    
-                    # Get scraped data
-                    if ref in fresh_data:
-                        company_data = fresh_data[ref]
-                        source = 'database'
-                    elif ref in newly_scraped:
-                        company_data = newly_scraped[ref]['data']
-                        source = 'scraped'
-                    else:
-                        continue
-                    
-                    top_companies_full_data.append({
-                        'rank': comp['rank'],
-                        'reference': ref,
-                        'name': comp['name'],
-                        'similarity_score': round(comp['similarity_score'], 4),
-                        'tracxn_score': comp['tracxn_score'],
-                        'normalized_tracxn_score': round(comp['normalized_tracxn_score'], 4),
-                        'combined_score': round(comp['combined_score'], 4),
-                        'appearance_count': comp['appearance_count'],
-                        'keywords': comp['keywords'],
-                        'full_data': company_data,
-                        'source': source
-                    })
+                # Get scraped data
+                if ref in fresh_data:
+                    company_data = fresh_data[ref]
+                    source = 'database'
+                elif ref in newly_scraped:
+                    company_data = newly_scraped[ref]['data']
+                    source = 'scraped'
+                else:
+                    continue
                 
-                return {
-                    "all_companies": all_companies_response,
-                    "top_companies_full_data": top_companies_full_data,
-                    "metadata": {
-                        "total_keywords_searched": len(request.company_names),
-                        "total_unique_companies": len(company_tracker),
-                        "all_companies_count": len(all_companies_response),
-                        "top_count_requested": request.top_count,
-                        "top_count_returned": len(top_companies_full_data),
-                        "target_description": request.target_description,
-                        "similarity_weight": request.similarity_weight,
-                        "score_weight": request.score_weight,
-                        "tracxn_score_range": {
-                            "min": min_score,
-                            "max": max_score
-                        }
+                top_companies_full_data.append({
+                    'rank': comp['rank'],
+                    'reference': ref,
+                    'name': comp['name'],
+                    'similarity_score': round(comp['similarity_score'], 4),
+                    'tracxn_score': comp['tracxn_score'],
+                    'normalized_tracxn_score': round(comp['normalized_tracxn_score'], 4),
+                    'combined_score': round(comp['combined_score'], 4),
+                    'appearance_count': comp['appearance_count'],
+                    'keywords': comp['keywords'],
+                    'full_data': company_data,
+                    'source': source
+                })
+            
+            return {
+                "all_companies": all_companies_response,
+                "top_companies_full_data": top_companies_full_data,
+                "metadata": {
+                    "total_keywords_searched": len(request.company_names),
+                    "total_unique_companies": len(company_tracker),
+                    "all_companies_count": len(all_companies_response),
+                    "top_count_requested": request.top_count,
+                    "top_count_returned": len(top_companies_full_data),
+                    "target_description": request.target_description,
+                    "similarity_weight": request.similarity_weight,
+                    "score_weight": request.score_weight,
+                    "tracxn_score_range": {
+                        "min": min_score,
+                        "max": max_score
                     }
                 }
-                
-            except Exception as e:
-                logger.error(f"Error in similarity/ranking: {e}")
-                raise HTTPException(
-                    status_code=500,
-                    detail={"error": f"Similarity search failed: {str(e)}"}
-                )
-                
+            }
+            
+        except Exception as e:
+            logger.error(f"Error in similarity/ranking: {e}")
+            raise HTTPException(
+                status_code=500,
+                detail={"error": f"Similarity search failed: {str(e)}"}
+            )
+            
     except HTTPException:
         raise
     except Exception as e:
@@ -2436,7 +2156,12 @@ async def health_check():
         db_test = DatabaseManager()
         if db_test.connect():
             db_test.disconnect()
-            return {"status": "healthy", "database": "connected", "timestamp": datetime.now()}
+            response = {"status": "healthy", "database": "connected", "timestamp": datetime.now()}
+            response["context_pool"] = context_pool.stats()
+            if SIMILARITY_SEARCH_AVAILABLE:
+                response["embedding"] = get_embedding_service().health()
+                response["vector_index"] = company_index.stats()
+            return response
         else:
             return JSONResponse(
                 status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
@@ -19,6 +19,13 @@ TEMPMAIL_TOKEN = os.getenv("TEMPMAIL_TOKEN")
 
 USE_PROXY = False
 
+# Browser context pool: logged-in TracxnBot sessions shared by all scraping requests
+CONTEXT_POOL_SIZE = int(os.getenv("TRACXN_POOL_SIZE", 4))
+SESSION_STATE_DIR = os.getenv("TRACXN_STATE_DIR", os.path.join(os.getcwd(), "session_state"))
+SESSION_CHECK_INTERVAL = float(os.getenv("TRACXN_SESSION_CHECK_INTERVAL", 600))
+SESSION_CHECK_URL = os.getenv("TRACXN_SESSION_CHECK_URL", "https://platform.tracxn.com/a/dashboard")
+LOGIN_MAX_RETRIES = 3
+
 # Database configuration
 DB_CONFIG_HOST = "table-mountain.liara.cloud"
 DB_CONFIG_PORT = 30986
@@ -0,0 +1,215 @@
+"""
+Pool of logged-in TracXN browser contexts.
+
+Logging in to TracXN means a temp-mail signup with captcha solving, so every
+scraping request used to pay a full browser launch plus login per chunk of
+companies. The pool keeps CONTEXT_POOL_SIZE authenticated TracxnBot sessions
+alive for the life of the API process:
+
+- Sessions are restored from saved storage state (survives restarts)
+- A session is health-checked when leased if it has not been checked recently
+- Login only runs when a session has expired or no saved state exists
+"""
+
+import asyncio
+import logging
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional
+
+from playwright.async_api import async_playwright
+
+from config import CONTEXT_POOL_SIZE, SESSION_STATE_DIR, SESSION_CHECK_INTERVAL, LOGIN_MAX_RETRIES
+from tracxn_scrapper import TracxnBot
+
+logger = logging.getLogger(__name__)
+
+
+class SessionUnavailableError(Exception):
+    """Raised when a pooled context cannot be logged in"""
+
+
+class _PooledSession:
+    def __init__(self, slot: int, state_path: str):
+        self.slot = slot
+        self.state_path = state_path
+        self.bot: Optional[TracxnBot] = None
+        self.last_checked = 0.0
+        self.logins = 0
+        self.leases = 0
+
+
+class TracxnContextPool:
+    """
+    Long-lived pool of authenticated TracxnBot contexts.
+
+    Usage:
+        async with get_context_pool().lease() as bot:
+            data = await bot.scrape_company(ref)
+    """
+
+    def __init__(self, size: int = CONTEXT_POOL_SIZE, state_dir: str = SESSION_STATE_DIR,
+                 check_interval: float = SESSION_CHECK_INTERVAL):
+        self.size = size
+        self.state_dir = state_dir
+        self.check_interval = check_interval
+        self.playwright = None
+        self._sessions: List[_PooledSession] = []
+        self._idle: asyncio.Queue = asyncio.Queue()
+        self._start_lock = asyncio.Lock()
+        self._warm_task: Optional[asyncio.Task] = None
+        self._closed = False
+
+    async def start(self):
+        """Start playwright and register the pool slots (idempotent)."""
+        async with self._start_lock:
+            if self.playwright:
+                return
+            os.makedirs(self.state_dir, exist_ok=True)
+            self.playwright = await async_playwright().start()
+            self._closed = False
+            for slot in range(self.size):
+                session = _PooledSession(slot, os.path.join(self.state_dir, f"state_{slot}.json"))
+                self._sessions.append(session)
+                self._idle.put_nowait(session)
+            logger.info(f"TracXN context pool started with {self.size} slots")
+
+    async def warm_up(self):
+        """Restore or log in every idle slot so the first requests don't pay for it."""
+        await self.start()
+
+        async def _warm(session: _PooledSession):
+            try:
+                await self._ensure_session(session)
+            except Exception as e:
+                logger.error(f"Pool slot {session.slot} failed to warm up: {e}")
+
+        sessions = []
+        while not self._idle.empty():
+            sessions.append(self._idle.get_nowait())
+        try:
+            await asyncio.gather(*[_warm(session) for session in sessions])
+        finally:
+            for session in sessions:
+                self._idle.put_nowait(session)
+
+    def start_warm_up(self):
+        """Warm the pool in the background (used at API startup)."""
+        self._warm_task = asyncio.create_task(self.warm_up())
+
+    async def _ensure_session(self, session: _PooledSession):
+        """Make sure the slot holds a logged-in bot, re-logging in only when needed."""
+        now = time.time()
+        if session.bot is not None:
+            if now - session.last_checked < self.check_interval:
+                return
+            if await session.bot.is_session_valid():
+                session.last_checked = now
+                return
+            logger.info(f"Pool slot {session.slot} session expired, logging in again")
+            await self._discard_bot(session)
+
+        # Reuse the saved storage state from an earlier login/process if it is still valid
+        bot = TracxnBot(self.playwright, debug=False)
+        if await bot.restore_session(session.state_path):
+            logger.info(f"Pool slot {session.slot} restored saved session")
+            session.bot = bot
+            session.last_checked = time.time()
+            return
+
+        for attempt in range(LOGIN_MAX_RETRIES):
+            bot = TracxnBot(self.playwright, debug=False)
+            try:
+                if await bot.login():
+                    await bot.save_session(session.state_path)
+                    session.bot = bot
+                    session.last_checked = time.time()
+                    session.logins += 1
+                    logger.info(f"Pool slot {session.slot} logged in on attempt {attempt + 1}")
+                    return
+                logger.warning(f"Pool slot {session.slot} login failed, attempt {attempt + 1}/{LOGIN_MAX_RETRIES}")
+            except Exception as e:
+                logger.error(f"Pool slot {session.slot} error during login attempt {attempt + 1}: {e}")
+            await bot.close()
+            if attempt + 1 < LOGIN_MAX_RETRIES:
+                await asyncio.sleep(5)
+
+        raise SessionUnavailableError(f"Failed to login after {LOGIN_MAX_RETRIES} attempts")
+
+    async def _discard_bot(self, session: _PooledSession):
+        if session.bot:
+            try:
+                await session.bot.close()
+            except Exception as e:
+                logger.error(f"Error closing pooled bot: {e}")
+        session.bot = None
+        session.last_checked = 0.0
+
+    @asynccontextmanager
+    async def lease(self):
+        """
+        Lease a logged-in TracxnBot for the duration of the block.
+
+        Waits for an idle slot; concurrency is therefore bounded by the pool size.
+        Raises SessionUnavailableError if the slot cannot be logged in.
+        """
+        if self._closed:
+            raise SessionUnavailableError("Context pool is closed")
+        await self.start()
+        session = await self._idle.get()
+        try:
+            await self._ensure_session(session)
+            session.leases += 1
+            try:
+                yield session.bot
+            except Exception:
+                # The page may be left mid-navigation or logged out; check it on next lease
+                session.last_checked = 0.0
+                raise
+        finally:
+            if self._closed:
+                await self._discard_bot(session)
+            else:
+                self._idle.put_nowait(session)
+
+    def stats(self) -> Dict:
+        return {
+            "size": self.size,
+            "idle": self._idle.qsize(),
+            "logged_in": sum(1 for s in self._sessions if s.bot is not None),
+            "logins": sum(s.logins for s in self._sessions),
+            "leases": sum(s.leases for s in self._sessions),
+        }
+
+    async def close(self):
+        """Close every pooled browser (storage state stays on disk for the next start)."""
+        self._closed = True
+        if self._warm_task and not self._warm_task.done():
+            self._warm_task.cancel()
+        for session in self._sessions:
+            await self._discard_bot(session)
+        if self.playwright:
+            await self.playwright.stop()
+            self.playwright = None
+        logger.info("TracXN context pool closed")
+
+
+# Global context pool instance
+_context_pool = None
+
+
+def get_context_pool() -> TracxnContextPool:
+    """Get or create the global context pool (browsers start on first use/warm-up)."""
+    global _context_pool
+    if _context_pool is None:
+        _context_pool = TracxnContextPool()
+    return _context_pool
+
+
+async def close_context_pool():
+    """Close the global context pool."""
+    global _context_pool
+    if _context_pool:
+        await _context_pool.close()
+        _context_pool = None
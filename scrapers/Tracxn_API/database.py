@@ -29,6 +29,8 @@ class DatabaseManager:
     def __init__(self):
         self.connection = None
         self._connection_params = None
+        # Callbacks invoked with (company_reference, data) after every successful save
+        self.save_listeners = []
         
     def connect(self) -> bool:
         """Establish connection to MySQL database"""
@@ -237,6 +239,12 @@ class DatabaseManager:
         finally:
             if cursor:
                 cursor.close()
+        
+        for callback in self.save_listeners:
+            try:
+                callback(company_reference, data)
+            except Exception as e:
+                logger.warning(f"Save listener failed for {company_reference}: {e}")
     
     def get_fresh_companies(self, company_references: List[str], freshness_days: int = 180) -> Dict[str, Any]:
         """Get fresh companies from database and return which ones need scraping"""
@@ -12,7 +12,7 @@ from datetime import datetime
 from dotenv import load_dotenv
 from playwright.async_api import Playwright, async_playwright, TimeoutError as PlaywrightTimeoutError
 from twocaptcha import TwoCaptcha, ApiException
-from config import DEBUG_MODE, APIKEY_2CAPTCHA, TARGET_URL, SLEEP_DELAY, PROXY_SERVER, PROXY_USER, PROXY_PASS, USE_PROXY
+from config import DEBUG_MODE, APIKEY_2CAPTCHA, TARGET_URL, SESSION_CHECK_URL, SLEEP_DELAY, PROXY_SERVER, PROXY_USER, PROXY_PASS, USE_PROXY
 from tempmailcore import EmailInbox
 import uuid
 from helpers.index import calculate_captcha, send_request, test_request
@@ -28,6 +28,7 @@ class TracxnBot:
         self.debug = debug
         self.playwright = playwright
         self.browser = None
+        self.context = None
         self.page = None
         self.image_chache_path = f"images_cache/downloaded_image_{uuid.uuid4().hex}.png"
         self.audio_cache_path = f"audio_cache/downloaded_audio_{uuid.uuid4().hex}.mp3"
@@ -598,25 +599,27 @@ class TracxnBot:
             self.log.warning("search failed.")
         return list_of_companies
     
+    def _launch_options(self):
+        """Browser launch options (with proxy when configured)"""
+        launch_options = {"headless": False, "args": ['--password-store=basic']}
+        
+        # Add proxy configuration if available
+        if USE_PROXY:
+            self.log.info(f"Using proxy: {PROXY_SERVER}")
+            launch_options["proxy"] = {
+                "server": f"http://{PROXY_SERVER}",
+                "username": PROXY_USER,
+                "password": PROXY_PASS
+            }
+        return launch_options
+
     async def open_target_page(self, with_init = True):
         """Initialize browser and navigate to target page"""
         try:
             self.log.info("Launching browser...")
             
-            # Configure browser launch options
-            launch_options = {"headless": False, "args": ['--password-store=basic']}
-            
-            # Add proxy configuration if available
-            if USE_PROXY:
-                self.log.info(f"Using proxy: {PROXY_SERVER}")
-                launch_options["proxy"] = {
-                    "server": f"http://{PROXY_SERVER}",
-                    "username": PROXY_USER,
-                    "password": PROXY_PASS
-                }
-            
             if with_init:
-                self.browser = await self.playwright.chromium.launch(**launch_options)
+                self.browser = await self.playwright.chromium.launch(**self._launch_options())
                 self.context = await self.browser.new_context()
                 self.page = await self.context.new_page()
                 self.log.info(f"Navigating to {self.target_url}")
@@ -640,6 +643,50 @@ class TracxnBot:
             self.log.error(f"Unexpected error while opening target page: {e}")
             return False
 
+    async def restore_session(self, state_path: str):
+        """
+        Open a browser context from a saved storage state (cookies + local storage).
+
+        Returns:
+            True if the restored session is still logged in
+        """
+        if not os.path.exists(state_path):
+            return False
+        try:
+            self.log.info(f"Restoring session from {state_path}")
+            self.browser = await self.playwright.chromium.launch(**self._launch_options())
+            self.context = await self.browser.new_context(storage_state=state_path)
+            self.page = await self.context.new_page()
+        except Exception as e:
+            self.log.error(f"Error restoring session: {e}")
+            await self.close()
+            return False
+        if await self.is_session_valid():
+            return True
+        await self.close()
+        return False
+
+    async def save_session(self, state_path: str):
+        """Persist the logged-in storage state so it can be restored after a restart"""
+        try:
+            os.makedirs(os.path.dirname(state_path) or ".", exist_ok=True)
+            await self.context.storage_state(path=state_path)
+            self.log.info(f"Session saved to {state_path}")
+        except Exception as e:
+            self.log.error(f"Error saving session: {e}")
+
+    async def is_session_valid(self):
+        """Check that the context is still logged in to the platform"""
+        if not self.browser or not self.page or self.page.is_closed():
+            return False
+        try:
+            await self.page.goto(SESSION_CHECK_URL, wait_until="domcontentloaded", timeout=60_000)
+            current_url = self.page.url
+            return 'platform.tracxn.com' in current_url and 'login' not in current_url.lower()
+        except Exception as e:
+            self.log.warning(f"Session check failed: {e}")
+            return False
+
     async def close(self):
         """Close browser safely"""
         if os.path.exists(self.image_chache_path):
@@ -662,6 +709,7 @@ class TracxnBot:
             self.log.error(f"Error closing browser: {e}")
         finally:
             self.browser = None
+            self.context = None
             self.page = None
 
     async def get_new_email(self):
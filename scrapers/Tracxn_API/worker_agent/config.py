@@ -18,6 +18,10 @@ API_TYPE = os.getenv("API_TYPE", "tracxn")
 # Local API endpoint (the actual scraper API this agent wraps)
 LOCAL_API_URL = os.getenv("LOCAL_API_URL", "http://localhost:8008")
 
+# Concurrent task slots advertised to the orchestrator; defaults to the
+# logged-in sessions in the local API's context pool
+WORKER_CAPACITY = int(os.getenv("WORKER_CAPACITY", os.getenv("TRACXN_POOL_SIZE", "4")))
+
 # Connection settings
 HEARTBEAT_INTERVAL = int(os.getenv("HEARTBEAT_INTERVAL", "10"))  # seconds
 RECONNECT_DELAY = int(os.getenv("RECONNECT_DELAY", "5"))  # seconds
@@ -0,0 +1,174 @@
+"""
+Persistent description-embedding cache for the scraper embedding service.
+
+Vectors are stored as float32 rows in a memory-mapped `.npy` file; a JSON
+index maps a content hash (model + text) to its row and last-use time. Only
+new or changed descriptions miss the cache, so re-ranking the same companies
+across reports skips the encoder entirely.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+CACHE_DIR = os.getenv("EMBEDDING_CACHE_DIR", os.path.join(os.getcwd(), "embedding_cache"))
+CACHE_CAPACITY = int(os.getenv("EMBEDDING_CACHE_CAPACITY", 100000))
+# Fraction of capacity kept (most recently used first) when the store is full
+COMPACT_RATIO = 0.8
+# Persist the index after this many inserted rows
+INDEX_FLUSH_EVERY = 256
+
+
+def content_hash(model_name: str, text: str) -> str:
+    """Stable cache key for a text embedded with a given model."""
+    return hashlib.sha1(f"{model_name}\x00{text}".encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Content-hash keyed store of normalized embedding vectors.
+
+    - Rows live in `<model>.npy` (memory-mapped, fixed capacity)
+    - `<model>.index.json` maps hash -> [row, last_used]
+    - When full, the least recently used rows are dropped and the rest compacted
+
+    Methods block on file I/O (index and memmap flushes), so async callers run
+    them in an executor; EmbeddingService uses a dedicated cache thread.
+    """
+
+    def __init__(self, model_name: str, dimension: int, cache_dir: str = CACHE_DIR,
+                 capacity: int = CACHE_CAPACITY):
+        self.model_name = model_name
+        self.dimension = dimension
+        self.capacity = capacity
+        safe_name = model_name.replace("/", "_")
+        os.makedirs(cache_dir, exist_ok=True)
+        self.vectors_path = os.path.join(cache_dir, f"{safe_name}.npy")
+        self.index_path = os.path.join(cache_dir, f"{safe_name}.index.json")
+
+        self._lock = threading.Lock()
+        self._index: Dict[str, List] = {}
+        self._size = 0
+        self._unflushed = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._open()
+
+    def _open(self):
+        """Open (or create) the vector file and load the index."""
+        if os.path.exists(self.vectors_path) and os.path.exists(self.index_path):
+            try:
+                with open(self.index_path, "r", encoding="utf-8") as f:
+                    meta = json.load(f)
+                vectors = np.load(self.vectors_path, mmap_mode="r+")
+                if (meta.get("dimension") == self.dimension
+                        and vectors.shape == (self.capacity, self.dimension)):
+                    self._vectors = vectors
+                    self._index = meta.get("rows", {})
+                    self._size = meta.get("size", len(self._index))
+                    print(f"✅ Embedding cache loaded: {self._size} vectors from {self.vectors_path}")
+                    return
+                print("⚠️ Embedding cache shape changed, rebuilding")
+            except Exception as e:
+                print(f"⚠️ Embedding cache unreadable ({e}), rebuilding")
+
+        self._vectors = np.lib.format.open_memmap(
+            self.vectors_path, mode="w+", dtype=np.float32, shape=(self.capacity, self.dimension)
+        )
+        self._index = {}
+        self._size = 0
+        self._flush_index()
+
+    def _flush_index(self):
+        tmp_path = f"{self.index_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "model": self.model_name,
+                "dimension": self.dimension,
+                "size": self._size,
+                "rows": self._index,
+            }, f)
+        self._vectors.flush()
+        os.replace(tmp_path, self.index_path)
+        self._unflushed = 0
+
+    def lookup(self, keys: List[str]) -> Tuple[Dict[int, np.ndarray], List[int]]:
+        """
+        Look up keys in the cache.
+
+        Returns:
+            (found, missing) where `found` maps the position in `keys` to its vector
+            and `missing` lists the positions that need encoding.
+        """
+        found, missing = {}, []
+        now = time.time()
+        with self._lock:
+            for i, key in enumerate(keys):
+                entry = self._index.get(key)
+                if entry is None:
+                    missing.append(i)
+                    continue
+                entry[1] = now
+                found[i] = np.array(self._vectors[entry[0]])
+            self.hits += len(found)
+            self.misses += len(missing)
+        return found, missing
+
+    def store(self, keys: List[str], vectors: np.ndarray):
+        """Insert vectors for keys not already cached, compacting when full."""
+        now = time.time()
+        with self._lock:
+            new, seen = [], set()
+            for key, vector in zip(keys, vectors):
+                if key not in self._index and key not in seen:
+                    seen.add(key)
+                    new.append((key, vector))
+            new = new[:self.capacity]
+            if not new:
+                return
+            if self._size + len(new) > self.capacity:
+                self._compact(len(new))
+            for key, vector in new:
+                self._vectors[self._size] = vector
+                self._index[key] = [self._size, now]
+                self._size += 1
+            self._unflushed += len(new)
+            if self._unflushed >= INDEX_FLUSH_EVERY:
+                self._flush_index()
+
+    def _compact(self, needed: int):
+        """Drop least recently used rows and move the survivors to the front."""
+        keep = max(0, min(int(self.capacity * COMPACT_RATIO), self.capacity - needed))
+        entries = sorted(self._index.items(), key=lambda kv: kv[1][1], reverse=True)[:keep]
+        if entries:
+            rows = np.array(self._vectors[[entry[0] for _, entry in entries]])
+            self._vectors[:len(entries)] = rows
+        self.evictions += self._size - len(entries)
+        self._index = {key: [i, entry[1]] for i, (key, entry) in enumerate(entries)}
+        self._size = len(entries)
+        print(f"🗜️ Embedding cache compacted to {self._size} vectors")
+        self._flush_index()
+
+    def flush(self):
+        with self._lock:
+            if self._unflushed:
+                self._flush_index()
+
+    def stats(self) -> Dict:
+        total = self.hits + self.misses
+        return {
+            "size": self._size,
+            "capacity": self.capacity,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else None,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,262 @@
+"""
+Resident embedding service shared by the Crunchbase and Tracxn scrapers.
+
+Loads the sentence-transformer model once per process (at FastAPI lifespan
+startup) and runs batched encoding on a dedicated worker thread so the event
+loop is never blocked by model inference. Embedding cache lookups, inserts and
+index flushes (file I/O) run on a separate single cache thread.
+"""
+
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from embedding_cache import EmbeddingCache, content_hash
+
+DEFAULT_MODEL_NAME = os.getenv("EMBEDDING_MODEL_NAME", "all-MiniLM-L6-v2")
+ENCODE_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", 32))
+ENCODE_WORKERS = int(os.getenv("EMBEDDING_WORKERS", 1))
+CACHE_ENABLED = os.getenv("EMBEDDING_CACHE_ENABLED", "true").lower() == "true"
+
+
+def _get_model_path(model_name: str) -> str:
+    """Get the local model path if available, otherwise return model name for download."""
+    candidates = [
+        os.getenv("EMBEDDING_MODEL_PATH"),
+        f"/app/models/{model_name}",  # Docker container path
+        os.path.join(os.getcwd(), "models", model_name),  # Scraper working directory
+    ]
+    for path in candidates:
+        if path and os.path.exists(path):
+            print(f"Using local model from: {path}")
+            return path
+    # Fall back to downloading from HuggingFace
+    print(f"Local model not found, will download: {model_name}")
+    return model_name
+
+
+def company_text(company: Dict) -> str:
+    """
+    Pick the text used to embed a company.
+
+    Handles the Crunchbase (description/about/combined_text) and Tracxn
+    (description/detailedDescription) field names, falling back to the
+    company name and industry when no description is present.
+    """
+    desc = (
+        company.get('description')
+        or company.get('detailedDescription')
+        or company.get('about')
+        or company.get('About')
+        or company.get('combined_text', '')
+    )
+    if not desc:
+        company_name = company.get('company_name') or company.get('Company Name') or company.get('name', 'Unknown')
+        industry = company.get('industry') or company.get('Company Type', '')
+        desc = f"{company_name}. {industry}" if industry else f"{company_name}"
+    return desc
+
+
+class EmbeddingService:
+    """
+    Process-wide embedding engine.
+
+    - Loads the model once and keeps it resident
+    - Encodes on a dedicated thread pool (the model is not shared across threads
+      concurrently unless EMBEDDING_WORKERS > 1)
+    - Returns L2-normalized float32 vectors so cosine similarity is a dot product
+    - Reuses vectors from the persistent EmbeddingCache; only unseen texts are encoded.
+      All cache calls run on one cache thread, so they stay ordered and off the loop
+    """
+
+    def __init__(self, model_name: str = DEFAULT_MODEL_NAME, batch_size: int = ENCODE_BATCH_SIZE,
+                 max_workers: int = ENCODE_WORKERS, cache_enabled: bool = CACHE_ENABLED):
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.model = None
+        self.dimension: Optional[int] = None
+        self.cache_enabled = cache_enabled
+        self.cache: Optional[EmbeddingCache] = None
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="embedding")
+        self._cache_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="embedding-cache")
+        self._load_lock = asyncio.Lock()
+        self._loaded_at: Optional[float] = None
+        self._encode_calls = 0
+        self._texts_encoded = 0
+        self._last_error: Optional[str] = None
+
+    @property
+    def is_ready(self) -> bool:
+        return self.model is not None
+
+    def _load_model(self):
+        from sentence_transformers import SentenceTransformer
+
+        model_path = _get_model_path(self.model_name)
+        print(f"Loading embedding model: {model_path}")
+        model = SentenceTransformer(model_path)
+        # Warm-up: first encode triggers lazy allocations inside torch/tokenizers
+        warm = model.encode(["warm-up"], batch_size=1, normalize_embeddings=True)
+        self.dimension = int(warm.shape[1])
+        return model
+
+    async def start(self):
+        """Load and warm up the model on the worker thread (idempotent)."""
+        async with self._load_lock:
+            if self.model is not None:
+                return
+            loop = asyncio.get_running_loop()
+            start = time.time()
+            try:
+                self.model = await loop.run_in_executor(self._executor, self._load_model)
+                if self.cache_enabled:
+                    self.cache = await loop.run_in_executor(
+                        self._cache_executor, EmbeddingCache, self.model_name, self.dimension
+                    )
+            except Exception as e:
+                self._last_error = f"{type(e).__name__}: {e}"
+                raise
+            self._loaded_at = time.time()
+            print(f"✅ Embedding model ready in {self._loaded_at - start:.2f}s (dim={self.dimension})")
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        vectors = self.model.encode(
+            texts,
+            batch_size=self.batch_size,
+            show_progress_bar=False,
+            normalize_embeddings=True,
+        )
+        return np.asarray(vectors, dtype=np.float32)
+
+    async def embed(self, texts: List[str]) -> np.ndarray:
+        """
+        Encode texts into normalized float32 vectors of shape (len(texts), dim).
+
+        Cached vectors are reused; only texts missing from the cache are encoded.
+        """
+        if self.model is None:
+            await self.start()
+        if not texts:
+            return np.zeros((0, self.dimension or 0), dtype=np.float32)
+
+        texts = list(texts)
+        if self.cache is None:
+            return await self._encode_async(texts)
+
+        loop = asyncio.get_running_loop()
+        keys = [content_hash(self.model_name, text) for text in texts]
+        found, missing = await loop.run_in_executor(self._cache_executor, self.cache.lookup, keys)
+        vectors = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        for i, vector in found.items():
+            vectors[i] = vector
+        if missing:
+            encoded = await self._encode_async([texts[i] for i in missing])
+            vectors[missing] = encoded
+            # Not awaited: the insert (and any index flush it triggers) finishes
+            # on the cache thread before later lookups, which queue behind it
+            stored = loop.run_in_executor(
+                self._cache_executor, self.cache.store, [keys[i] for i in missing], encoded
+            )
+            stored.add_done_callback(self._on_cache_stored)
+        return vectors
+
+    def _on_cache_stored(self, future: asyncio.Future):
+        if not future.cancelled() and future.exception():
+            error = future.exception()
+            self._last_error = f"{type(error).__name__}: {error}"
+            print(f"⚠️ Embedding cache insert failed: {self._last_error}")
+
+    async def _encode_async(self, texts: List[str]) -> np.ndarray:
+        loop = asyncio.get_running_loop()
+        try:
+            vectors = await loop.run_in_executor(self._executor, self._encode, texts)
+        except Exception as e:
+            self._last_error = f"{type(e).__name__}: {e}"
+            raise
+        self._encode_calls += 1
+        self._texts_encoded += len(texts)
+        return vectors
+
+    async def rank(
+        self,
+        target_description: str,
+        candidates: List[Dict],
+        top_k: Optional[int] = None,
+        text_getter: Callable[[Dict], str] = company_text,
+    ) -> List[Dict]:
+        """
+        Rank candidate companies by cosine similarity to a target description.
+
+        Args:
+            target_description: The target description to compare against
+            candidates: List of company dicts
+            top_k: Number of top results to return (None returns all)
+            text_getter: Function extracting the text to embed from a company dict
+
+        Returns:
+            Copies of the candidates sorted by similarity (highest first), each with
+            `similarity_score` (cosine similarity) and `rank` (1-indexed) added.
+        """
+        if not candidates:
+            return []
+
+        texts = [text_getter(company) for company in candidates]
+        vectors = await self.embed([target_description] + texts)
+        similarities = vectors[1:] @ vectors[0]
+
+        order = np.argsort(-similarities, kind="stable")
+        if top_k is not None:
+            order = order[:top_k]
+
+        results = []
+        for position, i in enumerate(order, 1):
+            company_result = dict(candidates[i])
+            company_result['similarity_score'] = float(similarities[i])
+            company_result['rank'] = position
+            results.append(company_result)
+        return results
+
+    def health(self) -> Dict:
+        """Health probe payload for the scraper /health endpoints."""
+        return {
+            "ready": self.is_ready,
+            "model": self.model_name,
+            "dimension": self.dimension,
+            "loaded_at": self._loaded_at,
+            "encode_calls": self._encode_calls,
+            "texts_encoded": self._texts_encoded,
+            "last_error": self._last_error,
+            "cache": self.cache.stats() if self.cache else None,
+        }
+
+    def close(self):
+        # Let queued cache inserts land before the final flush
+        self._cache_executor.shutdown(wait=True)
+        if self.cache:
+            self.cache.flush()
+        self._executor.shutdown(wait=False)
+        self.model = None
+
+
+# Global embedding service instance
+_embedding_service = None
+
+
+def get_embedding_service() -> EmbeddingService:
+    """Get or create the global embedding service instance (model loads on start())."""
+    global _embedding_service
+    if _embedding_service is None:
+        _embedding_service = EmbeddingService()
+    return _embedding_service
+
+
+def close_embedding_service():
+    """Close the global embedding service."""
+    global _embedding_service
+    if _embedding_service:
+        _embedding_service.close()
+        _embedding_service = None
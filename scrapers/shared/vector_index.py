@@ -0,0 +1,269 @@
+"""
+Local approximate-nearest-neighbour index over the scraped company corpus.
+
+Each scraper keeps one `CompanyVectorIndex` of normalized MiniLM vectors for
+every company stored in its database. The index is built at startup, kept up
+to date by the database save hooks, and persisted next to the embedding cache
+so restarts only re-sync changed rows.
+
+Uses HNSW (hnswlib) when installed and falls back to an exact dot-product
+scan otherwise.
+"""
+
+import asyncio
+import json
+import os
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from embedding_cache import CACHE_DIR, content_hash
+from embedding_service import get_embedding_service
+
+try:
+    import hnswlib
+    HNSW_AVAILABLE = True
+except ImportError:
+    HNSW_AVAILABLE = False
+    print("Warning: hnswlib not available. Vector index will use exact search.")
+
+INDEX_INITIAL_CAPACITY = int(os.getenv("VECTOR_INDEX_CAPACITY", 20000))
+HNSW_M = int(os.getenv("VECTOR_INDEX_M", 16))
+HNSW_EF_CONSTRUCTION = int(os.getenv("VECTOR_INDEX_EF_CONSTRUCTION", 200))
+HNSW_EF_SEARCH = int(os.getenv("VECTOR_INDEX_EF_SEARCH", 64))
+# Persist the index after this many incremental inserts
+SAVE_EVERY = 50
+
+
+class CompanyVectorIndex:
+    """
+    ANN index keyed by company URL (Crunchbase) or reference (Tracxn).
+
+    - `start()` loads the persisted index and re-syncs it against the full corpus,
+      skipping rows whose text is unchanged
+    - `schedule_upsert()` is safe to call from synchronous save hooks
+    - `search()` returns the top-k companies for a target description
+    """
+
+    def __init__(self, name: str, index_dir: str = CACHE_DIR):
+        self.name = name
+        os.makedirs(index_dir, exist_ok=True)
+        self.index_path = os.path.join(index_dir, f"{name}.hnsw")
+        self.meta_path = os.path.join(index_dir, f"{name}.index-meta.json")
+
+        self.dimension: Optional[int] = None
+        self._index = None          # hnswlib.Index when HNSW_AVAILABLE
+        self._matrix = None         # exact-search fallback, rows by label
+        self._capacity = 0
+        self._labels: Dict[str, int] = {}
+        self._keys: List[str] = []
+        self._entries: Dict[str, Dict] = {}
+        self._lock = asyncio.Lock()
+        self._unsaved = 0
+        self._pending: set = set()
+
+        self.ready = False
+        self.last_sync: Optional[float] = None
+
+    # ------------------------------------------------------------------
+    # Storage
+    # ------------------------------------------------------------------
+
+    def _init_storage(self, capacity: int):
+        self._capacity = capacity
+        if HNSW_AVAILABLE:
+            self._index = hnswlib.Index(space="ip", dim=self.dimension)
+            self._index.init_index(max_elements=capacity, M=HNSW_M, ef_construction=HNSW_EF_CONSTRUCTION)
+            self._index.set_ef(HNSW_EF_SEARCH)
+        else:
+            self._matrix = np.zeros((capacity, self.dimension), dtype=np.float32)
+
+    def _grow(self, needed: int):
+        if needed <= self._capacity:
+            return
+        new_capacity = max(needed, self._capacity * 2)
+        if HNSW_AVAILABLE:
+            self._index.resize_index(new_capacity)
+        else:
+            matrix = np.zeros((new_capacity, self.dimension), dtype=np.float32)
+            matrix[:len(self._keys)] = self._matrix[:len(self._keys)]
+            self._matrix = matrix
+        self._capacity = new_capacity
+
+    def _load(self) -> bool:
+        """Load a persisted index; returns False if it is missing or stale."""
+        if not (HNSW_AVAILABLE and os.path.exists(self.index_path) and os.path.exists(self.meta_path)):
+            return False
+        try:
+            with open(self.meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            if meta.get("dimension") != self.dimension:
+                return False
+            self._capacity = max(meta["capacity"], len(meta["keys"]))
+            self._index = hnswlib.Index(space="ip", dim=self.dimension)
+            self._index.load_index(self.index_path, max_elements=self._capacity)
+            self._index.set_ef(HNSW_EF_SEARCH)
+            self._keys = meta["keys"]
+            self._labels = {key: label for label, key in enumerate(self._keys)}
+            self._entries = meta["entries"]
+            print(f"✅ Vector index '{self.name}' loaded: {len(self._keys)} companies")
+            return True
+        except Exception as e:
+            print(f"⚠️ Vector index '{self.name}' unreadable ({e}), rebuilding")
+            return False
+
+    def save(self):
+        """Persist the HNSW graph and key metadata (exact-search mode is rebuilt on start)."""
+        if not HNSW_AVAILABLE or self._index is None:
+            return
+        self._index.save_index(self.index_path)
+        tmp_path = f"{self.meta_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "dimension": self.dimension,
+                "capacity": self._capacity,
+                "keys": self._keys,
+                "entries": self._entries,
+            }, f)
+        os.replace(tmp_path, self.meta_path)
+        self._unsaved = 0
+
+    # ------------------------------------------------------------------
+    # Indexing
+    # ------------------------------------------------------------------
+
+    async def start(self, corpus_loader: Callable[[], Iterable[Tuple[str, str, Dict]]]):
+        """
+        Load the persisted index and sync it against the database corpus.
+
+        Args:
+            corpus_loader: Blocking callable returning (key, text, metadata) tuples
+                           for every stored company; run in a worker thread.
+        """
+        service = get_embedding_service()
+        await service.start()
+        self.dimension = service.dimension
+        if not self._load():
+            self._init_storage(INDEX_INITIAL_CAPACITY)
+
+        start = time.time()
+        items = await asyncio.to_thread(lambda: list(corpus_loader()))
+        await self.upsert_many(items)
+        self.save()
+        self.ready = True
+        self.last_sync = time.time()
+        print(f"✅ Vector index '{self.name}' synced: {len(self._keys)} companies in {self.last_sync - start:.2f}s")
+
+    async def upsert_many(self, items: List[Tuple[str, str, Dict]]):
+        """Insert or update companies; rows whose text is unchanged are skipped."""
+        changed = []
+        for key, text, metadata in items:
+            if not key or not text:
+                continue
+            text_hash = content_hash(self.name, text)
+            entry = self._entries.get(key)
+            if entry and entry.get("hash") == text_hash:
+                entry.update(metadata)
+                continue
+            changed.append((key, text, text_hash, metadata))
+        if not changed:
+            return
+
+        vectors = await get_embedding_service().embed([text for _, text, _, _ in changed])
+        async with self._lock:
+            self._grow(len(self._keys) + len(changed))
+            labels = []
+            for key, _, text_hash, metadata in changed:
+                label = self._labels.get(key)
+                if label is None:
+                    label = len(self._keys)
+                    self._labels[key] = label
+                    self._keys.append(key)
+                elif HNSW_AVAILABLE and key not in self._entries:
+                    # Previously removed company coming back
+                    self._index.unmark_deleted(label)
+                labels.append(label)
+                self._entries[key] = {**metadata, "hash": text_hash}
+            if HNSW_AVAILABLE:
+                self._index.add_items(vectors, np.asarray(labels))
+            else:
+                self._matrix[labels] = vectors
+            self._unsaved += len(changed)
+            if self._unsaved >= SAVE_EVERY:
+                self.save()
+
+    def schedule_upsert(self, key: str, text: str, metadata: Dict):
+        """
+        Fire-and-forget insert for database save hooks.
+
+        Save functions are synchronous but always run inside the API's event loop,
+        so the embedding work is scheduled as a background task.
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        task = loop.create_task(self.upsert_many([(key, text, metadata)]))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    def keys(self, **match) -> List[str]:
+        """Keys of indexed companies whose metadata matches all given fields."""
+        return [key for key, entry in self._entries.items()
+                if all(entry.get(field) == value for field, value in match.items())]
+
+    def remove(self, keys: Iterable[str]):
+        """Drop deleted companies from search results."""
+        for key in list(keys):
+            if self._entries.pop(key, None) is None:
+                continue
+            label = self._labels[key]
+            if HNSW_AVAILABLE:
+                self._index.mark_deleted(label)
+            else:
+                self._matrix[label] = 0
+            self._unsaved += 1
+
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
+
+    async def search(self, target_description: str, top_k: int = 20) -> List[Dict]:
+        """
+        Return the top_k stored companies most similar to a target description.
+
+        Each result carries the stored metadata plus `key`, `similarity_score`
+        and `rank` (1-indexed).
+        """
+        if not self._entries:
+            return []
+        top_k = min(top_k, len(self._entries))
+
+        query = (await get_embedding_service().embed([target_description]))[0]
+        if HNSW_AVAILABLE:
+            self._index.set_ef(max(HNSW_EF_SEARCH, top_k))
+            labels, distances = self._index.knn_query(query, k=top_k)
+            # "ip" space returns 1 - dot product
+            hits = [(int(label), 1.0 - float(dist)) for label, dist in zip(labels[0], distances[0])]
+        else:
+            scores = self._matrix[:len(self._keys)] @ query
+            order = np.argsort(-scores)
+            hits = [(int(label), float(scores[label])) for label in order
+                    if self._keys[label] in self._entries][:top_k]
+
+        results = []
+        for position, (label, score) in enumerate(hits, 1):
+            key = self._keys[label]
+            entry = {k: v for k, v in self._entries.get(key, {}).items() if k != "hash"}
+            results.append({**entry, "key": key, "similarity_score": round(score, 4), "rank": position})
+        return results
+
+    def stats(self) -> Dict:
+        return {
+            "ready": self.ready,
+            "backend": "hnsw" if HNSW_AVAILABLE else "exact",
+            "size": len(self._entries),
+            "capacity": self._capacity,
+            "last_sync": self.last_sync,
+        }
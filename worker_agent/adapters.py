@@ -73,6 +73,7 @@ class CrunchbaseAdapter(BaseAPIAdapter):
     
     ENDPOINTS = {
         "search_with_rank": "/search/crunchbase/top-similar-with-rank",
+        "collect_with_rank": "/search/crunchbase/collect-with-rank",  # Scatter sub-task (keyword collection only)
         "search_similar": "/search/crunchbase/top-similar",
         "search_similar_full": "/search/crunchbase/top-similar-full",
         "search_batch": "/search/crunchbase/batch",
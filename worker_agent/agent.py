@@ -27,12 +27,12 @@ class WorkerAgent:
     
     Lifecycle:
     1. Connect to orchestrator via WebSocket
-    2. Authenticate with token
+    2. Authenticate with token, advertising WORKER_CAPACITY slots
     3. Wait for task assignment
-    4. Execute task by calling local API
-    5. Stream status updates to orchestrator
+    4. Execute tasks (up to capacity concurrently) by calling local API
+    5. Stream per-task status updates to orchestrator
     6. Report completion/failure
-    7. Go back to idle, repeat
+    7. Free the slot, repeat
     """
     
     def __init__(self):
@@ -43,7 +43,10 @@ class WorkerAgent:
         
         self.websocket: Optional[websockets.WebSocketClientProtocol] = None
         self.worker_id: Optional[str] = None
-        self.current_task_id: Optional[str] = None
+        self.capacity = max(config.WORKER_CAPACITY, 1)
+        
+        # task_id -> running execution
+        self._tasks: Dict[str, asyncio.Task] = {}
         
         self._running = False
         self._reconnect_attempts = 0
@@ -72,6 +75,8 @@ class WorkerAgent:
         logger.info("🛑 Stopping worker agent...")
         self._running = False
         
+        await self._cancel_all_tasks()
+        
         if self.websocket:
             await self.websocket.close()
         
@@ -125,6 +130,9 @@ class WorkerAgent:
             try:
                 await self._message_loop()
             finally:
+                # The orchestrator requeues in-flight tasks on disconnect;
+                # stop ours so they don't run twice
+                await self._cancel_all_tasks()
                 heartbeat_task.cancel()
                 try:
                     await heartbeat_task
@@ -140,7 +148,8 @@ class WorkerAgent:
             "metadata": {
                 "name": config.WORKER_NAME,
                 "version": config.WORKER_VERSION,
-                "local_api_url": self.local_api_url
+                "local_api_url": self.local_api_url,
+                "capacity": self.capacity
             }
         }
         
@@ -151,7 +160,7 @@ class WorkerAgent:
         
         if data.get("type") == "auth_success":
             self.worker_id = data.get("worker_id")
-            logger.info(f"✅ Authenticated as {self.worker_id}")
+            logger.info(f"✅ Authenticated as {self.worker_id} ({data.get('capacity', self.capacity)} slot(s))")
             return True
         else:
             error = data.get("error", "Unknown error")
@@ -182,15 +191,17 @@ class WorkerAgent:
                     logger.debug("💓 Heartbeat acknowledged")
                     
                 elif msg_type == "task":
-                    # Received a task to execute
-                    await self._handle_task(data)
+                    # Received a task - run it alongside any others so the
+                    # loop keeps serving heartbeats, cancels and new tasks
+                    self._start_task(data)
                     
                 elif msg_type == "cancel":
                     # Task cancellation request
                     task_id = data.get("task_id")
-                    if task_id == self.current_task_id:
+                    execution = self._tasks.get(task_id)
+                    if execution:
                         logger.info(f"🚫 Task {task_id} cancelled")
-                        # TODO: Implement cancellation logic
+                        execution.cancel()
                         
                 else:
                     logger.debug(f"Received: {msg_type}")
@@ -200,6 +211,35 @@ class WorkerAgent:
             except Exception as e:
                 logger.error(f"Message handling error: {e}")
     
+    def _start_task(self, data: dict):
+        """Schedule a task in its own asyncio task, tracked by task_id."""
+        task_id = data.get("task_id")
+        if task_id in self._tasks:
+            logger.warning(f"Task {task_id} already running, ignoring duplicate assignment")
+            return
+        if len(self._tasks) >= self.capacity:
+            logger.warning(
+                f"Received task {task_id} with all {self.capacity} slot(s) busy; running it anyway"
+            )
+        
+        execution = asyncio.create_task(self._handle_task(data))
+        self._tasks[task_id] = execution
+        execution.add_done_callback(lambda done: self._on_task_done(task_id, done))
+    
+    def _on_task_done(self, task_id: str, execution: asyncio.Task):
+        """Free the slot and surface errors raised outside _handle_task's handlers."""
+        self._tasks.pop(task_id, None)
+        if not execution.cancelled() and execution.exception():
+            logger.error(f"Task {task_id} handler error: {execution.exception()}")
+    
+    async def _cancel_all_tasks(self):
+        """Cancel every running task and wait for them to unwind."""
+        executions = list(self._tasks.values())
+        for execution in executions:
+            execution.cancel()
+        if executions:
+            await asyncio.gather(*executions, return_exceptions=True)
+    
     async def _handle_task(self, data: dict):
         """
         Handle an incoming task from orchestrator.
@@ -209,8 +249,7 @@ class WorkerAgent:
         action = data.get("action")
         payload = data.get("payload", {})
         
-        logger.info(f"📥 Received task: {task_id} ({action})")
-        self.current_task_id = task_id
+        logger.info(f"📥 Received task: {task_id} ({action}) [{len(self._tasks)}/{self.capacity} slots]")
         
         # Notify orchestrator we're starting
         await self._send({
@@ -230,6 +269,10 @@ class WorkerAgent:
             })
             logger.info(f"✅ Task {task_id} completed")
             
+        except asyncio.CancelledError:
+            # Orchestrator already marked it cancelled (or requeued it on disconnect)
+            logger.info(f"🚫 Task {task_id} stopped")
+            raise
         except Exception as e:
             # Report failure
             error_msg = str(e)
@@ -239,8 +282,6 @@ class WorkerAgent:
                 "task_id": task_id,
                 "error": error_msg
             })
-        finally:
-            self.current_task_id = None
     
     async def _execute_task(
         self, 
@@ -286,6 +327,7 @@ class WorkerAgent:
         endpoints = {
             # Crunchbase endpoints
             "search_with_rank": "/search/crunchbase/top-similar-with-rank",
+            "collect_with_rank": "/search/crunchbase/collect-with-rank",  # Scatter sub-task (keyword collection only)
             "search_similar": "/search/crunchbase/top-similar",
             "search_batch": "/search/crunchbase/batch",
             
@@ -306,22 +348,23 @@ class WorkerAgent:
     
     async def send_status(
         self,
+        task_id: str,
         step_key: str,
         detail_type: str,
         message: str,
         data: dict = None
     ):
         """
-        Send a status update to orchestrator.
+        Send a status update for one running task to orchestrator.
         
         This can be called during task execution to report progress.
         """
-        if not self.current_task_id:
+        if task_id not in self._tasks:
             return
         
         await self._send({
             "type": "status",
-            "task_id": self.current_task_id,
+            "task_id": task_id,
             "step_key": step_key,
             "detail_type": detail_type,
             "message": message,
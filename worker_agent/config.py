@@ -18,6 +18,10 @@ API_TYPE = os.getenv("API_TYPE", "crunchbase")
 # Local API endpoint (the actual scraper API this agent wraps)
 LOCAL_API_URL = os.getenv("LOCAL_API_URL", "http://localhost:8003")
 
+# Concurrent task slots advertised to the orchestrator (e.g. browser tabs/contexts
+# the local scraper can drive in parallel)
+WORKER_CAPACITY = int(os.getenv("WORKER_CAPACITY", "1"))
+
 # Connection settings
 HEARTBEAT_INTERVAL = int(os.getenv("HEARTBEAT_INTERVAL", "10"))  # seconds
 RECONNECT_DELAY = int(os.getenv("RECONNECT_DELAY", "5"))  # seconds